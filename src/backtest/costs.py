@@ -0,0 +1,192 @@
+"""펀딩비 / 오더북 depth 슬리피지 비용 모델.
+
+백테스트 전에 한 번만 봉 인덱스에 맞춘 배열(CostArrays)을 만들고, fast 엔진 커널은
+봉마다 배열 조회만 한다 (주문마다 오더북을 다시 걷지 않는다).
+
+- 펀딩: 펀딩 시각 t 를 포함하는 봉에서, 그 봉 시가 직전부터 들고 있던 포지션에
+  direction x size x 시가 x rate 를 현금에서 차감 (롱은 양수 rate 에 지불, 숏은 수취).
+  펀딩 시각이 봉 시가와 일치하는 경우(8h 이하 interval)가 정확하고, 더 긴 봉은 합산 근사.
+- 슬리피지: 스냅샷마다 명목가 격자(notional) 위의 시장가 매수/매도 평균 체결가 괴리율
+  곡선을 미리 계산하고, 봉마다 그 시각 이전 최신 스냅샷 번호만 둔다. 시가 진입과
+  손절(stop) 청산에 적용하고, 지정가인 익절(limit) 청산에는 적용하지 않는다.
+"""
+from __future__ import annotations
+
+from typing import NamedTuple, Sequence
+
+import numpy as np
+import pandas as pd
+
+from data.cost_store import CostStore, DepthSnapshots
+
+# 10 USDT ~ 100M USDT, log-spaced
+DEFAULT_NOTIONAL_GRID = np.logspace(1, 8, 29)
+
+
+class CostArrays(NamedTuple):
+    """봉 인덱스에 정렬된 비용 배열. fast 엔진 커널 인자로 그대로 넘긴다 (numba 지원 namedtuple).
+
+    funding   : (n_bars, n_symbols) 봉 시가에 부과할 펀딩 rate 합계. 빈 배열이면 펀딩 없음.
+    depth_idx : (n_bars, n_symbols) buy / sell 곡선 행 번호, -1 은 슬리피지 없음. 빈 배열이면 depth 없음.
+    notional  : (n_grid,) 곡선 격자 (호가 통화 명목가).
+    buy, sell : (n_curves, n_grid) 시장가 매수 / 매도 슬리피지 비율 (>= 0).
+    """
+
+    funding: np.ndarray
+    depth_idx: np.ndarray
+    notional: np.ndarray
+    buy: np.ndarray
+    sell: np.ndarray
+
+    @classmethod
+    def empty(cls, n_symbols: int = 1) -> "CostArrays":
+        """비용 없음 (엔진 결과는 비용 모델 이전과 비트 단위로 같다)."""
+        grid = np.array([0.0, 1.0])
+        return cls(
+            np.zeros((0, n_symbols)),
+            np.zeros((0, n_symbols), dtype=np.int64),
+            grid,
+            np.zeros((1, 2)),
+            np.zeros((1, 2)),
+        )
+
+    def check(self, n_bars: int, n_symbols: int = 1) -> "CostArrays":
+        for name in ("funding", "depth_idx"):
+            a = getattr(self, name)
+            if a.shape[0] and a.shape != (n_bars, n_symbols):
+                raise ValueError(f"costs.{name} must be ({n_bars}, {n_symbols}), got {a.shape}")
+        return self
+
+    def column(self, k: int) -> "CostArrays":
+        """심볼 k 열만 남긴 (n_bars, 1) 비용 (단일 심볼 엔진용)."""
+        return self._replace(funding=self.funding[:, k : k + 1], depth_idx=self.depth_idx[:, k : k + 1])
+
+
+def slippage_curves(
+    depth: DepthSnapshots,
+    notional: np.ndarray = DEFAULT_NOTIONAL_GRID,
+) -> tuple[np.ndarray, np.ndarray]:
+    """스냅샷별 시장가 매수(ask 소진) / 매도(bid 소진) 슬리피지 곡선 (n_snapshots, n_grid).
+
+    명목가 q 주문의 평균 체결가를 호가를 순서대로 걸어 구하고 mid 대비 괴리율을 반환한다.
+    호가 전체 깊이를 넘는 주문은 마지막 호가 가격으로 나머지가 체결된다고 본다.
+    """
+    mid = (depth.bid_px[:, 0] + depth.ask_px[:, 0]) / 2.0
+    buy_px = _average_fill(depth.ask_px, depth.ask_qty, notional)
+    sell_px = _average_fill(depth.bid_px, depth.bid_qty, notional)
+    buy = np.maximum(buy_px / mid[:, None] - 1.0, 0.0)
+    sell = np.maximum(1.0 - sell_px / mid[:, None], 0.0)
+    return buy, sell
+
+
+def _average_fill(px: np.ndarray, qty: np.ndarray, notional: np.ndarray) -> np.ndarray:
+    # px / qty: (n_snapshots, n_levels) best level first
+    cum_notional = np.cumsum(px * qty, axis=1)
+    cum_qty = np.cumsum(qty, axis=1)
+    q = notional[None, :]
+    # level that completes each order (clamped to the last level); one (n, grid) pass per book level
+    level = np.zeros((px.shape[0], q.shape[1]), dtype=np.int64)
+    for j in range(px.shape[1] - 1):
+        level += cum_notional[:, j : j + 1] < q
+    prev_notional = np.where(level > 0, np.take_along_axis(cum_notional, np.maximum(level - 1, 0), axis=1), 0.0)
+    prev_qty = np.where(level > 0, np.take_along_axis(cum_qty, np.maximum(level - 1, 0), axis=1), 0.0)
+    level_px = np.take_along_axis(px, level, axis=1)
+    filled = prev_qty + (q - prev_notional) / level_px
+    return q / filled
+
+
+def funding_by_bar(index: pd.DatetimeIndex, funding: pd.Series, step_ms: int | None = None) -> np.ndarray:
+    """펀딩 시각별 rate 를 그 시각을 포함하는 봉 [open, open + step) 에 합산한 (n_bars,) 배열."""
+    bars = pd.DatetimeIndex(index).asi8 // 1_000_000
+    out = np.zeros(len(bars))
+    if funding is None or funding.empty or len(bars) == 0:
+        return out
+    if step_ms is None:
+        step_ms = int(np.median(np.diff(bars))) if len(bars) > 1 else 0
+    t = pd.DatetimeIndex(funding.index).asi8 // 1_000_000
+    pos = np.searchsorted(bars, t, side="right") - 1
+    ok = (pos >= 0) & (t < bars[np.maximum(pos, 0)] + step_ms)
+    np.add.at(out, pos[ok], np.asarray(funding, dtype=np.float64)[ok])
+    return out
+
+
+def depth_by_bar(
+    index: pd.DatetimeIndex,
+    snapshot_times: pd.DatetimeIndex,
+    max_age: str | pd.Timedelta | None = "1h",
+) -> np.ndarray:
+    """봉 시가 시점의 최신 스냅샷 번호 (as-of). 스냅샷 이전이거나 max_age 보다 오래되면 -1."""
+    bars = pd.DatetimeIndex(index).asi8
+    snaps = pd.DatetimeIndex(snapshot_times).asi8
+    pos = np.searchsorted(snaps, bars, side="right") - 1
+    if max_age is not None and len(snaps):
+        age = bars - snaps[np.maximum(pos, 0)]
+        pos[age > pd.Timedelta(max_age).value] = -1
+    return pos.astype(np.int64)
+
+
+class CostModel:
+    """CostStore 의 펀딩 / depth 이력을 봉 인덱스에 한 번 정렬해 CostArrays 로 만든다.
+
+    Parameters
+    ----------
+    store : CostStore
+    funding, depth : bool
+        각 비용을 켜고 끈다 (꺼진 비용은 빈 배열).
+    notional : ndarray
+        슬리피지 곡선의 명목가 격자.
+    max_depth_age : str
+        이보다 오래된 스냅샷은 쓰지 않는다 (그 봉은 슬리피지 0).
+    """
+
+    def __init__(
+        self,
+        store: CostStore,
+        funding: bool = True,
+        depth: bool = True,
+        notional: np.ndarray = DEFAULT_NOTIONAL_GRID,
+        max_depth_age: str | None = "1h",
+    ):
+        self.store = store
+        self.funding = funding
+        self.depth = depth
+        self.notional = np.asarray(notional, dtype=np.float64)
+        self.max_depth_age = max_depth_age
+
+    def arrays(self, symbols: Sequence[str], index: pd.DatetimeIndex) -> CostArrays:
+        """symbols 열 순서의 (n_bars, n_symbols) 비용 배열. 여러 심볼의 곡선은 한 표로 이어 붙인다."""
+        index = pd.DatetimeIndex(index)
+        m = len(symbols)
+        out = CostArrays.empty(m)
+        if len(index) == 0:
+            return out
+        start_ts = int(index[0].timestamp() * 1000)
+        end_ts = int(index[-1].timestamp() * 1000)
+        if self.funding:
+            funding = np.column_stack(
+                [funding_by_bar(index, self.store.read_funding(sym, start_ts, end_ts)) for sym in symbols]
+            )
+            out = out._replace(funding=funding)
+        if self.depth:
+            lookback = int(pd.Timedelta(self.max_depth_age or "1D").total_seconds() * 1000)
+            depth_idx = np.full((len(index), m), -1, dtype=np.int64)
+            buys, sells = [], []
+            offset = 0
+            for k, sym in enumerate(symbols):
+                snaps = self.store.read_depth(sym, start_ts - lookback, end_ts)
+                if snaps is None:
+                    continue
+                buy, sell = slippage_curves(snaps, self.notional)
+                pos = depth_by_bar(index, snaps.times, self.max_depth_age)
+                depth_idx[:, k] = np.where(pos >= 0, pos + offset, -1)
+                buys.append(buy)
+                sells.append(sell)
+                offset += len(buy)
+            if buys:
+                out = out._replace(
+                    depth_idx=depth_idx,
+                    notional=self.notional,
+                    buy=np.ascontiguousarray(np.concatenate(buys)),
+                    sell=np.ascontiguousarray(np.concatenate(sells)),
+                )
+        return out
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
 import datetime as dt
-from typing import Type
+from typing import Callable, Sequence, Type
 
 import backtrader as bt
+import numpy as np
 import pandas as pd
 
+from .costs import CostArrays
+from .fast_engine import FastBacktestResult, run_fast_backtest
+
 
 class PandasData_bt(bt.feeds.PandasData):
     params = (
@@ -27,13 +31,53 @@ def run_backtest(
     cash: float = 100_000.0,
     commission: float = 0.005,  # 0.5% per trade (both sides combined)
     leverage: float = 10.0,
+    engine: str = "backtrader",
+    costs: CostArrays | None = None,
+    checkpoints: Sequence[int] | None = None,
+    on_checkpoint: Callable[[int, np.ndarray, np.ndarray], bool] | None = None,
     **strategy_params,
 ):
+    """df 위에서 strategy_cls 를 백테스트.
+
+    engine="backtrader" 는 Cerebro 를 반환하고, engine="fast" 는 동일한 브래킷/수수료/
+    사이저 규칙을 배열 루프로 시뮬레이션해 FastBacktestResult 를 반환한다.
+    fast 경로의 진입 시그널은 strategy_cls.fast_signals(df, **params) 로 구한다.
+    fast 경로는 df 로 data.columnar.ColumnarFrame.feed() 뷰도 받는다.
+    costs (backtest.costs.CostArrays, 펀딩/depth 슬리피지) 와 checkpoints / on_checkpoint
+    (중간 보고, run_fast_backtest 참고) 는 fast 경로에서만 지원한다.
+    """
+    if engine == "fast":
+        params = dict(strategy_cls.params._getitems())
+        params.update(strategy_params)
+        signal = strategy_cls.fast_signals(df, **params)
+        return run_fast_backtest(
+            np.asarray(df["open"]),
+            np.asarray(df["high"]),
+            np.asarray(df["low"]),
+            np.asarray(df["close"]),
+            signal,
+            cash=cash,
+            commission=commission,
+            leverage=leverage,
+            sl_pct=params["sl_pct"],
+            rr=params["rr"],
+            index=df.index,
+            costs=costs,
+            checkpoints=checkpoints,
+            on_checkpoint=on_checkpoint,
+        )
+    if engine != "backtrader":
+        raise ValueError(f"Unknown engine: {engine}")
+    if costs is not None:
+        raise ValueError('costs require engine="fast"')
+    if checkpoints is not None:
+        raise ValueError('checkpoints require engine="fast"')
+
     cerebro = bt.Cerebro()
     cerebro.broker.setcash(cash)
-    cerebro.broker.setcommission(commission=commission)
+    cerebro.broker.setcommission(commission=commission, leverage=leverage)
     cerebro.broker.set_slippage_perc(perc=0.0)  # no slippage
-    cerebro.addsizer(bt.sizers.PercentSizer, perc=100)  # full notional (will be leveraged)
+    cerebro.addsizer(bt.sizers.PercentSizer, percents=100)  # full notional (will be leveraged)
 
     datafeed = PandasData_bt(dataname=df)
     cerebro.adddata(datafeed)
@@ -42,4 +86,11 @@ def run_backtest(
     print(f"Starting Portfolio Value: {cerebro.broker.getvalue():.2f}")
     cerebro.run()
     print(f"Final Portfolio Value: {cerebro.broker.getvalue():.2f}")
-    return cerebro 
\ No newline at end of file
+    return cerebro
+
+
+def final_value(result: bt.Cerebro | FastBacktestResult) -> float:
+    """run_backtest 결과(엔진 무관)의 최종 포트폴리오 가치."""
+    if isinstance(result, FastBacktestResult):
+        return result.final_value
+    return result.broker.getvalue()
@@ -0,0 +1,554 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Sequence
+
+import numpy as np
+import pandas as pd
+from numba import njit
+
+from .costs import CostArrays
+
+TRADE_COLUMNS = [
+    "entry_idx",
+    "exit_idx",
+    "direction",
+    "size",
+    "entry_price",
+    "exit_price",
+    "pnl",
+]
+
+
+@dataclass
+class FastBacktestResult:
+    """run_backtest(engine="fast") 결과.
+
+    equity 는 각 봉 종가 기준 포트폴리오 가치, trades 는 청산 완료된 거래 목록.
+    stopped_at 은 on_checkpoint 로 중단된 경우 그 봉 위치 (equity 는 그 앞까지).
+    funding / slippage 는 costs 로 부과된 펀딩비(음수면 수취)와 슬리피지 비용 누계.
+    """
+
+    final_value: float
+    equity: np.ndarray
+    trades: pd.DataFrame
+    index: pd.Index | None = None
+    stopped_at: int | None = None
+    funding: float = 0.0
+    slippage: float = 0.0
+
+    def getvalue(self) -> float:
+        return self.final_value
+
+    @property
+    def equity_curve(self) -> pd.Series:
+        return pd.Series(self.equity, index=self.index, name="equity")
+
+
+@dataclass
+class BatchBacktestResult:
+    """run_backtest_batch 결과. equity 외 모든 필드는 (n_configs,) 배열.
+
+    n_wins / gross_profit / gross_loss / bars_held 는 청산된 거래 기준 누계 (backtest.metrics 입력).
+    equity 는 record_equity=True 일 때만 (n_configs, n_bars) 봉별 가치.
+    funding / slippage 는 costs 로 부과된 비용 누계.
+    """
+
+    final_value: np.ndarray
+    max_drawdown: np.ndarray
+    n_trades: np.ndarray
+    n_wins: np.ndarray | None = None
+    gross_profit: np.ndarray | None = None
+    gross_loss: np.ndarray | None = None
+    bars_held: np.ndarray | None = None
+    equity: np.ndarray | None = None
+    n_bars: int = 0
+    cash: float = 100_000.0
+    funding: np.ndarray | None = None
+    slippage: np.ndarray | None = None
+
+
+@njit(cache=True)
+def _bracket_accepted(cash, direction, size, created, sl_price, tp_price, commission, leverage):
+    """BackBroker.check_submitted 재현: 부모 -> SL -> TP 순으로 현금을 누적 의사 체결.
+
+    하나라도 현금이 음수가 되면 브래킷 전체가 취소(Margin)된다.
+    """
+    s = size
+    if direction > 0:
+        cash -= s * created / leverage + s * created * commission
+        if cash < 0.0:
+            return False
+        # SL 매도 = 롱 청산
+        cash += s * sl_price / leverage - s * sl_price * commission
+        if cash < 0.0:
+            return False
+        # TP 매도 = (의사 체결상) 신규 숏
+        cash += s * tp_price - s * tp_price * commission
+    else:
+        cash += s * created - s * created * commission
+        if cash < 0.0:
+            return False
+        # SL 매수 = 숏 청산
+        cash -= s * sl_price + s * sl_price * commission
+        if cash < 0.0:
+            return False
+        # TP 매수 = (의사 체결상) 신규 롱
+        cash -= s * tp_price / leverage + s * tp_price * commission
+    return cash >= 0.0
+
+
+# per-config state columns (float64 배열 한 행 = 한 설정)
+(
+    _CASH,
+    _POS_DIR,
+    _POS_SIZE,
+    _ENTRY,
+    _ENTRY_COMM,
+    _ACTIVE,
+    _PEND_DIR,
+    _PEND_SIZE,
+    _PEND_CREATED,
+    _SL,
+    _TP,
+    _FUNDING,  # cumulative funding paid (negative = received)
+    _SLIPPAGE,  # cumulative slippage cost
+) = range(13)
+_N_STATE = 13
+
+
+@njit(cache=True)
+def _init_state(n_configs, cash):
+    state = np.zeros((n_configs, _N_STATE))
+    state[:, _CASH] = cash
+    return state
+
+
+@njit(cache=True)
+def _open_position(st, d, s, price, commission, leverage):
+    """size s 포지션을 price 에 진입. 진입 후 현금이 음수가 되면 체결하지 않고 False."""
+    cash = st[_CASH]
+    if d > 0:
+        need = s * price / leverage + s * price * commission
+    else:
+        need = -s * price + s * price * commission
+    if cash - need < 0.0:
+        return False
+    st[_CASH] = cash - need
+    st[_POS_DIR] = d
+    st[_POS_SIZE] = s
+    st[_ENTRY] = price
+    st[_ENTRY_COMM] = s * price * commission
+    st[_ACTIVE] = 0.0
+    return True
+
+
+@njit(cache=True)
+def _close_position(st, exit_price, commission, leverage):
+    """보유 포지션을 exit_price 에 청산 (증거금 반환 + 손익 - 청산 수수료)."""
+    s = st[_POS_SIZE]
+    entry_price = st[_ENTRY]
+    exit_comm = s * exit_price * commission
+    if st[_POS_DIR] > 0:
+        st[_CASH] += s * entry_price / leverage + s * (exit_price - entry_price) - exit_comm
+    else:
+        st[_CASH] += -s * entry_price + s * (entry_price - exit_price) - exit_comm
+    st[_POS_DIR] = 0.0
+
+
+@njit(cache=True)
+def _broker_step(st, o, h, lo, commission, leverage, slip=0.0):
+    """한 설정의 한 봉 브로커 처리. 청산이 일어나면 청산가, 아니면 nan 반환.
+
+    backtrader BackBroker + SignalTradeStrategy 브래킷 주문 흐름을 그대로 재현:
+    - 대기 중 브래킷은 제출 시 의사 체결 검사 + 시가 체결 검사 후 진입.
+    - SL/TP 는 진입 다음 봉부터 유효, 같은 봉에서 둘 다 닿으면 SL 우선.
+    - 롱은 명목가/leverage 만큼 현금을 묶고, 숏은 매도대금이 현금에 더해짐.
+    - slip (비율, _slippage 참고) 은 시가 진입과 손절 청산을 불리한 쪽으로 민다.
+      지정가인 익절 청산에는 적용하지 않는다. slip=0 이면 backtrader 와 동일.
+    """
+    exit_price = np.nan
+    pos_dir = st[_POS_DIR]
+    if st[_PEND_DIR] != 0.0:
+        d = st[_PEND_DIR]
+        s = st[_PEND_SIZE]
+        ok = _bracket_accepted(st[_CASH], d, s, st[_PEND_CREATED], st[_SL], st[_TP], commission, leverage)
+        fill = o
+        if slip != 0.0:
+            o = fill * (1.0 + d * slip)
+        if ok and _open_position(st, d, s, o, commission, leverage):
+            st[_SLIPPAGE] += s * abs(o - fill)
+        st[_PEND_DIR] = 0.0
+    elif pos_dir != 0.0 and st[_ACTIVE] != 0.0:
+        sl_price = st[_SL]
+        tp_price = st[_TP]
+        stopped = False
+        if pos_dir > 0:
+            if o <= sl_price:
+                exit_price = o
+                stopped = True
+            elif lo <= sl_price:
+                exit_price = sl_price
+                stopped = True
+            elif tp_price <= o:
+                exit_price = o
+            elif tp_price <= h:
+                exit_price = tp_price
+        else:
+            if o >= sl_price:
+                exit_price = o
+                stopped = True
+            elif h >= sl_price:
+                exit_price = sl_price
+                stopped = True
+            elif tp_price >= o:
+                exit_price = o
+            elif tp_price >= lo:
+                exit_price = tp_price
+        if stopped and slip != 0.0:
+            trigger = exit_price
+            exit_price = trigger * (1.0 - pos_dir * slip)
+            st[_SLIPPAGE] += st[_POS_SIZE] * abs(exit_price - trigger)
+        if not np.isnan(exit_price):
+            _close_position(st, exit_price, commission, leverage)
+    if st[_POS_DIR] != 0.0:
+        st[_ACTIVE] = 1.0
+    return exit_price
+
+
+@njit(cache=True)
+def _slippage(st, o, costs, i, k):
+    """봉 i / 심볼 k 시가에 체결될 수 있는 주문(대기 진입 또는 보유 포지션 청산)의 슬리피지 비율.
+
+    주문 명목가(size x 시가)를 그 봉의 depth 곡선(costs.buy / costs.sell 행)에 선형 보간한다.
+    """
+    if costs.depth_idx.shape[0] == 0:
+        return 0.0
+    row = costs.depth_idx[i, k]
+    if row < 0:
+        return 0.0
+    if st[_PEND_DIR] != 0.0:
+        side = st[_PEND_DIR]
+        size = st[_PEND_SIZE]
+    elif st[_POS_DIR] != 0.0:
+        side = -st[_POS_DIR]
+        size = st[_POS_SIZE]
+    else:
+        return 0.0
+    curve = costs.buy[row] if side > 0 else costs.sell[row]
+    return np.interp(size * o, costs.notional, curve)
+
+
+@njit(cache=True)
+def _charge_funding(st, o, costs, i, k):
+    """봉 i 시가 직전부터 보유한 포지션에 그 봉의 펀딩 rate 를 시가 명목가로 부과 (롱 지불 / 숏 수취)."""
+    if costs.funding.shape[0] == 0 or st[_POS_DIR] == 0.0:
+        return
+    rate = costs.funding[i, k]
+    if rate != 0.0:
+        amount = st[_POS_DIR] * st[_POS_SIZE] * o * rate
+        st[_CASH] -= amount
+        st[_FUNDING] += amount
+
+
+@njit(cache=True)
+def _mark_value(st, c, leverage):
+    """봉 종가 기준 포트폴리오 가치 (BackBroker._get_value 와 동일)."""
+    if st[_POS_DIR] > 0:
+        return st[_CASH] + st[_POS_SIZE] * st[_ENTRY] / leverage + st[_POS_SIZE] * (c - st[_ENTRY])
+    if st[_POS_DIR] < 0:
+        return st[_CASH] - st[_POS_SIZE] * c
+    return st[_CASH]
+
+
+@njit(cache=True)
+def _strategy_step(st, c, sig, sl_pct, rr, percents):
+    """포지션이 없으면 시그널 봉 종가로 브래킷(size/SL/TP) 을 예약."""
+    if st[_POS_DIR] != 0.0 or (sig != 1 and sig != -1):
+        return
+    st[_PEND_DIR] = sig
+    st[_PEND_SIZE] = st[_CASH] / c * (percents / 100.0)
+    st[_PEND_CREATED] = c
+    if sig == 1:
+        st[_SL] = c * (1.0 - sl_pct)
+        st[_TP] = c + (c - st[_SL]) * rr
+    else:
+        st[_SL] = c * (1.0 + sl_pct)
+        st[_TP] = c - (st[_SL] - c) * rr
+
+
+@njit(cache=True)
+def _simulate_segment(
+    open_,
+    high,
+    low,
+    close,
+    signal,
+    sl_pct,
+    rr,
+    commission,
+    leverage,
+    percents,
+    st,
+    start,
+    stop,
+    equity,
+    t_int,
+    t_float,
+    counters,
+    costs,
+):
+    """[start, stop) 봉 구간 시뮬레이션. 상태(st)·equity·거래 버퍼를 이어서 갱신한다.
+
+    t_int 행: entry_idx / exit_idx / direction, t_float 행: size / entry_price / exit_price / pnl.
+    counters = [거래 수, 현재 포지션 진입 봉].
+    """
+    n_trades = counters[0]
+    entry_idx = counters[1]
+    for i in range(start, stop):
+        o = open_[i]
+        _charge_funding(st, o, costs, i, 0)
+        was_pending = st[_PEND_DIR] != 0.0
+        pos_dir = st[_POS_DIR]
+        exit_price = _broker_step(st, o, high[i], low[i], commission, leverage, _slippage(st, o, costs, i, 0))
+        if was_pending and st[_POS_DIR] != 0.0:
+            entry_idx = i
+        if not np.isnan(exit_price):
+            s = st[_POS_SIZE]
+            entry_price = st[_ENTRY]
+            if pos_dir > 0:
+                pnl = s * (exit_price - entry_price)
+            else:
+                pnl = s * (entry_price - exit_price)
+            t_int[0, n_trades] = entry_idx
+            t_int[1, n_trades] = i
+            t_int[2, n_trades] = int(pos_dir)
+            t_float[0, n_trades] = s
+            t_float[1, n_trades] = entry_price
+            t_float[2, n_trades] = exit_price
+            t_float[3, n_trades] = pnl - st[_ENTRY_COMM] - s * exit_price * commission
+            n_trades += 1
+        equity[i] = _mark_value(st, close[i], leverage)
+        _strategy_step(st, close[i], signal[i], sl_pct, rr, percents)
+    counters[0] = n_trades
+    counters[1] = entry_idx
+
+
+@njit(cache=True)
+def _simulate_bracket_batch(
+    open_,
+    high,
+    low,
+    close,
+    signals,
+    sl_pct,
+    rr,
+    cash,
+    commission,
+    leverage,
+    percents,
+    equity,
+    costs,
+):
+    """여러 설정을 한 번의 봉 루프로 시뮬레이션. 설정별 상태는 state 행렬의 행.
+
+    signals 는 봉 단위 접근이 연속이 되도록 (n_bars, n_configs) 로 받는다.
+    equity 가 (n_bars, n_configs) 면 봉별 가치를 기록하고, (0, n_configs) 면 기록하지 않는다.
+    costs 는 (n_bars, 1) 비용 배열 (모든 설정이 같은 심볼).
+    """
+    n = close.shape[0]
+    m = signals.shape[1]
+    record = equity.shape[0] == n
+    state = _init_state(m, cash)
+    peak = np.full(m, cash)
+    max_dd = np.zeros(m)
+    n_trades = np.zeros(m, dtype=np.int64)
+    n_wins = np.zeros(m, dtype=np.int64)
+    gross_profit = np.zeros(m)
+    gross_loss = np.zeros(m)
+    bars_held = np.zeros(m, dtype=np.int64)
+    entry_bar = np.zeros(m, dtype=np.int64)
+    final = np.full(m, cash)
+    for i in range(n):
+        o = open_[i]
+        h = high[i]
+        lo = low[i]
+        c = close[i]
+        for k in range(m):
+            st = state[k]
+            _charge_funding(st, o, costs, i, 0)
+            was_pending = st[_PEND_DIR] != 0.0
+            pos_dir = st[_POS_DIR]
+            exit_price = _broker_step(st, o, h, lo, commission, leverage, _slippage(st, o, costs, i, 0))
+            if was_pending and st[_POS_DIR] != 0.0:
+                entry_bar[k] = i
+            if not np.isnan(exit_price):
+                n_trades[k] += 1
+                # same net pnl as the trade list of _simulate_segment
+                s = st[_POS_SIZE]
+                gross = s * (exit_price - st[_ENTRY]) if pos_dir > 0 else s * (st[_ENTRY] - exit_price)
+                pnl = gross - st[_ENTRY_COMM] - s * exit_price * commission
+                if pnl > 0.0:
+                    n_wins[k] += 1
+                    gross_profit[k] += pnl
+                elif pnl < 0.0:
+                    gross_loss[k] -= pnl
+                bars_held[k] += i - entry_bar[k]
+            v = _mark_value(st, c, leverage)
+            if record:
+                equity[i, k] = v
+            if v > peak[k]:
+                peak[k] = v
+            elif peak[k] > 0.0:
+                dd = 1.0 - v / peak[k]
+                if dd > max_dd[k]:
+                    max_dd[k] = dd
+            final[k] = v
+            _strategy_step(st, c, signals[i, k], sl_pct[k], rr[k], percents)
+    return final, max_dd, n_trades, n_wins, gross_profit, gross_loss, bars_held, state[:, _FUNDING], state[:, _SLIPPAGE]
+
+
+def _trades_frame(t_int: np.ndarray, t_float: np.ndarray, n_trades: int) -> pd.DataFrame:
+    cols = [*t_int[:, :n_trades], *t_float[:, :n_trades]]
+    return pd.DataFrame(dict(zip(TRADE_COLUMNS, cols)))
+
+
+def run_fast_backtest(
+    open_: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    signal: np.ndarray,
+    cash: float = 100_000.0,
+    commission: float = 0.005,
+    leverage: float = 10.0,
+    sl_pct: float = 0.005,
+    rr: float = 1.5,
+    percents: float = 100.0,
+    index: pd.Index | None = None,
+    checkpoints: Sequence[int] | None = None,
+    on_checkpoint: Callable[[int, np.ndarray, np.ndarray], bool] | None = None,
+    costs: CostArrays | None = None,
+) -> FastBacktestResult:
+    """OHLC/시그널 배열 위에서 브래킷(SL/TP) 전략을 시뮬레이션.
+
+    checkpoints 는 중간 보고 지점(봉 위치, 오름차순). 각 지점 stop 까지 진행한 뒤
+    on_checkpoint(stop, equity[:stop], 청산된 거래 pnl) 를 호출하고 (배열은 복사 없는 뷰),
+    True 를 반환하면 거기서 멈춘 부분 결과(stopped_at=stop)를 반환한다 (Optuna pruning 용).
+    costs 는 backtest.costs.CostModel.arrays() 로 만든 (n_bars, 1) 펀딩/슬리피지 배열.
+    """
+    arrays = [np.ascontiguousarray(a, dtype=np.float64) for a in (open_, high, low, close)]
+    sig = np.asarray(signal)
+    if sig.dtype.kind == "f":
+        sig = np.nan_to_num(sig)
+    sig = np.ascontiguousarray(sig, dtype=np.int8)
+    n = len(sig)
+    max_trades = n // 2 + 1
+    equity = np.empty(n)
+    t_int = np.empty((3, max_trades), dtype=np.int64)
+    t_float = np.empty((4, max_trades))
+    counters = np.zeros(2, dtype=np.int64)
+    st = _init_state(1, float(cash))[0]
+    params = (float(sl_pct), float(rr), float(commission), float(leverage), float(percents))
+    costs = (costs or CostArrays.empty()).check(n)
+
+    stops = [int(b) for b in (checkpoints or ()) if 0 < b < n] + [n]
+    start = 0
+    for stop in stops:
+        _simulate_segment(*arrays, sig, *params, st, start, stop, equity, t_int, t_float, counters, costs)
+        start = stop
+        if stop < n and on_checkpoint is not None and on_checkpoint(stop, equity[:stop], t_float[3, : counters[0]]):
+            return FastBacktestResult(
+                final_value=float(equity[stop - 1]),
+                equity=equity[:stop],
+                trades=_trades_frame(t_int, t_float, int(counters[0])),
+                index=index[:stop] if index is not None else None,
+                stopped_at=stop,
+                funding=float(st[_FUNDING]),
+                slippage=float(st[_SLIPPAGE]),
+            )
+
+    final_value = float(equity[-1]) if n else float(cash)
+    trades = _trades_frame(t_int, t_float, int(counters[0]))
+    return FastBacktestResult(
+        final_value=final_value,
+        equity=equity,
+        trades=trades,
+        index=index,
+        funding=float(st[_FUNDING]),
+        slippage=float(st[_SLIPPAGE]),
+    )
+
+
+def run_backtest_batch(
+    ohlc: np.ndarray | pd.DataFrame,
+    signals_matrix: np.ndarray,
+    sl_pct: np.ndarray | float,
+    rr: np.ndarray | float,
+    cash: float = 100_000.0,
+    commission: float = 0.005,
+    leverage: float = 10.0,
+    percents: float = 100.0,
+    record_equity: bool = False,
+    costs: CostArrays | None = None,
+) -> BatchBacktestResult:
+    """N 개의 독립 설정을 공유 OHLC 버퍼 위에서 한 번에 시뮬레이션.
+
+    Parameters
+    ----------
+    ohlc : ndarray or DataFrame
+        (n_bars, 4) open/high/low/close. DataFrame 이면 해당 이름 컬럼 사용.
+    signals_matrix : ndarray
+        (n_configs, n_bars) 진입 시그널(+1/-1/0). 1-D 면 모든 설정에 공유.
+    sl_pct, rr : ndarray or float
+        설정별 SL 비율과 RR. 스칼라면 브로드캐스트.
+    record_equity : bool
+        True 면 설정별 봉 가치 (n_configs, n_bars) 를 result.equity 에 담는다
+        (Sharpe 등 equity 기반 지표용, n_configs x n_bars x 8 바이트).
+    costs : CostArrays
+        (n_bars, 1) 펀딩/슬리피지 배열. 모든 설정에 같이 적용.
+    """
+    if isinstance(ohlc, pd.DataFrame):
+        ohlc = ohlc[["open", "high", "low", "close"]].values
+    ohlc = np.asarray(ohlc, dtype=np.float64)
+    sig = np.asarray(signals_matrix)
+    if sig.dtype.kind == "f":
+        sig = np.nan_to_num(sig)
+    sl = np.atleast_1d(np.asarray(sl_pct, dtype=np.float64))
+    rr_ = np.atleast_1d(np.asarray(rr, dtype=np.float64))
+    m = max(sig.shape[0] if sig.ndim == 2 else 1, sl.size, rr_.size)
+    if sig.ndim == 1:
+        sig = np.broadcast_to(sig, (m, sig.size))
+    if sig.shape[1] != ohlc.shape[0]:
+        raise ValueError(f"signals_matrix has {sig.shape[1]} bars, ohlc has {ohlc.shape[0]}")
+    sig = np.ascontiguousarray(np.broadcast_to(sig.astype(np.int8, copy=False), (m, ohlc.shape[0])).T)
+    sl = np.ascontiguousarray(np.broadcast_to(sl, (m,)))
+    rr_ = np.ascontiguousarray(np.broadcast_to(rr_, (m,)))
+    equity = np.empty((ohlc.shape[0] if record_equity else 0, m))
+    costs = (costs or CostArrays.empty()).check(ohlc.shape[0])
+    final, max_dd, n_trades, n_wins, gross_profit, gross_loss, bars_held, funding, slippage = _simulate_bracket_batch(
+        *(np.ascontiguousarray(ohlc[:, j]) for j in range(4)),
+        sig,
+        sl,
+        rr_,
+        float(cash),
+        float(commission),
+        float(leverage),
+        float(percents),
+        equity,
+        costs,
+    )
+    return BatchBacktestResult(
+        final_value=final,
+        max_drawdown=max_dd,
+        n_trades=n_trades,
+        n_wins=n_wins,
+        gross_profit=gross_profit,
+        gross_loss=gross_loss,
+        bars_held=bars_held,
+        equity=equity.T if record_equity else None,
+        n_bars=ohlc.shape[0],
+        cash=float(cash),
+        funding=funding,
+        slippage=slippage,
+    )
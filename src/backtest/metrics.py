@@ -0,0 +1,325 @@
+"""equity / 거래 배열에서 성과 지표를 벡터화로 계산.
+
+모든 함수는 마지막 축을 시간(봉) 축으로 본다. 1-D 입력은 실행 하나, 2-D 입력
+(n_runs, n_bars) 는 여러 실행을 한 번의 배열 연산으로 처리하고 실행별 값을 반환한다.
+backtrader analyzer 없이 FastBacktestResult / BatchBacktestResult 에서 바로 계산한다.
+"""
+from __future__ import annotations
+
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from .engine import final_value
+from .fast_engine import BatchBacktestResult, FastBacktestResult
+
+Metrics = Dict[str, np.ndarray]
+
+HOURS_PER_YEAR = 365 * 24  # crypto trades 24/7
+
+
+def periods_per_year(index: pd.Index) -> float:
+    """DatetimeIndex 의 봉 간격(중앙값)으로 연간 봉 수 추정. 판단 불가면 1h 기준."""
+    ts = pd.DatetimeIndex(index).asi8
+    if len(ts) < 2:
+        return float(HOURS_PER_YEAR)
+    step = float(np.median(np.diff(ts)))
+    if step <= 0:
+        return float(HOURS_PER_YEAR)
+    return 365 * 24 * 3600 * 1e9 / step
+
+
+def returns(equity: np.ndarray) -> np.ndarray:
+    """봉별 단순 수익률 (마지막 축 길이 n-1). 직전 가치가 0 이하인 봉은 0."""
+    equity = np.asarray(equity, dtype=np.float64)
+    prev = equity[..., :-1]
+    out = np.zeros_like(prev)
+    np.divide(np.diff(equity, axis=-1), prev, out=out, where=prev > 0)
+    return out
+
+
+def _ratio(num: np.ndarray, den: np.ndarray) -> np.ndarray:
+    # num / den with 0 where the denominator is 0
+    num, den = np.broadcast_arrays(np.asarray(num, dtype=np.float64), np.asarray(den, dtype=np.float64))
+    out = np.zeros(num.shape)
+    np.divide(num, den, out=out, where=den != 0)
+    return out
+
+
+def sharpe_ratio(equity: np.ndarray, periods: float = HOURS_PER_YEAR) -> np.ndarray:
+    """연율화 Sharpe (무위험 수익률 0, 표본 표준편차)."""
+    r = returns(equity)
+    if r.shape[-1] < 2:
+        return np.zeros(r.shape[:-1])
+    return _ratio(r.mean(axis=-1), r.std(axis=-1, ddof=1)) * np.sqrt(periods)
+
+
+def sortino_ratio(equity: np.ndarray, periods: float = HOURS_PER_YEAR) -> np.ndarray:
+    """연율화 Sortino (하방 편차 = 음수 수익률 제곱 평균의 제곱근)."""
+    r = returns(equity)
+    if r.shape[-1] < 1:
+        return np.zeros(r.shape[:-1])
+    downside = np.sqrt(np.mean(np.minimum(r, 0.0) ** 2, axis=-1))
+    return _ratio(r.mean(axis=-1), downside) * np.sqrt(periods)
+
+
+def drawdown(equity: np.ndarray, initial: float | np.ndarray | None = None) -> tuple[np.ndarray, np.ndarray]:
+    """(최대 낙폭 비율, 최장 낙폭 기간[봉]).
+
+    기간은 직전 고점(신고가 봉)부터 지난 봉 수의 최댓값으로, 끝까지 회복하지 못한 구간도 포함한다.
+    initial 을 주면 시작 자본도 고점 후보로 본다 (배치 엔진의 max_drawdown 과 같은 기준).
+    """
+    equity = np.asarray(equity, dtype=np.float64)
+    if equity.shape[-1] == 0:
+        shape = equity.shape[:-1]
+        return np.zeros(shape), np.zeros(shape, dtype=np.int64)
+    peak = np.maximum.accumulate(equity, axis=-1)
+    if initial is not None:
+        peak = np.maximum(peak, np.asarray(initial, dtype=np.float64)[..., None])
+    dd = 1.0 - _ratio(equity, peak)
+    dd[peak <= 0] = 0.0
+    bars = np.arange(equity.shape[-1])
+    last_peak = np.maximum.accumulate(np.where(equity >= peak, bars, 0), axis=-1)
+    return dd.max(axis=-1), (bars - last_peak).max(axis=-1)
+
+
+def _trade_summary(n_trades, n_wins, gross_profit, gross_loss, bars_held, n_bars) -> Metrics:
+    n_trades = np.asarray(n_trades, dtype=np.int64)
+    n_wins = np.asarray(n_wins, dtype=np.int64)
+    gross_profit = np.asarray(gross_profit, dtype=np.float64)
+    gross_loss = np.asarray(gross_loss, dtype=np.float64)
+    # no losing trade: inf if anything was won, 0 otherwise
+    pf = np.array(np.where(gross_profit > 0, np.inf, 0.0) * np.ones_like(gross_loss))
+    np.divide(gross_profit, gross_loss, out=pf, where=gross_loss > 0)
+    return {
+        "n_trades": n_trades,
+        "win_rate": _ratio(n_wins, n_trades),
+        "profit_factor": pf,
+        "avg_trade": _ratio(gross_profit - gross_loss, n_trades),
+        "avg_win": _ratio(gross_profit, n_wins),
+        "avg_loss": -_ratio(gross_loss, n_trades - n_wins),
+        "exposure": _ratio(bars_held, n_bars),
+    }
+
+
+def trade_stats(
+    pnl: np.ndarray,
+    entry_idx: np.ndarray | None = None,
+    exit_idx: np.ndarray | None = None,
+    n_bars: int = 0,
+) -> Metrics:
+    """청산된 거래 배열의 통계. 2-D 면 (n_runs, max_trades) 에 빈 칸은 nan.
+
+    exposure 는 청산된 거래가 포지션을 들고 있던 봉(진입 봉 ~ 청산 직전 봉) 비율.
+    """
+    pnl = np.asarray(pnl, dtype=np.float64)
+    valid = ~np.isnan(pnl)
+    p = np.where(valid, pnl, 0.0)
+    held = 0
+    if entry_idx is not None and exit_idx is not None:
+        held = np.nansum(np.asarray(exit_idx, dtype=np.float64) - np.asarray(entry_idx, dtype=np.float64), axis=-1)
+    return _trade_summary(
+        valid.sum(axis=-1),
+        (p > 0).sum(axis=-1),
+        np.where(p > 0, p, 0.0).sum(axis=-1),
+        -np.where(p < 0, p, 0.0).sum(axis=-1),
+        held,
+        n_bars,
+    )
+
+
+def _summary(final, start, n, periods, sharpe, sortino, max_dd, dd_bars) -> Metrics:
+    total = _ratio(final, start) - 1.0 if n else np.zeros(np.shape(final))
+    years = n / periods if periods > 0 else 0.0
+    growth = np.maximum(1.0 + total, 0.0)
+    annual = growth ** (1.0 / years) - 1.0 if years > 0 else np.zeros_like(total)
+    return {
+        "final_value": final,
+        "total_return": total,
+        "annual_return": annual,
+        "sharpe": sharpe,
+        "sortino": sortino,
+        "max_drawdown": max_dd,
+        "max_drawdown_duration": dd_bars,
+        "calmar": _ratio(annual, max_dd),
+        "sharpe_dd": sharpe * (1.0 - max_dd),
+    }
+
+
+def equity_metrics(
+    equity: np.ndarray,
+    periods: float = HOURS_PER_YEAR,
+    initial: float | np.ndarray | None = None,
+) -> Metrics:
+    """equity 만으로 계산되는 지표. initial 이 없으면 첫 봉 가치를 시작 자본으로 본다."""
+    equity = np.asarray(equity, dtype=np.float64)
+    n = equity.shape[-1]
+    if n == 0:
+        final = np.full(equity.shape[:-1], np.nan if initial is None else initial, dtype=np.float64)
+    else:
+        final = equity[..., -1]
+    start = equity[..., 0] if initial is None else np.asarray(initial, dtype=np.float64)
+    max_dd, dd_bars = drawdown(equity, initial)
+    return _summary(
+        final,
+        start,
+        n,
+        periods,
+        sharpe_ratio(equity, periods),
+        sortino_ratio(equity, periods),
+        max_dd,
+        dd_bars,
+    )
+
+
+class RunningMetrics:
+    """이어서 들어오는 equity 구간으로 equity_metrics 를 누적 계산 (실행 하나, 1-D).
+
+    수익률 합·제곱합과 고점/최대 낙폭만 들고 있으므로 구간마다 그 구간 길이만큼만 계산한다.
+    Optuna 중간 보고처럼 같은 실행의 앞부분 지표를 여러 번 구할 때 쓴다
+    (Sharpe 분산은 합계식이라 equity_metrics 와 마지막 자리 수준의 차이가 날 수 있다).
+    """
+
+    def __init__(self, periods: float = HOURS_PER_YEAR):
+        self.periods = periods
+        self.n = 0
+        self.first = np.nan
+        self.last = np.nan
+        self.sum_r = 0.0
+        self.sum_r2 = 0.0
+        self.sum_down2 = 0.0
+        self.peak = -np.inf
+        self.peak_bar = 0
+        self.max_dd = 0.0
+        self.dd_bars = 0
+
+    def update(self, equity: np.ndarray) -> "RunningMetrics":
+        e = np.asarray(equity, dtype=np.float64)
+        if e.size == 0:
+            return self
+        if self.n == 0:
+            self.first = float(e[0])
+            r = returns(e)
+        else:
+            r = returns(np.concatenate(([self.last], e)))
+        self.sum_r += float(r.sum())
+        self.sum_r2 += float(np.dot(r, r))
+        down = np.minimum(r, 0.0)
+        self.sum_down2 += float(np.dot(down, down))
+
+        bars = np.arange(self.n, self.n + e.size)
+        peak = np.maximum(np.maximum.accumulate(e), self.peak)
+        dd = 1.0 - _ratio(e, peak)
+        dd[peak <= 0] = 0.0
+        self.max_dd = max(self.max_dd, float(dd.max()))
+        last_peak = np.maximum(np.maximum.accumulate(np.where(e >= peak, bars, 0)), self.peak_bar)
+        self.dd_bars = max(self.dd_bars, int((bars - last_peak).max()))
+        self.peak = float(peak[-1])
+        self.peak_bar = int(last_peak[-1])
+        self.last = float(e[-1])
+        self.n += e.size
+        return self
+
+    def values(self) -> Metrics:
+        k = self.n - 1  # number of returns
+        ann = np.sqrt(self.periods)
+        sharpe = sortino = 0.0
+        if k >= 2:
+            mean = self.sum_r / k
+            var = max(self.sum_r2 - k * mean * mean, 0.0) / (k - 1)
+            sharpe = mean / np.sqrt(var) * ann if var > 0 else 0.0
+        if k >= 1:
+            down = np.sqrt(self.sum_down2 / k)
+            sortino = self.sum_r / k / down * ann if down > 0 else 0.0
+        return _summary(
+            np.asarray(self.last),
+            np.asarray(self.first),
+            self.n,
+            self.periods,
+            np.asarray(sharpe),
+            np.asarray(sortino),
+            np.asarray(self.max_dd),
+            np.asarray(self.dd_bars),
+        )
+
+
+def compute_metrics(
+    result: FastBacktestResult | BatchBacktestResult,
+    periods: float | None = None,
+    initial: float | None = None,
+) -> Metrics:
+    """백테스트 결과 하나(또는 배치)의 전체 지표.
+
+    FastBacktestResult 는 스칼라(0-d 배열) 값을, BatchBacktestResult 는 설정별 (n_configs,)
+    배열을 담은 딕셔너리를 반환한다. periods 가 없으면 결과 index 로 추정(없으면 1h).
+    배치 결과의 equity 지표는 run_backtest_batch(record_equity=True) 일 때만 포함된다.
+    """
+    if isinstance(result, FastBacktestResult):
+        if periods is None:
+            periods = periods_per_year(result.index) if result.index is not None else HOURS_PER_YEAR
+        n = len(result.equity)
+        out = equity_metrics(result.equity, periods, initial)
+        t = result.trades
+        out.update(trade_stats(t["pnl"].to_numpy(), t["entry_idx"].to_numpy(), t["exit_idx"].to_numpy(), n))
+        return out
+
+    periods = HOURS_PER_YEAR if periods is None else periods
+    out: Metrics = {"final_value": result.final_value, "max_drawdown": result.max_drawdown}
+    if result.equity is not None:
+        out.update(equity_metrics(result.equity, periods, result.cash if initial is None else initial))
+    out.update(
+        _trade_summary(
+            result.n_trades, result.n_wins, result.gross_profit, result.gross_loss, result.bars_held, result.n_bars
+        )
+    )
+    return out
+
+
+# objective name -> metric key, maximized by the optimizers
+OBJECTIVES: Dict[str, str] = {
+    "value": "final_value",
+    "sharpe": "sharpe",
+    "sortino": "sortino",
+    "calmar": "calmar",
+    "sharpe_dd": "sharpe_dd",  # Sharpe x (1 - MaxDD)
+    "profit_factor": "profit_factor",
+}
+
+# objectives the batch engine can score without recording the equity matrix
+_BATCH_NATIVE = {"value", "profit_factor"}
+# objectives computed from the equity curve alone (RunningMetrics can track them)
+EQUITY_OBJECTIVES = {"value", "sharpe", "sortino", "calmar", "sharpe_dd"}
+
+
+def needs_equity(objective: str) -> bool:
+    """배치 엔진에서 이 objective 가 봉별 equity 기록을 필요로 하는지."""
+    check_objective(objective)
+    return objective not in _BATCH_NATIVE
+
+
+def check_objective(objective: str) -> str:
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Unknown objective: {objective!r} (choose from {', '.join(OBJECTIVES)})")
+    return objective
+
+
+def objective_value(metrics: Metrics, objective: str) -> np.ndarray:
+    """metrics 딕셔너리에서 objective 값 (배치면 설정별 배열)."""
+    return metrics[OBJECTIVES[check_objective(objective)]]
+
+
+def score(result, objective: str = "value", periods: float | None = None) -> float | np.ndarray:
+    """run_backtest / run_backtest_batch 결과의 objective 값.
+
+    value 는 지표 계산 없이 최종 가치를 그대로 쓰므로 Cerebro 결과도 받는다.
+    그 외 objective 는 봉별 equity 가 필요해 fast 엔진 결과만 지원한다.
+    """
+    check_objective(objective)
+    if objective == "value":
+        value = result.final_value if isinstance(result, BatchBacktestResult) else final_value(result)
+    elif isinstance(result, (FastBacktestResult, BatchBacktestResult)):
+        value = objective_value(compute_metrics(result, periods), objective)
+    else:
+        raise ValueError(f"objective {objective!r} requires engine='fast'")
+    return float(value) if np.ndim(value) == 0 else value
@@ -0,0 +1,297 @@
+"""여러 심볼을 하나의 현금/증거금 원장으로 시뮬레이션하는 포트폴리오 fast 엔진.
+
+심볼별 포지션·브래킷 상태는 fast_engine 의 상태 행(_broker_step / _strategy_step)을 그대로 쓰고,
+현금만 포트폴리오 전체가 공유한다. 한 봉 안의 처리 순서는 backtrader 멀티 데이터 Cerebro 와 같다:
+모든 심볼의 주문 체결/청산 → 종가 평가 → 모든 심볼의 전략(신규 브래킷 예약).
+심볼 하나에 percents=100 이면 run_fast_backtest 와 같은 결과가 나온다.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Mapping
+
+import numpy as np
+import pandas as pd
+from numba import njit
+
+from .costs import CostArrays
+from .fast_engine import (
+    _CASH,
+    _ENTRY,
+    _ENTRY_COMM,
+    _FUNDING,
+    _PEND_DIR,
+    _POS_DIR,
+    _POS_SIZE,
+    _SLIPPAGE,
+    _broker_step,
+    _charge_funding,
+    _init_state,
+    _mark_value,
+    _slippage,
+    _strategy_step,
+)
+
+PORTFOLIO_TRADE_COLUMNS = [
+    "symbol",
+    "entry_idx",
+    "exit_idx",
+    "direction",
+    "size",
+    "entry_price",
+    "exit_price",
+    "pnl",
+]
+PRICE_COLUMNS = ("open", "high", "low", "close")
+
+
+@dataclass
+class PortfolioData:
+    """공유 타임스탬프 그리드 위의 (n_bars, n_symbols) OHLC. 봉이 없는 칸(상장 전, 결측)은 nan."""
+
+    symbols: List[str]
+    index: pd.DatetimeIndex
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+
+    @classmethod
+    def align(cls, frames: Mapping[str, pd.DataFrame], suffix: str = "") -> "PortfolioData":
+        """심볼별 DataFrame 을 모든 인덱스의 합집합 그리드에 맞춘다.
+
+        suffix 를 주면 f"open{suffix}" 등의 컬럼을 사용 (예: 병합 프레임의 "_5m").
+        """
+        symbols = list(frames)
+        # asi8 is in the index's own unit (ms for parquet/arrow frames): compare in ns only
+        stamps = [pd.DatetimeIndex(df.index).as_unit("ns") for df in frames.values()]
+        # int64 union / searchsorted: pandas index set ops are ~100x slower on tz-aware stamps
+        grid = np.unique(np.concatenate([ix.asi8 for ix in stamps])) if stamps else np.empty(0, np.int64)
+        index = pd.DatetimeIndex(grid.view("datetime64[ns]"))
+        tz = stamps[0].tz if stamps else None
+        if tz is not None:
+            index = index.tz_localize("UTC").tz_convert(tz)
+        n, m = len(index), len(symbols)
+        arrays = {c: np.full((n, m), np.nan) for c in PRICE_COLUMNS}
+        for k, (sym, ix) in enumerate(zip(symbols, stamps)):
+            pos = np.searchsorted(grid, ix.asi8)
+            for c in PRICE_COLUMNS:
+                arrays[c][pos, k] = np.asarray(frames[sym][f"{c}{suffix}"], dtype=np.float64)
+        return cls(symbols, index, **arrays)
+
+    def align_signals(self, signals: Mapping[str, np.ndarray], index: Mapping[str, pd.Index]) -> np.ndarray:
+        """심볼별 시그널 배열(각 심볼 자기 인덱스 기준)을 (n_bars, n_symbols) int8 로. 없는 봉은 0."""
+        grid = self.index.as_unit("ns").asi8
+        out = np.zeros(self.close.shape, dtype=np.int8)
+        for k, sym in enumerate(self.symbols):
+            pos = np.searchsorted(grid, pd.DatetimeIndex(index[sym]).as_unit("ns").asi8)
+            out[pos, k] = np.asarray(signals[sym], dtype=np.int8)
+        return out
+
+    @property
+    def n_bars(self) -> int:
+        return len(self.index)
+
+
+@dataclass
+class PortfolioResult:
+    """포트폴리오 백테스트 결과. equity / cash / margin 은 봉별 원장 (n_bars,).
+
+    funding / slippage 는 costs 로 부과된 심볼별 비용 누계 (n_symbols,).
+    """
+
+    symbols: List[str]
+    final_value: float
+    equity: np.ndarray
+    cash: np.ndarray
+    margin: np.ndarray  # 보유 포지션 증거금 합 (진입 명목가 / leverage)
+    trades: pd.DataFrame
+    index: pd.Index | None = None
+    timings: Dict[str, float] = field(default_factory=dict)
+    funding: np.ndarray | None = None
+    slippage: np.ndarray | None = None
+
+    def getvalue(self) -> float:
+        return self.final_value
+
+    @property
+    def equity_curve(self) -> pd.Series:
+        return pd.Series(self.equity, index=self.index, name="equity")
+
+    def symbol_pnl(self) -> pd.Series:
+        """심볼별 청산 거래 손익 합계 (거래 없는 심볼은 0)."""
+        pnl = self.trades.groupby("symbol", observed=False)["pnl"].sum()
+        return pnl.reindex(self.symbols, fill_value=0.0)
+
+
+@njit(cache=True)
+def _simulate_portfolio_segment(
+    open_,
+    high,
+    low,
+    close,
+    signals,
+    sl_pct,
+    rr,
+    commission,
+    leverage,
+    percents,
+    state,
+    ledger,
+    last_close,
+    entry_bar,
+    start,
+    stop,
+    equity,
+    cash_out,
+    margin_out,
+    t_int,
+    t_float,
+    costs,
+):
+    """[start, stop) 봉 구간. 반환: 이번 구간 청산 거래 수 (t_int / t_float 앞쪽에 기록).
+
+    state[k] 는 심볼 k 의 상태 행이고 현금 칸은 처리 직전에 ledger[0] (공유 현금) 으로 채운다.
+    t_int 행: symbol / entry_idx / exit_idx / direction, t_float 행: size / entry_price / exit_price / pnl.
+    """
+    m = open_.shape[1]
+    n_trades = 0
+    cash = ledger[0]
+    for i in range(start, stop):
+        # 1) broker: fills and bracket exits of every symbol against the shared cash
+        for k in range(m):
+            o = open_[i, k]
+            if np.isnan(o):
+                continue
+            st = state[k]
+            st[_CASH] = cash
+            _charge_funding(st, o, costs, i, k)
+            was_pending = st[_PEND_DIR] != 0.0
+            pos_dir = st[_POS_DIR]
+            exit_price = _broker_step(st, o, high[i, k], low[i, k], commission, leverage, _slippage(st, o, costs, i, k))
+            cash = st[_CASH]
+            if was_pending and st[_POS_DIR] != 0.0:
+                entry_bar[k] = i
+            if not np.isnan(exit_price):
+                s = st[_POS_SIZE]
+                entry_price = st[_ENTRY]
+                if pos_dir > 0:
+                    pnl = s * (exit_price - entry_price)
+                else:
+                    pnl = s * (entry_price - exit_price)
+                t_int[0, n_trades] = k
+                t_int[1, n_trades] = entry_bar[k]
+                t_int[2, n_trades] = i
+                t_int[3, n_trades] = int(pos_dir)
+                t_float[0, n_trades] = s
+                t_float[1, n_trades] = entry_price
+                t_float[2, n_trades] = exit_price
+                t_float[3, n_trades] = pnl - st[_ENTRY_COMM] - s * exit_price * commission
+                n_trades += 1
+        # 2) mark to market (symbols without a bar keep their last close)
+        value = cash
+        margin = 0.0
+        for k in range(m):
+            c = close[i, k]
+            if not np.isnan(c):
+                last_close[k] = c
+            st = state[k]
+            if st[_POS_DIR] != 0.0:
+                # running value in the cash slot: same float ops as the single-symbol engine
+                st[_CASH] = value
+                value = _mark_value(st, last_close[k], leverage)
+                margin += st[_POS_SIZE] * st[_ENTRY] / leverage
+        equity[i] = value
+        cash_out[i] = cash
+        margin_out[i] = margin
+        # 3) strategy: new brackets sized from the cash after this bar's fills
+        for k in range(m):
+            c = close[i, k]
+            if np.isnan(c):
+                continue
+            st = state[k]
+            st[_CASH] = cash
+            _strategy_step(st, c, signals[i, k], sl_pct, rr, percents)
+    ledger[0] = cash
+    return n_trades
+
+
+def run_portfolio_backtest(
+    data: PortfolioData,
+    signals: np.ndarray,
+    cash: float = 100_000.0,
+    commission: float = 0.005,
+    leverage: float = 10.0,
+    sl_pct: float = 0.005,
+    rr: float = 1.5,
+    percents: float | None = None,
+    segment: int = 16_384,
+    costs: CostArrays | None = None,
+) -> PortfolioResult:
+    """(n_bars, n_symbols) 진입 시그널로 공유 현금 포트폴리오를 시뮬레이션.
+
+    percents 는 신규 진입 한 건에 쓰는 현금 비율(%, 기본 100 / n_symbols).
+    거래 버퍼는 segment 봉마다 비우므로 메모리는 봉 수가 아닌 segment x n_symbols 에 비례한다.
+    costs 는 CostModel.arrays(data.symbols, data.index) 로 만든 (n_bars, n_symbols) 펀딩/슬리피지 배열.
+    """
+    m = len(data.symbols)
+    n = data.n_bars
+    sig = np.asarray(signals)
+    if sig.shape != (n, m):
+        raise ValueError(f"signals must be ({n}, {m}), got {sig.shape}")
+    if sig.dtype.kind == "f":
+        sig = np.nan_to_num(sig)
+    sig = np.ascontiguousarray(sig, dtype=np.int8)
+    prices = [np.ascontiguousarray(a, dtype=np.float64) for a in (data.open, data.high, data.low, data.close)]
+    percents = 100.0 / max(m, 1) if percents is None else float(percents)
+    params = (float(sl_pct), float(rr), float(commission), float(leverage), percents)
+    costs = (costs or CostArrays.empty(m)).check(n, m)
+
+    state = _init_state(m, float(cash))
+    ledger = np.array([float(cash)])
+    last_close = np.full(m, np.nan)
+    entry_bar = np.zeros(m, dtype=np.int64)
+    equity = np.empty(n)
+    cash_out = np.empty(n)
+    margin_out = np.empty(n)
+    # at most one exit per symbol every other bar
+    capacity = m * (min(segment, n) // 2 + 2)
+    t_int = np.empty((4, capacity), dtype=np.int64)
+    t_float = np.empty((4, capacity))
+    pieces = []
+    for start in range(0, n, segment):
+        stop = min(start + segment, n)
+        k = _simulate_portfolio_segment(
+            *prices,
+            sig,
+            *params,
+            state,
+            ledger,
+            last_close,
+            entry_bar,
+            start,
+            stop,
+            equity,
+            cash_out,
+            margin_out,
+            t_int,
+            t_float,
+            costs,
+        )
+        if k:
+            pieces.append((t_int[:, :k].copy(), t_float[:, :k].copy()))
+    cols = [np.concatenate([p[0][j] for p in pieces]) if pieces else np.empty(0, np.int64) for j in range(4)]
+    cols += [np.concatenate([p[1][j] for p in pieces]) if pieces else np.empty(0) for j in range(4)]
+    trades = pd.DataFrame(dict(zip(PORTFOLIO_TRADE_COLUMNS, cols)))
+    trades["symbol"] = pd.Categorical.from_codes(trades["symbol"], categories=data.symbols)
+    return PortfolioResult(
+        symbols=data.symbols,
+        final_value=float(equity[-1]) if n else float(cash),
+        equity=equity,
+        cash=cash_out,
+        margin=margin_out,
+        trades=trades,
+        index=data.index,
+        funding=state[:, _FUNDING].copy(),
+        slippage=state[:, _SLIPPAGE].copy(),
+    )
@@ -0,0 +1,337 @@
+"""aggTrade / depth-diff 이벤트 재생으로 브래킷(SL/TP) 을 봉 내부 해상도로 체결하는 백테스트.
+
+봉 단위 엔진(fast_engine)은 한 봉 안에서 SL 과 TP 가 모두 닿으면 순서를 알 수 없어 SL 을
+우선한다. 여기서는 이벤트를 시간순으로 걸으며 먼저 닿은 쪽으로 청산한다.
+
+- 신호 / 사이징 / 평가는 봉 기준 그대로: 봉 종가에 브래킷을 예약하고 equity 는 봉 종가로 평가.
+- 대기 진입은 다음 봉의 첫 가격 이벤트에서, 오더북이 있으면 top-N 호가를 걸은 평균가로 체결
+  (없으면 그 체결가). 브래킷은 진입 직후부터 유효하다.
+- 손절은 시장가(오더북 평균가 또는 트리거 가격), 익절은 지정가(TP 가격)로 청산.
+- 가격 이벤트가 하나도 없는 봉은 fast_engine._broker_step 으로 OHLC 체결 (봉 데이터 fallback).
+  이벤트가 전혀 없으면 결과는 run_fast_backtest 와 같다.
+- 이벤트는 청크 단위로 커널에 넘기고 버리므로 메모리는 이벤트 수가 아닌 청크 크기 + 봉 수에 비례한다.
+"""
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterable
+
+import numpy as np
+import pandas as pd
+from numba import njit
+
+from data.concurrent_fetch import interval_ms
+from data.tick_stream import TRADE, TickChunk
+
+from .fast_engine import (
+    TRADE_COLUMNS,
+    _ACTIVE,
+    _CASH,
+    _ENTRY,
+    _ENTRY_COMM,
+    _PEND_CREATED,
+    _PEND_DIR,
+    _PEND_SIZE,
+    _POS_DIR,
+    _POS_SIZE,
+    _SL,
+    _TP,
+    _bracket_accepted,
+    _broker_step,
+    _close_position,
+    _init_state,
+    _mark_value,
+    _open_position,
+    _strategy_step,
+)
+
+DEFAULT_BOOK_LEVELS = 20
+
+# cursor slots carried across chunks
+_BAR, _BAR_EVENTS, _N_TRADES, _ENTRY_BAR, _TICK_BARS, _FALLBACK_BARS = range(6)
+
+
+@dataclass
+class ReplayResult:
+    """replay_backtest 결과. equity / trades 는 FastBacktestResult 와 같은 형식.
+
+    tick_bars / fallback_bars 는 이벤트로 / OHLC 로 체결 처리된 봉 수.
+    """
+
+    final_value: float
+    equity: np.ndarray
+    trades: pd.DataFrame
+    index: pd.Index | None = None
+    n_events: int = 0
+    elapsed: float = 0.0
+    tick_bars: int = 0
+    fallback_bars: int = 0
+
+    def getvalue(self) -> float:
+        return self.final_value
+
+    @property
+    def equity_curve(self) -> pd.Series:
+        return pd.Series(self.equity, index=self.index, name="equity")
+
+    @property
+    def events_per_sec(self) -> float:
+        return self.n_events / self.elapsed if self.elapsed > 0 else 0.0
+
+
+@njit(cache=True)
+def _book_update(book_px, book_qty, book_n, side, price, qty):
+    """top-N 한쪽(0=bid 내림차순, 1=ask 오름차순) 레벨의 절대 수량 갱신. qty<=0 이면 삭제.
+
+    N 을 넘는 바깥 레벨은 버린다 (그 뒤 안쪽 레벨이 지워져도 복원하지 않음).
+    """
+    cap = book_px.shape[1]
+    m = book_n[side]
+    px = book_px[side]
+    qt = book_qty[side]
+    j = 0
+    if side == 0:
+        while j < m and px[j] > price:
+            j += 1
+    else:
+        while j < m and px[j] < price:
+            j += 1
+    if j < m and px[j] == price:
+        if qty > 0.0:
+            qt[j] = qty
+        else:
+            for r in range(j, m - 1):
+                px[r] = px[r + 1]
+                qt[r] = qt[r + 1]
+            book_n[side] = m - 1
+        return
+    if qty <= 0.0 or j >= cap:
+        return
+    last = m if m < cap else cap - 1
+    for r in range(last, j, -1):
+        px[r] = px[r - 1]
+        qt[r] = qt[r - 1]
+    px[j] = price
+    qt[j] = qty
+    book_n[side] = last + 1
+
+
+@njit(cache=True)
+def _book_fill(book_px, book_qty, book_n, side, size):
+    """size 만큼 시장가로 side(0=bid 에 매도, 1=ask 에서 매수) 호가를 걸은 평균 체결가.
+
+    호가가 비어 있으면 nan, 깊이를 넘는 나머지는 마지막 레벨 가격.
+    """
+    m = book_n[side]
+    if m == 0 or size <= 0.0:
+        return np.nan
+    left = size
+    cost = 0.0
+    for j in range(m):
+        take = min(left, book_qty[side, j])
+        cost += take * book_px[side, j]
+        left -= take
+        if left <= 0.0:
+            return cost / size
+    return (cost + left * book_px[side, m - 1]) / size
+
+
+@njit(cache=True)
+def _record_trade(st, pos_dir, exit_price, entry_bar, i, commission, t_int, t_float, n):
+    s = st[_POS_SIZE]
+    entry_price = st[_ENTRY]
+    if pos_dir > 0:
+        pnl = s * (exit_price - entry_price)
+    else:
+        pnl = s * (entry_price - exit_price)
+    t_int[0, n] = entry_bar
+    t_int[1, n] = i
+    t_int[2, n] = int(pos_dir)
+    t_float[0, n] = s
+    t_float[1, n] = entry_price
+    t_float[2, n] = exit_price
+    t_float[3, n] = pnl - st[_ENTRY_COMM] - s * exit_price * commission
+
+
+@njit(cache=True)
+def _close_bar(i, open_, high, low, close, signal, sl_pct, rr, commission, leverage, percents, st, cursor, equity, t_int, t_float):
+    """봉 i 마감: (가격 이벤트가 없었으면 OHLC 체결) → 종가 평가 → 전략."""
+    if cursor[_BAR_EVENTS] == 0 or st[_PEND_DIR] != 0.0:
+        # no priced event in this bar (or none before the entry could fill): bar-level fill
+        was_pending = st[_PEND_DIR] != 0.0
+        pos_dir = st[_POS_DIR]
+        exit_price = _broker_step(st, open_[i], high[i], low[i], commission, leverage)
+        if was_pending and st[_POS_DIR] != 0.0:
+            cursor[_ENTRY_BAR] = i
+        if not np.isnan(exit_price):
+            _record_trade(st, pos_dir, exit_price, cursor[_ENTRY_BAR], i, commission, t_int, t_float, cursor[_N_TRADES])
+            cursor[_N_TRADES] += 1
+    if cursor[_BAR_EVENTS] == 0:
+        cursor[_FALLBACK_BARS] += 1
+    else:
+        cursor[_TICK_BARS] += 1
+    equity[i] = _mark_value(st, close[i], leverage)
+    _strategy_step(st, close[i], signal[i], sl_pct, rr, percents)
+    cursor[_BAR_EVENTS] = 0
+
+
+@njit(cache=True)
+def _replay_chunk(
+    ev_time,
+    ev_price,
+    ev_qty,
+    ev_kind,
+    bar_time,
+    step,
+    open_,
+    high,
+    low,
+    close,
+    signal,
+    sl_pct,
+    rr,
+    commission,
+    leverage,
+    percents,
+    st,
+    book_px,
+    book_qty,
+    book_n,
+    cursor,
+    equity,
+    t_int,
+    t_float,
+    flush,
+):
+    """이벤트 청크 하나를 재생. 상태(st / book / cursor)는 다음 청크로 이어진다.
+
+    flush=True 면 청크 뒤에 남은 봉을 모두 마감한다 (스트림 끝).
+    """
+    n_bars = bar_time.shape[0]
+    for j in range(ev_time.shape[0]):
+        t = ev_time[j]
+        while cursor[_BAR] < n_bars and t >= bar_time[cursor[_BAR]] + step:
+            _close_bar(cursor[_BAR], open_, high, low, close, signal, sl_pct, rr, commission, leverage, percents, st, cursor, equity, t_int, t_float)
+            cursor[_BAR] += 1
+        kind = ev_kind[j]
+        if kind != TRADE:
+            _book_update(book_px, book_qty, book_n, kind - 1, ev_price[j], ev_qty[j])
+        i = cursor[_BAR]
+        if i >= n_bars or t < bar_time[i]:
+            continue
+        if kind == TRADE:
+            price = ev_price[j]
+        elif book_n[0] > 0 and book_n[1] > 0:
+            price = (book_px[0, 0] + book_px[1, 0]) / 2.0
+        else:
+            continue
+        cursor[_BAR_EVENTS] += 1
+        if st[_PEND_DIR] != 0.0:
+            d = st[_PEND_DIR]
+            s = st[_PEND_SIZE]
+            fill = _book_fill(book_px, book_qty, book_n, 1 if d > 0 else 0, s)
+            if np.isnan(fill):
+                fill = price
+            ok = _bracket_accepted(st[_CASH], d, s, st[_PEND_CREATED], st[_SL], st[_TP], commission, leverage)
+            if ok and _open_position(st, d, s, fill, commission, leverage):
+                st[_ACTIVE] = 1.0
+                cursor[_ENTRY_BAR] = i
+            st[_PEND_DIR] = 0.0
+        elif st[_POS_DIR] != 0.0 and st[_ACTIVE] != 0.0:
+            pos_dir = st[_POS_DIR]
+            exit_price = np.nan
+            if pos_dir > 0:
+                if price <= st[_SL]:
+                    exit_price = _book_fill(book_px, book_qty, book_n, 0, st[_POS_SIZE])
+                    if np.isnan(exit_price):
+                        exit_price = price
+                elif price >= st[_TP]:
+                    exit_price = st[_TP]
+            else:
+                if price >= st[_SL]:
+                    exit_price = _book_fill(book_px, book_qty, book_n, 1, st[_POS_SIZE])
+                    if np.isnan(exit_price):
+                        exit_price = price
+                elif price <= st[_TP]:
+                    exit_price = st[_TP]
+            if not np.isnan(exit_price):
+                _close_position(st, exit_price, commission, leverage)
+                _record_trade(st, pos_dir, exit_price, cursor[_ENTRY_BAR], i, commission, t_int, t_float, cursor[_N_TRADES])
+                cursor[_N_TRADES] += 1
+    if flush:
+        while cursor[_BAR] < n_bars:
+            _close_bar(cursor[_BAR], open_, high, low, close, signal, sl_pct, rr, commission, leverage, percents, st, cursor, equity, t_int, t_float)
+            cursor[_BAR] += 1
+
+
+def replay_backtest(
+    bars: pd.DataFrame,
+    signal: np.ndarray,
+    events: Iterable[TickChunk] | None = None,
+    interval: str | None = None,
+    cash: float = 100_000.0,
+    commission: float = 0.005,
+    leverage: float = 10.0,
+    sl_pct: float = 0.005,
+    rr: float = 1.5,
+    percents: float = 100.0,
+    book_levels: int = DEFAULT_BOOK_LEVELS,
+    on_chunk: Callable[[int, float], None] | None = None,
+) -> ReplayResult:
+    """봉(bars: open/high/low/close, UTC DatetimeIndex = 봉 시작) 과 시그널 위에서 이벤트를 재생.
+
+    events 는 data.tick_stream 의 청크 이터레이터 (iter_agg_trades / iter_depth_updates /
+    merge_streams). None 이면 모든 봉이 OHLC fallback. interval 을 생략하면 인덱스 간격 중앙값.
+    on_chunk(누적 이벤트 수, 경과 초) 는 청크마다 호출된다 (진행률 / 처리량 보고용).
+    """
+    index = pd.DatetimeIndex(bars.index)
+    n = len(index)
+    bar_time = np.ascontiguousarray(index.asi8 // 1_000_000)
+    if interval is not None:
+        step = interval_ms(interval)
+    else:
+        step = int(np.median(np.diff(bar_time))) if n > 1 else 1
+    prices = [np.ascontiguousarray(bars[c], dtype=np.float64) for c in ("open", "high", "low", "close")]
+    sig = np.asarray(signal)
+    if sig.dtype.kind == "f":
+        sig = np.nan_to_num(sig)
+    sig = np.ascontiguousarray(sig, dtype=np.int8)
+    if len(sig) != n:
+        raise ValueError(f"signal has {len(sig)} bars, bars has {n}")
+    params = (float(sl_pct), float(rr), float(commission), float(leverage), float(percents))
+
+    st = _init_state(1, float(cash))[0]
+    book_px = np.zeros((2, book_levels))
+    book_qty = np.zeros((2, book_levels))
+    book_n = np.zeros(2, dtype=np.int64)
+    cursor = np.zeros(6, dtype=np.int64)
+    equity = np.empty(n)
+    # at most one closed trade per bar (+1 for an entry and exit inside the first bar)
+    t_int = np.empty((3, n + 1), dtype=np.int64)
+    t_float = np.empty((4, n + 1))
+    state = (st, book_px, book_qty, book_n, cursor, equity, t_int, t_float)
+
+    n_events = 0
+    t0 = time.perf_counter()
+    for chunk in events or ():
+        _replay_chunk(*chunk, bar_time, step, *prices, sig, *params, *state, False)
+        n_events += len(chunk)
+        if on_chunk is not None:
+            on_chunk(n_events, time.perf_counter() - t0)
+    empty = TickChunk(np.empty(0, np.int64), np.empty(0), np.empty(0), np.empty(0, np.int8))
+    _replay_chunk(*empty, bar_time, step, *prices, sig, *params, *state, True)
+    elapsed = time.perf_counter() - t0
+
+    k = int(cursor[_N_TRADES])
+    trades = pd.DataFrame(dict(zip(TRADE_COLUMNS, [*t_int[:, :k], *t_float[:, :k]])))
+    return ReplayResult(
+        final_value=float(equity[-1]) if n else float(cash),
+        equity=equity,
+        trades=trades,
+        index=index,
+        n_events=n_events,
+        elapsed=elapsed,
+        tick_bars=int(cursor[_TICK_BARS]),
+        fallback_bars=int(cursor[_FALLBACK_BARS]),
+    )
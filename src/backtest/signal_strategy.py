@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import backtrader as bt
+import numpy as np
+import pandas as pd
 
 
 class SignalTradeStrategy(bt.Strategy):
@@ -9,6 +11,11 @@ class SignalTradeStrategy(bt.Strategy):
         rr=1.5,  # TP = SL * RR
     )
 
+    @classmethod
+    def fast_signals(cls, df: pd.DataFrame, **params) -> np.ndarray:
+        """fast 엔진용 진입 시그널: feed 의 'signal' 컬럼 그대로."""
+        return np.asarray(df["signal"])
+
     def __init__(self):
         # 'signal' 라인 추가된 데이터 feed를 가정
         self.signal = self.datas[0].signal
@@ -31,16 +38,16 @@ class SignalTradeStrategy(bt.Strategy):
         self.entry_price = self.data.close[0]
         sl_price = self.entry_price * (1 - self.p.sl_pct)
         tp_price = self.entry_price + (self.entry_price - sl_price) * self.p.rr
-        self.order = self.buy()
-        self.sell(exectype=bt.Order.Stop, price=sl_price, parent=self.order)
+        self.order = self.buy(transmit=False)
+        self.sell(exectype=bt.Order.Stop, price=sl_price, parent=self.order, transmit=False)
         self.sell(exectype=bt.Order.Limit, price=tp_price, parent=self.order)
 
     def _open_short(self):
         self.entry_price = self.data.close[0]
         sl_price = self.entry_price * (1 + self.p.sl_pct)
         tp_price = self.entry_price - (sl_price - self.entry_price) * self.p.rr
-        self.order = self.sell()
-        self.buy(exectype=bt.Order.Stop, price=sl_price, parent=self.order)
+        self.order = self.sell(transmit=False)
+        self.buy(exectype=bt.Order.Stop, price=sl_price, parent=self.order, transmit=False)
         self.buy(exectype=bt.Order.Limit, price=tp_price, parent=self.order)
 
     def notify_order(self, order):
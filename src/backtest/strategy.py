@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import backtrader as bt
+import numpy as np
+import pandas as pd
 
 
 class MultiIndicatorStrategy(bt.Strategy):
@@ -14,6 +16,21 @@ class MultiIndicatorStrategy(bt.Strategy):
         rr=1.5,  # TP = SL * RR
     )
 
+    @classmethod
+    def fast_signals(cls, df: pd.DataFrame, **params) -> np.ndarray:
+        """fast 엔진용 진입 시그널 (RSI + Supertrend, signals.rsi_supertrend 와 동일 규칙)."""
+        from signals.rsi_supertrend import generate_signals
+
+        sig = generate_signals(
+            df[["open", "high", "low", "close"]],
+            rsi_period=params["rsi_period"],
+            rsi_overbought=params["rsi_overbought"],
+            rsi_oversold=params["rsi_oversold"],
+            st_atr_period=params["st_atr_period"],
+            st_multiplier=params["st_multiplier"],
+        )
+        return sig["signal"].values
+
     def __init__(self):
         # Indicators
         self.rsi = bt.ind.RSI(self.data.close, period=self.p.rsi_period)
@@ -39,15 +56,15 @@ class MultiIndicatorStrategy(bt.Strategy):
                 self.entry_price = self.data.close[0]
                 sl_price = self.entry_price * (1 - self.p.sl_pct)
                 tp_price = self.entry_price + (self.entry_price - sl_price) * self.p.rr
-                self.order = self.buy()
-                self.sl_order = self.sell(exectype=bt.Order.Stop, price=sl_price, parent=self.order)
+                self.order = self.buy(transmit=False)
+                self.sl_order = self.sell(exectype=bt.Order.Stop, price=sl_price, parent=self.order, transmit=False)
                 self.tp_order = self.sell(exectype=bt.Order.Limit, price=tp_price, parent=self.order)
             elif short_signal:
                 self.entry_price = self.data.close[0]
                 sl_price = self.entry_price * (1 + self.p.sl_pct)
                 tp_price = self.entry_price - (sl_price - self.entry_price) * self.p.rr
-                self.order = self.sell()
-                self.sl_order = self.buy(exectype=bt.Order.Stop, price=sl_price, parent=self.order)
+                self.order = self.sell(transmit=False)
+                self.sl_order = self.buy(exectype=bt.Order.Stop, price=sl_price, parent=self.order, transmit=False)
                 self.tp_order = self.buy(exectype=bt.Order.Limit, price=tp_price, parent=self.order)
         else:
             # No action; exits handled by SL/TP orders automatically
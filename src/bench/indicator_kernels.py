@@ -0,0 +1,133 @@
+"""indicators.kernels (numba) 와 pandas-ta 의 RSI / Supertrend 계산 시간 비교.
+
+pandas-ta 가 설치돼 있으면 pandas_ta.rsi / pandas_ta.supertrend 를 그대로 재고, 없으면 pandas-ta 0.3.14
+의 같은 코드 경로(ewm 기반 rma, .iloc 를 쓰는 supertrend 파이썬 루프)를 옮긴 _ta_* 로 잰다.
+어느 쪽을 썼는지는 결과 표의 baseline 열에 남는다. 커널은 numba 컴파일 후 repeat 회 중 최솟값.
+
+    python -m bench.indicator_kernels --bars 1000000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Callable, List
+
+import numpy as np
+import pandas as pd
+
+from bench.synthetic import synthetic_ohlcv
+from indicators.kernels import atr_wilder, rsi_wilder, supertrend_from_atr
+
+
+def _ta_rma(x: pd.Series, length: int) -> pd.Series:
+    return x.ewm(alpha=1.0 / length, min_periods=length).mean()
+
+
+def _ta_rsi(close: pd.Series, length: int) -> pd.Series:
+    negative = close.diff(1)
+    positive = negative.copy()
+    positive[positive < 0] = 0
+    negative[negative > 0] = 0
+    pos_avg, neg_avg = _ta_rma(positive, length), _ta_rma(negative, length)
+    return 100 * pos_avg / (pos_avg + neg_avg.abs())
+
+
+def _ta_supertrend(high: pd.Series, low: pd.Series, close: pd.Series, length: int, multiplier: float) -> pd.DataFrame:
+    prev = close.shift(1)
+    tr = pd.concat([high - low, (high - prev).abs(), (low - prev).abs()], axis=1).max(axis=1)
+    matr = multiplier * _ta_rma(tr, length)
+    hl2 = 0.5 * (high + low)
+    upperband, lowerband = hl2 + matr, hl2 - matr
+    m = close.size
+    dir_, trend = [1] * m, [0.0] * m
+    for i in range(1, m):
+        if close.iloc[i] > upperband.iloc[i - 1]:
+            dir_[i] = 1
+        elif close.iloc[i] < lowerband.iloc[i - 1]:
+            dir_[i] = -1
+        else:
+            dir_[i] = dir_[i - 1]
+            if dir_[i] > 0 and lowerband.iloc[i] < lowerband.iloc[i - 1]:
+                lowerband.iloc[i] = lowerband.iloc[i - 1]
+            if dir_[i] < 0 and upperband.iloc[i] > upperband.iloc[i - 1]:
+                upperband.iloc[i] = upperband.iloc[i - 1]
+        trend[i] = lowerband.iloc[i] if dir_[i] > 0 else upperband.iloc[i]
+    return pd.DataFrame({"trend": trend, "direction": dir_}, index=close.index)
+
+
+def _baseline():
+    try:
+        import pandas_ta as ta
+    except ImportError:
+        return "pandas-ta 0.3.14 code path (transcribed; pandas-ta not installed)", _ta_rsi, _ta_supertrend
+    return f"pandas-ta {ta.version}", ta.rsi, ta.supertrend
+
+
+def _best(fn: Callable[[], object], repeat: int) -> float:
+    best = np.inf
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def run(bars: List[int], rsi_len: int = 14, st_len: int = 10, multiplier: float = 3.0, repeat: int = 5) -> pd.DataFrame:
+    name, ta_rsi, ta_supertrend = _baseline()
+    start = int(pd.Timestamp("2020-01-01", tz="UTC").timestamp() * 1000)
+    rows = []
+    for n in sorted(bars):
+        df = synthetic_ohlcv("SYN00USDT", "1m", start, start + n * 60_000 - 1, listing_delay=False)
+        h, l, c = (np.ascontiguousarray(df[k], dtype=np.float64) for k in ("high", "low", "close"))
+        # numba compile / cache load outside the timings
+        supertrend_from_atr(h[:100], l[:100], c[:100], atr_wilder(h[:100], l[:100], c[:100], st_len), multiplier)
+        rsi_wilder(c[:100], rsi_len)
+
+        cases = {
+            "rsi": (
+                lambda: rsi_wilder(c, rsi_len),
+                lambda: ta_rsi(df["close"], rsi_len),
+            ),
+            "supertrend": (
+                lambda: supertrend_from_atr(h, l, c, atr_wilder(h, l, c, st_len), multiplier),
+                lambda: ta_supertrend(df["high"], df["low"], df["close"], st_len, multiplier),
+            ),
+        }
+        for indicator, (kernel, baseline) in cases.items():
+            sec_kernel = _best(kernel, repeat)
+            sec_baseline = _best(baseline, 1)
+            rows.append(
+                {
+                    "bars": len(df),
+                    "indicator": indicator,
+                    "sec_kernel": sec_kernel,
+                    "sec_baseline": sec_baseline,
+                    "speedup": sec_baseline / sec_kernel,
+                    "baseline": name,
+                }
+            )
+            print(pd.DataFrame(rows[-1:]).to_string(index=False, header=len(rows) == 1), flush=True)
+    return pd.DataFrame(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RSI / Supertrend kernel speed vs pandas-ta")
+    parser.add_argument("--bars", nargs="+", type=int, default=[100_000, 1_000_000])
+    parser.add_argument("--rsi-length", type=int, default=14)
+    parser.add_argument("--st-length", type=int, default=10)
+    parser.add_argument("--multiplier", type=float, default=3.0)
+    parser.add_argument("--repeat", type=int, default=5, help="Kernel runs (the best is reported)")
+    parser.add_argument("--json", help="Write the result table to this JSON file")
+    args = parser.parse_args()
+
+    table = run(args.bars, args.rsi_length, args.st_length, args.multiplier, args.repeat)
+    print()
+    print(table.to_string(index=False, float_format=lambda v: f"{v:,.4f}"))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(table.to_dict(orient="records"), f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+"""데이터 → 시그널 → 캘리브레이션 → 백테스트 파이프라인 회귀 벤치마크.
+
+네트워크 없이 결정적 합성 캔들(bench.synthetic)을 KlineStore 에 채워 두고,
+BinanceDataClient(client=SyntheticFuturesClient(), store=...) 를 쓰는 실제 로더 경로로 읽는다.
+(기준 interval 봉 수) x (타임프레임 수) 조합마다 단계별 / 전체 소요 시간과 메모리를 재서
+JSON 이력 파일에 쌓고, 저장해 둔 기준(baseline) 실행과 비교해 느려진 단계를 표시한다.
+
+단계
+- load            : MultiTFDataLoader.fetch_and_merge (저장소 읽기 + 병합)
+- generate_signals: signals.rsi_supertrend.generate_signals (기준 interval OHLC)
+- interval_signals: compute_interval_signals (interval 별 sig_<iv>)
+- score           : SignalAggregator.score_frame
+- calibrate       : BacktestPipeline.calibrate
+- backtest        : BacktestPipeline.run_backtest (engine, 기본 "fast")
+- end_to_end      : BacktestPipeline.execute (engine, 기본 "fast")
+
+--engine backtrader 는 기본 실행 경로(Cerebro)를 잰다. 봉당 ~0.2ms 라 기본 봉 수는 BACKTRADER_BARS.
+
+    python -m bench.pipeline_suite run --bars 10000 100000 1000000 --timeframes 1 3 5 --history bench.json
+    python -m bench.pipeline_suite run --engine backtrader --timeframes 1 3 --history bench.json
+    python -m bench.pipeline_suite baseline --history bench.json --out baseline.json
+    python -m bench.pipeline_suite compare --history bench.json --baseline baseline.json --tolerance 0.1
+
+compare 는 느려진 단계가 있으면 종료 코드 1 을 반환한다 (CI 용).
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from bench.synthetic import SyntheticFuturesClient, synthetic_klines
+from data.binance_collector import BinanceDataClient
+from data.concurrent_fetch import interval_ms
+from data.kline_store import KlineStore
+from data.multi_tf_loader import RESAMPLE_MODES, MultiTFDataLoader
+from pipeline.backtest_pipeline import BacktestPipeline, compute_interval_signals
+from signals.aggregator import SignalAggregator
+from signals.rsi_supertrend import generate_signals
+
+TIMEFRAMES = ["1m", "5m", "15m", "1h", "4h"]
+START = pd.Timestamp("2005-01-01", tz="UTC")
+STAGES = ["load", "generate_signals", "interval_signals", "score", "calibrate", "backtest", "end_to_end"]
+FAST_BARS = [10_000, 100_000, 1_000_000]
+BACKTRADER_BARS = [2_000, 10_000, 50_000]
+
+
+def case_window(n_bars: int, base: str = TIMEFRAMES[0]) -> tuple[str, str]:
+    """기준 interval 로 n_bars 개 봉이 되는 [start, end] 문자열 (모든 케이스가 같은 시작 시각)."""
+    end = START + pd.Timedelta(milliseconds=(n_bars - 1) * interval_ms(base))
+    return START.isoformat(), end.isoformat()
+
+
+def case_symbol(n_bars: int) -> str:
+    """케이스마다 다른 합성 심볼: 저장소를 재사용해도 케이스 데이터가 다른 케이스 실행 여부와 무관하다."""
+    return f"BENCH{n_bars}USDT"
+
+
+def seed_store(store: KlineStore, symbol: str, intervals: List[str], start: str, end: str) -> None:
+    """저장소가 덮지 않는 interval 만 합성 캔들로 채운다 (측정 대상 아님)."""
+    start_ts = int(pd.Timestamp(start).timestamp() * 1000)
+    end_ts = int(pd.Timestamp(end).timestamp() * 1000)
+    for iv in intervals:
+        coverage = store.coverage(symbol, iv)
+        # same rule as BinanceDataClient._missing_ranges: nothing left to fetch
+        if coverage is not None and coverage[0] <= start_ts and coverage[1] + interval_ms(iv) > end_ts:
+            continue
+        store.write(symbol, iv, synthetic_klines(symbol, iv, start_ts, end_ts, listing_delay=False))
+
+
+def _rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _measure(fn: Callable[[], object], repeat: int, memory: bool) -> Dict[str, float]:
+    """fn 을 repeat 번 실행한 최소 시간(초)과, memory=True 면 한 번 더 실행한 tracemalloc 최대 할당(MB).
+
+    tracemalloc 은 numpy 버퍼까지 잡지만 numba 커널 안의 할당은 잡지 못한다.
+    rss_mb 는 단계 직후 프로세스 RSS.
+    """
+    best = float("inf")
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - t0)
+        peak = float("nan")
+        if memory:
+            tracemalloc.start()
+            try:
+                fn()
+                peak = tracemalloc.get_traced_memory()[1] / 2**20
+            finally:
+                tracemalloc.stop()
+    return {"sec": best, "peak_mb": peak, "rss_mb": _rss_mb()}
+
+
+def run_case(
+    store: KlineStore,
+    n_bars: int,
+    n_timeframes: int,
+    repeat: int = 3,
+    memory: bool = True,
+    resample: str | None = None,
+    engine: str = "fast",
+) -> List[dict]:
+    """한 (봉 수, 타임프레임 수) 케이스의 단계별 측정 행 목록. engine 은 backtest / end_to_end 단계의 엔진."""
+    intervals = TIMEFRAMES[:n_timeframes]
+    base = intervals[0]
+    start, end = case_window(n_bars, base)
+    symbol = case_symbol(n_bars)
+    seed_store(store, symbol, intervals if resample is None else [base], start, end)
+
+    def make_loader() -> MultiTFDataLoader:
+        client = BinanceDataClient(client=SyntheticFuturesClient(listing_delay=False), store=store)
+        return MultiTFDataLoader(client=client, resample=resample)
+
+    loader = make_loader()
+    pipe = BacktestPipeline(symbol, intervals, start, end, engine=engine, loader=loader)
+    df = loader.fetch_and_merge(symbol, intervals, start, end)
+    cols = ["open", "high", "low", "close"]
+    ohlc = df[[f"{c}_{base}" for c in cols]].set_axis(cols, axis=1)
+    compute_interval_signals(df, intervals)
+    df["score"] = pipe.aggregator.score_frame(df)
+
+    def end_to_end():
+        BacktestPipeline(symbol, intervals, start, end, engine=engine, loader=make_loader()).execute()
+
+    stages: Dict[str, Callable[[], object]] = {
+        "load": lambda: loader.fetch_and_merge(symbol, intervals, start, end),
+        "generate_signals": lambda: generate_signals(ohlc),
+        "interval_signals": lambda: compute_interval_signals(df, intervals),
+        "score": lambda: SignalAggregator(pipe.weights).score_frame(df),
+        "calibrate": lambda: pipe.calibrate(df),
+        "backtest": lambda: pipe.run_backtest(df),
+        "end_to_end": end_to_end,
+    }
+    rows = []
+    for name in STAGES:
+        stats = _measure(stages[name], repeat, memory)
+        rows.append({"bars": len(df), "timeframes": n_timeframes, "engine": engine, "stage": name, **stats})
+    return rows
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True,
+            text=True,
+            timeout=10,
+        )
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_suite(
+    bars: List[int],
+    timeframes: List[int],
+    store_dir: str | None = None,
+    repeat: int = 3,
+    memory: bool = True,
+    resample: str | None = None,
+    engine: str = "fast",
+) -> dict:
+    """모든 케이스를 측정해 이력 파일 한 건(run 레코드)을 반환."""
+    with contextlib.ExitStack() as stack:
+        root = store_dir or stack.enter_context(tempfile.TemporaryDirectory())
+        store = KlineStore(root)
+        # warm-up: numba cache load / compilation stays out of the numbers
+        run_case(store, 2_000, max(timeframes), repeat=1, memory=False, resample=resample, engine=engine)
+        results = []
+        for n in bars:
+            for k in timeframes:
+                rows = run_case(store, n, k, repeat, memory, resample, engine)
+                results.extend(rows)
+                print(pd.DataFrame(rows).to_string(index=False, float_format=lambda v: f"{v:.4f}"), flush=True)
+    return {
+        "timestamp": pd.Timestamp.now(tz="UTC").isoformat(),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "config": {"bars": bars, "timeframes": timeframes, "repeat": repeat, "resample": resample, "engine": engine},
+        "results": results,
+    }
+
+
+def load_history(path: str | os.PathLike) -> List[dict]:
+    p = Path(path)
+    if not p.exists():
+        return []
+    with open(p) as f:
+        data = json.load(f)
+    return data["runs"] if isinstance(data, dict) and "runs" in data else [data]
+
+
+def append_history(path: str | os.PathLike, run: dict) -> None:
+    runs = load_history(path) + [run]
+    tmp = Path(f"{path}.tmp")
+    with open(tmp, "w") as f:
+        json.dump({"runs": runs}, f, indent=1)
+    os.replace(tmp, path)
+
+
+def compare_runs(
+    current: dict,
+    baseline: dict,
+    tolerance: float = 0.10,
+    min_delta: float = 0.005,
+    memory_tolerance: float = 0.25,
+) -> pd.DataFrame:
+    """같은 (bars, timeframes, engine, stage) 끼리 시간 / 메모리 비율과 회귀 여부.
+
+    slower: sec 가 baseline x (1 + tolerance) 를 넘고 차이가 min_delta 초 이상.
+    bigger: peak_mb 가 baseline x (1 + memory_tolerance) 를 넘음.
+    """
+    key = ["bars", "timeframes", "engine", "stage"]
+    # runs recorded before --engine existed measured the fast engine
+    cur = pd.DataFrame(current["results"]).reindex(columns=key + ["sec", "peak_mb"]).fillna({"engine": "fast"})
+    base = pd.DataFrame(baseline["results"]).reindex(columns=key + ["sec", "peak_mb"]).fillna({"engine": "fast"})
+    cur, base = cur.set_index(key), base.set_index(key)
+    table = cur[["sec", "peak_mb"]].join(base[["sec", "peak_mb"]], rsuffix="_base", how="inner")
+    table["ratio"] = table["sec"] / table["sec_base"]
+    table["slower"] = (table["ratio"] > 1.0 + tolerance) & (table["sec"] - table["sec_base"] >= min_delta)
+    table["mem_ratio"] = table["peak_mb"] / table["peak_mb_base"]
+    table["bigger"] = table["mem_ratio"] > 1.0 + memory_tolerance
+    return table.reset_index()
+
+
+def _pick(runs: List[dict], index: int, path: str) -> dict:
+    if not runs:
+        raise SystemExit(f"no runs in {path}")
+    return runs[index]
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Offline pipeline benchmark suite (synthetic OHLCV)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_run = sub.add_parser("run", help="Measure every stage and append the run to the history file")
+    p_run.add_argument(
+        "--bars",
+        nargs="+",
+        type=int,
+        help=(
+            f"Base-interval bars per case (default: {FAST_BARS} fast, {BACKTRADER_BARS} backtrader), "
+            "e.g. 10000000 as well (load peaks at ~0.8GB per 1M bars with 5 timeframes)"
+        ),
+    )
+    p_run.add_argument(
+        "--timeframes",
+        nargs="+",
+        type=int,
+        default=[1, 3, 5],
+        choices=range(1, len(TIMEFRAMES) + 1),
+        help=f"Number of timeframes, taken from {TIMEFRAMES}",
+    )
+    p_run.add_argument("--engine", choices=["backtrader", "fast"], default="fast", help="Engine for the backtest / end_to_end stages")
+    p_run.add_argument("--repeat", type=int, default=3, help="Timed repetitions per stage (minimum is kept)")
+    p_run.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass")
+    p_run.add_argument("--resample", choices=RESAMPLE_MODES, help="Load only the base interval and resample locally")
+    p_run.add_argument("--store", help="Reuse a KlineStore directory for the synthetic candles (default: temporary)")
+    p_run.add_argument("--history", default="bench_history.json")
+
+    p_base = sub.add_parser("baseline", help="Save one run of the history file as the baseline")
+    p_base.add_argument("--history", default="bench_history.json")
+    p_base.add_argument("--run", type=int, default=-1, help="Run index in the history (default: latest)")
+    p_base.add_argument("--out", default="bench_baseline.json")
+
+    p_cmp = sub.add_parser("compare", help="Flag stages slower than the baseline (exit code 1 on regressions)")
+    p_cmp.add_argument("--history", default="bench_history.json")
+    p_cmp.add_argument("--run", type=int, default=-1)
+    p_cmp.add_argument("--baseline", default="bench_baseline.json")
+    p_cmp.add_argument("--tolerance", type=float, default=0.10, help="Allowed relative slowdown")
+    p_cmp.add_argument("--min-delta", type=float, default=0.005, help="Ignore slowdowns smaller than this many seconds")
+    p_cmp.add_argument("--memory-tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        bars = args.bars or (BACKTRADER_BARS if args.engine == "backtrader" else FAST_BARS)
+        run = run_suite(bars, args.timeframes, args.store, args.repeat, not args.no_memory, args.resample, args.engine)
+        append_history(args.history, run)
+        print(f"Appended run {run['timestamp']} to {args.history}")
+        return 0
+    if args.command == "baseline":
+        run = _pick(load_history(args.history), args.run, args.history)
+        with open(args.out, "w") as f:
+            json.dump(run, f, indent=1)
+        print(f"Saved baseline {run['timestamp']} ({run['commit']}) to {args.out}")
+        return 0
+
+    current = _pick(load_history(args.history), args.run, args.history)
+    baseline = _pick(load_history(args.baseline), -1, args.baseline)
+    table = compare_runs(current, baseline, args.tolerance, args.min_delta, args.memory_tolerance)
+    flags = table["slower"].map({True: "SLOWER ", False: ""}) + table["bigger"].map({True: "BIGGER", False: ""})
+    table["flag"] = flags.str.strip()
+    print(f"current {current['timestamp']} ({current['commit']}) vs baseline {baseline['timestamp']} ({baseline['commit']})")
+    cols = ["bars", "timeframes", "engine", "stage", "sec_base", "sec", "ratio", "peak_mb_base", "peak_mb", "flag"]
+    print(table[cols].to_string(index=False, float_format=lambda v: f"{v:.4f}"))
+    n_bad = int((table["slower"] | table["bigger"]).sum())
+    if n_bad:
+        print(f"{n_bad} regression(s) beyond tolerance")
+    return 1 if n_bad else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
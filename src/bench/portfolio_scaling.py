@@ -0,0 +1,81 @@
+"""유니버스 크기(1 → 50 심볼)에 따른 포트폴리오 백테스트 소요 시간.
+
+네트워크 없이 SyntheticFuturesClient 캔들을 실제 수집 경로(BinanceDataClient → MultiTFDataLoader)로
+읽고, 심볼 수 x 워커 수 조합마다 PortfolioPipeline.execute() 단계별 시간을 잰다.
+
+    python -m bench.portfolio_scaling --sizes 1 5 10 25 50 --workers 1 8 --json portfolio.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from typing import List
+
+import pandas as pd
+
+from bench.synthetic import SyntheticFuturesClient
+from data.binance_collector import BinanceDataClient
+from data.multi_tf_loader import MultiTFDataLoader
+from pipeline.portfolio_pipeline import PortfolioPipeline
+
+
+def universe(n: int) -> List[str]:
+    return [f"SYN{k:02d}USDT" for k in range(n)]
+
+
+def run(
+    sizes: List[int],
+    workers: List[int],
+    start: str,
+    end: str,
+    intervals: List[str],
+    prob_threshold: float = 0.5,
+) -> pd.DataFrame:
+    def execute(n: int, w: int):
+        loader = MultiTFDataLoader(client=BinanceDataClient(client=SyntheticFuturesClient()), resample="closed")
+        pipe = PortfolioPipeline(universe(n), intervals, start, end, prob_threshold=prob_threshold, loader=loader, n_workers=w)
+        return pipe.execute()
+
+    execute(1, 1)  # warm-up: numba compilation / cache load stays out of the table
+    rows = []
+    for n in sizes:
+        for w in workers:
+            result = execute(n, w)
+            rows.append(
+                {
+                    "symbols": n,
+                    "workers": w,
+                    "bars": len(result.index),
+                    "trades": len(result.trades),
+                    **{f"sec_{k}": v for k, v in result.timings.items()},
+                    "final_value": result.final_value,
+                }
+            )
+            print(pd.DataFrame(rows[-1:]).to_string(index=False, header=len(rows) == 1), flush=True)
+    table = pd.DataFrame(rows)
+    table["ms_per_symbol"] = 1e3 * table["sec_total"] / table["symbols"]
+    return table
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Portfolio backtest wall time vs universe size (synthetic data)")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[1, 2, 5, 10, 20, 50])
+    parser.add_argument("--workers", nargs="+", type=int, default=[1, os.cpu_count() or 1])
+    parser.add_argument("--start", default="2024-01-01")
+    parser.add_argument("--end", default="2024-04-01")
+    parser.add_argument("--intervals", nargs="+", default=["5m", "15m", "1h"])
+    parser.add_argument("--prob-threshold", type=float, default=0.5, help="Low enough that random-walk data trades")
+    parser.add_argument("--json", help="Write the result table to this JSON file")
+    args = parser.parse_args()
+
+    table = run(args.sizes, sorted(set(args.workers)), args.start, args.end, args.intervals, args.prob_threshold)
+    print()
+    print(table.to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(table.to_dict(orient="records"), f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""tick 재생 엔진 처리량(events/sec)과 메모리 상한.
+
+합성 aggTrades 를 하루 단위 파일로 디스크에 쓴 뒤 replay_backtest 로 청크 스트리밍 재생한다.
+기간(days)을 늘려도 최대 RSS 가 청크 크기에만 비례하는지 확인하는 용도.
+
+    python -m bench.replay_throughput --days 1 7 30 --ticks-per-bar 600 --chunk-rows 1000000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import resource
+import tempfile
+import time
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from backtest.fast_engine import run_fast_backtest
+from backtest.replay import replay_backtest
+from bench.synthetic import synthetic_ohlcv, write_agg_trade_fixtures
+from data.tick_stream import iter_agg_trades
+
+SYMBOL = "SYN00USDT"
+
+
+def _peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run(days: List[int], ticks_per_bar: int, chunk_rows: int, interval: str = "1m", fmt: str = "csv") -> pd.DataFrame:
+    start = int(pd.Timestamp("2024-01-01", tz="UTC").timestamp() * 1000)
+    rows = []
+    with tempfile.TemporaryDirectory() as d:
+        for n_days in sorted(days):
+            end = start + n_days * 86_400_000 - 1
+            paths = write_agg_trade_fixtures(d, SYMBOL, start, end, interval, ticks_per_bar, fmt)
+            bars = synthetic_ohlcv(SYMBOL, interval, start, end, listing_delay=False)
+            signal = np.random.default_rng(0).choice([-1, 0, 0, 0, 0, 0, 1], len(bars)).astype(np.int8)
+            # warm-up (numba cache load) on a few bars
+            replay_backtest(bars.iloc[:10], signal[:10], iter_agg_trades(paths[:1], 1_000), interval)
+            t0 = time.perf_counter()
+            run_fast_backtest(*(bars[c].to_numpy() for c in ("open", "high", "low", "close")), signal)
+            bar_sec = time.perf_counter() - t0
+            result = replay_backtest(bars, signal, iter_agg_trades(paths, chunk_rows), interval)
+            rows.append(
+                {
+                    "days": n_days,
+                    "bars": len(bars),
+                    "events": result.n_events,
+                    "sec_replay": result.elapsed,
+                    "events_per_sec": result.events_per_sec,
+                    "sec_bar_engine": bar_sec,
+                    "tick_bars": result.tick_bars,
+                    "fallback_bars": result.fallback_bars,
+                    "trades": len(result.trades),
+                    "peak_rss_mb": _peak_rss_mb(),
+                }
+            )
+            print(pd.DataFrame(rows[-1:]).to_string(index=False, header=len(rows) == 1), flush=True)
+            for p in paths:
+                os.remove(p)  # keep disk usage bounded as well
+    return pd.DataFrame(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tick replay throughput and memory (synthetic aggTrades)")
+    parser.add_argument("--days", nargs="+", type=int, default=[1, 3, 7])
+    parser.add_argument("--ticks-per-bar", type=int, default=300)
+    parser.add_argument("--chunk-rows", type=int, default=1_000_000)
+    parser.add_argument("--interval", default="1m")
+    parser.add_argument("--format", choices=["csv", "parquet"], default="parquet")
+    parser.add_argument("--json", help="Write the result table to this JSON file")
+    args = parser.parse_args()
+
+    table = run(args.days, args.ticks_per_bar, args.chunk_rows, args.interval, args.format)
+    print()
+    print(table.to_string(index=False, float_format=lambda v: f"{v:,.3f}"))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(table.to_dict(orient="records"), f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
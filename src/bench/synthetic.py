@@ -0,0 +1,230 @@
+"""네트워크 없이 벤치마크를 돌리기 위한 결정적 합성 캔들 / 펀딩비 / 오더북 depth."""
+from __future__ import annotations
+
+import zlib
+from typing import Iterable, List
+
+import numpy as np
+import pandas as pd
+
+from data.concurrent_fetch import interval_ms
+from data.cost_store import DEPTH_LEVELS, CostStore, DepthSnapshots
+
+FUNDING_MS = 8 * 3_600_000
+KLINE_COLUMNS = [
+    "open_time",
+    "open",
+    "high",
+    "low",
+    "close",
+    "volume",
+    "close_time",
+    "quote_asset_volume",
+    "num_trades",
+    "taker_base_volume",
+    "taker_quote_volume",
+    "ignore",
+]
+
+
+def synthetic_ohlcv(
+    symbol: str,
+    interval: str,
+    start_ts: int,
+    end_ts: int,
+    listing_delay: bool = True,
+) -> pd.DataFrame:
+    """(symbol, interval, 구간) 이 같으면 항상 같은 랜덤워크 캔들 (open_time UTC 인덱스, OHLCV).
+
+    listing_delay=True 면 심볼마다 구간 앞쪽 0~9% 를 비워 상장 시점이 다른 유니버스를 흉내 낸다.
+    """
+    step = interval_ms(interval)
+    seed = zlib.crc32(f"{symbol}/{interval}".encode())
+    first = -(-start_ts // step) * step
+    if listing_delay:
+        first += ((end_ts - first) * (seed % 10) // 100) // step * step
+    open_ms = np.arange(first, end_ts + 1, step, dtype=np.int64)
+    n = len(open_ms)
+    rng = np.random.default_rng(seed)
+    vol = 0.002 * np.sqrt(step / 300_000)  # ~0.2% per 5m bar
+    close = (10.0 + seed % 1000) * np.exp(np.cumsum(rng.normal(0.0, vol, n)))
+    open_ = np.r_[close[0], close[:-1]] if n else close
+    wick = rng.random((2, n)) * vol
+    df = pd.DataFrame(
+        {
+            "open": open_,
+            "high": np.maximum(open_, close) * (1 + wick[0]),
+            "low": np.minimum(open_, close) * (1 - wick[1]),
+            "close": close,
+            "volume": rng.gamma(2.0, 50.0, n),
+        },
+        index=pd.DatetimeIndex(pd.to_datetime(open_ms, unit="ms", utc=True), name="open_time"),
+    )
+    return df
+
+
+def synthetic_klines(symbol: str, interval: str, start_ts: int, end_ts: int, listing_delay: bool = True) -> pd.DataFrame:
+    """synthetic_ohlcv 를 BinanceDataClient._klines_to_df 와 같은 컬럼으로 (KlineStore 에 바로 쓸 수 있는 형태)."""
+    df = synthetic_ohlcv(symbol, interval, start_ts, end_ts, listing_delay)
+    step = interval_ms(interval)
+    quote = df["volume"] * df["close"]
+    return df.assign(
+        close_time=df.index.asi8 // 1_000_000 + step - 1,
+        quote_asset_volume=quote,
+        num_trades=100,
+        taker_base_volume=df["volume"] / 2,
+        taker_quote_volume=quote / 2,
+        ignore=0.0,
+    )
+
+
+class SyntheticFuturesClient:
+    """python-binance Client 의 futures_historical_klines 만 흉내 내는 오프라인 클라이언트.
+
+    BinanceDataClient(client=SyntheticFuturesClient()) 로 넘기면 수집 → DataFrame 변환 →
+    (store 가 있으면) 저장 경로를 실제와 같이 거친다.
+    """
+
+    def __init__(self, listing_delay: bool = True):
+        self.listing_delay = listing_delay
+        self.calls = 0
+
+    def futures_historical_klines(
+        self,
+        symbol: str,
+        interval: str,
+        start_str: int,
+        end_str: int | None = None,
+        limit: int = 1500,
+    ) -> List[list]:
+        self.calls += 1
+        step = interval_ms(interval)
+        end_ts = int(end_str) if end_str is not None else int(start_str) + 1000 * step
+        df = synthetic_klines(symbol, interval, int(start_str), end_ts, self.listing_delay)
+        cols = [df.index.asi8 // 1_000_000, *(df[c].to_numpy() for c in KLINE_COLUMNS[1:])]
+        return [list(row) for row in zip(*(c.tolist() for c in cols))]
+
+
+def synthetic_funding(symbol: str, start_ts: int, end_ts: int) -> pd.Series:
+    """00/08/16 UTC 8시간 펀딩 rate (기준 0.01% 주변 AR(1) 노이즈, 심볼별 고정 시드)."""
+    first = -(-start_ts // FUNDING_MS) * FUNDING_MS
+    t = np.arange(first, end_ts + 1, FUNDING_MS, dtype=np.int64)
+    rng = np.random.default_rng(zlib.crc32(f"{symbol}/funding".encode()))
+    noise = rng.normal(0.0, 5e-5, len(t))
+    rates = np.empty(len(t))
+    level = 0.0
+    for j, e in enumerate(noise):
+        level = 0.8 * level + e
+        rates[j] = 1e-4 + level
+    return pd.Series(rates, index=pd.to_datetime(t, unit="ms", utc=True), name="funding_rate")
+
+
+def synthetic_depth(
+    symbol: str,
+    start_ts: int,
+    end_ts: int,
+    every: str = "5m",
+    levels: int = DEPTH_LEVELS,
+) -> DepthSnapshots:
+    """every 간격 스냅샷. mid 는 같은 심볼의 synthetic_ohlcv 시가, 스프레드 ~1bp, 호가 간격 ~1bp.
+
+    레벨 수량은 안쪽이 얇고 바깥이 두꺼운 감마 분포 (명목가 합 ~ 10^5..10^6 USDT).
+    """
+    ohlcv = synthetic_ohlcv(symbol, every, start_ts, end_ts, listing_delay=False)
+    n = len(ohlcv)
+    rng = np.random.default_rng(zlib.crc32(f"{symbol}/depth".encode()))
+    mid = ohlcv["open"].to_numpy()
+    tick = mid[:, None] * 1e-4
+    steps = np.arange(levels)[None, :] + 0.5
+    notional = rng.gamma(2.0, 5_000.0, (2, n, levels)) * (1.0 + np.arange(levels) / 4.0)
+    bid_px = mid[:, None] - tick * steps
+    ask_px = mid[:, None] + tick * steps
+    return DepthSnapshots(ohlcv.index, bid_px, notional[0] / bid_px, ask_px, notional[1] / ask_px)
+
+
+def write_cost_fixtures(store: CostStore, symbols: Iterable[str], start_ts: int, end_ts: int, every: str = "5m") -> None:
+    """symbols 의 합성 펀딩 / depth 이력을 CostStore 에 기록 (CostModel 오프라인 검증용 fixture)."""
+    for sym in symbols:
+        store.write_funding(sym, synthetic_funding(sym, start_ts, end_ts))
+        store.write_depth(sym, synthetic_depth(sym, start_ts, end_ts, every))
+
+
+def synthetic_agg_trades(
+    symbol: str,
+    start_ts: int,
+    end_ts: int,
+    interval: str = "1m",
+    ticks_per_bar: int = 60,
+    bars: pd.DataFrame | None = None,
+) -> pd.DataFrame:
+    """synthetic_ohlcv 봉마다 ticks_per_bar 개 체결을 만든 aggTrades (Binance 덤프 컬럼).
+
+    봉 안의 경로는 open → high / low (순서는 봉마다 랜덤) → close 를 잇는 꺾은선 + 노이즈이고,
+    [low, high] 로 잘라 봉 OHLC 와 어긋나지 않는다.
+    bars 를 주면 그 봉을 그대로 쓴다 (더 긴 구간의 synthetic_ohlcv 를 잘라 넘기는 용도.
+    synthetic_ohlcv 는 구간 시작부터 경로를 새로 만들기 때문).
+    """
+    if bars is None:
+        bars = synthetic_ohlcv(symbol, interval, start_ts, end_ts, listing_delay=False)
+    n, k = len(bars), ticks_per_bar
+    first_ms = int(bars.index.asi8[0] // 1_000_000) if n else start_ts
+    rng = np.random.default_rng(zlib.crc32(f"{symbol}/{interval}/trades/{first_ms}".encode()))
+    o, h, lo, c = (bars[col].to_numpy()[:, None] for col in ("open", "high", "low", "close"))
+    high_first = rng.random((n, 1)) < 0.5
+    first = np.where(high_first, h, lo)
+    second = np.where(high_first, lo, h)
+    u1, u2 = np.sort(rng.uniform(0.1, 0.9, (2, n, 1)), axis=0)
+    u = np.linspace(0.0, 1.0, k)[None, :]
+    path = np.where(
+        u <= u1,
+        o + (first - o) * u / u1,
+        np.where(u <= u2, first + (second - first) * (u - u1) / (u2 - u1), second + (c - second) * (u - u2) / (1.0 - u2)),
+    )
+    path = np.clip(path + rng.normal(0.0, 1e-5, (n, k)) * o, lo, h)
+    path[:, 0], path[:, -1] = o[:, 0], c[:, 0]
+    step = interval_ms(interval)
+    times = bars.index.asi8[:, None] // 1_000_000 + (np.arange(k)[None, :] * step) // k
+    ids = np.arange(n * k, dtype=np.int64)
+    return pd.DataFrame(
+        {
+            "agg_trade_id": ids,
+            "price": path.ravel(),
+            "quantity": rng.gamma(1.5, 0.2, n * k),
+            "first_trade_id": ids,
+            "last_trade_id": ids,
+            "transact_time": times.ravel(),
+            "is_buyer_maker": rng.random(n * k) < 0.5,
+        }
+    )
+
+
+def write_agg_trade_fixtures(
+    directory: str,
+    symbol: str,
+    start_ts: int,
+    end_ts: int,
+    interval: str = "1m",
+    ticks_per_bar: int = 60,
+    fmt: str = "csv",
+) -> List[str]:
+    """하루 단위 aggTrades 파일(<symbol>-aggTrades-<YYYY-MM-DD>.csv|parquet)을 쓰고 경로 목록 반환.
+
+    체결은 synthetic_ohlcv(symbol, interval, start_ts, end_ts, listing_delay=False) 봉과 일치한다
+    (봉은 전체 구간으로 한 번 만들고 하루씩 잘라 쓴다).
+    CSV 는 Binance 데이터 덤프처럼 헤더 없이 쓴다. 체결은 하루씩 만들어 메모리는 하루치로 묶인다.
+    """
+    bars = synthetic_ohlcv(symbol, interval, start_ts, end_ts, listing_delay=False)
+    open_ms = bars.index.asi8 // 1_000_000
+    paths = []
+    day = 86_400_000
+    for lo in range(start_ts - start_ts % day, end_ts + 1, day):
+        hi = min(lo + day - 1, end_ts)
+        a, b = np.searchsorted(open_ms, [max(lo, start_ts), hi + 1])
+        df = synthetic_agg_trades(symbol, max(lo, start_ts), hi, interval, ticks_per_bar, bars=bars.iloc[a:b])
+        path = f"{directory}/{symbol}-aggTrades-{pd.Timestamp(lo, unit='ms'):%Y-%m-%d}.{fmt}"
+        if fmt == "parquet":
+            df.to_parquet(path, index=False)
+        else:
+            df.to_csv(path, index=False, header=False)
+        paths.append(path)
+    return paths
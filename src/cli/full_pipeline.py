@@ -5,10 +5,12 @@ import json
 import sys
 from pathlib import Path
 
-import optuna
-
-from pipeline.backtest_pipeline import BacktestPipeline
-from optimize.pipeline_optuna_runner import INTERVALS, objective
+from backtest.engine import final_value
+from data.multi_tf_loader import RESAMPLE_MODES, MultiTFDataLoader
+from pipeline.backtest_pipeline import BacktestPipeline, StudyDataContext
+from optimize.optuna_runner import PRUNERS, check_pruning
+from optimize.param_space import normalize_weights
+from optimize.pipeline_optuna_runner import INTERVALS, run_study
 
 
 def parse_args():
@@ -20,28 +22,89 @@ def parse_args():
     p.add_argument("--storage", help="Optuna storage URI")
     p.add_argument("--study", help="Study name")
     p.add_argument("--report", help="Path to save JSON report")
-    return p.parse_args()
+    p.add_argument("--engine", choices=["backtrader", "fast"], default="backtrader", help="Backtest engine")
+    p.add_argument("--n-workers", type=int, default=1, help="Optuna worker processes (shared storage)")
+    p.add_argument(
+        "--resample",
+        choices=RESAMPLE_MODES,
+        help="Download only the base interval and build higher timeframes locally",
+    )
+    p.add_argument(
+        "--concurrent",
+        action="store_true",
+        help="Fetch kline pages concurrently (ConcurrentKlineFetcher) instead of sequential python-binance pages",
+    )
+    p.add_argument(
+        "--pruner",
+        choices=list(PRUNERS),
+        default="none",
+        help="Prune Optuna trials from intermediate equity checkpoints (needs --engine fast)",
+    )
+    p.add_argument(
+        "--checkpoint-every",
+        type=lambda v: int(v) if v.isdigit() else v,
+        default="MS",
+        help="Checkpoint spacing: N bars or a pandas frequency (default: MS = each month)",
+    )
+    args = p.parse_args()
+    try:
+        check_pruning(args.pruner, args.engine)
+    except ValueError as e:
+        p.error(str(e))
+    return args
 
 
-def run_optuna(symbol: str, start: str, end: str, trials: int, storage: str | None, study_name: str | None):
-    study = optuna.create_study(direction="maximize", study_name=study_name, storage=storage, load_if_exists=bool(storage))
-    study.optimize(lambda t: objective(t, symbol, start, end), n_trials=trials)
-    return study
+def run_optuna(
+    symbol: str,
+    start: str,
+    end: str,
+    trials: int,
+    storage: str | None,
+    study_name: str | None,
+    context: StudyDataContext | None = None,
+    engine: str = "backtrader",
+    n_workers: int = 1,
+    pruner: str = "none",
+    checkpoint_every: int | str = "MS",
+):
+    context = context or StudyDataContext(symbol, INTERVALS, start, end).load()
+    return run_study(
+        context,
+        trials,
+        storage,
+        study_name,
+        engine,
+        n_workers,
+        pruner=pruner,
+        checkpoint_every=checkpoint_every,
+    )
 
 
 def main():
     args = parse_args()
+    loader = MultiTFDataLoader(resample=args.resample, concurrent=args.concurrent)
+    context = StudyDataContext(args.symbol, INTERVALS, args.start, args.end, loader=loader).load()
 
     # Step 1: Optimization (optional)
     weights = None
     prob_threshold = 0.8
     if args.opt_trials > 0:
-        study = run_optuna(args.symbol, args.start, args.end, args.opt_trials, args.storage, args.study)
+        study = run_optuna(
+            args.symbol,
+            args.start,
+            args.end,
+            args.opt_trials,
+            args.storage,
+            args.study,
+            context,
+            args.engine,
+            args.n_workers,
+            args.pruner,
+            args.checkpoint_every,
+        )
         best = study.best_params
         prob_threshold = best.pop("prob_threshold")
-        weights = {k.replace("w_", "sig_"): v for k, v in best.items() if k.startswith("w_")}
-        total = sum(weights.values())
-        weights = {k: v / total for k, v in weights.items()}
+        weights = normalize_weights({k.replace("w_", "sig_"): v for k, v in best.items() if k.startswith("w_")})
     else:
         weights = {f"sig_{iv}": 1 / len(INTERVALS) for iv in INTERVALS}
 
@@ -53,10 +116,11 @@ def main():
         end=args.end,
         aggregator_weights=weights,
         prob_threshold=prob_threshold,
+        context=context,
+        engine=args.engine,
     )
-    cerebro = pipe.execute()
-    final_value = cerebro.broker.getvalue()
-    print(f"Final portfolio value: {final_value:.2f}")
+    value = final_value(pipe.execute())
+    print(f"Final portfolio value: {value:.2f}")
 
     # Optional report
     if args.report:
@@ -65,7 +129,7 @@ def main():
             "symbol": args.symbol,
             "start": args.start,
             "end": args.end,
-            "final_value": final_value,
+            "final_value": value,
             "weights": weights,
             "prob_threshold": prob_threshold,
         }, indent=2))
@@ -2,13 +2,16 @@ from __future__ import annotations
 
 import datetime as dt
 import logging
-from typing import List, Literal, Optional
+from typing import List, Literal, Optional, Tuple
 
 import pandas as pd
 from binance.client import Client
 from dotenv import load_dotenv
 import os
 
+from .concurrent_fetch import ConcurrentKlineFetcher, interval_ms
+from .kline_store import KlineStore
+
 load_dotenv()
 
 logger = logging.getLogger(__name__)
@@ -28,6 +31,9 @@ Interval = Literal[
     "8h",
     "12h",
     "1d",
+    "3d",
+    "1w",
+    "1M",
 ]
 
 
@@ -39,6 +45,12 @@ class BinanceDataClient:
     - USDT-M 선물 전용.
     - REST 엔드포인트로 히스토리 캔들 가져오기.
     - 가져온 데이터는 pandas.DataFrame(UTC 인덱스) 반환.
+    - store 가 주어지면(또는 KLINE_STORE_DIR 설정 시) 로컬 Parquet 저장소를 먼저 읽고
+      앞/뒤 빈 구간만 REST 로 받아 저장소에 채워 넣는다.
+    - offline=True 이면 네트워크를 전혀 쓰지 않으며, 저장소에 없는 구간은 ValueError.
+    - client 로 futures_historical_klines 를 가진 임의 객체(테스트용 가짜 클라이언트 등) 주입 가능.
+    - fetcher(ConcurrentKlineFetcher)가 주어지면 python-binance 순차 페이지 대신
+      페이지 동시 요청으로 받는다. concurrent=True 는 기본 설정 fetcher 를 만들어 쓴다.
     """
 
     def __init__(
@@ -46,12 +58,26 @@ class BinanceDataClient:
         api_key: Optional[str] | None = None,
         api_secret: Optional[str] | None = None,
         testnet: bool = False,
+        store: KlineStore | None = None,
+        offline: bool = False,
+        client: Client | None = None,
+        fetcher: ConcurrentKlineFetcher | None = None,
+        concurrent: bool = False,
     ) -> None:
-        api_key = api_key or os.getenv("BINANCE_API_KEY")
-        api_secret = api_secret or os.getenv("BINANCE_API_SECRET")
-        self.client = Client(api_key, api_secret, testnet=testnet)
-        # Futures (UM) endpoint
-        self.client.FUTURES_URL = "https://fapi.binance.com/fapi"
+        self.store = store or KlineStore.from_env()
+        self.offline = offline
+        if offline and self.store is None:
+            raise ValueError("offline mode requires a KlineStore")
+        if fetcher is None and concurrent and not offline:
+            fetcher = ConcurrentKlineFetcher()
+        self.fetcher = fetcher
+        if client is None and fetcher is None and not offline:
+            api_key = api_key or os.getenv("BINANCE_API_KEY")
+            api_secret = api_secret or os.getenv("BINANCE_API_SECRET")
+            client = Client(api_key, api_secret, testnet=testnet)
+            # Futures (UM) endpoint
+            client.FUTURES_URL = "https://fapi.binance.com/fapi"
+        self.client = client
 
     def fetch_klines(
         self,
@@ -88,17 +114,77 @@ class BinanceDataClient:
             )
         else:
             end_ts = None
-        raw = self.client.futures_historical_klines(
+        if self.store is None:
+            raw = self._fetch_raw(symbol, interval, start_ts, end_ts, limit)
+            if not raw:
+                raise ValueError("No klines returned from Binance")
+            return self._klines_to_df(raw)
+
+        pending = []
+        gaps = self._missing_ranges(symbol, interval, start_ts, end_ts)
+        for gap_start, gap_end in gaps:
+            if self.offline:
+                raise ValueError(
+                    f"{symbol} {interval} [{gap_start}, {gap_end}] not in local store (offline mode)"
+                )
+            raw = self._fetch_raw(symbol, interval, gap_start, gap_end, limit)
+            if not raw:
+                continue
+            gap_df = self._klines_to_df(raw)
+            # 진행 중인 캔들은 저장하지 않고 이번 결과에만 포함
+            now_ms = int(pd.Timestamp.now(tz="UTC").timestamp() * 1000)
+            closed = gap_df["close_time"] < now_ms
+            self.store.write(symbol, interval, gap_df[closed])
+            pending.append(gap_df[~closed])
+        if gaps and gaps[0][0] == start_ts:
+            # the head range was fetched in full: nothing before the first stored candle (not listed yet)
+            self.store.mark_start(symbol, interval, start_ts)
+
+        df = self.store.read(symbol, interval, start_ts, end_ts)
+        pending = [p for p in pending if not p.empty]
+        if pending:
+            df = pd.concat([df, *pending]) if not df.empty else pd.concat(pending)
+        if df.empty:
+            raise ValueError("No klines returned from Binance")
+        return df
+
+    def _fetch_raw(
+        self,
+        symbol: str,
+        interval: str,
+        start_ts: int,
+        end_ts: Optional[int],
+        limit: int,
+    ) -> List[list]:
+        if self.fetcher is not None:
+            return self.fetcher.fetch_raw(symbol, interval, start_ts, end_ts)
+        return self.client.futures_historical_klines(
             symbol=symbol,
             interval=interval,
             start_str=start_ts,
             end_str=end_ts,
             limit=limit,
         )
-        if not raw:
-            raise ValueError("No klines returned from Binance")
-        df = self._klines_to_df(raw)
-        return df
+
+    def _missing_ranges(
+        self,
+        symbol: str,
+        interval: str,
+        start_ts: int,
+        end_ts: Optional[int],
+    ) -> List[Tuple[int, Optional[int]]]:
+        """저장소가 덮지 못하는 앞/뒤 구간 [(start, end)] (ms, 양끝 포함)."""
+        coverage = self.store.coverage(symbol, interval)
+        if coverage is None:
+            return [(start_ts, end_ts)]
+        step = interval_ms(interval)
+        first, last = coverage
+        gaps: List[Tuple[int, Optional[int]]] = []
+        if start_ts <= first - step:
+            gaps.append((start_ts, first - step))
+        if end_ts is None or end_ts >= last + step:
+            gaps.append((last + step, end_ts))
+        return gaps
 
     @staticmethod
     def _klines_to_df(raw: List[list]) -> pd.DataFrame:
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import re
+from typing import Dict, Iterator, List, NamedTuple
+
+import numpy as np
+import pandas as pd
+
+PRICE_FIELDS = ("open", "high", "low", "close", "volume")
+_PRICE_COL = re.compile(r"^(open|high|low|close|volume)_(\w+)$")
+_SIGNAL_COL = re.compile(r"^(sig_\w+|trade_signal|signal)$")
+
+
+class OHLCVView(NamedTuple):
+    """한 interval 의 OHLCV 배열 뷰 (복사 없음)."""
+
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+
+class ColumnarFrame:
+    """병합 멀티 타임프레임 데이터를 담는 배열 기반 컨테이너.
+
+    Notes
+    -----
+    - 타임스탬프: int64 epoch ms (UTC). DatetimeIndex 는 index 접근 시에만 만든다.
+    - 가격: interval 마다 (5 x n) 블록 하나 (open/high/low/close/volume 행).
+      dtype=np.float32 로 절반 크기 저장 가능 (지표 커널·엔진은 호출 시 float64 로 변환).
+    - 시그널: sig_* / trade_signal / signal 컬럼은 int8.
+    - 그 외 컬럼(score 등)은 넣은 값의 dtype 그대로 둔다. set(name, values, dtype) 로 명시 가능.
+    - frame["close_5m"], frame["sig_1h"] 는 ndarray 뷰. frame[name] = values 로 컬럼 추가.
+    - view(iv), feed(iv), slice(), copy() 는 모두 복사 없이 같은 버퍼를 가리킨다.
+    """
+
+    def __init__(
+        self,
+        ts: np.ndarray,
+        columns: Dict[str, np.ndarray] | None = None,
+        dtype: np.dtype | type = np.float64,
+    ):
+        self.ts = np.asarray(ts, dtype=np.int64)
+        self.dtype = np.dtype(dtype)
+        self._columns: Dict[str, np.ndarray] = {}
+        self._blocks: Dict[str, np.ndarray] = {}
+        self._index: pd.DatetimeIndex | None = None
+        for name, values in (columns or {}).items():
+            self[name] = values
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, dtype: np.dtype | type = np.float64) -> "ColumnarFrame":
+        """fetch_and_merge 결과(<col>_<iv> 컬럼, UTC DatetimeIndex)를 변환."""
+        index = pd.DatetimeIndex(df.index)
+        frame = cls(index.asi8 // 1_000_000, dtype=dtype)
+        intervals: List[str] = []
+        for col in df.columns:
+            m = _PRICE_COL.match(str(col))
+            if m and m.group(2) not in intervals:
+                intervals.append(m.group(2))
+        for iv in intervals:
+            cols = [f"{f}_{iv}" for f in PRICE_FIELDS]
+            if all(c in df.columns for c in cols):
+                frame.set_ohlcv(iv, [df[c].to_numpy() for c in cols])
+        for col in df.columns:
+            if col not in frame._columns:
+                frame[col] = df[col].to_numpy()
+        return frame
+
+    def set_ohlcv(self, iv: str, arrays) -> None:
+        """interval 하나의 OHLCV 를 (5 x n) 블록으로 저장하고 <field>_<iv> 컬럼을 행 뷰로 연결."""
+        block = np.empty((len(PRICE_FIELDS), len(self.ts)), dtype=self.dtype)
+        for i, values in enumerate(arrays):
+            block[i] = values
+        self._blocks[iv] = block
+        for i, field in enumerate(PRICE_FIELDS):
+            self._columns[f"{field}_{iv}"] = block[i]
+
+    @property
+    def intervals(self) -> List[str]:
+        return list(self._blocks)
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._columns)
+
+    @property
+    def index(self) -> pd.DatetimeIndex:
+        if self._index is None:
+            self._index = pd.DatetimeIndex(pd.to_datetime(self.ts, unit="ms", utc=True), name="open_time")
+        return self._index
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._columns
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._columns)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self._columns[name]
+
+    def __setitem__(self, name: str, values) -> None:
+        self.set(name, values)
+
+    def column_dtype(self, name: str) -> np.dtype | None:
+        """이름 규칙으로 정해지는 저장 dtype: 시그널 int8, 가격(<field>[_<iv>]) frame dtype, 그 외 None."""
+        if _SIGNAL_COL.match(name):
+            return np.dtype(np.int8)
+        if name in PRICE_FIELDS or _PRICE_COL.match(name):
+            return self.dtype
+        return None
+
+    def set(self, name: str, values, dtype: np.dtype | type | None = None) -> None:
+        """컬럼 저장. dtype 을 생략하면 column_dtype(name) 으로, 그것도 없으면 값의 dtype 그대로.
+
+        가격 컬럼의 float 축소(price dtype)는 의도된 것이고, 정수 dtype 으로의 변환은 값이
+        그대로 보존될 때만 한다 (범위 초과, 소수, nan 이면 ValueError).
+        """
+        arr = np.asarray(values)
+        if arr.ndim == 0:
+            arr = np.full(len(self.ts), arr)
+        if arr.shape != (len(self.ts),):
+            raise ValueError(f"column {name!r}: expected shape ({len(self.ts)},), got {arr.shape}")
+        target = np.dtype(dtype) if dtype is not None else self.column_dtype(name)
+        if target is not None and target != arr.dtype:
+            with np.errstate(invalid="ignore"):  # nan -> int is reported below
+                cast = arr.astype(target)
+            if target.kind in "biu" and not np.array_equal(cast, arr):
+                raise ValueError(f"column {name!r}: values do not fit {target} without loss")
+            arr = cast
+        self._columns[name] = arr
+
+    def view(self, iv: str) -> OHLCVView:
+        return OHLCVView(*(self._columns[f"{f}_{iv}"] for f in PRICE_FIELDS))
+
+    def feed(self, iv: str, signal: str | None = None) -> "ColumnarFrame":
+        """open/high/low/close/volume(/signal) 이름의 단일 interval 프레임 (백테스트 엔진 입력)."""
+        out = ColumnarFrame(self.ts, dtype=self.dtype)
+        out._index = self._index
+        for field, arr in zip(PRICE_FIELDS, self.view(iv)):
+            out._columns[field] = arr
+        if signal is not None:
+            out._columns["signal"] = self._columns[signal]
+        return out
+
+    def slice(self, start: int, stop: int) -> "ColumnarFrame":
+        """[start, stop) 행 구간 뷰."""
+        out = ColumnarFrame(self.ts[start:stop], dtype=self.dtype)
+        out._blocks = {iv: b[:, start:stop] for iv, b in self._blocks.items()}
+        out._columns = {name: arr[start:stop] for name, arr in self._columns.items()}
+        return out
+
+    def copy(self, deep: bool = False) -> "ColumnarFrame":
+        """deep=False 면 버퍼는 공유하고 컬럼 목록만 분리 (새로 추가한 컬럼은 원본에 보이지 않음)."""
+        out = self.slice(0, len(self.ts))
+        out._index = self._index
+        if deep:
+            out.ts = self.ts.copy()
+            out._blocks = {iv: b.copy() for iv, b in self._blocks.items()}
+            out._columns = {}
+            for iv, block in out._blocks.items():
+                for i, field in enumerate(PRICE_FIELDS):
+                    out._columns[f"{field}_{iv}"] = block[i]
+            for name, arr in self._columns.items():
+                if name not in out._columns:
+                    out._columns[name] = arr.copy()
+        return out
+
+    def memory_usage(self) -> Dict[str, int]:
+        """버퍼별 바이트 (가격 블록은 interval 단위로 한 번만 센다)."""
+        usage = {"timestamps": self.ts.nbytes}
+        in_blocks = set()
+        for iv, block in self._blocks.items():
+            usage[iv] = block.nbytes
+            in_blocks.update(f"{f}_{iv}" for f in PRICE_FIELDS)
+        for name, arr in self._columns.items():
+            if name not in in_blocks:
+                usage[name] = arr.nbytes
+        return usage
+
+    @property
+    def nbytes(self) -> int:
+        return sum(self.memory_usage().values())
+
+    def to_frame(self) -> pd.DataFrame:
+        """pandas DataFrame 으로 변환 (새 메모리 할당)."""
+        return pd.DataFrame(dict(self._columns), index=self.index)
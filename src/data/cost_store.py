@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import logging
+import os
+from pathlib import Path
+from typing import List, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEPTH_LEVELS = 20
+
+
+class DepthSnapshots(NamedTuple):
+    """오더북 스냅샷 묶음. 가격/수량은 (n_snapshots, n_levels), 0 번 레벨이 최우선 호가."""
+
+    times: pd.DatetimeIndex
+    bid_px: np.ndarray
+    bid_qty: np.ndarray
+    ask_px: np.ndarray
+    ask_qty: np.ndarray
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "DepthSnapshots":
+        levels = sum(1 for c in df.columns if c.startswith("bid_px_"))
+
+        def block(prefix: str) -> np.ndarray:
+            cols = [f"{prefix}_{j}" for j in range(levels)]
+            return np.ascontiguousarray(df[cols].to_numpy(dtype=np.float64))
+
+        return cls(pd.DatetimeIndex(df.index), block("bid_px"), block("bid_qty"), block("ask_px"), block("ask_qty"))
+
+    def to_frame(self) -> pd.DataFrame:
+        cols = {}
+        for name in ("bid_px", "bid_qty", "ask_px", "ask_qty"):
+            a = getattr(self, name)
+            cols.update({f"{name}_{j}": a[:, j] for j in range(a.shape[1])})
+        return pd.DataFrame(cols, index=pd.DatetimeIndex(self.times, name="snapshot_time"))
+
+
+class CostStore:
+    """심볼별 펀딩비 이력과 오더북 depth 스냅샷을 월별 Parquet 파일에 보관하는 로컬 저장소.
+
+    Notes
+    -----
+    - 경로 규칙: <root>/funding/symbol=<SYMBOL>/<YYYY-MM>.parquet,
+      <root>/depth/symbol=<SYMBOL>/<YYYY-MM>.parquet (KlineStore 와 같은 월 파티션)
+    - funding: 인덱스 funding_time(UTC), 컬럼 funding_rate.
+    - depth: 인덱스 snapshot_time(UTC), 컬럼 bid_px_<j> / bid_qty_<j> / ask_px_<j> / ask_qty_<j>.
+    - 같은 시각 행은 나중에 쓴 값으로 덮어쓴다.
+    """
+
+    def __init__(self, root: str | os.PathLike):
+        self.root = Path(root)
+
+    @classmethod
+    def from_env(cls, var: str = "COST_STORE_DIR") -> Optional["CostStore"]:
+        """환경변수에 경로가 지정되어 있으면 저장소를, 아니면 None 반환."""
+        root = os.getenv(var)
+        return cls(root) if root else None
+
+    def partition_dir(self, kind: str, symbol: str) -> Path:
+        return self.root / kind / f"symbol={symbol}"
+
+    def _month_files(self, kind: str, symbol: str, start_ts: Optional[int], end_ts: Optional[int]) -> List[Path]:
+        d = self.partition_dir(kind, symbol)
+        if not d.exists():
+            return []
+        lo = _month_key(start_ts) if start_ts is not None else None
+        hi = _month_key(end_ts) if end_ts is not None else None
+        return [
+            f for f in sorted(d.glob("*.parquet")) if (lo is None or f.stem >= lo) and (hi is None or f.stem <= hi)
+        ]
+
+    def _read(self, kind: str, symbol: str, start_ts: Optional[int], end_ts: Optional[int]) -> pd.DataFrame:
+        files = self._month_files(kind, symbol, start_ts, end_ts)
+        if not files:
+            return pd.DataFrame()
+        df = pd.concat([pd.read_parquet(f) for f in files])
+        if start_ts is not None:
+            df = df[df.index >= pd.Timestamp(start_ts, unit="ms", tz="UTC")]
+        if end_ts is not None:
+            df = df[df.index <= pd.Timestamp(end_ts, unit="ms", tz="UTC")]
+        return df
+
+    def _write(self, kind: str, symbol: str, df: pd.DataFrame) -> None:
+        if df.empty:
+            return
+        d = self.partition_dir(kind, symbol)
+        d.mkdir(parents=True, exist_ok=True)
+        for month, part in df.groupby(df.index.strftime("%Y-%m")):
+            path = d / f"{month}.parquet"
+            if path.exists():
+                part = pd.concat([pd.read_parquet(path), part])
+                part = part[~part.index.duplicated(keep="last")]
+            part = part.sort_index()
+            tmp = path.with_suffix(".parquet.tmp")
+            part.to_parquet(tmp)
+            os.replace(tmp, path)
+        logger.info("Stored %d %s rows for %s", len(df), kind, symbol)
+
+    def read_funding(self, symbol: str, start_ts: Optional[int] = None, end_ts: Optional[int] = None) -> pd.Series:
+        """[start_ts, end_ts] (ms, 양끝 포함) 펀딩 rate. 없으면 빈 Series."""
+        df = self._read("funding", symbol, start_ts, end_ts)
+        if df.empty:
+            return pd.Series(dtype=np.float64, name="funding_rate")
+        return df["funding_rate"]
+
+    def write_funding(self, symbol: str, rates: pd.Series) -> None:
+        self._write("funding", symbol, rates.rename("funding_rate").rename_axis("funding_time").to_frame())
+
+    def read_depth(
+        self, symbol: str, start_ts: Optional[int] = None, end_ts: Optional[int] = None
+    ) -> Optional[DepthSnapshots]:
+        """[start_ts, end_ts] (ms, 양끝 포함) depth 스냅샷. 없으면 None."""
+        df = self._read("depth", symbol, start_ts, end_ts)
+        return DepthSnapshots.from_frame(df) if not df.empty else None
+
+    def write_depth(self, symbol: str, snapshots: DepthSnapshots) -> None:
+        self._write("depth", symbol, snapshots.to_frame())
+
+
+class CostCollector:
+    """Binance 선물 REST 로 펀딩비 이력 / 오더북 스냅샷을 받아 CostStore 에 쌓는다.
+
+    Notes
+    -----
+    - client 는 futures_funding_rate / futures_order_book 을 가진 python-binance Client (또는 가짜 객체).
+    - 펀딩비는 과거 구간을 페이지 단위로 받을 수 있지만, depth 는 현재 스냅샷만 제공되므로
+      snapshot_depth() 를 주기적으로(예: cron 5분) 호출해 이력을 쌓아야 한다.
+    """
+
+    FUNDING_PAGE = 1000
+
+    def __init__(self, store: CostStore, client=None):
+        if client is None:
+            from binance.client import Client
+
+            client = Client(os.getenv("BINANCE_API_KEY"), os.getenv("BINANCE_API_SECRET"))
+        self.client = client
+        self.store = store
+
+    def collect_funding(self, symbol: str, start_ts: int, end_ts: int) -> pd.Series:
+        """[start_ts, end_ts] (ms) 펀딩 이력을 받아 저장하고 반환."""
+        rows = []
+        cursor = start_ts
+        while cursor <= end_ts:
+            page = self.client.futures_funding_rate(
+                symbol=symbol, startTime=cursor, endTime=end_ts, limit=self.FUNDING_PAGE
+            )
+            if not page:
+                break
+            rows.extend(page)
+            cursor = int(page[-1]["fundingTime"]) + 1
+            if len(page) < self.FUNDING_PAGE:
+                break
+        times = pd.to_datetime([int(r["fundingTime"]) for r in rows], unit="ms", utc=True)
+        rates = pd.Series([float(r["fundingRate"]) for r in rows], index=times, dtype=np.float64)
+        self.store.write_funding(symbol, rates)
+        return rates
+
+    def snapshot_depth(self, symbol: str, levels: int = DEPTH_LEVELS) -> DepthSnapshots:
+        """현재 오더북 상위 levels 호가를 스냅샷 한 건으로 저장하고 반환."""
+        book = self.client.futures_order_book(symbol=symbol, limit=levels)
+        bids = np.asarray(book["bids"], dtype=np.float64)[:levels]
+        asks = np.asarray(book["asks"], dtype=np.float64)[:levels]
+        n = min(len(bids), len(asks))
+        t = pd.to_datetime([int(book.get("T") or book.get("E"))], unit="ms", utc=True)
+        snap = DepthSnapshots(t, bids[None, :n, 0], bids[None, :n, 1], asks[None, :n, 0], asks[None, :n, 1])
+        self.store.write_depth(symbol, snap)
+        return snap
+
+
+def _month_key(ts_ms: int) -> str:
+    return pd.Timestamp(ts_ms, unit="ms").strftime("%Y-%m")
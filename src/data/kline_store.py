@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import logging
+import os
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+
+class KlineStore:
+    """(symbol, interval) 단위로 캔들을 월별 Parquet 파일에 보관하는 로컬 저장소.
+
+    Notes
+    -----
+    - 경로 규칙: <root>/symbol=<SYMBOL>/interval=<iv>/<YYYY-MM>.parquet (hive 파티션)
+    - 인덱스는 open_time(UTC), 컬럼은 BinanceDataClient._klines_to_df 결과와 동일.
+    - 마감된 캔들만 저장한다. 진행 중인 캔들은 호출자가 별도로 처리.
+    - 저장 구간은 [첫 open_time, 마지막 open_time] 하나의 연속 구간으로 취급.
+      mark_start 로 첫 캔들 앞의 빈 구간(상장 전)을 기록하면 구간 시작이 그 시각으로 당겨진다.
+    - 행 그룹은 ROW_GROUP_ROWS 행 단위 (KlineDataset 의 시간 범위 pushdown 단위).
+    """
+
+    ROW_GROUP_ROWS = 10_000
+
+    def __init__(self, root: str | os.PathLike):
+        self.root = Path(root)
+
+    @classmethod
+    def from_env(cls, var: str = "KLINE_STORE_DIR") -> Optional["KlineStore"]:
+        """환경변수에 경로가 지정되어 있으면 저장소를, 아니면 None 반환."""
+        root = os.getenv(var)
+        return cls(root) if root else None
+
+    def partition_dir(self, symbol: str, interval: str) -> Path:
+        return self.root / f"symbol={symbol}" / f"interval={interval}"
+
+    def _month_files(self, symbol: str, interval: str) -> List[Path]:
+        d = self.partition_dir(symbol, interval)
+        if not d.exists():
+            return []
+        return sorted(d.glob("*.parquet"))
+
+    def _start_marker(self, symbol: str, interval: str) -> Path:
+        return self.partition_dir(symbol, interval) / "_coverage_start"
+
+    def coverage(self, symbol: str, interval: str) -> Optional[Tuple[int, int]]:
+        """저장된 (첫 open_time, 마지막 open_time) 을 ms 단위로 반환. 없으면 None.
+
+        mark_start 로 기록한 시작 시각이 더 이르면 그 값을 첫 시각으로 쓴다.
+        """
+        files = self._month_files(symbol, interval)
+        if not files:
+            return None
+        first = pq.read_table(files[0], columns=["open_time"]).column("open_time")
+        last = pq.read_table(files[-1], columns=["open_time"]).column("open_time")
+        first_ts = int(pd.Timestamp(first[0].as_py()).timestamp() * 1000)
+        last_ts = int(pd.Timestamp(last[len(last) - 1].as_py()).timestamp() * 1000)
+        marker = self._start_marker(symbol, interval)
+        if marker.exists():
+            first_ts = min(first_ts, int(marker.read_text()))
+        return first_ts, last_ts
+
+    def mark_start(self, symbol: str, interval: str, start_ts: int) -> None:
+        """start_ts 부터 저장된 첫 캔들 직전까지 캔들이 없음을 기록 (빈 앞 구간을 다시 요청하지 않게).
+
+        저장된 캔들이 없으면 기록하지 않는다 (빈 구간이 어디까지인지 알 수 없음).
+        """
+        coverage = self.coverage(symbol, interval)
+        if coverage is None or start_ts >= coverage[0]:
+            return
+        marker = self._start_marker(symbol, interval)
+        tmp = marker.with_suffix(".tmp")
+        tmp.write_text(str(int(start_ts)))
+        os.replace(tmp, marker)
+
+    def read(
+        self,
+        symbol: str,
+        interval: str,
+        start_ts: Optional[int] = None,
+        end_ts: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """[start_ts, end_ts] (ms, 양끝 포함) 구간의 캔들을 DataFrame 으로 반환."""
+        lo = _month_key(start_ts) if start_ts is not None else None
+        hi = _month_key(end_ts) if end_ts is not None else None
+        files = [
+            f
+            for f in self._month_files(symbol, interval)
+            if (lo is None or f.stem >= lo) and (hi is None or f.stem <= hi)
+        ]
+        if not files:
+            return pd.DataFrame()
+        df = pd.concat([pd.read_parquet(f) for f in files])
+        if start_ts is not None:
+            df = df[df.index >= pd.Timestamp(start_ts, unit="ms", tz="UTC")]
+        if end_ts is not None:
+            df = df[df.index <= pd.Timestamp(end_ts, unit="ms", tz="UTC")]
+        return df
+
+    def write(self, symbol: str, interval: str, df: pd.DataFrame) -> None:
+        """캔들을 월별 파티션에 병합 저장(open_time 기준 중복 제거)."""
+        if df.empty:
+            return
+        d = self.partition_dir(symbol, interval)
+        d.mkdir(parents=True, exist_ok=True)
+        for month, part in df.groupby(df.index.strftime("%Y-%m")):
+            path = d / f"{month}.parquet"
+            if path.exists():
+                part = pd.concat([pd.read_parquet(path), part])
+                part = part[~part.index.duplicated(keep="last")]
+            part = part.sort_index()
+            tmp = path.with_suffix(".parquet.tmp")
+            part.to_parquet(tmp, row_group_size=self.ROW_GROUP_ROWS)
+            os.replace(tmp, path)
+        logger.info("Stored %d klines for %s %s", len(df), symbol, interval)
+
+
+def _month_key(ts_ms: int) -> str:
+    return pd.Timestamp(ts_ms, unit="ms").strftime("%Y-%m")
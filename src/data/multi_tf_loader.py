@@ -1,10 +1,77 @@
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
-from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Sequence, Tuple
 
 from .binance_collector import BinanceDataClient
 
+OHLCV = ["open", "high", "low", "close", "volume"]
+RESAMPLE_MODES = ("closed", "in_progress")
+
+
+def resample_ohlcv(
+    df: pd.DataFrame,
+    base_iv: str,
+    target_iv: str,
+    alignment: str = "closed",
+) -> pd.DataFrame:
+    """base_iv 캔들로 상위 target_iv OHLCV 를 만들어 base 인덱스에 정렬해 반환.
+
+    alignment
+        "closed": 각 base 봉에서 그 봉 종료 시점까지 완성된 가장 최근 상위 봉 (미래 정보 없음).
+            완성 전 구간은 nan.
+        "in_progress": 각 base 봉까지 누적한 진행 중 상위 봉
+            (open=상위 봉 첫 open, high/low=누적 최대/최소, close=현재 close, volume=누적합).
+
+    상위 봉 경계는 Binance 와 같이 UTC epoch 기준 target_iv 배수.
+    """
+    if alignment not in RESAMPLE_MODES:
+        raise ValueError(f"alignment must be one of {RESAMPLE_MODES}, got {alignment!r}")
+    base_ms = MultiTFDataLoader._interval_minutes(base_iv) * 60_000
+    target_ms = MultiTFDataLoader._interval_minutes(target_iv) * 60_000
+    if target_ms % base_ms:
+        raise ValueError(f"{target_iv} is not a multiple of {base_iv}")
+
+    n = len(df)
+    if n == 0:
+        return df[OHLCV].copy()
+    # asi8 is in the index's own unit (ms for parquet/arrow frames): normalize before bucketing
+    t = pd.DatetimeIndex(df.index).as_unit("ms").asi8
+    gid = t // target_ms
+    starts = np.flatnonzero(np.r_[True, gid[1:] != gid[:-1]])
+    o, h, lo, c, v = (df[col].to_numpy(dtype=np.float64) for col in OHLCV)
+
+    if alignment == "in_progress":
+        first = np.repeat(starts, np.diff(np.r_[starts, n]))
+        groups = pd.DataFrame({"high": h, "low": lo, "volume": v}).groupby(gid, sort=False)
+        out = {
+            "open": o[first],
+            "high": groups["high"].cummax().to_numpy(),
+            "low": groups["low"].cummin().to_numpy(),
+            "close": c,
+            "volume": groups["volume"].cumsum().to_numpy(),
+        }
+        return pd.DataFrame(out, index=df.index)
+
+    bars = {
+        "open": o[starts],
+        "high": np.maximum.reduceat(h, starts),
+        "low": np.minimum.reduceat(lo, starts),
+        "close": c[np.r_[starts[1:], n] - 1],
+        "volume": np.add.reduceat(v, starts),
+    }
+    # 상위 봉 종료 시각 이후 처음 닫히는 base 봉부터 사용 가능
+    pos = np.searchsorted(t + base_ms, gid[starts] * target_ms + target_ms, side="left")
+    keep = (pos < n) & np.r_[pos[1:] != pos[:-1], True]
+    out = {}
+    for col, values in bars.items():
+        arr = np.full(n, np.nan)
+        arr[pos[keep]] = values[keep]
+        out[col] = arr
+    return pd.DataFrame(out, index=df.index).ffill()
+
 
 class MultiTFDataLoader:
     """여러 타임프레임의 캔들을 하나의 DataFrame으로 병합.
@@ -13,10 +80,44 @@ class MultiTFDataLoader:
     -----
     - 최저(가장 짧은) 타임프레임을 기준으로 리샘플/조인
     - 컬럼 이름 규칙: <col>_<interval>, 예) close_1h, close_4h
+    - (symbol, interval) 조합은 max_workers 개 스레드로 동시에 받는다.
+      client 에 ConcurrentKlineFetcher 를 붙이면 각 구간의 페이지도 동시 요청되며,
+      요청 가중치 한도는 fetcher 의 토큰 버킷 하나가 전체에 대해 지킨다
+      (client 없이 concurrent=True 면 그렇게 만든 BinanceDataClient 를 쓴다).
+    - resample="closed" | "in_progress" 이면 가장 짧은 interval 만 받고 상위 interval 은
+      resample_ohlcv 로 로컬에서 만든다 (다운로드량 ~1/len(intervals)).
     """
 
-    def __init__(self, client: BinanceDataClient | None = None):
-        self.client = client or BinanceDataClient()
+    def __init__(
+        self,
+        client: BinanceDataClient | None = None,
+        max_workers: int = 4,
+        resample: str | None = None,
+        concurrent: bool = False,
+    ):
+        if resample is not None and resample not in RESAMPLE_MODES:
+            raise ValueError(f"resample must be None or one of {RESAMPLE_MODES}, got {resample!r}")
+        self.client = client or BinanceDataClient(concurrent=concurrent)
+        self.max_workers = max_workers
+        self.resample = resample
+
+    def _download_intervals(self, intervals: Sequence[str]) -> List[str]:
+        if self.resample is not None:
+            return [min(intervals, key=self._interval_minutes)]
+        return list(intervals)
+
+    def fetch_frames(
+        self,
+        symbols: Sequence[str],
+        intervals: Sequence[str],
+        start: str,
+        end: str,
+    ) -> Dict[Tuple[str, str], pd.DataFrame]:
+        """모든 (symbol, interval) 캔들을 동시에 받아 {(symbol, interval): DataFrame} 반환."""
+        keys = [(sym, iv) for sym in symbols for iv in intervals]
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(keys)))) as pool:
+            futures = [pool.submit(self.client.fetch_klines, sym, iv, start, end) for sym, iv in keys]
+            return {key: f.result() for key, f in zip(keys, futures)}
 
     def fetch_and_merge(
         self,
@@ -25,14 +126,37 @@ class MultiTFDataLoader:
         start: str,
         end: str,
     ) -> pd.DataFrame:
+        ivs = self._download_intervals(intervals)
+        frames = self.fetch_frames([symbol], ivs, start, end)
+        return self._merge({iv: frames[(symbol, iv)] for iv in ivs}, intervals)
+
+    def fetch_and_merge_many(
+        self,
+        symbols: Sequence[str],
+        intervals: List[str],
+        start: str,
+        end: str,
+    ) -> Dict[str, pd.DataFrame]:
+        """여러 심볼(top-50 유니버스 등)을 한 번에 받아 심볼별 병합 DataFrame 반환."""
+        ivs = self._download_intervals(intervals)
+        frames = self.fetch_frames(symbols, ivs, start, end)
+        return {sym: self._merge({iv: frames[(sym, iv)] for iv in ivs}, intervals) for sym in symbols}
+
+    def _merge(self, raw: Dict[str, pd.DataFrame], intervals: List[str]) -> pd.DataFrame:
+        # 가장 짧은 interval로 정렬
+        base_iv = min(intervals, key=self._interval_minutes)
+        if self.resample is not None:
+            base = raw[base_iv]
+            raw = {
+                iv: base if iv == base_iv else resample_ohlcv(base, base_iv, iv, self.resample)
+                for iv in intervals
+            }
+
         dfs: Dict[str, pd.DataFrame] = {}
         for iv in intervals:
-            df = self.client.fetch_klines(symbol, iv, start, end)
-            dfs[iv] = df[["open", "high", "low", "close", "volume"]].copy()
+            dfs[iv] = raw[iv][OHLCV].copy()
             dfs[iv].columns = [f"{c}_{iv}" for c in dfs[iv].columns]
 
-        # 가장 짧은 interval로 정렬
-        base_iv = min(intervals, key=self._interval_minutes)
         base_df = dfs.pop(base_iv)
 
         for iv, df in dfs.items():
@@ -0,0 +1,155 @@
+"""aggTrade / depth-diff 파일을 고정 크기 청크로 읽는 이벤트 스트림.
+
+청크는 TickChunk (time ms, price, qty, kind) 배열 묶음이고 kind 는
+TRADE(체결) / BID / ASK(해당 가격 레벨의 절대 수량 갱신, 0 이면 레벨 삭제).
+파일은 시간순으로 주어져야 하며, 한 번에 메모리에 올리는 행 수는 chunk_rows 로 제한된다.
+
+지원 형식
+- aggTrades: Binance 데이터 덤프 CSV (헤더 유무 모두) 또는 같은 컬럼의 Parquet.
+  agg_trade_id, price, quantity, first_trade_id, last_trade_id, transact_time, is_buyer_maker
+- depth diff: CSV / Parquet, 컬럼 transact_time, side ("b"/"a" 또는 "bid"/"ask"), price, quantity.
+"""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Iterable, Iterator, List, NamedTuple, Sequence
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+TRADE, BID, ASK = 0, 1, 2
+
+AGG_TRADE_COLUMNS = [
+    "agg_trade_id",
+    "price",
+    "quantity",
+    "first_trade_id",
+    "last_trade_id",
+    "transact_time",
+    "is_buyer_maker",
+]
+DEPTH_COLUMNS = ["transact_time", "side", "price", "quantity"]
+DEFAULT_CHUNK_ROWS = 1_000_000
+
+
+class TickChunk(NamedTuple):
+    time: np.ndarray  # int64 epoch ms
+    price: np.ndarray
+    qty: np.ndarray
+    kind: np.ndarray  # int8 TRADE / BID / ASK
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    @classmethod
+    def concat(cls, chunks: Sequence["TickChunk"]) -> "TickChunk":
+        return cls(*(np.concatenate([getattr(c, f) for c in chunks]) for f in cls._fields))
+
+    def take(self, idx) -> "TickChunk":
+        return TickChunk(*(a[idx] for a in self))
+
+
+def _frames(path: Path, columns: List[str], chunk_rows: int) -> Iterator[pd.DataFrame]:
+    if path.suffix == ".parquet":
+        pf = pq.ParquetFile(path)
+        names = [c for c in columns if c in pf.schema_arrow.names]
+        for batch in pf.iter_batches(batch_size=chunk_rows, columns=names):
+            yield batch.to_pandas()
+        return
+    with open(path) as f:
+        first = f.readline()
+    has_header = not first[:1].isdigit()
+    reader = pd.read_csv(
+        path,
+        header=0 if has_header else None,
+        names=None if has_header else columns,
+        usecols=lambda c: c in columns,
+        chunksize=chunk_rows,
+    )
+    with reader:
+        yield from reader
+
+
+def iter_agg_trades(paths: Iterable[str | os.PathLike], chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[TickChunk]:
+    """aggTrades 파일들을 순서대로 읽어 TRADE 청크를 낸다."""
+    for path in paths:
+        for df in _frames(Path(path), AGG_TRADE_COLUMNS, chunk_rows):
+            n = len(df)
+            yield TickChunk(
+                df["transact_time"].to_numpy(dtype=np.int64),
+                df["price"].to_numpy(dtype=np.float64),
+                df["quantity"].to_numpy(dtype=np.float64),
+                np.full(n, TRADE, dtype=np.int8),
+            )
+
+
+def iter_depth_updates(paths: Iterable[str | os.PathLike], chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[TickChunk]:
+    """depth diff 파일들을 순서대로 읽어 BID / ASK 청크를 낸다."""
+    for path in paths:
+        for df in _frames(Path(path), DEPTH_COLUMNS, chunk_rows):
+            side = df["side"].astype(str).str[0].str.lower().to_numpy()
+            yield TickChunk(
+                df["transact_time"].to_numpy(dtype=np.int64),
+                df["price"].to_numpy(dtype=np.float64),
+                df["quantity"].to_numpy(dtype=np.float64),
+                np.where(side == "b", BID, ASK).astype(np.int8),
+            )
+
+
+def merge_streams(*streams: Iterable[TickChunk]) -> Iterator[TickChunk]:
+    """시간순 청크 스트림 여러 개를 하나의 시간순 스트림으로 병합 (같은 시각은 인자 순서 우선).
+
+    각 스트림에서 한 청크씩만 버퍼에 두므로 메모리는 스트림 수 x 청크 크기로 묶인다
+    (같은 시각 이벤트가 청크 경계를 넘으면 그 구간만큼 버퍼가 늘어난다).
+    """
+    iters = [iter(s) for s in streams]
+    buffers: List[TickChunk | None] = [_next_chunk(it) for it in iters]
+    exhausted = [b is None for b in buffers]
+    while True:
+        live = [k for k, b in enumerate(buffers) if b is not None]
+        if not live:
+            return
+        if len(live) == 1 and all(exhausted[k] for k in range(len(buffers)) if k != live[0]):
+            k = live[0]
+            yield buffers[k]
+            yield from iters[k]
+            return
+        open_ = [k for k in live if not exhausted[k]]
+        if not open_:
+            merged = TickChunk.concat([buffers[k] for k in live])
+            yield merged.take(np.argsort(merged.time, kind="stable"))
+            return
+        # a stream's later chunks start at or after its buffer end: earlier events are final
+        horizon = min(buffers[k].time[-1] for k in open_)
+        parts = []
+        for k in live:
+            b = buffers[k]
+            cut = int(np.searchsorted(b.time, horizon, side="left"))
+            if cut:
+                parts.append(b.take(slice(0, cut)))
+                buffers[k] = b.take(slice(cut, None)) if cut < len(b) else None
+        if parts:
+            merged = TickChunk.concat(parts)
+            yield merged.take(np.argsort(merged.time, kind="stable"))
+        else:
+            # everything left starts at the horizon: extend the buffers that end there
+            for k in open_:
+                if buffers[k].time[-1] == horizon:
+                    nxt = _next_chunk(iters[k])
+                    if nxt is None:
+                        exhausted[k] = True
+                    else:
+                        buffers[k] = TickChunk.concat([buffers[k], nxt])
+        for k in open_:
+            if buffers[k] is None:
+                buffers[k] = _next_chunk(iters[k])
+                exhausted[k] = buffers[k] is None
+
+
+def _next_chunk(it: Iterator[TickChunk]) -> TickChunk | None:
+    for chunk in it:
+        if len(chunk):
+            return chunk
+    return None
@@ -1,7 +1,12 @@
+from .cache import IndicatorCache, cache_stats, get_cache, set_cache
 from .rsi import compute_rsi
 from .supertrend import compute_supertrend
 
 __all__ = [
+    "IndicatorCache",
+    "cache_stats",
     "compute_rsi",
     "compute_supertrend",
-] 
\ No newline at end of file
+    "get_cache",
+    "set_cache",
+]
@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import threading
+import zipfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def fingerprint(data: Any) -> str:
+    """입력 OHLC 버퍼(ndarray / Series / DataFrame)의 내용 해시."""
+    h = hashlib.blake2b(digest_size=16)
+    _update(h, data)
+    return h.hexdigest()
+
+
+def _update(h, data: Any) -> None:
+    if isinstance(data, pd.DataFrame):
+        h.update(repr(tuple(data.columns)).encode())
+        _update_index(h, data.index)
+        for col in data.columns:
+            _update_array(h, data[col].to_numpy())
+    elif isinstance(data, pd.Series):
+        _update_index(h, data.index)
+        _update_array(h, data.to_numpy())
+    elif isinstance(data, (tuple, list)):
+        for d in data:
+            _update(h, d)
+    else:
+        _update_array(h, np.asarray(data))
+
+
+def _update_index(h, index: pd.Index) -> None:
+    if isinstance(index, pd.RangeIndex):
+        h.update(repr((index.start, index.stop, index.step)).encode())
+    elif isinstance(index, pd.DatetimeIndex):
+        h.update(str(index.tz).encode())
+        _update_array(h, index.asi8)
+    else:
+        _update_array(h, index.to_numpy())
+
+
+def _update_array(h, arr: np.ndarray) -> None:
+    h.update(f"{arr.dtype.str}{arr.shape}".encode())
+    if arr.dtype == object:
+        h.update(pickle.dumps(arr.tolist()))
+    else:
+        h.update(np.ascontiguousarray(arr).data)
+
+
+def _nbytes(value: Any) -> int:
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return int(np.sum(value.memory_usage(index=True, deep=False)))
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, tuple):
+        return sum(_nbytes(v) for v in value)
+    return 0
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif isinstance(value, tuple):
+        for v in value:
+            _freeze(v)
+    return value
+
+
+def _plain(value: Any) -> bool:
+    # 디스크 티어에 저장 가능한 값: 객체 dtype 이 아닌 ndarray 또는 그 tuple
+    if isinstance(value, tuple):
+        return bool(value) and all(_plain(v) for v in value)
+    return isinstance(value, np.ndarray) and not value.dtype.hasobject
+
+
+def _share(value: Any) -> Any:
+    # pandas 객체는 호출자가 수정할 수 있으므로 복사본, ndarray 는 읽기 전용 원본
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy()
+    return value
+
+
+class IndicatorCache:
+    """(데이터 지문, 지표명, 파라미터) 키 기반 지표 결과 LRU 캐시.
+
+    Notes
+    -----
+    - 메모리 티어: 항목 수(max_entries)와 바이트(max_bytes) 양쪽으로 제한, 초과 시 LRU 제거.
+    - 디스크 티어(disk_dir): 선택. ndarray 는 .npy, ndarray tuple 은 .npz 로 저장해 같은 데이터로
+      다시 시작하는 study 가 따뜻한 캐시로 시작할 수 있게 한다. 읽을 때 allow_pickle=False 라
+      디렉터리에 놓인 파일이 코드를 실행할 수 없고, 그 외 값(DataFrame 등)은 메모리 티어에만 둔다.
+    - stats() 로 hit/miss 통계 확인.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        max_bytes: int = 512 * 1024 * 1024,
+        disk_dir: str | os.PathLike | None = None,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self._items: OrderedDict[Tuple, Tuple[Any, int]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_env(cls) -> "IndicatorCache":
+        return cls(disk_dir=os.getenv("INDICATOR_CACHE_DIR"))
+
+    def get(self, key: Tuple) -> Any | None:
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return item[0]
+        value = self._disk_get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+        self._put_memory(key, value)
+        return value
+
+    def put(self, key: Tuple, value: Any) -> None:
+        self._put_memory(key, value)
+        self._disk_put(key, value)
+
+    def get_or_compute(self, key: Tuple, fn: Callable[[], Any]) -> Any:
+        value = self.get(key)
+        if value is None:
+            value = _freeze(fn())
+            self.put(key, value)
+        return value
+
+    def _put_memory(self, key: Tuple, value: Any) -> None:
+        size = _nbytes(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._items[key] = (value, size)
+            self._bytes += size
+            while self._items and (len(self._items) > self.max_entries or self._bytes > self.max_bytes):
+                _, (_, evicted) = self._items.popitem(last=False)
+                self._bytes -= evicted
+                self.evictions += 1
+
+    def _disk_path(self, key: Tuple, suffix: str) -> Path:
+        digest = hashlib.blake2b(repr(key).encode(), digest_size=16).hexdigest()
+        return self.disk_dir / f"{key[1]}-{digest}{suffix}"
+
+    def _disk_get(self, key: Tuple) -> Any | None:
+        if self.disk_dir is None:
+            return None
+        for path in (self._disk_path(key, ".npy"), self._disk_path(key, ".npz")):
+            if not path.exists():
+                continue
+            try:
+                # allow_pickle=False: a file dropped into the cache dir can only ever be plain data
+                if path.suffix == ".npy":
+                    return _freeze(np.load(path, allow_pickle=False))
+                with np.load(path, allow_pickle=False) as npz:
+                    return _freeze(tuple(npz[f"arr_{i}"] for i in range(len(npz.files))))
+            except (OSError, ValueError, zipfile.BadZipFile):
+                return None  # unreadable / object array: recomputed and overwritten
+        return None
+
+    def _disk_put(self, key: Tuple, value: Any) -> None:
+        if self.disk_dir is None or not _plain(value):
+            return
+        self.disk_dir.mkdir(parents=True, exist_ok=True)
+        path = self._disk_path(key, ".npz" if isinstance(value, tuple) else ".npy")
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            if isinstance(value, tuple):
+                np.savez(f, *value)
+            else:
+                np.save(f, value, allow_pickle=False)
+        os.replace(tmp, path)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.disk_hits = self.evictions = 0
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._items),
+                "bytes": self._bytes,
+            }
+
+
+_cache = IndicatorCache.from_env()
+
+
+def get_cache() -> IndicatorCache:
+    """generate_signals·전략·파이프라인이 공유하는 프로세스 전역 캐시."""
+    return _cache
+
+
+def set_cache(cache: IndicatorCache) -> None:
+    global _cache
+    _cache = cache
+
+
+def cache_stats() -> Dict[str, float]:
+    return _cache.stats()
+
+
+def cached_indicator(name: str, n_data: int = 1) -> Callable:
+    """앞쪽 n_data 개 인자(OHLC 데이터) 지문 + 지표명 + 나머지 파라미터로 결과를 캐싱하는 데코레이터.
+
+    기본값이 적용된 파라미터로 키를 만들기 때문에 f(x) 와 f(x, length=기본값) 은 같은 항목.
+    """
+
+    def decorator(fn: Callable) -> Callable:
+        sig = inspect.signature(fn)
+        data_args = list(sig.parameters)[:n_data]
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            bound = sig.bind(*args, **kwargs)
+            bound.apply_defaults()
+            params = dict(bound.arguments)
+            data = tuple(params.pop(a) for a in data_args)
+            params_key: Tuple[Tuple[str, Hashable], ...] = tuple(sorted(params.items()))
+            key = (fingerprint(data), name, params_key)
+            return _share(_cache.get_or_compute(key, lambda: fn(*args, **kwargs)))
+
+        wrapper.uncached = fn
+        return wrapper
+
+    return decorator
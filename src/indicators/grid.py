@@ -0,0 +1,154 @@
+"""파라미터 그리드 전체에 대한 RSI / Supertrend 일괄 계산.
+
+공통 작업은 한 번만 한다: 종가 차분 1회, true range 1회, period 별 ATR 1회를
+모든 multiplier 가 재사용. 결과는 (파라미터 x 봉) 2-D 배열이라 Optuna trial 은
+지표 계산 대신 행 조회만 하면 된다.
+"""
+from __future__ import annotations
+
+from typing import Dict, Iterable, Sequence, Tuple
+
+import numpy as np
+from numba import njit, prange
+
+from .kernels import _f64, _first_valid, diff, rsi_from_diff, supertrend_into, true_range, wilder_smooth
+
+
+@njit(cache=True, parallel=True)
+def _rsi_grid(close, periods):
+    d = diff(close)
+    f = _first_valid(close)
+    out = np.empty((periods.shape[0], close.shape[0]))
+    for k in prange(periods.shape[0]):
+        out[k] = rsi_from_diff(d, f, periods[k])
+    return out
+
+
+@njit(cache=True, parallel=True)
+def _supertrend_grid(high, low, close, periods, multipliers, out_values):
+    n = close.shape[0]
+    n_mult = multipliers.shape[0]
+    tr = true_range(high, low, close)
+    # without out_values the value rows have length 0 and supertrend_into skips them
+    values = np.full((periods.shape[0] * n_mult, n if out_values else 0), np.nan)
+    directions = np.empty((periods.shape[0] * n_mult, n), dtype=np.int8)
+    for p in prange(periods.shape[0]):
+        atr = wilder_smooth(tr, periods[p])
+        for m in range(n_mult):
+            supertrend_into(high, low, close, atr, multipliers[m], values[p * n_mult + m], directions[p * n_mult + m])
+    return values, directions
+
+
+def compute_rsi_grid(close: np.ndarray, periods: Sequence[int]) -> np.ndarray:
+    """(len(periods), n_bars) Wilder RSI. 행 k 는 indicators.kernels.rsi(close, periods[k]) 와 동일."""
+    return _rsi_grid(_f64(close), np.asarray(periods, dtype=np.int64))
+
+
+def compute_supertrend_grid(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    periods: Sequence[int],
+    multipliers: Sequence[float],
+    out_values: bool = True,
+) -> Tuple[np.ndarray | None, np.ndarray]:
+    """(len(periods) * len(multipliers), n_bars) Supertrend 값과 방향(int8).
+
+    행 순서는 period 우선: 행 = i_period * len(multipliers) + i_multiplier.
+    out_values=False 면 값 행렬(float64)을 만들지 않고 (None, 방향) 을 반환한다.
+    """
+    values, directions = _supertrend_grid(
+        _f64(high),
+        _f64(low),
+        _f64(close),
+        np.asarray(periods, dtype=np.int64),
+        np.asarray(multipliers, dtype=np.float64),
+        bool(out_values),
+    )
+    return (values if out_values else None), directions
+
+
+def _key(x: float) -> float:
+    return round(float(x), 6)
+
+
+class IndicatorGrid:
+    """RSI period 그리드와 Supertrend (period, multiplier) 그리드를 미리 계산해 두고 조회.
+
+    Notes
+    -----
+    - Supertrend 는 방향(int8)만 보관한다 (615 조합 x 1M 봉 = ~615MB).
+    - multiplier 는 소수 6자리로 반올림해 조회 (Optuna step=0.1 부동소수 오차 흡수).
+    """
+
+    def __init__(
+        self,
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        rsi_periods: Iterable[int],
+        st_periods: Iterable[int],
+        st_multipliers: Iterable[float],
+    ):
+        self.rsi_periods = [int(p) for p in rsi_periods]
+        self.st_periods = [int(p) for p in st_periods]
+        self.st_multipliers = [float(m) for m in st_multipliers]
+        self.rsi = compute_rsi_grid(close, self.rsi_periods)
+        _, self.st_dir = compute_supertrend_grid(
+            high, low, close, self.st_periods, self.st_multipliers, out_values=False
+        )
+        self._build_lookup()
+
+    @classmethod
+    def from_arrays(
+        cls,
+        rsi: np.ndarray,
+        st_dir: np.ndarray,
+        rsi_periods: Iterable[int],
+        st_periods: Iterable[int],
+        st_multipliers: Iterable[float],
+    ) -> "IndicatorGrid":
+        """이미 계산된 (공유 메모리 등) 그리드 배열로 생성 (복사 없음)."""
+        grid = cls.__new__(cls)
+        grid.rsi_periods = [int(p) for p in rsi_periods]
+        grid.st_periods = [int(p) for p in st_periods]
+        grid.st_multipliers = [float(m) for m in st_multipliers]
+        grid.rsi = rsi
+        grid.st_dir = st_dir
+        grid._build_lookup()
+        return grid
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """from_arrays(**arrays) 로 되돌릴 수 있는 배열 dict (SharedArrays 게시용)."""
+        return {
+            "rsi": self.rsi,
+            "st_dir": self.st_dir,
+            "rsi_periods": np.asarray(self.rsi_periods, dtype=np.int64),
+            "st_periods": np.asarray(self.st_periods, dtype=np.int64),
+            "st_multipliers": np.asarray(self.st_multipliers, dtype=np.float64),
+        }
+
+    def slice(self, start: int, stop: int) -> "IndicatorGrid":
+        """[start, stop) 봉 구간 뷰. 지표는 전체 이력으로 계산된 값을 그대로 쓴다."""
+        return IndicatorGrid.from_arrays(
+            self.rsi[:, start:stop],
+            self.st_dir[:, start:stop],
+            self.rsi_periods,
+            self.st_periods,
+            self.st_multipliers,
+        )
+
+    def _build_lookup(self) -> None:
+        self._rsi_row: Dict[int, int] = {p: i for i, p in enumerate(self.rsi_periods)}
+        n_mult = len(self.st_multipliers)
+        self._st_row: Dict[Tuple[int, float], int] = {
+            (p, _key(m)): i * n_mult + j
+            for i, p in enumerate(self.st_periods)
+            for j, m in enumerate(self.st_multipliers)
+        }
+
+    def rsi_values(self, period: int) -> np.ndarray:
+        return self.rsi[self._rsi_row[int(period)]]
+
+    def supertrend_direction(self, period: int, multiplier: float) -> np.ndarray:
+        return self.st_dir[self._st_row[(int(period), _key(multiplier))]]
@@ -0,0 +1,181 @@
+"""RSI / ATR / Supertrend 네이티브 커널 (numba, float64 연속 배열).
+
+TA-Lib 이 설치된 pandas-ta(requirements 기준)와 같은 정의를 따른다.
+
+- RSI, ATR: Wilder 평활. 첫 값은 처음 period 개의 단순 평균, 이후
+  avg = (avg * (period - 1) + x) / period. period 이전 구간은 nan.
+- Supertrend: pandas_ta.supertrend 와 같은 밴드/방향 갱신 규칙.
+  ATR 이 없는 구간은 값 nan, 방향 +1.
+- 앞쪽 nan(병합 직후 상위 TF 등)은 건너뛰고 첫 유효 값부터 계산한다.
+
+스트리밍 엔진이 같은 결과를 내도록 합계·평활은 모두 순차 루프로 계산한다.
+"""
+from __future__ import annotations
+
+from typing import Tuple
+
+import numpy as np
+from numba import njit
+
+from .cache import cached_indicator
+
+
+@njit(cache=True)
+def _first_valid(x):
+    for i in range(x.shape[0]):
+        if not np.isnan(x[i]):
+            return i
+    return x.shape[0]
+
+
+@njit(cache=True)
+def diff(x):
+    out = np.full(x.shape[0], np.nan)
+    for i in range(1, x.shape[0]):
+        out[i] = x[i] - x[i - 1]
+    return out
+
+
+@njit(cache=True)
+def rsi_from_diff(d, f, period):
+    """종가 차분 d (첫 유효 종가 위치 f) 로부터 Wilder RSI."""
+    n = d.shape[0]
+    out = np.full(n, np.nan)
+    if n - f <= period:
+        return out
+    gain = 0.0
+    loss = 0.0
+    for i in range(f + 1, f + period + 1):
+        if d[i] > 0:
+            gain += d[i]
+        else:
+            loss -= d[i]
+    gain /= period
+    loss /= period
+    i = f + period
+    out[i] = 100.0 * gain / (gain + loss) if gain + loss != 0.0 else 0.0
+    for i in range(f + period + 1, n):
+        gain *= period - 1
+        loss *= period - 1
+        if d[i] > 0:
+            gain += d[i]
+        else:
+            loss -= d[i]
+        gain /= period
+        loss /= period
+        out[i] = 100.0 * gain / (gain + loss) if gain + loss != 0.0 else 0.0
+    return out
+
+
+@njit(cache=True)
+def rsi_wilder(close, period):
+    return rsi_from_diff(diff(close), _first_valid(close), period)
+
+
+@njit(cache=True)
+def true_range(high, low, close):
+    n = close.shape[0]
+    out = np.full(n, np.nan)
+    for i in range(1, n):
+        pc = close[i - 1]
+        tr = high[i] - low[i]
+        a = abs(high[i] - pc)
+        b = abs(low[i] - pc)
+        if a > tr:
+            tr = a
+        if b > tr:
+            tr = b
+        out[i] = tr
+    return out
+
+
+@njit(cache=True)
+def wilder_smooth(x, period):
+    """x 의 첫 유효 구간 period 개 평균으로 시작하는 Wilder 평활."""
+    n = x.shape[0]
+    out = np.full(n, np.nan)
+    f = _first_valid(x)
+    if n - f < period:
+        return out
+    avg = 0.0
+    for i in range(f, f + period):
+        avg += x[i]
+    avg /= period
+    out[f + period - 1] = avg
+    for i in range(f + period, n):
+        avg = (avg * (period - 1) + x[i]) / period
+        out[i] = avg
+    return out
+
+
+@njit(cache=True)
+def atr_wilder(high, low, close, period):
+    return wilder_smooth(true_range(high, low, close), period)
+
+
+@njit(cache=True)
+def supertrend_into(high, low, close, atr, multiplier, value, direction):
+    """Supertrend 를 value / direction 에 기록. value 가 길이 0 이면 방향만 계산한다."""
+    n = close.shape[0]
+    write_value = value.shape[0] > 0
+    if n == 0:
+        return
+    direction[0] = 1
+    upper_prev = (high[0] + low[0]) / 2.0 + multiplier * atr[0]
+    lower_prev = (high[0] + low[0]) / 2.0 - multiplier * atr[0]
+    for i in range(1, n):
+        hl2 = (high[i] + low[i]) / 2.0
+        upper = hl2 + multiplier * atr[i]
+        lower = hl2 - multiplier * atr[i]
+        if close[i] > upper_prev:
+            direction[i] = 1
+        elif close[i] < lower_prev:
+            direction[i] = -1
+        else:
+            direction[i] = direction[i - 1]
+            if direction[i] > 0 and lower < lower_prev:
+                lower = lower_prev
+            if direction[i] < 0 and upper > upper_prev:
+                upper = upper_prev
+        if write_value:
+            value[i] = lower if direction[i] > 0 else upper
+        upper_prev = upper
+        lower_prev = lower
+
+
+@njit(cache=True)
+def supertrend_from_atr(high, low, close, atr, multiplier):
+    n = close.shape[0]
+    value = np.full(n, np.nan)
+    direction = np.ones(n, dtype=np.int8)
+    supertrend_into(high, low, close, atr, multiplier, value, direction)
+    return value, direction
+
+
+def _f64(x) -> np.ndarray:
+    return np.ascontiguousarray(x, dtype=np.float64)
+
+
+@cached_indicator("rsi")
+def rsi(close: np.ndarray, period: int = 14) -> np.ndarray:
+    """Wilder RSI (0~100) 배열."""
+    return rsi_wilder(_f64(close), int(period))
+
+
+@cached_indicator("atr", n_data=3)
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
+    """Wilder ATR 배열."""
+    return atr_wilder(_f64(high), _f64(low), _f64(close), int(period))
+
+
+@cached_indicator("supertrend", n_data=3)
+def supertrend(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    period: int = 10,
+    multiplier: float = 3.0,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """(Supertrend 값, 방향 int8 +1/-1) 배열."""
+    high, low, close = _f64(high), _f64(low), _f64(close)
+    return supertrend_from_atr(high, low, close, atr(high, low, close, period), float(multiplier))
@@ -0,0 +1,23 @@
+import pandas as pd
+
+from .kernels import rsi
+
+
+def compute_rsi(
+    close: pd.Series,
+    length: int = 14,
+) -> pd.Series:
+    """RSI 계산 (Wilder, indicators.kernels.rsi 의 Series 래퍼).
+
+    Parameters
+    ----------
+    close : pd.Series
+        종가
+    length : int
+        RSI 기간
+    Returns
+    -------
+    pd.Series
+        RSI (0~100)
+    """
+    return pd.Series(rsi(close.to_numpy(), length), index=close.index, name=f"RSI_{length}", copy=True)
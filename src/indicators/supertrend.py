@@ -1,5 +1,6 @@
 import pandas as pd
-import pandas_ta as ta
+
+from .kernels import supertrend
 
 
 def compute_supertrend(
@@ -22,5 +23,7 @@ def compute_supertrend(
     pd.DataFrame
         columns=["ST", "ST_dir"] (Supertrend 값, 추세(1:-1))
     """
-    st = ta.supertrend(high=df["high"], low=df["low"], close=df["close"], length=length, multiplier=multiplier)
-    return st 
\ No newline at end of file
+    value, direction = supertrend(
+        df["high"].to_numpy(), df["low"].to_numpy(), df["close"].to_numpy(), length, multiplier
+    )
+    return pd.DataFrame({"ST": value, "ST_dir": direction}, index=df.index, copy=True)
@@ -14,9 +14,14 @@ def main():
     parser.add_argument("--start", type=str, required=True, help="Start date YYYY-MM-DD")
     parser.add_argument("--end", type=str, required=True, help="End date YYYY-MM-DD")
     parser.add_argument("--interval", type=str, default="1h", help="Kline interval, default 1h")
+    parser.add_argument(
+        "--concurrent",
+        action="store_true",
+        help="Fetch kline pages concurrently (ConcurrentKlineFetcher) instead of sequential python-binance pages",
+    )
     args = parser.parse_args()
 
-    client = BinanceDataClient()
+    client = BinanceDataClient(concurrent=args.concurrent)
     df = client.fetch_klines(args.symbol.upper(), args.interval, args.start, args.end)
 
     # Keep only necessary columns
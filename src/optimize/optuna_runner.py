@@ -4,30 +4,209 @@ import argparse
 import datetime as dt
 import gc
 import os
-from typing import Dict
+from typing import Dict, List, Sequence
 
+import numpy as np
 import optuna
 import pandas as pd
 
 from data.binance_collector import BinanceDataClient
 from backtest.engine import run_backtest
+from backtest.fast_engine import run_backtest_batch, run_fast_backtest
+from backtest.metrics import (
+    EQUITY_OBJECTIVES,
+    OBJECTIVES,
+    RunningMetrics,
+    check_objective,
+    needs_equity,
+    periods_per_year,
+    score,
+    trade_stats,
+)
 from backtest.strategy import MultiIndicatorStrategy
-from optimize.param_space import suggest_params
+from indicators.grid import IndicatorGrid
+from optimize.param_space import indicator_grid, suggest_params
+from signals.rsi_supertrend import grid_signals
+from optimize.parallel import in_memory_copy, make_storage, optimize_parallel, study_storage
 
 
-def objective(trial: optuna.Trial, df: pd.DataFrame) -> float:
+PRUNERS = {
+    "none": optuna.pruners.NopPruner,
+    "median": optuna.pruners.MedianPruner,
+    "hyperband": optuna.pruners.HyperbandPruner,
+}
+
+
+def make_pruner(name: str = "none") -> optuna.pruners.BasePruner:
+    if name not in PRUNERS:
+        raise ValueError(f"Unknown pruner: {name!r} (choose from {', '.join(PRUNERS)})")
+    return PRUNERS[name]()
+
+
+def checkpoint_bars(index: pd.Index, every: int | str) -> List[int]:
+    """중간 보고 지점(봉 위치). every 가 int 면 N 봉마다, 문자열이면 pandas 주기
+    (예: "MS" 매월 초, "W" 매주) 경계마다. 처음과 끝 위치는 제외한다."""
+    n = len(index)
+    if isinstance(every, int):
+        return list(range(every, n, every)) if every > 0 else []
+    index = pd.DatetimeIndex(index)
+    if n == 0:
+        return []
+    edges = pd.date_range(index[0], index[-1], freq=every)
+    return sorted({int(b) for b in index.searchsorted(edges) if 0 < b < n})
+
+
+def check_pruning(pruner: str, engine: str | None, batch_size: int = 1) -> None:
+    """pruner 는 중간값을 보고하는 경로(fast 엔진, trial 단위 평가)에서만 쓸 수 있다."""
+    if pruner == "none":
+        return
+    if batch_size > 1:
+        raise ValueError(f"pruner={pruner!r} needs batch_size=1: batched trials are told only their final value")
+    if engine != "fast":
+        raise ValueError(f"pruner={pruner!r} needs engine='fast': the backtrader engine reports no intermediate values")
+
+
+def pruning_callback(trial: optuna.Trial, metric: str, periods: float):
+    # report the metric of the run so far at each checkpoint, step = bars simulated.
+    # equity metrics are accumulated segment by segment instead of over the whole prefix.
+    running = RunningMetrics(periods)
+
+    def report(stop: int, equity: np.ndarray, pnl: np.ndarray) -> bool:
+        if metric == "value":
+            value = equity[-1]
+        elif metric in EQUITY_OBJECTIVES:
+            value = running.update(equity[running.n :]).values()[OBJECTIVES[metric]]
+        else:
+            value = trade_stats(pnl)[OBJECTIVES[metric]]
+        trial.report(float(value), stop)
+        return trial.should_prune()
+
+    return report
+
+
+def objective(
+    trial: optuna.Trial,
+    df: pd.DataFrame,
+    engine: str = "backtrader",
+    grid: IndicatorGrid | None = None,
+    metric: str = "value",
+    checkpoints: Sequence[int] | None = None,
+    periods: float | None = None,
+) -> float:
     params = suggest_params(trial)
 
-    cerebro = run_backtest(
+    if grid is not None:
+        # precomputed indicator grid: the trial is a row lookup + fast engine run
+        if checkpoints and periods is None:
+            periods = periods_per_year(df.index)
+        result = run_fast_backtest(
+            df["open"].values,
+            df["high"].values,
+            df["low"].values,
+            df["close"].values,
+            grid_signals(grid, **params),
+            commission=0.005,
+            leverage=10,
+            sl_pct=params["sl_pct"],
+            rr=params["rr"],
+            index=df.index,
+            checkpoints=checkpoints,
+            on_checkpoint=pruning_callback(trial, metric, periods) if checkpoints else None,
+        )
+        if result.stopped_at is not None:
+            raise optuna.TrialPruned(f"pruned at bar {result.stopped_at}")
+        return score(result, metric, periods)
+
+    result = run_backtest(
         df=df,
         strategy_cls=MultiIndicatorStrategy,
         commission=0.005,
         leverage=10,
+        engine=engine,
         **params,
     )
-    final_value = cerebro.broker.getvalue()
-    # maximize final portfolio value
-    return final_value
+    # maximize the selected metric (default: final portfolio value)
+    return score(result, metric)
+
+
+SIGNAL_PARAMS = ("rsi_period", "rsi_overbought", "rsi_oversold", "st_atr_period", "st_multiplier")
+
+
+def optimize_in_batches(
+    study: optuna.Study,
+    df: pd.DataFrame,
+    trials: int,
+    batch_size: int,
+    grid: IndicatorGrid | None = None,
+    metric: str = "value",
+) -> None:
+    """ask/tell 로 batch_size 개 trial 을 묶어 run_backtest_batch 한 번으로 평가."""
+    ohlc = df[["open", "high", "low", "close"]].values
+    record_equity = needs_equity(metric)
+    periods = periods_per_year(df.index)
+    done = 0
+    while done < trials:
+        batch = [study.ask() for _ in range(min(batch_size, trials - done))]
+        params = [suggest_params(t) for t in batch]
+        # same indicator params -> same entry signals, compute once per batch
+        signal_cache: Dict[tuple, np.ndarray] = {}
+        rows = []
+        for p in params:
+            key = tuple(p[k] for k in SIGNAL_PARAMS)
+            if key not in signal_cache:
+                if grid is not None:
+                    signal_cache[key] = grid_signals(grid, **p)
+                else:
+                    signal_cache[key] = MultiIndicatorStrategy.fast_signals(df, **p)
+            rows.append(signal_cache[key])
+        result = run_backtest_batch(
+            ohlc,
+            np.vstack(rows),
+            sl_pct=np.array([p["sl_pct"] for p in params]),
+            rr=np.array([p["rr"] for p in params]),
+            commission=0.005,
+            leverage=10,
+            record_equity=record_equity,
+        )
+        for t, value in zip(batch, score(result, metric, periods)):
+            study.tell(t, float(value))
+        done += len(batch)
+
+
+def optimize_study(
+    study: optuna.Study,
+    df: pd.DataFrame,
+    trials: int,
+    engine: str | None = None,
+    batch_size: int = 1,
+    grid: IndicatorGrid | None = None,
+    metric: str = "value",
+    checkpoint_every: int | str | None = None,
+) -> None:
+    """checkpoint_every 를 주면 fast 엔진 trial 이 그 간격마다 trial.report 하고
+    study.pruner 판단에 따라 중단된다 (batch_size > 1 / backtrader 경로와는 함께 쓸 수 없다).
+
+    engine=None 이면 batch_size > 1 은 fast(run_backtest_batch), 아니면 backtrader.
+    batch 평가는 fast 엔진 전용이라 engine="backtrader" 와 batch_size > 1 은 함께 쓸 수 없다.
+    """
+    check_objective(metric)
+    if engine is None:
+        engine = "fast" if batch_size > 1 else "backtrader"
+    elif engine == "backtrader" and batch_size > 1:
+        raise ValueError("batch_size > 1 evaluates trials with the fast engine; use engine='fast' or batch_size=1")
+    if isinstance(study.pruner, optuna.pruners.NopPruner):
+        checkpoint_every = None  # nothing is pruned: skip the intermediate reports
+    if checkpoint_every is not None:
+        check_pruning(type(study.pruner).__name__, engine, batch_size)
+    # fast/batch paths evaluate the whole indicator grid once, trials only look rows up
+    if grid is None and (engine == "fast" or batch_size > 1):
+        grid = indicator_grid(df)
+    if batch_size > 1:
+        optimize_in_batches(study, df, trials, batch_size, grid, metric)
+    else:
+        checkpoints = checkpoint_bars(df.index, checkpoint_every) if checkpoint_every is not None else None
+        periods = periods_per_year(df.index)
+        study.optimize(lambda t: objective(t, df, engine, grid, metric, checkpoints, periods), n_trials=trials)
 
 
 def run_optimization(
@@ -38,18 +217,49 @@ def run_optimization(
     trials: int = 100,
     study_name: str | None = None,
     storage: str | None = None,
+    engine: str | None = None,
+    batch_size: int = 1,
+    n_workers: int = 1,
+    metric: str = "value",
+    pruner: str = "none",
+    checkpoint_every: int | str = "MS",
+    concurrent: bool = False,
 ):
-    client = BinanceDataClient()
+    engine = engine or ("fast" if batch_size > 1 else "backtrader")
+    check_pruning(pruner, engine, batch_size)
+    client = BinanceDataClient(concurrent=concurrent)
     df = client.fetch_klines(symbol.upper(), interval, start, end)
     df = df[["open", "high", "low", "close", "volume"]]
 
-    study = optuna.create_study(
-        direction="maximize",
-        study_name=study_name,
-        storage=storage,
-        load_if_exists=bool(storage),
-    )
-    study.optimize(lambda t: objective(t, df), n_trials=trials)
+    checkpoint_every = None if pruner == "none" else checkpoint_every
+    with study_storage(storage, n_workers) as path:
+        study = optuna.create_study(
+            direction="maximize",
+            study_name=study_name,
+            storage=make_storage(path),
+            load_if_exists=bool(path),
+            pruner=make_pruner(pruner),
+        )
+        if n_workers > 1:
+            # the fast paths look trials up in one indicator grid: build it here and share it
+            grid = indicator_grid(df) if engine == "fast" else None
+            study = optimize_parallel(
+                study,
+                path,
+                df,
+                trials,
+                n_workers,
+                optimize_study,
+                grid=grid,
+                engine=engine,
+                batch_size=batch_size,
+                metric=metric,
+                checkpoint_every=checkpoint_every,
+            )
+        else:
+            optimize_study(study, df, trials, engine, batch_size, metric=metric, checkpoint_every=checkpoint_every)
+        if path != storage:
+            study = in_memory_copy(study)  # the temporary journal is removed on exit
     print("Best value:", study.best_value)
     print("Best params:", study.best_params)
     return study
@@ -62,8 +272,41 @@ def main():
     parser.add_argument("--end", required=True)
     parser.add_argument("--interval", default="1h")
     parser.add_argument("--trials", type=int, default=50)
-    parser.add_argument("--storage", type=str, help="Optuna storage URL (e.g., sqlite:///study.db)")
+    parser.add_argument(
+        "--storage", type=str, help="Optuna storage URL (e.g., sqlite:///study.db) or journal file path"
+    )
     parser.add_argument("--name", type=str, help="Study name")
+    parser.add_argument(
+        "--engine",
+        choices=["backtrader", "fast"],
+        default=None,
+        help="Backtest engine (default: backtrader, or fast with --batch-size > 1)",
+    )
+    parser.add_argument("--batch-size", type=int, default=1, help="Evaluate trials in batches (fast engine only, ask/tell)")
+    parser.add_argument("--n-workers", type=int, default=1, help="Worker processes sharing one study storage")
+    parser.add_argument(
+        "--objective",
+        choices=list(OBJECTIVES),
+        default="value",
+        help="Metric to maximize (anything but 'value' needs the fast engine)",
+    )
+    parser.add_argument(
+        "--pruner",
+        choices=list(PRUNERS),
+        default="none",
+        help="Prune trials from intermediate equity checkpoints (needs --engine fast and --batch-size 1)",
+    )
+    parser.add_argument(
+        "--checkpoint-every",
+        type=lambda v: int(v) if v.isdigit() else v,
+        default="MS",
+        help="Checkpoint spacing: N bars or a pandas frequency (default: MS = each month)",
+    )
+    parser.add_argument(
+        "--concurrent",
+        action="store_true",
+        help="Fetch kline pages concurrently (ConcurrentKlineFetcher) instead of sequential python-binance pages",
+    )
     args = parser.parse_args()
 
     run_optimization(
@@ -74,6 +317,13 @@ def main():
         trials=args.trials,
         study_name=args.name,
         storage=args.storage,
+        engine=args.engine,
+        batch_size=args.batch_size,
+        n_workers=args.n_workers,
+        metric=args.objective,
+        pruner=args.pruner,
+        checkpoint_every=args.checkpoint_every,
+        concurrent=args.concurrent,
     )
 
 
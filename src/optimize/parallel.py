@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Tuple
+
+import numpy as np
+import optuna
+import pandas as pd
+
+if TYPE_CHECKING:
+    from indicators.grid import IndicatorGrid
+
+
+@dataclass(frozen=True)
+class SharedFrameHandle:
+    """워커에 넘기는 공유 메모리 DataFrame 메타데이터 (pickle 비용 ~ 수백 바이트)."""
+
+    name: str
+    columns: Tuple[str, ...]
+    n_rows: int
+    index_name: str | None
+    tz: str | None
+
+
+class SharedFrame:
+    """DataFrame 을 공유 메모리 블록 하나에 한 번만 게시하고 워커에서 zero-copy 로 붙이기.
+
+    Notes
+    -----
+    - 레이아웃: [int64 index(ns) | float64 (n_cols x n_rows) 컬럼 블록]
+    - 모든 컬럼은 float64 로 저장 (sig_* 등 정수 컬럼 포함).
+    - 워커 쪽 DataFrame 은 읽기 전용 버퍼 위의 뷰. 새 컬럼 추가는 가능.
+    - data.columnar.ColumnarFrame 도 게시할 수 있다 (워커는 DataFrame 뷰로 받는다).
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        n, k = len(df), len(df.columns)
+        self.shm = shared_memory.SharedMemory(create=True, size=max(8 * n * (1 + k), 1))
+        index = pd.DatetimeIndex(df.index)
+        idx = np.ndarray((n,), dtype=np.int64, buffer=self.shm.buf)
+        idx[:] = index.asi8
+        block = np.ndarray((k, n), dtype=np.float64, buffer=self.shm.buf, offset=8 * n)
+        for j, col in enumerate(df.columns):
+            block[j] = np.asarray(df[col], dtype=np.float64)
+        self.handle = SharedFrameHandle(
+            name=self.shm.name,
+            columns=tuple(df.columns),
+            n_rows=n,
+            index_name=index.name,
+            tz=str(index.tz) if index.tz is not None else None,
+        )
+
+    @staticmethod
+    def attach(handle: SharedFrameHandle) -> Tuple[pd.DataFrame, shared_memory.SharedMemory]:
+        """handle 로 공유 블록에 붙어 DataFrame 뷰와 (닫아야 할) SharedMemory 반환."""
+        shm = shared_memory.SharedMemory(name=handle.name)
+        n, k = handle.n_rows, len(handle.columns)
+        idx = np.ndarray((n,), dtype=np.int64, buffer=shm.buf)
+        block = np.ndarray((k, n), dtype=np.float64, buffer=shm.buf, offset=8 * n)
+        block.flags.writeable = False
+        index = pd.DatetimeIndex(idx.view("datetime64[ns]"), name=handle.index_name)
+        if handle.tz is not None:
+            index = index.tz_localize("UTC").tz_convert(handle.tz)
+        df = pd.DataFrame(block.T, index=index, columns=list(handle.columns), copy=False)
+        return df, shm
+
+    def close(self) -> None:
+        self.shm.close()
+        self.shm.unlink()
+
+
+@dataclass(frozen=True)
+class SharedArraysHandle:
+    """SharedArrays 메타데이터: (이름, dtype, shape, 바이트 오프셋) 목록."""
+
+    name: str
+    specs: Tuple[Tuple[str, str, Tuple[int, ...], int], ...]
+
+
+class SharedArrays:
+    """여러 ndarray(지표 그리드 등)를 공유 메모리 블록 하나에 게시하고 워커에서 읽기 전용 뷰로 붙이기."""
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        specs = []
+        offset = 0
+        for key, arr in arrays.items():
+            specs.append((key, arr.dtype.str, tuple(arr.shape), offset))
+            offset += -(-arr.nbytes // 8) * 8  # keep every array 8-byte aligned
+        self.shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        for (key, dtype, shape, off), arr in zip(specs, arrays.values()):
+            np.ndarray(shape, dtype=dtype, buffer=self.shm.buf, offset=off)[...] = arr
+        self.handle = SharedArraysHandle(name=self.shm.name, specs=tuple(specs))
+
+    @staticmethod
+    def attach(handle: SharedArraysHandle) -> Tuple[Dict[str, np.ndarray], shared_memory.SharedMemory]:
+        shm = shared_memory.SharedMemory(name=handle.name)
+        arrays = {}
+        for key, dtype, shape, off in handle.specs:
+            arr = np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=off)
+            arr.flags.writeable = False
+            arrays[key] = arr
+        return arrays, shm
+
+    def close(self) -> None:
+        self.shm.close()
+        self.shm.unlink()
+
+
+def resolve_storage(storage: str | None, n_workers: int) -> str | None:
+    """병렬 실행인데 storage 가 없으면 임시 journal 파일 경로를 만든다."""
+    if storage is None and n_workers > 1:
+        fd, path = tempfile.mkstemp(prefix="optuna_journal_", suffix=".log")
+        os.close(fd)
+        return path
+    return storage
+
+
+@contextmanager
+def study_storage(storage: str | None, n_workers: int) -> Iterator[str | None]:
+    """resolve_storage 와 같고, 여기서 만든 임시 journal 파일은 블록을 나갈 때 지운다."""
+    path = resolve_storage(storage, n_workers)
+    try:
+        yield path
+    finally:
+        if path is not None and path != storage:
+            for p in (path, path + ".lock"):
+                if os.path.exists(p):
+                    os.remove(p)
+
+
+def in_memory_copy(study: optuna.Study) -> optuna.Study:
+    """storage 와 무관한 in-memory 사본 (임시 storage 를 지운 뒤에도 best_value 등을 읽기 위해)."""
+    copy = optuna.create_study(study_name=study.study_name, directions=study.directions)
+    copy.add_trials(study.trials)
+    return copy
+
+
+def make_storage(storage: str | None):
+    """RDB URL(sqlite:///... 등)은 그대로, 그 외 문자열은 JournalFileStorage 경로로 해석."""
+    if storage is None or "://" in storage:
+        return storage
+    return optuna.storages.JournalStorage(optuna.storages.JournalFileStorage(storage))
+
+
+def split_trials(n_trials: int, n_workers: int) -> List[int]:
+    base, extra = divmod(n_trials, n_workers)
+    return [base + (1 if i < extra else 0) for i in range(n_workers) if base or i < extra]
+
+
+def _worker(
+    study_name: str,
+    storage: str,
+    handle: SharedFrameHandle,
+    n_trials: int,
+    optimize_fn: Callable,
+    kwargs: dict,
+    pruner: optuna.pruners.BasePruner | None = None,
+    grid_handle: SharedArraysHandle | None = None,
+) -> None:
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    df, shm = SharedFrame.attach(handle)
+    arrays, grid_shm = SharedArrays.attach(grid_handle) if grid_handle is not None else ({}, None)
+    try:
+        if grid_shm is not None:
+            from indicators.grid import IndicatorGrid
+
+            kwargs = {**kwargs, "grid": IndicatorGrid.from_arrays(**arrays)}
+        study = optuna.load_study(study_name=study_name, storage=make_storage(storage), pruner=pruner)
+        optimize_fn(study, df, n_trials, **kwargs)
+    finally:
+        del df, arrays, kwargs
+        shm.close()
+        if grid_shm is not None:
+            grid_shm.close()
+
+
+def optimize_parallel(
+    study: optuna.Study,
+    storage: str,
+    df: pd.DataFrame,
+    n_trials: int,
+    n_workers: int,
+    optimize_fn: Callable,
+    grid: IndicatorGrid | None = None,
+    **kwargs,
+) -> optuna.Study:
+    """n_workers 개 프로세스가 같은 storage 의 study 에 trial 을 나눠 실행.
+
+    optimize_fn(study, df, n_trials, **kwargs) 는 모듈 최상위 함수여야 한다(pickle).
+    워커는 spawn 으로 띄우므로 호출 스크립트는 if __name__ == "__main__" 가드가 필요하다.
+    df 는 SharedFrame 으로 한 번만 게시되고 워커는 공유 메모리 뷰를 받는다.
+    grid(지표 그리드)를 주면 같은 방식으로 SharedArrays 에 한 번 게시하고, 워커는 그 뷰로 만든
+    IndicatorGrid 를 optimize_fn 의 grid= 인자로 받는다 (워커마다 그리드를 다시 계산하지 않음).
+    워커는 study 를 storage 에서 다시 열 때 부모 study 의 pruner 를 그대로 쓴다.
+    """
+    shared = SharedFrame(df)
+    shared_grid = SharedArrays(grid.to_arrays()) if grid is not None else None
+    grid_handle = shared_grid.handle if shared_grid is not None else None
+    try:
+        # numba's threading layer is not fork-safe: start workers fresh
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=n_workers, mp_context=ctx) as pool:
+            futures = [
+                pool.submit(
+                    _worker, study.study_name, storage, shared.handle, n, optimize_fn, kwargs, study.pruner, grid_handle
+                )
+                for n in split_trials(n_trials, n_workers)
+            ]
+            for f in futures:
+                f.result()
+    finally:
+        shared.close()
+        if shared_grid is not None:
+            shared_grid.close()
+    return optuna.load_study(study_name=study.study_name, storage=make_storage(storage))
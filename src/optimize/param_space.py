@@ -1,6 +1,18 @@
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
+import numpy as np
 import optuna
+import pandas as pd
+
+if TYPE_CHECKING:
+    from indicators.grid import IndicatorGrid
+
+# 지표 파라미터 그리드 (suggest_params 범위와 동일해야 한다)
+RSI_PERIODS = range(2, 7)
+ST_ATR_PERIODS = range(7, 22)
+ST_MULTIPLIERS = np.round(np.arange(1.0, 5.0 + 1e-9, 0.1), 1)
 
 
 def suggest_params(trial: optuna.Trial) -> dict:
@@ -17,4 +29,34 @@ def suggest_params(trial: optuna.Trial) -> dict:
         "sl_pct": trial.suggest_float("sl_pct", 0.003, 0.01, step=0.0005),
         "rr": trial.suggest_float("rr", 1.2, 3.0, step=0.1),
     }
-    return params 
\ No newline at end of file
+    return params
+
+
+def normalize_weights(weights: dict) -> dict:
+    """합 1 로 정규화. 합이 0 이면 (모든 가중치 0) 균등 가중치."""
+    total_w = sum(weights.values())
+    if total_w <= 0:
+        return {k: 1 / len(weights) for k in weights}
+    return {k: w / total_w for k, w in weights.items()}
+
+
+def suggest_weights(trial: optuna.Trial, intervals: list[str]) -> tuple[dict, float]:
+    """타임프레임 가중치(합 1 로 정규화한 sig_<iv> 딕셔너리)와 확률 임계값."""
+    weights = normalize_weights({f"sig_{iv}": trial.suggest_float(f"w_{iv}", 0.0, 1.0) for iv in intervals})
+    prob_threshold = trial.suggest_float("prob_threshold", 0.6, 0.95)
+    return weights, prob_threshold
+
+
+def indicator_grid(df: pd.DataFrame) -> IndicatorGrid:
+    """suggest_params 의 RSI/Supertrend 탐색 공간 전체를 미리 계산한 그리드."""
+    # numba grid kernels load on first use, not when the search space is imported
+    from indicators.grid import IndicatorGrid
+
+    return IndicatorGrid(
+        df["high"].to_numpy(),
+        df["low"].to_numpy(),
+        df["close"].to_numpy(),
+        RSI_PERIODS,
+        ST_ATR_PERIODS,
+        ST_MULTIPLIERS,
+    )
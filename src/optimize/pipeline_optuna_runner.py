@@ -1,25 +1,36 @@
 from __future__ import annotations
 
 import argparse
+from typing import Sequence
 
 import optuna
+import pandas as pd
 
-from pipeline.backtest_pipeline import BacktestPipeline
+from backtest.metrics import OBJECTIVES, check_objective, periods_per_year, score
+from data.multi_tf_loader import RESAMPLE_MODES, MultiTFDataLoader
+from optimize.optuna_runner import PRUNERS, check_pruning, checkpoint_bars, make_pruner, pruning_callback
+from optimize.param_space import suggest_weights
+from optimize.parallel import in_memory_copy, make_storage, optimize_parallel, study_storage
+from pipeline.backtest_pipeline import BacktestPipeline, StudyDataContext
+from probability.calibrator import CALIBRATION_METHODS, ProbabilityCalibrator
 
 
 INTERVALS = ["5m", "15m", "1h"]  # can be parameterized
 
 
-def objective(trial: optuna.Trial, symbol: str, start: str, end: str):
-    # suggest weights
-    weights = {}
-    for iv in INTERVALS:
-        weights[iv] = trial.suggest_float(f"w_{iv}", 0.0, 1.0)
-    # normalize
-    total_w = sum(weights.values())
-    weights = {f"sig_{iv}": w / total_w for iv, w in weights.items()}
-
-    prob_threshold = trial.suggest_float("prob_threshold", 0.6, 0.95)
+def objective(
+    trial: optuna.Trial,
+    symbol: str,
+    start: str,
+    end: str,
+    context: StudyDataContext | None = None,
+    engine: str = "backtrader",
+    metric: str = "value",
+    calibrator: ProbabilityCalibrator | None = None,
+    checkpoints: Sequence[int] | None = None,
+    periods: float | None = None,
+):
+    weights, prob_threshold = suggest_weights(trial, INTERVALS)
 
     pipe = BacktestPipeline(
         symbol=symbol,
@@ -28,10 +39,90 @@ def objective(trial: optuna.Trial, symbol: str, start: str, end: str):
         end=end,
         aggregator_weights=weights,
         prob_threshold=prob_threshold,
+        context=context,
+        engine=engine,
+        calibrator=calibrator,
+        checkpoints=checkpoints,
+        on_checkpoint=pruning_callback(trial, metric, periods) if checkpoints else None,
+    )
+    result = pipe.execute()
+    if getattr(result, "stopped_at", None) is not None:
+        raise optuna.TrialPruned(f"pruned at bar {result.stopped_at}")
+    return score(result, metric)
+
+
+def optimize_study(
+    study: optuna.Study,
+    frame: pd.DataFrame,
+    trials: int,
+    symbol: str,
+    start: str,
+    end: str,
+    engine: str = "backtrader",
+    metric: str = "value",
+    calibration: str = "logistic",
+    checkpoint_every: int | str | None = None,
+) -> None:
+    """sig_<iv> 가 준비된 frame 으로 study 를 trials 회 최적화 (병렬 워커에서도 사용).
+
+    보정기는 study(워커) 당 하나를 trial 끼리 공유해 직전 trial 의 해에서 warm start 한다.
+    checkpoint_every 를 주면 (fast 엔진) trial 이 그 간격마다 trial.report 하고 study.pruner 로 중단된다.
+    """
+    check_objective(metric)
+    if isinstance(study.pruner, optuna.pruners.NopPruner):
+        checkpoint_every = None  # nothing is pruned: skip the intermediate reports
+    if checkpoint_every is not None:
+        check_pruning(type(study.pruner).__name__, engine)
+    context = StudyDataContext.from_frame(symbol, INTERVALS, start, end, frame)
+    calibrator = ProbabilityCalibrator(method=calibration, warm_start=True)
+    checkpoints = checkpoint_bars(frame.index, checkpoint_every) if checkpoint_every is not None else None
+    periods = periods_per_year(frame.index)
+    study.optimize(
+        lambda t: objective(t, symbol, start, end, context, engine, metric, calibrator, checkpoints, periods),
+        n_trials=trials,
+    )
+
+
+def run_study(
+    context: StudyDataContext,
+    trials: int,
+    storage: str | None = None,
+    study_name: str | None = None,
+    engine: str = "backtrader",
+    n_workers: int = 1,
+    metric: str = "value",
+    calibration: str = "logistic",
+    pruner: str = "none",
+    checkpoint_every: int | str = "MS",
+) -> optuna.Study:
+    """storage 없이 n_workers > 1 이면 임시 journal 을 쓰고 끝나면 지운다 (반환 study 는 in-memory 사본).
+
+    pruner 는 engine="fast" 에서만 쓸 수 있다 (checkpoint_every 간격의 중간값으로 판단).
+    """
+    check_pruning(pruner, engine)
+    frame = context.load().frame
+    kwargs = dict(
+        symbol=context.symbol,
+        start=context.start,
+        end=context.end,
+        engine=engine,
+        metric=metric,
+        calibration=calibration,
+        checkpoint_every=None if pruner == "none" else checkpoint_every,
     )
-    cerebro = pipe.execute()
-    final_value = cerebro.broker.getvalue()
-    return final_value
+    with study_storage(storage, n_workers) as path:
+        study = optuna.create_study(
+            direction="maximize",
+            study_name=study_name,
+            storage=make_storage(path),
+            load_if_exists=bool(path),
+            pruner=make_pruner(pruner),
+        )
+        if n_workers > 1:
+            study = optimize_parallel(study, path, frame, trials, n_workers, optimize_study, **kwargs)
+        else:
+            optimize_study(study, frame, trials, **kwargs)
+        return study if path == storage else in_memory_copy(study)
 
 
 def main():
@@ -42,15 +133,58 @@ def main():
     parser.add_argument("--trials", type=int, default=50)
     parser.add_argument("--storage")
     parser.add_argument("--study")
+    parser.add_argument("--engine", choices=["backtrader", "fast"], default="backtrader")
+    parser.add_argument("--n-workers", type=int, default=1)
+    parser.add_argument(
+        "--objective",
+        choices=list(OBJECTIVES),
+        default="value",
+        help="Metric to maximize (anything but 'value' needs --engine fast)",
+    )
+    parser.add_argument("--calibration", choices=CALIBRATION_METHODS, default="logistic", help="Score -> probability model")
+    parser.add_argument(
+        "--resample",
+        choices=RESAMPLE_MODES,
+        help="Download only the base interval and build higher timeframes locally",
+    )
+    parser.add_argument(
+        "--concurrent",
+        action="store_true",
+        help="Fetch kline pages concurrently (ConcurrentKlineFetcher) instead of sequential python-binance pages",
+    )
+    parser.add_argument(
+        "--pruner",
+        choices=list(PRUNERS),
+        default="none",
+        help="Prune trials from intermediate equity checkpoints (needs --engine fast)",
+    )
+    parser.add_argument(
+        "--checkpoint-every",
+        type=lambda v: int(v) if v.isdigit() else v,
+        default="MS",
+        help="Checkpoint spacing: N bars or a pandas frequency (default: MS = each month)",
+    )
     args = parser.parse_args()
+    try:
+        check_pruning(args.pruner, args.engine)
+    except ValueError as e:
+        parser.error(str(e))
 
-    study = optuna.create_study(
-        direction="maximize",
-        study_name=args.study,
-        storage=args.storage,
-        load_if_exists=bool(args.storage),
+    # data + per-interval signals are fixed for the whole study: load once
+    loader = MultiTFDataLoader(resample=args.resample, concurrent=args.concurrent)
+    context = StudyDataContext(args.symbol, INTERVALS, args.start, args.end, loader=loader).load()
+    study = run_study(
+        context,
+        args.trials,
+        args.storage,
+        args.study,
+        args.engine,
+        args.n_workers,
+        args.objective,
+        args.calibration,
+        args.pruner,
+        args.checkpoint_every,
     )
-    study.optimize(lambda t: objective(t, args.symbol, args.start, args.end), n_trials=args.trials)
     print("Best value", study.best_value)
     print("Best params", study.best_params)
 
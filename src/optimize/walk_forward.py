@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import optuna
+import pandas as pd
+
+from backtest.fast_engine import run_fast_backtest
+from data.binance_collector import BinanceDataClient
+from indicators.grid import IndicatorGrid
+from optimize.optuna_runner import optimize_study
+from optimize.param_space import indicator_grid
+from optimize.parallel import SharedArrays, SharedArraysHandle, SharedFrame, SharedFrameHandle
+from signals.rsi_supertrend import grid_signals
+
+CASH = 100_000.0
+
+
+@dataclass(frozen=True)
+class Fold:
+    """train [train_start, test_start) / test [test_start, test_stop) 봉 위치와 시각."""
+
+    fold: int
+    train_start: int
+    test_start: int
+    test_stop: int
+    train_from: str
+    test_from: str
+    test_to: str
+
+
+def make_folds(
+    index: pd.DatetimeIndex,
+    train_months: int = 6,
+    test_months: int = 1,
+    step_months: int = 1,
+) -> List[Fold]:
+    """train_months 학습 + 다음 test_months 검증 창을 step_months 씩 굴린 fold 목록.
+
+    test 창이 겹치면 이어 붙인 OOS equity 에 같은 봉이 두 번 들어가므로
+    step_months < test_months 는 ValueError.
+    """
+    if step_months < test_months:
+        raise ValueError(
+            f"step_months ({step_months}) < test_months ({test_months}): overlapping test windows cannot be chained"
+        )
+    folds: List[Fold] = []
+    if len(index) == 0:
+        return folds
+    first = index[0].normalize().replace(day=1)
+    k = 0
+    while True:
+        train_from = first + pd.DateOffset(months=k * step_months)
+        test_from = train_from + pd.DateOffset(months=train_months)
+        test_to = test_from + pd.DateOffset(months=test_months)
+        if test_from > index[-1]:
+            break
+        lo, mid, hi = index.searchsorted([train_from, test_from, test_to])
+        if mid > lo and hi > mid:
+            folds.append(
+                Fold(len(folds), int(lo), int(mid), int(hi), str(train_from), str(test_from), str(test_to))
+            )
+        k += 1
+    return folds
+
+
+def run_fold(
+    df: pd.DataFrame,
+    grid: IndicatorGrid,
+    fold: Fold,
+    trials: int,
+    batch_size: int = 1,
+    seed: int | None = None,
+) -> dict:
+    """fold 하나: train 구간에서 study 최적화 → 최적 파라미터로 test 구간 백테스트.
+
+    df / grid 는 전체 기간 (공유 메모리 뷰). fold 구간은 복사 없는 슬라이스이고
+    지표는 전체 이력으로 한 번 계산된 값을 재사용한다 (fold 경계 warm-up 없음).
+    """
+    t0 = time.perf_counter()
+    train_df = df.iloc[fold.train_start : fold.test_start]
+    train_grid = grid.slice(fold.train_start, fold.test_start)
+    sampler = optuna.samplers.TPESampler(seed=None if seed is None else seed + fold.fold)
+    study = optuna.create_study(direction="maximize", sampler=sampler)
+    t1 = time.perf_counter()
+    optimize_study(study, train_df, trials, engine="fast", batch_size=batch_size, grid=train_grid)
+    t2 = time.perf_counter()
+
+    params = study.best_params
+    test = df.iloc[fold.test_start : fold.test_stop]
+    result = run_fast_backtest(
+        test["open"].values,
+        test["high"].values,
+        test["low"].values,
+        test["close"].values,
+        grid_signals(grid.slice(fold.test_start, fold.test_stop), **params),
+        cash=CASH,
+        commission=0.005,
+        leverage=10,
+        sl_pct=params["sl_pct"],
+        rr=params["rr"],
+    )
+    t3 = time.perf_counter()
+    return {
+        **asdict(fold),
+        "best_params": params,
+        "train_value": study.best_value,
+        "test_value": result.final_value,
+        "test_trades": len(result.trades),
+        "equity": result.equity,
+        "timings": {"setup": t1 - t0, "optimize": t2 - t1, "test": t3 - t2, "total": t3 - t0},
+    }
+
+
+def _fold_worker(
+    frame_handle: SharedFrameHandle,
+    grid_handle: SharedArraysHandle,
+    fold: Fold,
+    trials: int,
+    batch_size: int,
+    seed: int | None,
+) -> dict:
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    t0 = time.perf_counter()
+    df, frame_shm = SharedFrame.attach(frame_handle)
+    arrays, grid_shm = SharedArrays.attach(grid_handle)
+    try:
+        grid = IndicatorGrid.from_arrays(**arrays)
+        attached = time.perf_counter()
+        out = run_fold(df, grid, fold, trials, batch_size, seed)
+        out["timings"]["attach"] = attached - t0
+        return out
+    finally:
+        del df, arrays
+        frame_shm.close()
+        grid_shm.close()
+
+
+@dataclass
+class WalkForwardResult:
+    folds: pd.DataFrame
+    equity: pd.Series  # 이어 붙인 out-of-sample equity
+    grid_seconds: float
+
+    def save(self, out_dir: str | Path) -> None:
+        out = Path(out_dir)
+        out.mkdir(parents=True, exist_ok=True)
+        self.equity.to_frame("equity").to_csv(out / "oos_equity.csv")
+        records = self.folds.to_dict(orient="records")
+        (out / "folds.json").write_text(
+            json.dumps({"grid_seconds": self.grid_seconds, "folds": records}, indent=2, default=str)
+        )
+
+
+def walk_forward(
+    df: pd.DataFrame,
+    trials: int = 100,
+    train_months: int = 6,
+    test_months: int = 1,
+    step_months: int = 1,
+    n_workers: int = 1,
+    batch_size: int = 1,
+    seed: int | None = None,
+) -> WalkForwardResult:
+    """rolling train/test fold 마다 study 를 돌리고 test 구간 equity 를 이어 붙인다.
+
+    전체 기간 OHLC 와 지표 그리드는 부모 프로세스에서 한 번만 만들어 공유 메모리로 게시하고,
+    fold 워커(n_workers 프로세스)는 자기 구간 뷰만 사용한다.
+    """
+    df = df[["open", "high", "low", "close", "volume"]]
+    folds = make_folds(pd.DatetimeIndex(df.index), train_months, test_months, step_months)
+    t0 = time.perf_counter()
+    grid = indicator_grid(df)
+    grid_seconds = time.perf_counter() - t0
+
+    if n_workers > 1:
+        shared_df = SharedFrame(df)
+        shared_grid = SharedArrays(grid.to_arrays())
+        try:
+            # spawn: the parent already started numba's (fork-unsafe) TBB pool for the grid
+            ctx = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=n_workers, mp_context=ctx) as pool:
+                futures = [
+                    pool.submit(_fold_worker, shared_df.handle, shared_grid.handle, f, trials, batch_size, seed)
+                    for f in folds
+                ]
+                results = [f.result() for f in futures]
+        finally:
+            shared_df.close()
+            shared_grid.close()
+    else:
+        results = [run_fold(df, grid, f, trials, batch_size, seed) for f in folds]
+
+    # chain test equity curves: each fold starts from the previous fold's ending capital
+    pieces = []
+    capital = CASH
+    for r in results:
+        eq = np.asarray(r.pop("equity")) * (capital / CASH)
+        if len(eq):
+            capital = float(eq[-1])
+        pieces.append(pd.Series(eq, index=df.index[r["test_start"] : r["test_stop"]]))
+        r["oos_capital"] = capital
+    equity = pd.concat(pieces) if pieces else pd.Series(dtype=float)
+    table = pd.DataFrame(results)
+    if not table.empty:
+        timings = pd.json_normalize(table.pop("timings")).add_prefix("sec_")
+        table = pd.concat([table, timings], axis=1)
+    return WalkForwardResult(folds=table, equity=equity, grid_seconds=grid_seconds)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Walk-forward optimization of the multi-indicator strategy")
+    parser.add_argument("symbol", type=str)
+    parser.add_argument("--start", required=True)
+    parser.add_argument("--end", required=True)
+    parser.add_argument("--interval", default="1h")
+    parser.add_argument("--trials", type=int, default=50, help="Optuna trials per fold")
+    parser.add_argument("--train-months", type=int, default=6)
+    parser.add_argument("--test-months", type=int, default=1)
+    parser.add_argument("--step-months", type=int, default=1)
+    parser.add_argument("--n-workers", type=int, default=1, help="Folds evaluated in parallel processes")
+    parser.add_argument("--batch-size", type=int, default=1, help="Evaluate trials in batches (ask/tell)")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--out", default="walk_forward", help="Output directory")
+    parser.add_argument(
+        "--concurrent",
+        action="store_true",
+        help="Fetch kline pages concurrently (ConcurrentKlineFetcher) instead of sequential python-binance pages",
+    )
+    args = parser.parse_args()
+
+    client = BinanceDataClient(concurrent=args.concurrent)
+    df = client.fetch_klines(args.symbol.upper(), args.interval, args.start, args.end)
+    result = walk_forward(
+        df,
+        trials=args.trials,
+        train_months=args.train_months,
+        test_months=args.test_months,
+        step_months=args.step_months,
+        n_workers=args.n_workers,
+        batch_size=args.batch_size,
+        seed=args.seed,
+    )
+    result.save(args.out)
+    print(result.folds[["fold", "test_from", "train_value", "test_value", "sec_total"]])
+    print("OOS final equity:", result.equity.iloc[-1] if len(result.equity) else CASH)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""타임프레임 가중치 / 확률 임계값 전용 벡터화 탐색.
+
+pipeline_optuna_runner.objective 는 trial 마다 BacktestPipeline 을 다시 만들어
+점수 → 캘리브레이션 → 임계값 → 백테스트를 처음부터 돈다. 여기서는 가중치와 무관한
+sig_<iv> 행렬, 라벨, 기준 interval OHLC 를 한 번만 준비하고 후보 가중치 수천 개를 배열 연산으로 평가한다.
+
+- 점수는 sig_<iv> 조합(최대 3^k 수준)만의 함수: 후보별 점수는 (m, 수준) 행렬 곱 한 번.
+- 캘리브레이션 / Youden 임계값은 수준 테이블 위에서 후보 축으로 벡터화 (fit_sigmoid_batch).
+- 수준별 진입 시그널이 같은 후보는 같은 백테스트이므로 고유 패턴만 run_backtest_batch 로 시뮬레이션.
+"""
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass
+from typing import List, Sequence
+
+import numpy as np
+import optuna
+import pandas as pd
+
+from backtest.fast_engine import run_backtest_batch
+from backtest.signal_strategy import SignalTradeStrategy
+from data.multi_tf_loader import RESAMPLE_MODES, MultiTFDataLoader
+from optimize.param_space import suggest_weights
+from optimize.parallel import make_storage
+from pipeline.backtest_pipeline import StudyDataContext, calibration_labels, signal_levels
+from probability.calibrator import (
+    CALIBRATION_METHODS,
+    ProbabilityCalibrator,
+    ScoreTable,
+    _sigmoid,
+    fit_sigmoid_batch,
+    youden_threshold_batch,
+)
+
+CASH = 100_000.0
+DIRECTIONS = ["maximize", "minimize"]  # (return, max drawdown)
+
+
+def pareto_front(returns: np.ndarray, drawdowns: np.ndarray) -> np.ndarray:
+    """수익률 최대 / 낙폭 최소 기준 비지배 점의 위치 (수익률 내림차순, 같은 점은 하나만)."""
+    returns = np.asarray(returns, dtype=np.float64)
+    drawdowns = np.asarray(drawdowns, dtype=np.float64)
+    order = np.lexsort((drawdowns, -returns))
+    dd = drawdowns[order]
+    best = np.minimum.accumulate(dd)
+    keep = np.r_[True, dd[1:] < best[:-1]] if len(dd) else np.zeros(0, dtype=bool)
+    return order[keep]
+
+
+@dataclass
+class WeightSearchResult:
+    """평가한 후보별 결과. weights 는 (m, n_signals), 나머지는 (m,) 배열."""
+
+    names: List[str]
+    weights: np.ndarray
+    prob_threshold: np.ndarray  # 후보가 제시한 임계값
+    threshold: np.ndarray  # 실제 사용한 max(Youden, prob_threshold)
+    final_value: np.ndarray
+    max_drawdown: np.ndarray
+    n_trades: np.ndarray
+    n_patterns: int  # 실제로 시뮬레이션한 고유 시그널 패턴 수
+    cash: float = CASH
+
+    @property
+    def returns(self) -> np.ndarray:
+        return self.final_value / self.cash - 1.0
+
+    def pareto(self) -> np.ndarray:
+        return pareto_front(self.returns, self.max_drawdown)
+
+    def frame(self) -> pd.DataFrame:
+        df = pd.DataFrame(self.weights, columns=[f"w_{n.removeprefix('sig_')}" for n in self.names])
+        df["prob_threshold"] = self.prob_threshold
+        df["threshold"] = self.threshold
+        df["final_value"] = self.final_value
+        df["return"] = self.returns
+        df["max_drawdown"] = self.max_drawdown
+        df["n_trades"] = self.n_trades
+        return df
+
+    @classmethod
+    def concat(cls, parts: Sequence["WeightSearchResult"]) -> "WeightSearchResult":
+        return cls(
+            names=parts[0].names,
+            weights=np.concatenate([p.weights for p in parts]),
+            prob_threshold=np.concatenate([p.prob_threshold for p in parts]),
+            threshold=np.concatenate([p.threshold for p in parts]),
+            final_value=np.concatenate([p.final_value for p in parts]),
+            max_drawdown=np.concatenate([p.max_drawdown for p in parts]),
+            n_trades=np.concatenate([p.n_trades for p in parts]),
+            n_patterns=sum(p.n_patterns for p in parts),
+            cash=parts[0].cash,
+        )
+
+
+class WeightSearch:
+    """가중치와 무관한 입력을 한 번 준비해 두고 후보 (가중치, 임계값) 묶음을 평가.
+
+    Parameters
+    ----------
+    signals : ndarray
+        (n_bars, n_signals) sig_<iv> 행렬 (-1/0/+1).
+    labels : ndarray
+        (n_bars,) 캘리브레이션 라벨 (pipeline.backtest_pipeline.calibration_labels).
+    ohlc : ndarray
+        (n_bars, 4) 기준 interval open/high/low/close.
+    method : str
+        캘리브레이션 방식 (BacktestPipeline 의 ProbabilityCalibrator 와 같은 목적함수).
+    chunk : int
+        run_backtest_batch 한 번에 넣는 고유 시그널 패턴 수 (메모리 ~ 2 x chunk x n_bars 바이트).
+    """
+
+    def __init__(
+        self,
+        signals: np.ndarray,
+        labels: np.ndarray,
+        ohlc: np.ndarray,
+        names: Sequence[str] | None = None,
+        method: str = "logistic",
+        chunk: int = 128,
+        cash: float = CASH,
+        commission: float = 0.005,
+        leverage: float = 10.0,
+    ):
+        if method not in CALIBRATION_METHODS:
+            raise ValueError(f"Unknown calibration method: {method!r} (choose from {', '.join(CALIBRATION_METHODS)})")
+        signals = np.asarray(signals)
+        self.names = list(names) if names is not None else [f"sig_{j}" for j in range(signals.shape[1])]
+        self.codes, first = signal_levels(signals)
+        self.levels = signals[first].astype(np.float64)  # (n_levels, n_signals)
+        labels = np.asarray(labels)
+        self.counts = np.bincount(self.codes, minlength=len(first)).astype(np.float64)
+        self.positives = np.bincount(self.codes, weights=(labels > 0).astype(np.float64), minlength=len(first))
+        self.ohlc = np.ascontiguousarray(ohlc, dtype=np.float64)
+        self.method = method
+        self.chunk = chunk
+        self.cash = cash
+        self.commission = commission
+        self.leverage = leverage
+        params = dict(SignalTradeStrategy.params._getitems())
+        self.sl_pct = params["sl_pct"]
+        self.rr = params["rr"]
+
+    @classmethod
+    def from_context(cls, context: StudyDataContext, **kwargs) -> "WeightSearch":
+        """StudyDataContext 의 병합 프레임 (sig_<iv>, 기준 interval 가격) 으로 생성."""
+        df = context.load().frame
+        intervals = context.intervals
+        base_iv = min(intervals, key=MultiTFDataLoader._interval_minutes)
+        names = [f"sig_{iv}" for iv in intervals]
+        return cls(
+            np.column_stack([np.asarray(df[n]) for n in names]),
+            calibration_labels(df, intervals),
+            np.column_stack([np.asarray(df[f"{c}_{base_iv}"], dtype=np.float64) for c in ("open", "high", "low", "close")]),
+            names=names,
+            **kwargs,
+        )
+
+    def level_probabilities(self, weights: np.ndarray) -> np.ndarray:
+        """(m, n_signals) 가중치의 수준별 점수를 보정한 확률 (m, n_levels)."""
+        scores = np.atleast_2d(weights) @ self.levels.T
+        if self.method == "isotonic":
+            out = np.empty_like(scores)
+            for i, v in enumerate(scores):
+                cal = ProbabilityCalibrator("isotonic", verbose=False).fit_table(ScoreTable(v, self.counts, self.positives))
+                out[i] = cal.predict_proba(v)
+            return out
+        coef = fit_sigmoid_batch(scores, self.counts, self.positives, self.method)
+        return _sigmoid(coef[:, :1] * scores + coef[:, 1:])
+
+    def evaluate(self, weights: np.ndarray, prob_threshold: np.ndarray | float) -> WeightSearchResult:
+        """후보 m 개를 점수 → 캘리브레이션 → 임계값 → 백테스트까지 배치로 평가.
+
+        BacktestPipeline(engine="fast") 과 같은 규칙: 임계값은 max(Youden, prob_threshold),
+        prob >= 임계값이면 +1, prob <= 1 - 임계값이면 -1.
+        """
+        weights = np.atleast_2d(np.asarray(weights, dtype=np.float64))
+        m = weights.shape[0]
+        prob_threshold = np.broadcast_to(np.asarray(prob_threshold, dtype=np.float64), (m,))
+        probs = self.level_probabilities(weights)
+        threshold = np.maximum(youden_threshold_batch(probs, self.counts, self.positives), prob_threshold)
+        level_sig = np.zeros(probs.shape, dtype=np.int8)
+        level_sig[probs >= threshold[:, None]] = 1
+        level_sig[probs <= 1 - threshold[:, None]] = -1
+        # candidates with the same per-level signals run the same backtest
+        patterns, inverse = np.unique(level_sig, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        final = np.empty(len(patterns))
+        max_dd = np.empty(len(patterns))
+        n_trades = np.empty(len(patterns), dtype=np.int64)
+        for lo in range(0, len(patterns), self.chunk):
+            block = patterns[lo : lo + self.chunk]
+            # (n_bars, block) C-order; its transpose is what run_backtest_batch lays out internally
+            sig = block.T[self.codes].T
+            res = run_backtest_batch(
+                self.ohlc,
+                sig,
+                sl_pct=self.sl_pct,
+                rr=self.rr,
+                cash=self.cash,
+                commission=self.commission,
+                leverage=self.leverage,
+            )
+            final[lo : lo + len(block)] = res.final_value
+            max_dd[lo : lo + len(block)] = res.max_drawdown
+            n_trades[lo : lo + len(block)] = res.n_trades
+        return WeightSearchResult(
+            names=self.names,
+            weights=weights,
+            prob_threshold=np.array(prob_threshold),
+            threshold=threshold,
+            final_value=final[inverse],
+            max_drawdown=max_dd[inverse],
+            n_trades=n_trades[inverse],
+            n_patterns=len(patterns),
+            cash=self.cash,
+        )
+
+
+def optimize_weights(
+    study: optuna.Study,
+    search: WeightSearch,
+    trials: int,
+    batch_size: int = 256,
+) -> WeightSearchResult:
+    """ask/tell 로 batch_size 개 후보를 묶어 평가하고 (수익률, 최대 낙폭) 을 study 에 기록.
+
+    study 는 directions=DIRECTIONS 인 다목적 study. 파라미터 이름은 pipeline_optuna_runner 와 같은
+    w_<iv> / prob_threshold 이므로 결과를 BacktestPipeline 에 그대로 넘길 수 있다.
+    """
+    intervals = [n.removeprefix("sig_") for n in search.names]
+    parts = []
+    done = 0
+    while done < trials:
+        batch = [study.ask() for _ in range(min(batch_size, trials - done))]
+        suggested = [suggest_weights(t, intervals) for t in batch]
+        weights = np.array([[w[n] for n in search.names] for w, _ in suggested])
+        result = search.evaluate(weights, np.array([thr for _, thr in suggested]))
+        for t, ret, dd in zip(batch, result.returns, result.max_drawdown):
+            study.tell(t, [float(ret), float(dd)])
+        parts.append(result)
+        done += len(batch)
+    return WeightSearchResult.concat(parts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vectorized search over timeframe weights and probability threshold")
+    parser.add_argument("symbol")
+    parser.add_argument("--start", required=True)
+    parser.add_argument("--end", required=True)
+    parser.add_argument("--intervals", nargs="+", default=["5m", "15m", "1h"])
+    parser.add_argument("--trials", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=256, help="Candidates per ask/tell batch")
+    parser.add_argument("--calibration", choices=CALIBRATION_METHODS, default="logistic", help="Score -> probability model")
+    parser.add_argument("--storage")
+    parser.add_argument("--study")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument(
+        "--resample",
+        choices=RESAMPLE_MODES,
+        help="Download only the base interval and build higher timeframes locally",
+    )
+    parser.add_argument(
+        "--concurrent",
+        action="store_true",
+        help="Fetch kline pages concurrently (ConcurrentKlineFetcher) instead of sequential python-binance pages",
+    )
+    parser.add_argument("--out", help="Write the Pareto front to this CSV file")
+    args = parser.parse_args()
+
+    loader = MultiTFDataLoader(resample=args.resample, concurrent=args.concurrent)
+    context = StudyDataContext(args.symbol, args.intervals, args.start, args.end, loader=loader).load()
+    search = WeightSearch.from_context(context, method=args.calibration)
+    study = optuna.create_study(
+        directions=DIRECTIONS,
+        study_name=args.study,
+        storage=make_storage(args.storage),
+        load_if_exists=bool(args.storage),
+        sampler=optuna.samplers.NSGAIISampler(seed=args.seed),
+    )
+    result = optimize_weights(study, search, args.trials, args.batch_size)
+    front = result.frame().iloc[result.pareto()]
+    print(f"{len(result.final_value)} candidates, {result.n_patterns} distinct signal patterns simulated")
+    print(front.to_string(index=False))
+    if args.out:
+        front.to_csv(args.out, index=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,138 @@
 from __future__ import annotations
 
-from typing import List, Dict
+from typing import Callable, List, Dict, Sequence, Tuple, Union
 
 import pandas as pd
 import numpy as np
 
+from data.columnar import ColumnarFrame
 from data.multi_tf_loader import MultiTFDataLoader
-from signals.rsi_supertrend import generate_signals
+from signals.rsi_supertrend import signal_array
 from signals.aggregator import SignalAggregator
-from probability.calibrator import ProbabilityCalibrator
+from probability.calibrator import ProbabilityCalibrator, ScoreTable
+from backtest.costs import CostModel
 from backtest.engine import run_backtest
 from backtest.strategy import MultiIndicatorStrategy
 
 
+Frame = Union[pd.DataFrame, ColumnarFrame]
+
+
+def compute_interval_signals(df: Frame, intervals: List[str]) -> Frame:
+    """interval 별 RSI+Supertrend 시그널을 sig_<iv> int8 컬럼으로 추가 (가중치와 무관).
+
+    가격 컬럼을 배열로 바로 넘기므로 interval 별 중간 DataFrame 을 만들지 않는다.
+    """
+    for iv in intervals:
+        df[f"sig_{iv}"] = signal_array(
+            np.asarray(df[f"high_{iv}"]),
+            np.asarray(df[f"low_{iv}"]),
+            np.asarray(df[f"close_{iv}"]),
+        )
+    return df
+
+
+def calibration_labels(df: Frame, intervals: List[str]) -> np.ndarray:
+    """캘리브레이션 라벨: 기준(최단) interval 종가의 다음 봉 수익률이 양수면 1 (마지막 봉은 0)."""
+    base_iv = min(intervals, key=MultiTFDataLoader._interval_minutes)
+    close = np.asarray(df[f"close_{base_iv}"], dtype=np.float64)
+    future_ret = np.append(close[1:] / close[:-1] - 1, np.nan)  # 1 step ahead
+    return (future_ret > 0).astype(np.int8)
+
+
+def signal_levels(signals: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(n_rows, n_signals) -1/0/+1 시그널 행렬의 조합 코드 (행별 조합 번호, 조합별 첫 행 위치)."""
+    signals = np.asarray(signals)
+    code = np.zeros(len(signals), dtype=np.int64)
+    for j in range(signals.shape[1]):
+        # signals are -1 / 0 / +1: base-3 digits
+        code = code * 3 + (signals[:, j].astype(np.int64) + 1)
+    codes, uniques = pd.factorize(code, sort=False)
+    first = np.full(len(uniques), len(codes), dtype=np.int64)
+    np.minimum.at(first, codes, np.arange(len(codes)))
+    return codes, first
+
+
+class StudyDataContext:
+    """Optuna study 동안 고정된 (symbol, 기간, intervals) 데이터를 한 번만 준비.
+
+    Notes
+    -----
+    - 멀티 타임프레임 병합과 가중치 무관한 sig_<iv> 컬럼 계산을 study 당 1회 수행.
+    - trial 마다 BacktestPipeline(context=...) 로 넘기면 점수·캘리브레이션·백테스트만 실행.
+    - compact=True 면 병합 결과를 ColumnarFrame(price_dtype 가격, int8 시그널)으로 보관한다.
+    - score 는 sig_<iv> 조합(최대 3^len(intervals) 가지)만의 함수이므로 score_levels() 가
+      조합별 대표 행 / 봉 수 / 양성 라벨 수를 study 당 1회 집계해 두고, trial 의 캘리브레이션은
+      이 테이블(행 수와 무관한 크기)로 학습한다.
+    """
+
+    def __init__(
+        self,
+        symbol: str,
+        intervals: List[str],
+        start: str,
+        end: str,
+        loader: MultiTFDataLoader | None = None,
+        compact: bool = False,
+        price_dtype: np.dtype | type = np.float64,
+    ):
+        self.symbol = symbol
+        self.intervals = intervals
+        self.start = start
+        self.end = end
+        self.loader = loader
+        self.compact = compact
+        self.price_dtype = price_dtype
+        self._frame: Frame | None = None
+        self._levels: Tuple[np.ndarray, np.ndarray, np.ndarray] | None = None
+
+    @classmethod
+    def from_frame(
+        cls,
+        symbol: str,
+        intervals: List[str],
+        start: str,
+        end: str,
+        frame: Frame,
+    ) -> "StudyDataContext":
+        """이미 sig_<iv> 까지 준비된 프레임(예: 공유 메모리 뷰)으로 컨텍스트 생성."""
+        ctx = cls(symbol, intervals, start, end)
+        ctx._frame = frame
+        return ctx
+
+    def load(self) -> "StudyDataContext":
+        if self._frame is None:
+            loader = self.loader or MultiTFDataLoader()
+            df = loader.fetch_and_merge(self.symbol, self.intervals, self.start, self.end)
+            if self.compact:
+                df = ColumnarFrame.from_frame(df, dtype=self.price_dtype)
+            self._frame = compute_interval_signals(df, self.intervals)
+        return self
+
+    @property
+    def frame(self) -> Frame:
+        """sig_<iv> 가 포함된 병합 프레임의 얕은 복사본(trial 이 추가한 컬럼은 공유되지 않음)."""
+        self.load()
+        return self._frame.copy(deep=False)
+
+    def score_levels(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """sig_<iv> 조합별 (첫 행 위치, 봉 수, 양성 라벨 수). 가중치와 무관하므로 한 번만 계산.
+
+        score[first] 는 해당 조합의 모든 행과 같은 점수이므로 ScoreTable 의 값으로 바로 쓴다.
+        """
+        if self._levels is None:
+            df = self.load()._frame
+            signals = np.column_stack([np.asarray(df[f"sig_{iv}"]) for iv in self.intervals])
+            codes, first = signal_levels(signals)
+            y = calibration_labels(df, self.intervals)
+            self._levels = (
+                first,
+                np.bincount(codes, minlength=len(first)).astype(np.float64),
+                np.bincount(codes, weights=y, minlength=len(first)),
+            )
+        return self._levels
+
+
 class BacktestPipeline:
     def __init__(
         self,
@@ -22,53 +142,88 @@ class BacktestPipeline:
         end: str,
         aggregator_weights: Dict[str, float] | None = None,
         prob_threshold: float = 0.8,
+        context: StudyDataContext | None = None,
+        engine: str = "backtrader",
+        calibrator: ProbabilityCalibrator | None = None,
+        cost_model: CostModel | None = None,
+        loader: MultiTFDataLoader | None = None,
+        checkpoints: Sequence[int] | None = None,
+        on_checkpoint: Callable[[int, np.ndarray, np.ndarray], bool] | None = None,
     ):
         self.symbol = symbol
         self.intervals = intervals
         self.start = start
         self.end = end
-        self.loader = MultiTFDataLoader()
+        self.context = context
+        self.loader = context.loader if context is not None else loader or MultiTFDataLoader()
         self.weights = aggregator_weights or {f"sig_{iv}": 1 / len(intervals) for iv in intervals}
         self.aggregator = SignalAggregator(self.weights)
         self.prob_threshold = prob_threshold
-        self.calibrator = ProbabilityCalibrator()
+        # a calibrator shared across runs (warm_start=True) starts from the previous fit
+        self.calibrator = calibrator or ProbabilityCalibrator()
+        self.engine = engine
+        # funding / depth slippage (fast engine only)
+        self.cost_model = cost_model
+        # intermediate reports on base-interval bar positions (fast engine only, e.g. Optuna pruning)
+        self.checkpoints = checkpoints
+        self.on_checkpoint = on_checkpoint
 
-    def prepare_data(self) -> pd.DataFrame:
+    def prepare_data(self) -> Frame:
+        if self.context is not None:
+            return self.context.frame
         df = self.loader.fetch_and_merge(self.symbol, self.intervals, self.start, self.end)
         return df
 
-    def compute_signals(self, df: pd.DataFrame) -> pd.DataFrame:
-        sig_cols = {}
-        for iv in self.intervals:
-            ohlc = df[[f"open_{iv}", f"high_{iv}", f"low_{iv}", f"close_{iv}"]].copy()
-            ohlc.columns = ["open", "high", "low", "close"]
-            sig_df = generate_signals(ohlc)
-            df[f"sig_{iv}"] = sig_df["signal"].values
-            sig_cols[f"sig_{iv}"] = f"sig_{iv}"
+    def compute_signals(self, df: Frame) -> Frame:
+        if self.context is None:
+            df = compute_interval_signals(df, self.intervals)
         # total score
-        df["score"] = df.apply(lambda row: self.aggregator.score(row[sig_cols.values()].to_dict()), axis=1)
+        df["score"] = self.aggregator.score_frame(df)
         return df
 
-    def calibrate(self, df: pd.DataFrame):
+    def calibrate(self, df: Frame):
         # Define label: profit positive? For calibration we approximate using future return of close_ base interval
-        base_iv = min(self.intervals, key=self.loader._interval_minutes)
-        future_ret = df[f"close_{base_iv}"].pct_change().shift(-1)  # 1 step ahead
-        y = (future_ret > 0).astype(int).values
-        X = df["score"].values
-        mask = ~np.isnan(X) & ~np.isnan(y)
-        self.calibrator.fit(X[mask], y[mask])
-        thr = self.calibrator.threshold_by_youden(X[mask], y[mask])
+        X = np.asarray(df["score"], dtype=np.float64)
+        if self.context is not None:
+            # score depends only on the sig_<iv> combination: fit on the per-combination table
+            first, counts, positives = self.context.score_levels()
+            self.calibrator.fit_table(ScoreTable(X[first], counts, positives))
+        else:
+            y = calibration_labels(df, self.intervals)
+            mask = ~np.isnan(X)
+            self.calibrator.fit(X[mask], y[mask])
+        thr = self.calibrator.threshold_by_youden()  # computed by fit on the same data
         self.prob_threshold = max(thr, self.prob_threshold)
         print(f"Calibrated probability threshold: {self.prob_threshold:.3f}")
 
-    def run_backtest(self, df: pd.DataFrame):
+    def trade_signals(self, df: Frame) -> np.ndarray:
         # Convert score -> probability -> trade_signal
-        prob = self.calibrator.predict_proba(df["score"].values)
-        df["trade_signal"] = 0
-        df.loc[prob >= self.prob_threshold, "trade_signal"] = 1
-        df.loc[prob <= 1 - self.prob_threshold, "trade_signal"] = -1
+        prob = self.calibrator.predict_proba(np.asarray(df["score"], dtype=np.float64))
+        trade_signal = np.zeros(len(prob), dtype=np.int8)
+        trade_signal[prob >= self.prob_threshold] = 1
+        trade_signal[prob <= 1 - self.prob_threshold] = -1
+        return trade_signal
+
+    def run_backtest(self, df: Frame):
+        df["trade_signal"] = self.trade_signals(df)
+
+        from backtest.signal_strategy import SignalTradeStrategy
+
+        base_iv = min(self.intervals, key=MultiTFDataLoader._interval_minutes)
+        if isinstance(df, ColumnarFrame):
+            # zero-copy views for the fast engine; backtrader needs a real DataFrame
+            feed = df.feed(base_iv, signal="trade_signal")
+            if self.engine != "fast":
+                feed = feed.to_frame()
+            return run_backtest(
+                feed,
+                SignalTradeStrategy,
+                engine=self.engine,
+                costs=self._costs(feed.index),
+                checkpoints=self.checkpoints,
+                on_checkpoint=self.on_checkpoint,
+            )
 
-        base_iv = min(self.intervals, key=self.loader._interval_minutes)
         feed_df = df[[
             f"open_{base_iv}",
             f"high_{base_iv}",
@@ -79,14 +234,25 @@ class BacktestPipeline:
         ]].copy()
         feed_df.columns = ["open", "high", "low", "close", "volume", "signal"]
 
-        from backtest.signal_strategy import SignalTradeStrategy
+        result = run_backtest(
+            feed_df,
+            SignalTradeStrategy,
+            engine=self.engine,
+            costs=self._costs(feed_df.index),
+            checkpoints=self.checkpoints,
+            on_checkpoint=self.on_checkpoint,
+        )
+        return result
 
-        cerebro = run_backtest(feed_df, SignalTradeStrategy)
-        return cerebro
+    def _costs(self, index: pd.DatetimeIndex):
+        if self.cost_model is None:
+            return None
+        return self.cost_model.arrays([self.symbol], index)
 
     def execute(self):
+        """engine="backtrader" 이면 Cerebro, "fast" 면 FastBacktestResult 반환."""
         df = self.prepare_data()
         df = self.compute_signals(df)
         self.calibrate(df)
-        cerebro = self.run_backtest(df)
-        return cerebro 
\ No newline at end of file
+        result = self.run_backtest(df)
+        return result 
\ No newline at end of file
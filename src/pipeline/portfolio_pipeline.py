@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from backtest.costs import CostModel
+from backtest.portfolio import PortfolioData, PortfolioResult, run_portfolio_backtest
+from backtest.signal_strategy import SignalTradeStrategy
+from data.concurrent_fetch import ConcurrentKlineFetcher
+from data.cost_store import CostStore
+from data.multi_tf_loader import RESAMPLE_MODES, MultiTFDataLoader
+from optimize.parallel import SharedFrame, SharedFrameHandle
+from pipeline.backtest_pipeline import BacktestPipeline, StudyDataContext, compute_interval_signals
+from probability.calibrator import CALIBRATION_METHODS, ProbabilityCalibrator
+
+
+def symbol_trade_signals(
+    frame: pd.DataFrame,
+    symbol: str,
+    intervals: List[str],
+    start: str,
+    end: str,
+    weights: Dict[str, float] | None = None,
+    prob_threshold: float = 0.8,
+    calibration: str = "logistic",
+) -> np.ndarray:
+    """심볼 하나의 병합 프레임에서 BacktestPipeline 과 같은 규칙으로 진입 시그널(+1/-1/0) 계산.
+
+    sig_<iv> → 점수 → 심볼별 캘리브레이션(조합 테이블) → max(Youden, prob_threshold) 임계값.
+    """
+    context = StudyDataContext.from_frame(symbol, intervals, start, end, compute_interval_signals(frame, intervals))
+    pipe = BacktestPipeline(
+        symbol,
+        intervals,
+        start,
+        end,
+        aggregator_weights=weights,
+        prob_threshold=prob_threshold,
+        context=context,
+        calibrator=ProbabilityCalibrator(calibration, verbose=False),
+    )
+    df = pipe.compute_signals(pipe.prepare_data())
+    pipe.calibrate(df)
+    return pipe.trade_signals(df)
+
+
+def _signal_worker(handle: SharedFrameHandle, symbol: str, *args) -> np.ndarray:
+    df, shm = SharedFrame.attach(handle)
+    try:
+        return symbol_trade_signals(df, symbol, *args)
+    finally:
+        del df
+        shm.close()
+
+
+class PortfolioPipeline:
+    """심볼 유니버스 전체를 하나의 현금/증거금 원장으로 백테스트.
+
+    Notes
+    -----
+    - 심볼별 멀티 타임프레임 병합 → 심볼별 시그널(n_workers 프로세스 병렬) →
+      기준 interval 타임스탬프 합집합 그리드 정렬 → run_portfolio_backtest.
+    - 시그널 워커에는 심볼 프레임을 공유 메모리(SharedFrame)로 넘기고 int8 시그널만 돌려받는다.
+    - 진입 한 건에 쓰는 현금 비율은 percents (기본 100 / 심볼 수), SL/RR 은 SignalTradeStrategy 기본값.
+    - cost_model 이 있으면 정렬된 그리드에 펀딩/depth 슬리피지 배열을 한 번 만들어 엔진에 넘긴다.
+    - execute() 결과의 timings 에 단계별 소요 시간(초)을 담는다.
+    """
+
+    def __init__(
+        self,
+        symbols: List[str],
+        intervals: List[str],
+        start: str,
+        end: str,
+        aggregator_weights: Dict[str, float] | None = None,
+        prob_threshold: float = 0.8,
+        loader: MultiTFDataLoader | None = None,
+        n_workers: int = 1,
+        calibration: str = "logistic",
+        cash: float = 100_000.0,
+        percents: float | None = None,
+        cost_model: CostModel | None = None,
+    ):
+        self.symbols = list(symbols)
+        self.intervals = intervals
+        self.start = start
+        self.end = end
+        self.weights = aggregator_weights
+        self.prob_threshold = prob_threshold
+        self.loader = loader or MultiTFDataLoader()
+        self.n_workers = n_workers
+        self.calibration = calibration
+        self.cash = cash
+        self.percents = percents
+        self.cost_model = cost_model
+
+    @property
+    def base_interval(self) -> str:
+        return min(self.intervals, key=MultiTFDataLoader._interval_minutes)
+
+    def prepare_data(self) -> Dict[str, pd.DataFrame]:
+        return self.loader.fetch_and_merge_many(self.symbols, self.intervals, self.start, self.end)
+
+    def compute_signals(self, frames: Dict[str, pd.DataFrame]) -> Dict[str, np.ndarray]:
+        """심볼별 진입 시그널 (각 심볼 프레임 인덱스 기준)."""
+        args = (self.intervals, self.start, self.end, self.weights, self.prob_threshold, self.calibration)
+        if self.n_workers <= 1 or len(frames) <= 1:
+            return {sym: symbol_trade_signals(df, sym, *args) for sym, df in frames.items()}
+        shared = {sym: SharedFrame(df) for sym, df in frames.items()}
+        try:
+            # spawn: the parent may already run numba's (fork-unsafe) threading layer
+            ctx = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=min(self.n_workers, len(frames)), mp_context=ctx) as pool:
+                futures = {sym: pool.submit(_signal_worker, s.handle, sym, *args) for sym, s in shared.items()}
+                return {sym: f.result() for sym, f in futures.items()}
+        finally:
+            for s in shared.values():
+                s.close()
+
+    def run_backtest(self, frames: Dict[str, pd.DataFrame], signals: Dict[str, np.ndarray]) -> PortfolioResult:
+        data = PortfolioData.align(frames, suffix=f"_{self.base_interval}")
+        sig = data.align_signals(signals, {sym: df.index for sym, df in frames.items()})
+        params = dict(SignalTradeStrategy.params._getitems())
+        costs = self.cost_model.arrays(data.symbols, data.index) if self.cost_model is not None else None
+        return run_portfolio_backtest(
+            data,
+            sig,
+            cash=self.cash,
+            sl_pct=params["sl_pct"],
+            rr=params["rr"],
+            percents=self.percents,
+            costs=costs,
+        )
+
+    def execute(self) -> PortfolioResult:
+        t0 = time.perf_counter()
+        frames = self.prepare_data()
+        t1 = time.perf_counter()
+        signals = self.compute_signals(frames)
+        t2 = time.perf_counter()
+        result = self.run_backtest(frames, signals)
+        t3 = time.perf_counter()
+        result.timings = {"load": t1 - t0, "signals": t2 - t1, "backtest": t3 - t2, "total": t3 - t0}
+        return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-symbol portfolio backtest")
+    parser.add_argument("symbols", nargs="*", help="Symbols (default: --top N by 24h quote volume)")
+    parser.add_argument("--top", type=int, default=50, help="Universe size when no symbols are given")
+    parser.add_argument("--start", required=True)
+    parser.add_argument("--end", required=True)
+    parser.add_argument("--intervals", nargs="+", default=["5m", "15m", "1h"])
+    parser.add_argument("--prob-threshold", type=float, default=0.8)
+    parser.add_argument("--calibration", choices=CALIBRATION_METHODS, default="logistic", help="Score -> probability model")
+    parser.add_argument("--n-workers", type=int, default=1, help="Processes computing per-symbol signals")
+    parser.add_argument(
+        "--resample",
+        choices=RESAMPLE_MODES,
+        help="Download only the base interval and build higher timeframes locally",
+    )
+    parser.add_argument(
+        "--concurrent",
+        action="store_true",
+        help="Fetch kline pages concurrently (ConcurrentKlineFetcher) instead of sequential python-binance pages",
+    )
+    parser.add_argument("--cost-store", help="CostStore root: charge funding and depth slippage")
+    args = parser.parse_args()
+
+    symbols = [s.upper() for s in args.symbols]
+    if not symbols:
+        with ConcurrentKlineFetcher() as fetcher:
+            symbols = fetcher.top_symbols(args.top)
+    pipe = PortfolioPipeline(
+        symbols,
+        args.intervals,
+        args.start,
+        args.end,
+        prob_threshold=args.prob_threshold,
+        loader=MultiTFDataLoader(resample=args.resample, concurrent=args.concurrent),
+        n_workers=args.n_workers,
+        calibration=args.calibration,
+        cost_model=CostModel(CostStore(args.cost_store)) if args.cost_store else None,
+    )
+    result = pipe.execute()
+    print(f"Final Portfolio Value: {result.final_value:.2f} ({len(result.trades)} trades)")
+    if args.cost_store:
+        print(f"Funding: {result.funding.sum():.2f}  Slippage: {result.slippage.sum():.2f}")
+    print("Timings:", {k: round(v, 3) for k, v in result.timings.items()})
+    print(result.symbol_pnl().sort_values().to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+from __future__ import annotations
+
+import argparse
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from data.kline_dataset import KlineDataset
+from data.multi_tf_loader import MultiTFDataLoader
+from probability.calibrator import ProbabilityCalibrator
+from signals.aggregator import SignalAggregator
+from signals.streaming import SignalEngine
+
+STAGES = ("indicators", "aggregate", "calibrate")
+ALIGNMENTS = ("native", "pipeline")
+
+
+class LatencyHistogram:
+    """ns 단위 지연 시간 기록. 고정 크기 로그 버킷(2배 구간을 SUB 개로 나눔)과 누적 count/sum/min/max.
+
+    샘플을 보관하지 않으므로 메모리는 이벤트 수와 무관하다. 백분위는 버킷 상한(최대 1/SUB 오차)을
+    [min, max] 로 자른 근사값이고 mean / min / max 는 정확하다.
+    """
+
+    SUB = 8  # buckets per power of two
+    _SHIFT = 3  # log2(SUB)
+
+    def __init__(self):
+        self.counts: List[int] = [0] * (64 * self.SUB)
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    def record(self, ns: int) -> None:
+        if ns < self.SUB:
+            k = max(ns, 0)
+        else:
+            e = ns.bit_length() - 1
+            k = (e << self._SHIFT) + ((ns >> (e - self._SHIFT)) & (self.SUB - 1))
+        self.counts[k] += 1
+        if not self.count or ns < self.min:
+            self.min = ns
+        if ns > self.max:
+            self.max = ns
+        self.count += 1
+        self.total += ns
+
+    def _upper(self, k: int) -> int:
+        # largest ns that lands in bucket k
+        if k < self.SUB:
+            return k
+        e, m = divmod(k, self.SUB)
+        return ((self.SUB + m + 1) << (e - self._SHIFT)) - 1
+
+    def percentile(self, q: float) -> float:
+        """q (0~100) 백분위 근사 (ns)."""
+        if not self.count:
+            return float("nan")
+        rank = max(1, int(np.ceil(q / 100 * self.count)))
+        seen = 0
+        for k, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return float(min(max(self._upper(k), self.min), self.max))
+        return float(self.max)
+
+    def buckets(self) -> Dict[str, int]:
+        """2배 구간별 {"<2048ns": count, ...} (빈 버킷 제외)."""
+        out: Dict[str, int] = {}
+        for e in range(64):
+            n = sum(self.counts[e * self.SUB : (e + 1) * self.SUB])
+            if n:
+                out[f"<{self._upper((e + 1) * self.SUB - 1) + 1}ns"] = n
+        return out
+
+    def summary(self) -> Dict[str, float]:
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean_us": self.total / self.count / 1e3,
+            "p50_us": self.percentile(50) / 1e3,
+            "p90_us": self.percentile(90) / 1e3,
+            "p99_us": self.percentile(99) / 1e3,
+            "max_us": self.max / 1e3,
+        }
+
+
+@dataclass
+class ReplayReport:
+    """재생 결과. rows 는 기준(최단) interval 봉마다 하나씩 기록된 sig_* / score / prob
+    (ReplayHarness.run(record=True) 일 때만, 아니면 비어 있다).
+
+    alignment 는 상위 interval 지표를 어떤 캔들 위에서 계산했는지 (ReplayHarness 참고).
+    """
+
+    n_events: int
+    elapsed: float
+    latencies: Dict[str, LatencyHistogram]
+    rows: Dict[str, List[tuple]] = field(default_factory=dict)
+    columns: List[str] = field(default_factory=list)
+    alignment: str = "native"
+
+    @property
+    def events_per_sec(self) -> float:
+        return self.n_events / self.elapsed if self.elapsed > 0 else float("inf")
+
+    def frame(self, symbol: str) -> pd.DataFrame:
+        """symbol 의 기준 interval 출력 (open_time 인덱스)."""
+        df = pd.DataFrame(self.rows.get(symbol, []), columns=["open_time", *self.columns])
+        df["open_time"] = pd.to_datetime(df["open_time"], unit="ms", utc=True)
+        return df.set_index("open_time")
+
+    def summary(self) -> Dict[str, object]:
+        return {
+            "alignment": self.alignment,
+            "events": self.n_events,
+            "elapsed_sec": self.elapsed,
+            "events_per_sec": self.events_per_sec,
+            "latency": {name: h.summary() for name, h in self.latencies.items()},
+        }
+
+
+class ReplayHarness:
+    """저장된 캔들을 라이브와 같은 스트리밍 경로(SignalEngine)로 재생.
+
+    Notes
+    -----
+    - 모든 (symbol, interval) 캔들을 마감 시각(open_time + interval) 순서로 병합한 하나의 이벤트 스트림.
+      같은 시각에 마감되는 봉은 긴 interval 부터 처리해 기준 봉이 막 마감된 상위 봉을 보도록 한다
+      (MultiTFDataLoader resample="closed" 정렬과 동일).
+    - 단계별(지표 갱신 / 가중합 / 확률) 지연을 LatencyHistogram 으로 기록.
+    - speed=None 이면 최대 속도, speed=k 면 실제 시간의 k 배속으로 이벤트 간격을 맞춘다.
+    - alignment 는 상위 interval 지표의 입력:
+      "native" (기본, 라이브와 같음): 상위 봉이 마감될 때마다 그 봉으로 한 번 갱신.
+      "pipeline": 배치 파이프라인(MultiTFDataLoader resample="closed" + compute_interval_signals)과
+      같게, 기준 봉마다 그 시점까지 마감된 최신 상위 봉(첫 마감 전은 nan)을 반복해 넣는다.
+      배치 sig_<상위 iv> 는 ffill 된 기준 길이 시리즈 위의 RSI/ATR 이므로 "native" 와 값이 다르다.
+    """
+
+    def __init__(
+        self,
+        dataset: KlineDataset,
+        intervals: Sequence[str],
+        aggregator: SignalAggregator | None = None,
+        calibrator: ProbabilityCalibrator | None = None,
+        alignment: str = "native",
+        **signal_params,
+    ):
+        if alignment not in ALIGNMENTS:
+            raise ValueError(f"alignment must be one of {ALIGNMENTS}, got {alignment!r}")
+        self.alignment = alignment
+        self.dataset = dataset
+        self.intervals = sorted(intervals, key=MultiTFDataLoader._interval_minutes)
+        self.base_iv = self.intervals[0]
+        self.engine = SignalEngine(self.intervals, aggregator, calibrator, **signal_params)
+
+    def events(self, symbols: Sequence[str], start_ts: int | None = None, end_ts: int | None = None):
+        """병합된 이벤트 배열 (close_ms, symbol_idx, interval_idx, open_ms, high, low, close)."""
+        parts = []
+        for si, sym in enumerate(symbols):
+            for ii, iv in enumerate(self.intervals):
+                a = self.dataset.arrays(sym, iv, start_ts, end_ts, columns=("high", "low", "close"))
+                n = len(a["open_time"])
+                step = MultiTFDataLoader._interval_minutes(iv) * 60_000
+                parts.append(
+                    (
+                        a["open_time"] + step,
+                        np.full(n, si),
+                        np.full(n, ii),
+                        a["open_time"],
+                        a["high"],
+                        a["low"],
+                        a["close"],
+                    )
+                )
+        if not parts or not sum(len(p[0]) for p in parts):
+            return tuple(np.empty(0, dtype=dt) for dt in (np.int64,) * 4 + (np.float64,) * 3)
+        close_ms, sym_idx, iv_idx, open_ms, high, low, close = (np.concatenate(col) for col in zip(*parts))
+        # close time ascending, longer interval first on ties, then symbol order
+        order = np.lexsort((sym_idx, -iv_idx, close_ms))
+        return (
+            close_ms[order],
+            sym_idx[order],
+            iv_idx[order],
+            open_ms[order],
+            high[order],
+            low[order],
+            close[order],
+        )
+
+    def run(
+        self,
+        symbols: Sequence[str],
+        start_ts: int | None = None,
+        end_ts: int | None = None,
+        speed: float | None = None,
+        record: bool = False,
+        on_row: Callable[[str, tuple], None] | None = None,
+    ) -> ReplayReport:
+        """모든 이벤트를 SignalEngine 으로 재생하고 단계별 지연을 잰다.
+
+        기준 interval 봉마다의 출력 (open_time, sig_*, score, prob) 은 기본으로 버린다 (메모리가 이벤트
+        수에 비례하지 않도록). record=True 면 report.rows 에 모으고, on_row(symbol, row) 를 주면
+        봉마다 호출한다.
+        """
+        close_ms, sym_idx, iv_idx, open_ms, high, low, close = self.events(symbols, start_ts, end_ts)
+        hist = {name: LatencyHistogram() for name in STAGES}
+        engine = self.engine
+        columns = [f"sig_{iv}" for iv in self.intervals] + ["score", "prob"]
+        rows: Dict[str, List[tuple]] = {sym: [] for sym in symbols} if record else {}
+        emit = record or on_row is not None
+        clock = time.perf_counter_ns
+        n = len(close_ms)
+        pipeline = self.alignment == "pipeline"
+        nan = float("nan")
+        # pipeline alignment: latest closed candle per (symbol, higher interval)
+        latest = [[(nan, nan, nan)] * len(self.intervals) for _ in symbols]
+
+        t_start = time.perf_counter()
+        for k, (cms, si, ii, oms, h, lo, c) in enumerate(
+            zip(
+                close_ms.tolist(),
+                sym_idx.tolist(),
+                iv_idx.tolist(),
+                open_ms.tolist(),
+                high.tolist(),
+                low.tolist(),
+                close.tolist(),
+            )
+        ):
+            if speed is not None and k:
+                target = (cms - int(close_ms[0])) / 1000 / speed
+                lag = target - (time.perf_counter() - t_start)
+                if lag > 0:
+                    time.sleep(lag)
+            sym, iv = symbols[si], self.intervals[ii]
+            if pipeline and ii:
+                latest[si][ii] = (h, lo, c)  # seen by the batch path only on base rows
+                continue
+            t0 = clock()
+            if pipeline:
+                for jj in range(1, len(self.intervals)):
+                    engine.update_indicators(sym, self.intervals[jj], *latest[si][jj])
+            signals = engine.update_indicators(sym, iv, h, lo, c)
+            t1 = clock()
+            score = engine.aggregator.score(signals)
+            t2 = clock()
+            prob = engine.probability(score)
+            t3 = clock()
+            hist["indicators"].record(t1 - t0)
+            hist["aggregate"].record(t2 - t1)
+            hist["calibrate"].record(t3 - t2)
+            if emit and ii == 0:
+                row = (oms, *(signals[col] for col in columns[:-2]), score, prob)
+                if record:
+                    rows[sym].append(row)
+                if on_row is not None:
+                    on_row(sym, row)
+        elapsed = time.perf_counter() - t_start
+        return ReplayReport(
+            n_events=n,
+            elapsed=elapsed,
+            latencies=hist,
+            rows=rows,
+            columns=columns,
+            alignment=self.alignment,
+        )
+
+
+def _to_ms(ts: str | None) -> int | None:
+    return int(pd.Timestamp(ts, tz="UTC").timestamp() * 1000) if ts else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay stored klines through the streaming signal path")
+    parser.add_argument("root", help="KlineStore root directory")
+    parser.add_argument("--symbols", nargs="+", required=True)
+    parser.add_argument("--intervals", nargs="+", default=["5m", "15m", "1h"])
+    parser.add_argument("--start")
+    parser.add_argument("--end")
+    parser.add_argument("--speed", type=float, help="Replay speed multiple of real time (default: as fast as possible)")
+    parser.add_argument(
+        "--alignment",
+        choices=ALIGNMENTS,
+        default="native",
+        help="Higher-interval indicator input: native closed candles (live) or the batch pipeline's ffilled series",
+    )
+    args = parser.parse_args()
+
+    harness = ReplayHarness(KlineDataset(args.root), args.intervals, alignment=args.alignment)
+    report = harness.run(args.symbols, _to_ms(args.start), _to_ms(args.end), args.speed)
+    print(
+        f"{report.n_events} events in {report.elapsed:.2f}s ({report.events_per_sec:,.0f} events/sec), "
+        f"higher intervals: {report.alignment}"
+    )
+    for name, h in report.latencies.items():
+        print(name, h.summary())
+        print("  ", h.buckets())
+
+
+if __name__ == "__main__":
+    main()
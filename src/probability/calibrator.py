@@ -1,32 +1,386 @@
 from __future__ import annotations
 
+from typing import NamedTuple
+
 import numpy as np
-from sklearn.linear_model import LogisticRegression
-from sklearn.metrics import roc_auc_score
-from sklearn.model_selection import train_test_split
+import pandas as pd
+from sklearn.isotonic import IsotonicRegression
+
+CALIBRATION_METHODS = ("logistic", "platt", "isotonic")
+MAX_TABLE_LEVELS = 4096  # fit 이 (값, 개수, 양성 수) 테이블로 압축하는 고유 점수 개수 상한
+
+
+class ScoreTable(NamedTuple):
+    """점수의 충분통계: 고유 값별 표본 수와 양성(y>0) 수."""
+
+    values: np.ndarray
+    counts: np.ndarray
+    positives: np.ndarray
+
+    @classmethod
+    def from_samples(cls, x: np.ndarray, y: np.ndarray, max_levels: int | None = MAX_TABLE_LEVELS):
+        """고유 값이 max_levels 이하이면 테이블, 아니면 None (해시 한 번, 정렬 없음).
+
+        max_levels=None 이면 압축하지 않고 행마다 개수 1 인 테이블을 만든다.
+        """
+        x = np.asarray(x, dtype=np.float64).reshape(-1)
+        pos = (np.asarray(y).reshape(-1) > 0).astype(np.float64)
+        if max_levels is None:
+            return cls(x, np.ones(len(x)), pos)
+        codes, uniques = pd.factorize(x, sort=False)
+        if len(uniques) > max_levels:
+            return None
+        k = len(uniques)
+        return cls(
+            np.asarray(uniques, dtype=np.float64),
+            np.bincount(codes, minlength=k).astype(np.float64),
+            np.bincount(codes, weights=pos, minlength=k),
+        )
+
+    @property
+    def n(self) -> float:
+        return float(self.counts.sum())
+
+    @property
+    def n_pos(self) -> float:
+        return float(self.positives.sum())
+
+
+class RocSummary(NamedTuple):
+    auc: float
+    threshold: float  # Youden J 최대 지점 (roc_curve 와 같이 첫 점은 +inf)
+    youden_j: float
+
+
+def roc_summary(
+    scores: np.ndarray,
+    y: np.ndarray | None = None,
+    counts: np.ndarray | None = None,
+    positives: np.ndarray | None = None,
+) -> RocSummary:
+    """정렬 한 번으로 AUC 와 Youden 임계값 계산.
+
+    행 단위(scores, y) 또는 테이블(scores=값, counts, positives) 입력.
+    sklearn roc_curve / roc_auc_score 와 같은 값: 동점 점수는 한 점으로 묶고,
+    J 가 같으면 더 높은 임계값(먼저 나오는 점)을 고른다. 한 클래스만 있으면 auc=nan.
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    if counts is None:
+        positives = (np.asarray(y) > 0).astype(np.float64)
+        counts = np.ones(len(scores))
+    order = np.argsort(scores, kind="mergesort")[::-1]
+    s = scores[order]
+    tps = np.cumsum(positives[order])
+    fps = np.cumsum(counts[order] - positives[order])
+    last = np.r_[np.flatnonzero(np.diff(s)), len(s) - 1] if len(s) else np.empty(0, dtype=np.int64)
+    tps, fps = tps[last], fps[last]
+    pos = tps[-1] if len(tps) else 0.0
+    neg = fps[-1] if len(fps) else 0.0
+    if pos == 0 or neg == 0:
+        return RocSummary(np.nan, np.inf, 0.0)
+    tpr = np.r_[0.0, tps / pos]
+    fpr = np.r_[0.0, fps / neg]
+    j = tpr - fpr
+    idx = int(np.argmax(j))
+    threshold = np.inf if idx == 0 else float(s[last[idx - 1]])
+    auc = float(np.sum(np.diff(fpr) * (tpr[1:] + tpr[:-1])) / 2.0)
+    return RocSummary(auc, threshold, float(j[idx]))
+
+
+def _sigmoid(z: np.ndarray) -> np.ndarray:
+    return 0.5 * (1.0 + np.tanh(0.5 * z))
+
+
+def _newton_logistic(x, c, t, theta, prior_mean, prior_prec, max_iter=100, tol=1e-8):
+    """1-D 로지스틱 p = sigmoid(a*x + b) 의 가중 음의 로그우도 + 0.5 (θ-μ)ᵀ P (θ-μ) 최소화.
+
+    x 값마다 표본 수 c 와 목표 합 t (양성 수, 또는 Platt 평활 목표의 합) 를 받는다.
+    행 단위 입력은 c=1, t=0~1 목표. 반환: (θ, 최적점 Hessian).
+    """
+    cx = c * x
+    cx2 = cx * x
+
+    def loss(th):
+        z = th[0] * x + th[1]
+        # c log(1 + e^z) - t z, numerically stable (np.logaddexp is ~3x slower)
+        d = th - prior_mean
+        softplus = np.maximum(z, 0.0) + np.log1p(np.exp(-np.abs(z)))
+        return float(c @ softplus - t @ z + 0.5 * d @ prior_prec @ d)
+
+    def hessian(p):
+        w = p * (1.0 - p)
+        sw, swx = w @ c, w @ cx
+        return np.array([[w @ cx2, swx], [swx, sw]]) + prior_prec
+
+    f = loss(theta)
+    for _ in range(max_iter):
+        p = _sigmoid(theta[0] * x + theta[1])
+        r = c * p - t
+        grad = np.array([r @ x, r.sum()]) + prior_prec @ (theta - prior_mean)
+        hess = hessian(p)
+        try:
+            step = np.linalg.solve(hess, grad)
+        except np.linalg.LinAlgError:
+            step = np.linalg.lstsq(hess, grad, rcond=None)[0]
+        if np.max(np.abs(step)) < tol:
+            theta = theta - step
+            break
+        # step halving keeps the loss monotone on (near) separable data
+        k = 1.0
+        while k > 1e-8:
+            new = theta - k * step
+            f_new = loss(new)
+            if f_new <= f + 1e-12 * max(1.0, abs(f)):
+                break
+            k *= 0.5
+        theta, f = new, f_new
+    return theta, hessian(_sigmoid(theta[0] * x + theta[1]))
+
+
+def fit_sigmoid_batch(
+    values: np.ndarray,
+    counts: np.ndarray,
+    positives: np.ndarray,
+    method: str = "logistic",
+    C: float = 1.0,
+    max_iter: int = 100,
+    tol: float = 1e-8,
+) -> np.ndarray:
+    """같은 (개수, 양성 수) 테이블 위의 m 개 점수 벡터를 한 번에 보정. 반환: (m, 2) 계수 (a, b).
+
+    values 는 (m, k): 후보마다 k 개 수준의 점수. ProbabilityCalibrator(method).fit_table 과
+    같은 목적함수를 후보 축으로 벡터화한 Newton 법 (2x2 Hessian 은 닫힌 형태로 푼다).
+    """
+    if method not in ("logistic", "platt"):
+        raise ValueError(f"batch calibration supports logistic / platt, got {method!r}")
+    x = np.atleast_2d(np.asarray(values, dtype=np.float64))
+    c = np.asarray(counts, dtype=np.float64)
+    t = np.asarray(positives, dtype=np.float64)
+    if method == "platt":
+        n_pos = t.sum()
+        n_neg = c.sum() - n_pos
+        t = t * (n_pos + 1.0) / (n_pos + 2.0) + (c - t) / (n_neg + 2.0)
+    lam = 1.0 / C if method == "logistic" and C > 0 else 0.0
+    m = x.shape[0]
+    theta = np.zeros((m, 2))
+
+    def loss(th, rows):
+        z = th[:, :1] * x[rows] + th[:, 1:]
+        softplus = np.maximum(z, 0.0) + np.log1p(np.exp(-np.abs(z)))
+        return softplus @ c - z @ t + 0.5 * lam * th[:, 0] ** 2
+
+    f = loss(theta, slice(None))
+    active = np.ones(m, dtype=bool)
+    for _ in range(max_iter):
+        th, xa = theta[active], x[active]
+        p = _sigmoid(th[:, :1] * xa + th[:, 1:])
+        r = p * c - t
+        w = p * (1.0 - p) * c
+        g0 = (r * xa).sum(axis=1) + lam * th[:, 0]
+        g1 = r.sum(axis=1)
+        h00 = (w * xa * xa).sum(axis=1) + lam
+        h01 = (w * xa).sum(axis=1)
+        h11 = w.sum(axis=1)
+        det = h00 * h11 - h01 * h01
+        ok = det > 1e-300
+        safe = np.where(ok, det, 1.0)
+        step = np.column_stack(
+            [
+                np.where(ok, (h11 * g0 - h01 * g1) / safe, 0.0),
+                np.where(ok, (h00 * g1 - h01 * g0) / safe, _safe_div(g1, h11)),
+            ]
+        )
+        done = np.max(np.abs(step), axis=1) < tol
+        idx = np.flatnonzero(active)
+        theta[idx[done]] -= step[done]
+        idx, th, step, f_old = idx[~done], th[~done], step[~done], f[idx[~done]]
+        # per-candidate step halving (same acceptance rule as _newton_logistic)
+        k = np.ones(len(idx))
+        new = th - step
+        f_new = loss(new, idx)
+        bad = f_new > f_old + 1e-12 * np.maximum(1.0, np.abs(f_old))
+        while bad.any() and k.max() > 1e-8:
+            k[bad] *= 0.5
+            new[bad] = th[bad] - k[bad, None] * step[bad]
+            f_new[bad] = loss(new[bad], idx[bad])
+            bad &= f_new > f_old + 1e-12 * np.maximum(1.0, np.abs(f_old))
+            bad &= k > 1e-8
+        theta[idx] = new
+        f[idx] = f_new
+        active[:] = False
+        active[idx] = True
+        if not active.any():
+            break
+    return theta
+
+
+def _merge_tables(*tables: ScoreTable) -> ScoreTable:
+    """테이블들을 고유 값 기준으로 합친다 (정렬된 값)."""
+    ux, inv = np.unique(np.concatenate([t.values for t in tables]), return_inverse=True)
+    counts = np.concatenate([t.counts for t in tables])
+    positives = np.concatenate([t.positives for t in tables])
+    return ScoreTable(
+        ux,
+        np.bincount(inv, weights=counts, minlength=len(ux)),
+        np.bincount(inv, weights=positives, minlength=len(ux)),
+    )
+
+
+def _safe_div(num: np.ndarray, den: np.ndarray) -> np.ndarray:
+    out = np.zeros_like(num)
+    np.divide(num, den, out=out, where=den > 0)
+    return out
+
+
+def youden_threshold_batch(probs: np.ndarray, counts: np.ndarray, positives: np.ndarray) -> np.ndarray:
+    """(m, k) 후보별 수준 확률과 공통 (개수, 양성 수) 테이블의 Youden 임계값 (m,).
+
+    roc_summary(probs[i], counts=counts, positives=positives).threshold 와 같은 값.
+    """
+    probs = np.atleast_2d(np.asarray(probs, dtype=np.float64))
+    m, k = probs.shape
+    c = np.asarray(counts, dtype=np.float64)
+    pos = np.asarray(positives, dtype=np.float64)
+    n_pos, n_neg = pos.sum(), c.sum() - pos.sum()
+    if n_pos == 0 or n_neg == 0 or k == 0:
+        return np.full(m, np.inf)
+    order = np.argsort(-probs, axis=1, kind="stable")
+    s = np.take_along_axis(probs, order, axis=1)
+    tpr = np.cumsum(pos[order], axis=1) / n_pos
+    fpr = np.cumsum((c - pos)[order], axis=1) / n_neg
+    j = tpr - fpr
+    # only the last entry of each run of tied probabilities is a ROC point
+    j[:, :-1][s[:, :-1] == s[:, 1:]] = -np.inf
+    j = np.column_stack([np.zeros(m), j])
+    best = np.argmax(j, axis=1)
+    return np.where(best == 0, np.inf, s[np.arange(m), np.maximum(best - 1, 0)])
 
 
 class ProbabilityCalibrator:
-    def __init__(self):
-        self.model = LogisticRegression(max_iter=1000)
+    """점수(1-D) -> 확률 보정.
 
-    def fit(self, X: np.ndarray, y: np.ndarray):
-        X = X.reshape(-1, 1)
-        self.model.fit(X, y)
-        preds = self.model.predict_proba(X)[:, 1]
-        auc = roc_auc_score(y, preds)
-        print(f"Calibration AUC: {auc:.4f}")
+    Notes
+    -----
+    - method="logistic": L2(C) 로지스틱 회귀 (sklearn LogisticRegression 기본값과 같은 목적함수),
+      "platt": Platt scaling (평활 목표, 벌점 없음), "isotonic": 단조 회귀.
+      로지스틱/Platt 는 2-파라미터 Newton 법을 numpy 로 직접 풀고, 예측은 sigmoid 한 번.
+    - warm_start=True 면 fit 이 직전 계수에서 시작한다 (점수가 조금씩 바뀌는 trial 반복에 유리).
+    - partial_fit 은 새로 라벨이 붙은 봉을 누적한 ScoreTable(고유 점수, 개수, 양성 수) 에 합쳐
+      다시 푼다 (전체 재학습과 같은 해). 로지스틱/Platt 는 직전 계수에서 시작하는 Newton 법이라
+      보통 몇 번의 반복으로 끝난다. 누적 테이블 크기는 고유 점수 개수에 비례한다.
+    - fit 은 학습 데이터의 AUC / Youden 임계값을 정렬 한 번으로 계산해 캐시한다
+      (threshold_by_youden() 인자 생략 시 재사용).
+    - 점수의 고유 값이 max_levels 이하이면 (sig_* 가중합처럼) fit/partial_fit 이 입력을
+      ScoreTable(값, 개수, 양성 수) 로 압축해 학습·AUC·Youden 을 고유 값 단위로 계산한다.
+      테이블을 이미 알고 있으면 fit_table 로 바로 넘겨 행 수와 무관한 비용으로 학습한다.
+    """
+
+    def __init__(
+        self,
+        method: str = "logistic",
+        warm_start: bool = False,
+        C: float = 1.0,
+        verbose: bool = True,
+        max_levels: int | None = MAX_TABLE_LEVELS,
+    ):
+        if method not in CALIBRATION_METHODS:
+            raise ValueError(f"Unknown calibration method: {method!r} (choose from {', '.join(CALIBRATION_METHODS)})")
+        self.method = method
+        self.warm_start = warm_start
+        self.C = C
+        self.verbose = verbose
+        self.max_levels = max_levels
+        self.coef_: np.ndarray | None = None  # (a, b) for logistic / platt
+        self.hessian_: np.ndarray | None = None
+        self.n_pos_ = 0
+        self.n_neg_ = 0
+        self.table_: ScoreTable | None = None  # everything seen since the last fit (partial_fit input)
+        self._iso_thresholds: tuple[np.ndarray, np.ndarray] | None = None
+        self.roc_: RocSummary | None = None
+
+    @property
+    def is_fitted(self) -> bool:
+        return self.coef_ is not None or self._iso_thresholds is not None
+
+    # ---- logistic / platt -------------------------------------------------
+    def _targets(self, table: ScoreTable) -> np.ndarray:
+        if self.method == "platt":
+            hi = (self.n_pos_ + 1.0) / (self.n_pos_ + 2.0)
+            lo = 1.0 / (self.n_neg_ + 2.0)
+            return table.positives * hi + (table.counts - table.positives) * lo
+        return table.positives
+
+    def _penalty(self) -> np.ndarray:
+        # sklearn's l2 penalty: 0.5 / C * a^2, intercept not penalized
+        if self.method == "logistic" and self.C > 0:
+            return np.diag([1.0 / self.C, 0.0])
+        return np.zeros((2, 2))
+
+    def _fit_sigmoid(self, table: ScoreTable, partial: bool) -> None:
+        self.n_pos_ = table.n_pos
+        self.n_neg_ = table.n - table.n_pos
+        t = self._targets(table)
+        warm = (partial or self.warm_start) and self.coef_ is not None
+        start = self.coef_.copy() if warm else np.zeros(2)
+        self.coef_, self.hessian_ = _newton_logistic(table.values, table.counts, t, start, np.zeros(2), self._penalty())
+
+    # ---- isotonic ----------------------------------------------------------
+    def _fit_isotonic(self, table: ScoreTable) -> None:
+        table = _merge_tables(table)
+        iso = IsotonicRegression(y_min=0.0, y_max=1.0, out_of_bounds="clip")
+        iso.fit(table.values, table.positives / table.counts, sample_weight=table.counts)
+        self._iso_thresholds = (iso.X_thresholds_, iso.y_thresholds_)
+
+    # ---- public API --------------------------------------------------------
+    def _update(self, table: ScoreTable, partial: bool):
+        new = table
+        if partial and self.table_ is not None:
+            table = _merge_tables(self.table_, table)
+        self.table_ = table
+        if self.method == "isotonic":
+            self._fit_isotonic(table)
+        else:
+            self._fit_sigmoid(table, partial)
+        self.roc_ = roc_summary(self.predict_proba(new.values), counts=new.counts, positives=new.positives)
+        if self.verbose:
+            print(f"Calibration AUC: {self.roc_.auc:.4f}")
         return self
 
+    def _table(self, X: np.ndarray, y: np.ndarray) -> ScoreTable:
+        table = ScoreTable.from_samples(X, y, self.max_levels) if self.max_levels else None
+        return table if table is not None else ScoreTable.from_samples(X, y, None)
+
+    def fit(self, X: np.ndarray, y: np.ndarray):
+        return self._update(self._table(X, y), partial=False)
+
+    def partial_fit(self, X: np.ndarray, y: np.ndarray):
+        """새로 라벨이 붙은 표본으로 기존 보정을 갱신 (미학습 상태면 fit)."""
+        return self._update(self._table(X, y), partial=self.is_fitted)
+
+    def fit_table(self, table: ScoreTable):
+        """(값, 개수, 양성 수) 테이블로 직접 학습. 비용은 행 수가 아닌 고유 값 수에 비례."""
+        return self._update(table, partial=False)
+
+    def partial_fit_table(self, table: ScoreTable):
+        return self._update(table, partial=self.is_fitted)
+
     def predict_proba(self, X: np.ndarray) -> np.ndarray:
-        X = X.reshape(-1, 1)
-        return self.model.predict_proba(X)[:, 1]
+        x = np.asarray(X, dtype=np.float64).reshape(-1)
+        if self.method == "isotonic":
+            xt, yt = self._iso_thresholds
+            return np.interp(x, xt, yt)
+        a, b = self.coef_
+        return _sigmoid(a * x + b)
 
-    def threshold_by_youden(self, X: np.ndarray, y: np.ndarray) -> float:
-        from sklearn.metrics import roc_curve
+    def predict_one(self, score: float) -> float:
+        """스칼라 점수 하나의 확률 (스트리밍 경로, 배열 할당 없음)."""
+        if self.method == "isotonic":
+            return float(np.interp(score, *self._iso_thresholds))
+        a, b = self.coef_
+        return float(_sigmoid(a * score + b))
 
-        probs = self.predict_proba(X)
-        fpr, tpr, thr = roc_curve(y, probs)
-        youden_j = tpr - fpr
-        idx = np.argmax(youden_j)
-        return thr[idx] 
\ No newline at end of file
+    def threshold_by_youden(self, X: np.ndarray | None = None, y: np.ndarray | None = None) -> float:
+        """Youden J 최대 확률 임계값. 인자를 생략하면 fit 때 계산한 값 사용."""
+        if X is None or y is None:
+            return self.roc_.threshold
+        return roc_summary(self.predict_proba(X), y).threshold
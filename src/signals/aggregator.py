@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from typing import Dict, List
 import numpy as np
+import pandas as pd
 
 
 class SignalAggregator:
@@ -17,6 +18,14 @@ class SignalAggregator:
         """
         self.weights = weights
 
+    @property
+    def names(self) -> List[str]:
+        return list(self.weights.keys())
+
+    @property
+    def weight_vector(self) -> np.ndarray:
+        return np.fromiter(self.weights.values(), dtype=np.float64, count=len(self.weights))
+
     def score(self, signals: Dict[str, int | float]) -> float:
         """weights x signals 을 곱해 총합."""
         total = 0.0
@@ -31,4 +40,58 @@ class SignalAggregator:
             return 1
         elif s < -threshold:
             return -1
-        return 0 
\ No newline at end of file
+        return 0 
+
+    def signal_matrix(self, signals: pd.DataFrame | np.ndarray) -> np.ndarray:
+        """(n_rows x n_signals) float64 행렬.
+
+        DataFrame(또는 ColumnarFrame 처럼 columns 를 가진 프레임)이면 weights 키 순서로
+        컬럼 선택(없으면 0).
+        """
+        if hasattr(signals, "columns"):
+            cols = [
+                np.asarray(signals[k], dtype=np.float64) if k in signals.columns else np.zeros(len(signals))
+                for k in self.weights
+            ]
+            return np.column_stack(cols) if cols else np.zeros((len(signals), 0))
+        X = np.asarray(signals, dtype=np.float64)
+        if X.ndim != 2 or X.shape[1] != len(self.weights):
+            raise ValueError(f"expected (n_rows, {len(self.weights)}) array, got {X.shape}")
+        return X
+
+    def score_frame(
+        self,
+        signals: pd.DataFrame | np.ndarray,
+        weights: np.ndarray | None = None,
+    ) -> np.ndarray:
+        """행 단위 score 를 한 번의 행렬-벡터 곱으로 계산.
+
+        Parameters
+        ----------
+        signals : DataFrame or ndarray
+            DataFrame 이면 weights 키 컬럼 사용, ndarray 면 (n_rows, n_signals) 로 weights 키 순서.
+        weights : ndarray, optional
+            (n_signals,) 또는 여러 가중치 세트 (n_weightsets, n_signals). 기본은 self.weights.
+        Returns
+        -------
+        ndarray
+            (n_rows,) 또는 (n_weightsets, n_rows)
+        """
+        X = self.signal_matrix(signals)
+        W = self.weight_vector if weights is None else np.asarray(weights, dtype=np.float64)
+        if W.ndim == 1:
+            return X @ W
+        return W @ X.T
+
+    def classify_frame(
+        self,
+        signals: pd.DataFrame | np.ndarray,
+        threshold: float = 0.0,
+        weights: np.ndarray | None = None,
+    ) -> np.ndarray:
+        """classify 의 배치 버전. +1/-1/0 int8 배열 (score_frame 과 같은 shape)."""
+        s = self.score_frame(signals, weights)
+        out = np.zeros(s.shape, dtype=np.int8)
+        out[s > threshold] = 1
+        out[s < -threshold] = -1
+        return out
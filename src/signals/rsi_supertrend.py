@@ -1,9 +1,36 @@
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
 import pandas as pd
 import numpy as np
-from indicators.rsi import compute_rsi
-from indicators.supertrend import compute_supertrend
+from indicators.kernels import rsi, supertrend
+
+if TYPE_CHECKING:
+    from indicators.grid import IndicatorGrid
+
+
+def signal_array(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    rsi_period: int = 3,
+    rsi_overbought: int = 80,
+    rsi_oversold: int = 20,
+    st_atr_period: int = 10,
+    st_multiplier: float = 3.0,
+) -> np.ndarray:
+    """generate_signals 의 배열 버전. +1/-1/0 int8 배열."""
+    rsi_v = rsi(close, rsi_period)
+    _, st_dir = supertrend(high, low, close, st_atr_period, st_multiplier)
+    return _combine(rsi_v, st_dir, rsi_overbought, rsi_oversold)
+
+
+def _combine(rsi_v: np.ndarray, st_dir: np.ndarray, rsi_overbought: float, rsi_oversold: float) -> np.ndarray:
+    sig = np.zeros(rsi_v.shape[0], dtype=np.int8)
+    sig[(rsi_v < rsi_oversold) & (st_dir == 1)] = 1
+    sig[(rsi_v > rsi_overbought) & (st_dir == -1)] = -1
+    return sig
 
 
 def generate_signals(
@@ -25,14 +52,33 @@ def generate_signals(
     DataFrame
         with column 'signal' (+1 long, -1 short, 0 none)
     """
-    out = df.copy().reset_index(drop=False)
-    out["rsi"] = compute_rsi(out["close"], length=rsi_period)
-    st = compute_supertrend(out[["open", "high", "low", "close"]], length=st_atr_period, multiplier=st_multiplier)
-    out["supertrend_dir"] = st["SUPERTd_{}_{}_{}_".format(st_atr_period, st_multiplier, st_atr_period)].values if isinstance(st, pd.DataFrame) else st["SUPERTd_10_3.0_10"].values
+    close = df["close"].to_numpy(dtype=np.float64)
+    high = df["high"].to_numpy(dtype=np.float64)
+    low = df["low"].to_numpy(dtype=np.float64)
+    rsi_v = rsi(close, rsi_period)
+    _, st_dir = supertrend(high, low, close, st_atr_period, st_multiplier)
+
+    out = df.copy()
+    out["rsi"] = rsi_v
+    out["supertrend_dir"] = st_dir
     # Compute signals
-    conditions_long = (out["rsi"] < rsi_oversold) & (out["supertrend_dir"] == 1)
-    conditions_short = (out["rsi"] > rsi_overbought) & (out["supertrend_dir"] == -1)
-    out["signal"] = 0
-    out.loc[conditions_long, "signal"] = 1
-    out.loc[conditions_short, "signal"] = -1
-    return out.set_index(df.index) 
\ No newline at end of file
+    out["signal"] = _combine(rsi_v, st_dir, rsi_overbought, rsi_oversold)
+    return out
+
+
+def grid_signals(
+    grid: "IndicatorGrid",
+    rsi_period: int = 3,
+    rsi_overbought: int = 80,
+    rsi_oversold: int = 20,
+    st_atr_period: int = 10,
+    st_multiplier: float = 3.0,
+    **_,
+) -> np.ndarray:
+    """미리 계산된 IndicatorGrid 의 행 조회로 signal_array 와 같은 결과를 만든다."""
+    return _combine(
+        grid.rsi_values(rsi_period),
+        grid.supertrend_direction(st_atr_period, st_multiplier),
+        rsi_overbought,
+        rsi_oversold,
+    )
@@ -0,0 +1,257 @@
+"""마감된 캔들을 하나씩 받아 RSI + Supertrend 시그널을 O(1) 상태로 갱신하는 스트리밍 엔진.
+
+IndicatorState 는 indicators.kernels 의 순차 루프(rsi_wilder, true_range, wilder_smooth,
+supertrend_from_atr)와 같은 연산을 같은 순서로 수행하므로, 한 interval 의 캔들을
+순서대로 넣으면 배치 generate_signals 와 비트 단위로 같은 값이 나온다.
+"""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from probability.calibrator import ProbabilityCalibrator
+from signals.aggregator import SignalAggregator
+
+NAN = float("nan")
+
+
+class IndicatorState:
+    """(symbol, interval) 하나의 Wilder RSI / ATR / Supertrend 롤링 상태."""
+
+    __slots__ = (
+        "rsi_period",
+        "rsi_overbought",
+        "rsi_oversold",
+        "st_atr_period",
+        "st_multiplier",
+        "n_bars",
+        "last_close",
+        "n_diff",
+        "rsi_prev",
+        "gain",
+        "loss",
+        "rsi",
+        "n_tr",
+        "tr_sum",
+        "atr",
+        "upper",
+        "lower",
+        "direction",
+        "st_value",
+    )
+
+    def __init__(
+        self,
+        rsi_period: int = 3,
+        rsi_overbought: float = 80,
+        rsi_oversold: float = 20,
+        st_atr_period: int = 10,
+        st_multiplier: float = 3.0,
+    ):
+        self.rsi_period = int(rsi_period)
+        self.rsi_overbought = rsi_overbought
+        self.rsi_oversold = rsi_oversold
+        self.st_atr_period = int(st_atr_period)
+        self.st_multiplier = float(st_multiplier)
+        self.n_bars = 0
+        self.last_close = NAN
+        # RSI: 첫 유효 종가 이후의 차분 개수와 Wilder 평균
+        self.n_diff = -1
+        self.rsi_prev = NAN
+        self.gain = 0.0
+        self.loss = 0.0
+        self.rsi = NAN
+        # ATR: 첫 유효 TR 이후 개수, seed 합계
+        self.n_tr = 0
+        self.tr_sum = 0.0
+        self.atr = NAN
+        # Supertrend: 직전 봉 밴드와 방향
+        self.upper = NAN
+        self.lower = NAN
+        self.direction = 1
+        self.st_value = NAN
+
+    def _update_rsi(self, close: float) -> None:
+        if self.n_diff < 0:
+            if not math.isnan(close):
+                self.n_diff = 0
+                self.rsi_prev = close
+            return
+        p = self.rsi_period
+        d = close - self.rsi_prev
+        self.rsi_prev = close
+        self.n_diff += 1
+        if self.n_diff > p:
+            self.gain *= p - 1
+            self.loss *= p - 1
+        if d > 0:
+            self.gain += d
+        else:
+            self.loss -= d
+        if self.n_diff >= p:
+            self.gain /= p
+            self.loss /= p
+            s = self.gain + self.loss
+            self.rsi = 100.0 * self.gain / s if s != 0.0 else 0.0
+
+    def _update_atr(self, tr: float) -> None:
+        if self.n_tr == 0 and math.isnan(tr):
+            return
+        p = self.st_atr_period
+        self.n_tr += 1
+        if self.n_tr <= p:
+            self.tr_sum += tr
+            if self.n_tr == p:
+                self.atr = self.tr_sum / p
+        else:
+            self.atr = (self.atr * (p - 1) + tr) / p
+
+    def update(self, high: float, low: float, close: float) -> int:
+        """마감된 캔들 하나를 반영하고 이번 봉의 시그널(+1/-1/0) 반환."""
+        self._update_rsi(close)
+        m = self.st_multiplier
+        if self.n_bars == 0:
+            # 첫 봉: TR/ATR 없음, 밴드 nan, 방향 +1
+            self.upper = (high + low) / 2.0 + m * self.atr
+            self.lower = (high + low) / 2.0 - m * self.atr
+        else:
+            pc = self.last_close
+            tr = high - low
+            a = abs(high - pc)
+            b = abs(low - pc)
+            if a > tr:
+                tr = a
+            if b > tr:
+                tr = b
+            self._update_atr(tr)
+            hl2 = (high + low) / 2.0
+            upper = hl2 + m * self.atr
+            lower = hl2 - m * self.atr
+            if close > self.upper:
+                self.direction = 1
+            elif close < self.lower:
+                self.direction = -1
+            else:
+                if self.direction > 0 and lower < self.lower:
+                    lower = self.lower
+                if self.direction < 0 and upper > self.upper:
+                    upper = self.upper
+            self.st_value = lower if self.direction > 0 else upper
+            self.upper = upper
+            self.lower = lower
+        self.last_close = close
+        self.n_bars += 1
+        return self.signal
+
+    @property
+    def signal(self) -> int:
+        if self.rsi < self.rsi_oversold and self.direction == 1:
+            return 1
+        if self.rsi > self.rsi_overbought and self.direction == -1:
+            return -1
+        return 0
+
+
+@dataclass
+class SignalEvent:
+    """캔들 하나를 처리한 결과. signals 는 해당 심볼의 interval 별 최신 sig_<iv>."""
+
+    symbol: str
+    interval: str
+    open_time: int
+    signal: int
+    signals: Dict[str, int]
+    score: float
+    prob: Optional[float]
+
+
+class SignalEngine:
+    """(symbol, interval) 별 IndicatorState 를 들고 새 캔들마다 sig_*, score, 확률을 내보낸다.
+
+    Notes
+    -----
+    - 캔들은 interval 마다 마감 순서대로 넣어야 한다 (on_candle / on_candles).
+    - 상위 interval 시그널은 다음 마감 전까지 마지막 값을 유지(as-of)한다.
+    - aggregator 기본값은 파이프라인과 같은 균등 가중 sig_<iv>.
+    - calibrator 가 학습되어 있으면 score 의 확률을, 아니면 prob=None.
+    """
+
+    def __init__(
+        self,
+        intervals: Sequence[str],
+        aggregator: SignalAggregator | None = None,
+        calibrator: ProbabilityCalibrator | None = None,
+        rsi_period: int = 3,
+        rsi_overbought: float = 80,
+        rsi_oversold: float = 20,
+        st_atr_period: int = 10,
+        st_multiplier: float = 3.0,
+    ):
+        self.intervals = list(intervals)
+        self.aggregator = aggregator or SignalAggregator({f"sig_{iv}": 1 / len(self.intervals) for iv in self.intervals})
+        self.calibrator = calibrator
+        self.params = dict(
+            rsi_period=rsi_period,
+            rsi_overbought=rsi_overbought,
+            rsi_oversold=rsi_oversold,
+            st_atr_period=st_atr_period,
+            st_multiplier=st_multiplier,
+        )
+        self.states: Dict[Tuple[str, str], IndicatorState] = {}
+        self.latest: Dict[str, Dict[str, int]] = {}
+
+    def state(self, symbol: str, interval: str) -> IndicatorState:
+        key = (symbol, interval)
+        st = self.states.get(key)
+        if st is None:
+            st = self.states[key] = IndicatorState(**self.params)
+        return st
+
+    def update_indicators(self, symbol: str, interval: str, high: float, low: float, close: float) -> Dict[str, int]:
+        """지표 상태를 갱신하고 심볼의 최신 sig_<iv> 딕셔너리(내부 상태) 반환."""
+        sig = self.state(symbol, interval).update(float(high), float(low), float(close))
+        signals = self.latest.setdefault(symbol, {f"sig_{iv}": 0 for iv in self.intervals})
+        signals[f"sig_{interval}"] = sig
+        return signals
+
+    def probability(self, score: float) -> Optional[float]:
+        if self.calibrator is None or not self.calibrator.is_fitted:
+            return None
+        return self.calibrator.predict_one(score)
+
+    def on_candle(
+        self,
+        symbol: str,
+        interval: str,
+        open_time: int,
+        high: float,
+        low: float,
+        close: float,
+    ) -> SignalEvent:
+        """마감된 캔들 하나 처리."""
+        signals = self.update_indicators(symbol, interval, high, low, close)
+        score = self.aggregator.score(signals)
+        return SignalEvent(
+            symbol,
+            interval,
+            int(open_time),
+            signals[f"sig_{interval}"],
+            dict(signals),
+            score,
+            self.probability(score),
+        )
+
+    def on_candles(self, symbol: str, interval: str, df: pd.DataFrame) -> List[SignalEvent]:
+        """마감된 캔들 micro-batch (open_time 인덱스, high/low/close 컬럼) 를 순서대로 처리."""
+        times = pd.DatetimeIndex(df.index).asi8 // 1_000_000
+        highs = df["high"].to_numpy(dtype=np.float64)
+        lows = df["low"].to_numpy(dtype=np.float64)
+        closes = df["close"].to_numpy(dtype=np.float64)
+        return [
+            self.on_candle(symbol, interval, t, h, lo, c)
+            for t, h, lo, c in zip(times.tolist(), highs.tolist(), lows.tolist(), closes.tolist())
+        ]
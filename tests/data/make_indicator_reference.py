@@ -0,0 +1,135 @@
+"""indicator_reference.csv 생성 스크립트 (test_indicator_kernels.py 의 기대값).
+
+기대값은 실제 pandas-ta(requirements.txt 의 pandas-ta==0.3.14)로 만든다. 사용한 pandas-ta 버전과
+TA-Lib 위임 여부(설치 시 RSI/ATR 은 TA-Lib)가 파일 첫 줄 주석에 남는다. --port 를 주면 pandas-ta
+없이 같은 정의를 순수 파이썬 루프로 옮긴 아래 _port_* 로 만들고, 주석에 그렇게 적힌다.
+입력 OHLC 도 같은 파일에 들어 있어 테스트는 합성 생성기와 무관하다.
+
+    cd src && PYTHONPATH=. python ../tests/data/make_indicator_reference.py
+"""
+from __future__ import annotations
+
+import argparse
+import math
+import os
+
+import numpy as np
+import pandas as pd
+
+PARAMS = [(14, 10, 3.0), (7, 7, 2.0)]  # (rsi length, supertrend length, multiplier)
+OUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "indicator_reference.csv")
+
+
+def _input() -> pd.DataFrame:
+    from bench.synthetic import synthetic_ohlcv
+
+    start = int(pd.Timestamp("2024-01-01", tz="UTC").timestamp() * 1000)
+    df = synthetic_ohlcv("REFUSDT", "1h", start, start + 400 * 3_600_000 - 1, listing_delay=False)
+    df = df[["open", "high", "low", "close"]].copy()
+    df.iloc[250:262] = df.iloc[250]["close"]  # flat stretch: zero gain / loss and zero true range
+    return df
+
+
+def _port_rsi(close: list, length: int) -> list:
+    out = [math.nan] * len(close)
+    gain = loss = 0.0
+    for i in range(1, len(close)):
+        d = close[i] - close[i - 1]
+        g, l = max(d, 0.0), max(-d, 0.0)
+        if i <= length:
+            gain += g / length
+            loss += l / length
+        else:
+            gain = (gain * (length - 1) + g) / length
+            loss = (loss * (length - 1) + l) / length
+        if i >= length:
+            out[i] = 100.0 * gain / (gain + loss) if gain + loss else 0.0
+    return out
+
+
+def _port_atr(high: list, low: list, close: list, length: int) -> list:
+    out = [math.nan] * len(close)
+    avg = 0.0
+    for i in range(1, len(close)):
+        tr = max(high[i] - low[i], abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1]))
+        if i <= length:
+            avg += tr
+            if i == length:
+                avg /= length
+                out[i] = avg
+        else:
+            avg = (avg * (length - 1) + tr) / length
+            out[i] = avg
+    return out
+
+
+def _port_supertrend(high: list, low: list, close: list, length: int, multiplier: float):
+    # pandas_ta.supertrend loop on the ATR above
+    atr = _port_atr(high, low, close, length)
+    upper = [(h + l) / 2 + multiplier * a for h, l, a in zip(high, low, atr)]
+    lower = [(h + l) / 2 - multiplier * a for h, l, a in zip(high, low, atr)]
+    direction = [1] * len(close)
+    trend = [0.0] * len(close)
+    for i in range(1, len(close)):
+        if close[i] > upper[i - 1]:
+            direction[i] = 1
+        elif close[i] < lower[i - 1]:
+            direction[i] = -1
+        else:
+            direction[i] = direction[i - 1]
+            if direction[i] > 0 and lower[i] < lower[i - 1]:
+                lower[i] = lower[i - 1]
+            if direction[i] < 0 and upper[i] > upper[i - 1]:
+                upper[i] = upper[i - 1]
+        trend[i] = lower[i] if direction[i] > 0 else upper[i]
+    return trend, direction
+
+
+def _source(ta) -> str:
+    talib = bool(getattr(ta, "Imports", {}).get("talib"))
+    return f"pandas-ta {ta.version} ({'TA-Lib for RSI/ATR' if talib else 'no TA-Lib'})"
+
+
+def reference(df: pd.DataFrame, port: bool = False) -> tuple[pd.DataFrame, str]:
+    if port:
+        ta = None
+    else:
+        try:
+            import pandas_ta as ta
+        except ImportError as e:
+            raise SystemExit("pandas-ta is required (pip install pandas-ta==0.3.14), or pass --port") from e
+    out = df.copy()
+    h, l, c = (df[k].tolist() for k in ("high", "low", "close"))
+    for rsi_len, st_len, mult in PARAMS:
+        if ta is not None:
+            out[f"RSI_{rsi_len}"] = ta.rsi(df["close"], rsi_len)
+            out[f"ATR_{st_len}"] = ta.atr(df["high"], df["low"], df["close"], st_len)
+            st = ta.supertrend(df["high"], df["low"], df["close"], st_len, mult)
+            out[f"SUPERT_{st_len}_{mult}"] = st[f"SUPERT_{st_len}_{mult}"]
+            out[f"SUPERTd_{st_len}_{mult}"] = st[f"SUPERTd_{st_len}_{mult}"]
+        else:
+            out[f"RSI_{rsi_len}"] = _port_rsi(c, rsi_len)
+            out[f"ATR_{st_len}"] = _port_atr(h, l, c, st_len)
+            trend, direction = _port_supertrend(h, l, c, st_len, mult)
+            out[f"SUPERT_{st_len}_{mult}"] = trend
+            out[f"SUPERTd_{st_len}_{mult}"] = direction
+    if ta is not None:
+        source = _source(ta)
+    else:
+        source = "pure-Python port of the pandas-ta / TA-Lib loops (pandas-ta not installed)"
+    return out, source
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write tests/data/indicator_reference.csv")
+    parser.add_argument("--port", action="store_true", help="Use the pure-Python port instead of pandas-ta")
+    args = parser.parse_args()
+    out, source = reference(_input(), port=args.port)
+    with open(OUT, "w") as f:
+        f.write(f"# generated by tests/data/make_indicator_reference.py from {source}\n")
+        out.to_csv(f, float_format="%.17g")
+    print(f"wrote {OUT} ({source})")
+
+
+if __name__ == "__main__":
+    main()
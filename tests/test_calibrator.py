@@ -0,0 +1,126 @@
+import numpy as np
+import pytest
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import roc_auc_score, roc_curve
+
+from probability.calibrator import CALIBRATION_METHODS, ProbabilityCalibrator, ScoreTable, roc_summary
+
+
+def _continuous(n=2000, seed=1):
+    rng = np.random.default_rng(seed)
+    x = rng.normal(size=n)
+    y = (rng.random(n) < 1.0 / (1.0 + np.exp(-(1.5 * x - 0.3)))).astype(int)
+    return x, y
+
+
+def _levels(n=2000, seed=2):
+    # few distinct values, like a weighted sum of ternary sig_* columns
+    rng = np.random.default_rng(seed)
+    x = rng.choice([-1.0, -0.5, 0.0, 0.5, 1.0], n)
+    y = (rng.random(n) < 0.4 + 0.2 * x).astype(int)
+    return x, y
+
+
+def _sklearn_youden(y, p):
+    fpr, tpr, thr = roc_curve(y, p, drop_intermediate=False)
+    return thr[np.argmax(tpr - fpr)]
+
+
+@pytest.mark.parametrize("data", [_continuous, _levels])
+def test_logistic_matches_sklearn(data):
+    x, y = data()
+    cal = ProbabilityCalibrator(verbose=False).fit(x, y)
+    ref = LogisticRegression(C=1.0, tol=1e-10, max_iter=1000).fit(x[:, None], y)
+    np.testing.assert_allclose(cal.coef_, [ref.coef_[0, 0], ref.intercept_[0]], rtol=1e-6)
+    np.testing.assert_allclose(cal.predict_proba(x), ref.predict_proba(x[:, None])[:, 1], rtol=1e-6)
+
+    p = cal.predict_proba(x)
+    assert cal.roc_.auc == pytest.approx(roc_auc_score(y, p), rel=1e-12)
+    assert cal.threshold_by_youden() == _sklearn_youden(y, p)
+    assert cal.threshold_by_youden(x, y) == _sklearn_youden(y, p)
+
+
+def test_roc_summary_matches_sklearn_with_ties():
+    rng = np.random.default_rng(3)
+    scores = rng.integers(0, 20, 500) / 20.0
+    y = (rng.random(500) < scores).astype(int)
+    roc = roc_summary(scores, y)
+    assert roc.auc == pytest.approx(roc_auc_score(y, scores), rel=1e-12)
+    assert roc.threshold == _sklearn_youden(y, scores)
+
+    table = ScoreTable.from_samples(scores, y)
+    assert len(table.values) <= 20
+    assert roc_summary(table.values, counts=table.counts, positives=table.positives) == pytest.approx(roc)
+
+
+def test_roc_summary_single_class():
+    roc = roc_summary(np.linspace(0, 1, 10), np.zeros(10))
+    assert np.isnan(roc.auc) and roc.threshold == np.inf and roc.youden_j == 0.0
+
+
+@pytest.mark.parametrize("method", CALIBRATION_METHODS)
+@pytest.mark.parametrize(
+    "case",
+    ["continuous", "levels", "all_negative", "all_positive", "constant_score"],
+)
+def test_fit_table_matches_row_fit(method, case):
+    x, y = _levels() if case == "levels" else _continuous()
+    if case == "all_negative":
+        y = np.zeros_like(y)
+    elif case == "all_positive":
+        y = np.ones_like(y)
+    elif case == "constant_score":
+        x = np.full_like(x, 0.3)
+
+    rows = ProbabilityCalibrator(method, verbose=False, max_levels=None).fit(x, y)
+    table = ProbabilityCalibrator(method, verbose=False).fit_table(ScoreTable.from_samples(x, y))
+    compressed = ProbabilityCalibrator(method, verbose=False).fit(x, y)
+    for cal in (table, compressed):
+        np.testing.assert_allclose(cal.predict_proba(x), rows.predict_proba(x), rtol=1e-7, atol=1e-12)
+        assert cal.threshold_by_youden() == pytest.approx(rows.threshold_by_youden(), rel=1e-9)
+        np.testing.assert_allclose(cal.roc_.auc, rows.roc_.auc, rtol=1e-12)
+
+    p = rows.predict_proba(x)
+    assert np.isfinite(p).all() and (p >= 0).all() and (p <= 1).all()
+    if case in ("all_negative", "all_positive"):
+        assert np.isnan(rows.roc_.auc) and rows.threshold_by_youden() == np.inf
+        assert (p < 0.5).all() if case == "all_negative" else (p > 0.5).all()
+    if case == "constant_score":
+        assert rows.roc_.auc == 0.5
+        np.testing.assert_allclose(p, y.mean(), rtol=1e-6)
+
+
+@pytest.mark.parametrize("method", CALIBRATION_METHODS)
+@pytest.mark.parametrize("data", [_continuous, _levels])
+def test_chunked_partial_fit_equals_full_fit(method, data):
+    x, y = data()
+    full = ProbabilityCalibrator(method, verbose=False).fit(x, y)
+    chunked = ProbabilityCalibrator(method, verbose=False)
+    for k in range(0, len(x), 300):
+        chunked.partial_fit(x[k : k + 300], y[k : k + 300])
+    grid = np.linspace(x.min() - 1, x.max() + 1, 101)
+    np.testing.assert_allclose(chunked.predict_proba(grid), full.predict_proba(grid), rtol=1e-9, atol=1e-12)
+    if method != "isotonic":
+        np.testing.assert_allclose(chunked.coef_, full.coef_, rtol=1e-9)
+        assert (chunked.n_pos_, chunked.n_neg_) == (full.n_pos_, full.n_neg_)
+
+    # a plain fit starts over
+    refit = chunked.fit(x[:300], y[:300])
+    np.testing.assert_allclose(
+        refit.predict_proba(grid),
+        ProbabilityCalibrator(method, verbose=False).fit(x[:300], y[:300]).predict_proba(grid),
+        rtol=1e-9,
+        atol=1e-12,
+    )
+
+
+@pytest.mark.parametrize("method", CALIBRATION_METHODS)
+def test_calibrated_probabilities_are_monotone_and_bounded(method):
+    x, y = _continuous()
+    cal = ProbabilityCalibrator(method, verbose=False).fit(x, y)
+    grid = np.linspace(-10, 10, 2001)
+    p = cal.predict_proba(grid)
+    assert (p >= 0).all() and (p <= 1).all()
+    assert (np.diff(p) >= 0).all()
+    assert p[-1] > p[0]
+    assert [cal.predict_one(v) for v in grid[::100]] == pytest.approx(p[::100], rel=1e-12)
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.columnar import ColumnarFrame
+
+N = 6
+
+
+@pytest.fixture
+def frame():
+    ts = np.arange(N, dtype=np.int64) * 60_000
+    df = pd.DataFrame(
+        {f"{f}_1m": np.linspace(100, 101, N) for f in ("open", "high", "low", "close", "volume")},
+        index=pd.to_datetime(ts, unit="ms", utc=True),
+    )
+    return ColumnarFrame.from_frame(df, dtype=np.float32)
+
+
+def test_known_columns_are_narrowed(frame):
+    frame["sig_1h"] = np.array([-1, 0, 1, 1, 0, -1], dtype=np.int64)
+    frame["trade_signal"] = np.zeros(N)
+    frame["close_5m"] = np.linspace(1, 2, N)
+    assert frame["sig_1h"].dtype == np.int8
+    assert frame["trade_signal"].dtype == np.int8
+    assert frame["close_5m"].dtype == np.float32
+    assert frame["close_1m"].dtype == np.float32
+
+
+def test_other_columns_keep_their_dtype(frame):
+    score = np.linspace(-1, 1, N) / 3
+    frame["score"] = score
+    frame["count"] = np.arange(N) * 1_000
+    frame["flag"] = np.arange(N) % 2 == 0
+    assert frame["score"].dtype == np.float64
+    np.testing.assert_array_equal(frame["score"], score)
+    assert frame["count"].dtype == np.int64
+    assert frame["count"][-1] == 5_000
+    assert frame["flag"].dtype == np.bool_
+
+
+def test_lossy_integer_casts_raise(frame):
+    with pytest.raises(ValueError, match="without loss"):
+        frame["sig_1h"] = np.array([0, 0, 0, 0, 0, 300])
+    with pytest.raises(ValueError, match="without loss"):
+        frame["signal"] = np.array([0, 1, np.nan, 0, 0, 0])
+    with pytest.raises(ValueError, match="without loss"):
+        frame.set("count", np.arange(N) * 0.5, dtype=np.int16)
+    frame.set("count", np.arange(N) * 1.0, dtype=np.int16)
+    assert frame["count"].dtype == np.int16
+
+
+def test_explicit_dtype(frame):
+    frame.set("score", np.linspace(0, 1, N), dtype=np.float32)
+    assert frame["score"].dtype == np.float32
@@ -0,0 +1,130 @@
+"""ConcurrentKlineFetcher 를 스레드에서 도는 로컬 http.server 스텁에 붙여 검증."""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+import pytest
+
+from bench.synthetic import SyntheticFuturesClient
+from data.binance_collector import BinanceDataClient
+from data.concurrent_fetch import ConcurrentKlineFetcher, TokenBucket, kline_weight, page_ranges
+
+START = int(pd.Timestamp("2024-01-01", tz="UTC").timestamp() * 1000)
+STEP = 60_000
+N_BARS = 1_000
+END = START + N_BARS * STEP - 1
+ROWS = SyntheticFuturesClient(listing_delay=False).futures_historical_klines("STUBUSDT", "1m", START, END)
+
+
+class StubState:
+    def __init__(self, throttle: int = 0):
+        self.throttle = throttle  # answer this many requests with 429 first
+        self.requests = []
+        self.lock = threading.Lock()
+
+
+def _handler(state: StubState):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            q = {k: v[0] for k, v in parse_qs(url.query).items()}
+            with state.lock:
+                state.requests.append((url.path, q))
+                throttled = state.throttle > 0
+                state.throttle -= throttled
+            if throttled:
+                self.send_response(429)
+                self.send_header("Retry-After", "0")
+                self.end_headers()
+                return
+            if url.path != "/fapi/v1/klines":
+                self.send_response(404)
+                self.end_headers()
+                return
+            lo, hi, limit = int(q["startTime"]), int(q["endTime"]), int(q["limit"])
+            body = json.dumps([r for r in ROWS if lo <= r[0] <= hi][:limit]).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+@pytest.fixture
+def stub():
+    servers = []
+
+    def start(throttle: int = 0):
+        state = StubState(throttle)
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _handler(state))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}", state
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_pages_are_fetched_and_stitched_in_order(stub):
+    url, state = stub()
+    with ConcurrentKlineFetcher(base_url=url, limit=100, max_workers=4) as fetcher:
+        rows = fetcher.fetch_raw("STUBUSDT", "1m", START, END)
+    assert rows == ROWS
+    windows = sorted((int(q["startTime"]), int(q["endTime"])) for _, q in state.requests)
+    assert windows == page_ranges(START, END, "1m", 100)
+    assert all(q["limit"] == "100" and q["symbol"] == "STUBUSDT" for _, q in state.requests)
+
+
+def test_rate_limit_is_retried_and_drains_the_bucket(stub):
+    url, state = stub(throttle=3)
+    with ConcurrentKlineFetcher(base_url=url, limit=250, max_workers=2) as fetcher:
+        drained = []
+        drain = fetcher.bucket.drain
+        fetcher.bucket.drain = lambda: (drained.append(1), drain())
+        rows = fetcher.fetch_raw("STUBUSDT", "1m", START, END)
+    assert rows == ROWS
+    assert len(state.requests) == len(page_ranges(START, END, "1m", 250)) + 3
+    assert len(drained) == 3
+
+
+def test_gives_up_after_max_retries(stub):
+    url, state = stub(throttle=100)
+    with ConcurrentKlineFetcher(base_url=url, limit=1000, max_retries=3) as fetcher:
+        with pytest.raises(RuntimeError, match="rate limited after 3 retries"):
+            fetcher.fetch_raw("STUBUSDT", "1m", START, END)
+    assert len(state.requests) == 3
+
+
+def test_token_bucket_paces_requests(stub):
+    url, state = stub()
+    with ConcurrentKlineFetcher(base_url=url, limit=100, max_workers=4) as fetcher:
+        # capacity 4 weight, refilled at 20 weight/s; each limit=100 page costs 2
+        fetcher.bucket = TokenBucket(4, period=0.2)
+        t0 = time.perf_counter()
+        rows = fetcher.fetch_raw("STUBUSDT", "1m", START, END)
+        elapsed = time.perf_counter() - t0
+    assert rows == ROWS
+    n_pages = len(page_ranges(START, END, "1m", 100))
+    assert elapsed >= (n_pages * kline_weight(100) - 4) / 20 * 0.9
+
+
+def test_client_uses_fetcher(stub, monkeypatch):
+    monkeypatch.delenv("KLINE_STORE_DIR", raising=False)
+    url, _ = stub()
+    with ConcurrentKlineFetcher(base_url=url, limit=300) as fetcher:
+        df = BinanceDataClient(fetcher=fetcher).fetch_klines("STUBUSDT", "1m", START, END)
+    assert len(df) == N_BARS
+    assert df.index[0] == pd.Timestamp(START, unit="ms", tz="UTC")
+    client = BinanceDataClient(concurrent=True)
+    assert isinstance(client.fetcher, ConcurrentKlineFetcher)
+    client.fetcher.close()
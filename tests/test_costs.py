@@ -0,0 +1,139 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.costs import CostArrays, CostModel, _average_fill, depth_by_bar, funding_by_bar
+from backtest.fast_engine import run_backtest_batch, run_fast_backtest
+from backtest.portfolio import PortfolioData, run_portfolio_backtest
+from bench.synthetic import synthetic_ohlcv, write_cost_fixtures
+from data.cost_store import CostStore
+
+SYMBOLS = ["SYN00USDT", "SYN01USDT"]
+START = int(pd.Timestamp("2024-01-01", tz="UTC").timestamp() * 1000)
+END = START + 3 * 86_400_000 - 1
+
+
+def _ts(s):
+    return pd.Timestamp(s, tz="UTC")
+
+
+def test_funding_by_bar_sums_into_containing_bar():
+    index = pd.date_range("2024-01-01", periods=4, freq="1h", tz="UTC")
+    funding = pd.Series(
+        [1.0, 2.0, 4.0, 8.0, 16.0],
+        index=pd.DatetimeIndex(
+            [
+                _ts("2023-12-31 23:00"),  # before the first bar
+                _ts("2024-01-01 00:00"),
+                _ts("2024-01-01 00:30"),
+                _ts("2024-01-01 02:59:59"),
+                _ts("2024-01-01 04:00"),  # after the last bar closes
+            ]
+        ),
+    )
+    np.testing.assert_array_equal(funding_by_bar(index, funding), [6.0, 0.0, 8.0, 0.0])
+    assert funding_by_bar(index, funding.iloc[:0]).tolist() == [0.0] * 4
+
+
+def test_depth_by_bar_asof_and_staleness():
+    snaps = pd.DatetimeIndex([_ts("2024-01-01 00:00"), _ts("2024-01-01 00:05")])
+    bars = pd.DatetimeIndex(
+        [_ts("2023-12-31 23:55"), _ts("2024-01-01 00:00"), _ts("2024-01-01 00:07"), _ts("2024-01-01 01:10")]
+    )
+    assert depth_by_bar(bars, snaps, "1h").tolist() == [-1, 0, 1, -1]
+    assert depth_by_bar(bars, snaps, None).tolist() == [-1, 0, 1, 1]
+
+
+def test_average_fill_beyond_book_depth_uses_last_level():
+    px = np.array([[100.0, 101.0]])
+    qty = np.ones((1, 2))
+    fill = _average_fill(px, qty, np.array([50.0, 201.0, 302.0]))
+    # 302 = 100 x 1 + 101 x 2: the part past the book fills at the last level price
+    np.testing.assert_allclose(fill[0], [100.0, 100.5, 302.0 / 3.0])
+
+
+def _held_position(direction, rate_at):
+    n = 10
+    flat = np.full(n, 100.0)
+    signal = np.zeros(n, np.int8)
+    signal[0] = direction
+    funding = np.zeros((n, 1))
+    funding[rate_at, 0] = 1e-3
+    costs = CostArrays.empty()._replace(funding=funding)
+    base = run_fast_backtest(flat, flat, flat, flat, signal)
+    return base, run_fast_backtest(flat, flat, flat, flat, signal, costs=costs)
+
+
+@pytest.mark.parametrize("direction", [1, -1])
+def test_funding_sign_long_pays_short_receives(direction):
+    base, res = _held_position(direction, rate_at=5)
+    assert np.sign(res.funding) == direction
+    assert res.final_value == pytest.approx(base.final_value - res.funding)
+    # the bar the position is opened on is not charged
+    base, res = _held_position(direction, rate_at=1)
+    assert res.funding == 0.0
+    assert res.final_value == base.final_value
+
+
+@pytest.fixture(scope="module")
+def fixture_data(tmp_path_factory):
+    store = CostStore(tmp_path_factory.mktemp("costs"))
+    write_cost_fixtures(store, SYMBOLS, START, END)
+    frames = {sym: synthetic_ohlcv(sym, "5m", START, END, listing_delay=False) for sym in SYMBOLS}
+    data = PortfolioData.align(frames)
+    rng = np.random.default_rng(0)
+    signals = rng.choice([-1, 0, 0, 0, 0, 0, 1], (data.n_bars, len(SYMBOLS))).astype(np.int8)
+    return store, data, signals
+
+
+def _ohlc(data, k):
+    return [getattr(data, c)[:, k] for c in ("open", "high", "low", "close")]
+
+
+def test_fixture_costs_are_charged(fixture_data):
+    store, data, signals = fixture_data
+    costs = CostModel(store).arrays(SYMBOLS, data.index)
+    # 8h funding lands on three 5m bars per day
+    assert (costs.funding != 0).sum(axis=0).tolist() == [9, 9]
+    assert (costs.depth_idx >= 0).all()
+    base = run_fast_backtest(*_ohlc(data, 0), signals[:, 0])
+    res = run_fast_backtest(*_ohlc(data, 0), signals[:, 0], costs=costs.column(0))
+    assert res.slippage > 0.0
+    assert res.final_value < base.final_value
+
+
+def test_no_cost_runs_are_bit_identical(fixture_data):
+    store, data, signals = fixture_data
+    full = CostModel(store).arrays(SYMBOLS, data.index)
+    no_costs = [
+        None,
+        CostArrays.empty(len(SYMBOLS)),
+        CostModel(store, funding=False, depth=False).arrays(SYMBOLS, data.index),
+        full._replace(funding=np.zeros_like(full.funding), depth_idx=np.full_like(full.depth_idx, -1)),
+    ]
+
+    ref = run_fast_backtest(*_ohlc(data, 0), signals[:, 0])
+    ref_batch = run_backtest_batch(
+        np.column_stack(_ohlc(data, 0)), signals[:, 0], [0.005, 0.01], [1.5, 2.0], record_equity=True
+    )
+    ref_port = run_portfolio_backtest(data, signals)
+    for costs in no_costs:
+        single = run_fast_backtest(*_ohlc(data, 0), signals[:, 0], costs=costs and costs.column(0))
+        np.testing.assert_array_equal(single.equity, ref.equity)
+        assert single.final_value == ref.final_value
+        assert (single.funding, single.slippage) == (0.0, 0.0)
+
+        batch = run_backtest_batch(
+            np.column_stack(_ohlc(data, 0)),
+            signals[:, 0],
+            [0.005, 0.01],
+            [1.5, 2.0],
+            record_equity=True,
+            costs=costs and costs.column(0),
+        )
+        np.testing.assert_array_equal(batch.equity, ref_batch.equity)
+        np.testing.assert_array_equal(batch.final_value, ref_batch.final_value)
+
+        port = run_portfolio_backtest(data, signals, costs=costs)
+        np.testing.assert_array_equal(port.equity, ref_port.equity)
+        np.testing.assert_array_equal(port.cash, ref_port.cash)
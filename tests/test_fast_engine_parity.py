@@ -0,0 +1,96 @@
+"""fast 엔진과 backtrader(Cerebro) 가 같은 합성 fixture 에서 같은 결과를 내는지."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.engine import run_backtest
+from backtest.fast_engine import run_backtest_batch, run_fast_backtest
+from backtest.signal_strategy import SignalTradeStrategy
+from bench.synthetic import synthetic_ohlcv
+
+START = int(pd.Timestamp("2024-01-01", tz="UTC").timestamp() * 1000)
+
+
+class RecordingStrategy(SignalTradeStrategy):
+    """봉마다 broker 가치와 청산된 거래 pnl 을 기록한다."""
+
+    def __init__(self):
+        super().__init__()
+        self.values = []
+        self.closed = []
+
+    def next(self):
+        self.values.append(self.broker.getvalue())
+        super().next()
+
+    def notify_trade(self, trade):
+        if trade.isclosed:
+            self.closed.append((len(self.data) - 1, trade.pnlcomm))
+
+
+def _fixture(symbol: str, n_bars: int = 600) -> pd.DataFrame:
+    df = synthetic_ohlcv(symbol, "5m", START, START + n_bars * 300_000 - 1, listing_delay=False)
+    rng = np.random.default_rng(len(symbol) + n_bars)
+    return df.assign(signal=rng.choice([-1, 0, 0, 0, 1], len(df)).astype(float))
+
+
+@pytest.mark.parametrize(
+    "symbol, leverage, sl_pct, rr",
+    [
+        ("PARITY0USDT", 10.0, 0.005, 1.5),
+        ("PARITY1USDT", 1.0, 0.003, 2.0),
+        ("PARITY2USDT", 1.004, 0.01, 1.0),
+        ("PARITY3USDT", 5.0, 0.002, 3.0),
+    ],
+)
+def test_fast_matches_backtrader(symbol, leverage, sl_pct, rr):
+    df = _fixture(symbol)
+    kwargs = dict(cash=100_000.0, commission=0.0005, leverage=leverage, sl_pct=sl_pct, rr=rr)
+
+    cerebro = run_backtest(df, RecordingStrategy, engine="backtrader", **kwargs)
+    fast = run_backtest(df, SignalTradeStrategy, engine="fast", **kwargs)
+    strat = cerebro.runstrats[0][0]
+
+    assert fast.final_value == pytest.approx(cerebro.broker.getvalue(), rel=1e-10)
+    np.testing.assert_allclose(fast.equity, strat.values, rtol=1e-10)
+
+    assert len(fast.trades) == len(strat.closed) > 0
+    bt_exit, bt_pnl = map(np.asarray, zip(*strat.closed))
+    np.testing.assert_array_equal(fast.trades["exit_idx"].to_numpy(), bt_exit)
+    np.testing.assert_allclose(fast.trades["pnl"].to_numpy(), bt_pnl, rtol=1e-8, atol=1e-6)
+
+
+@pytest.mark.parametrize("shared_signal", [True, False])
+@pytest.mark.parametrize("leverage", [10.0, 1.004])
+@pytest.mark.parametrize(
+    "sl_pct, rr",
+    [
+        ([0.005, 0.005, 0.005], [1.0, 1.5, 3.0]),  # same stop, different targets
+        ([0.002, 0.005, 0.01, 0.02], [2.0, 2.0, 2.0, 2.0]),  # same target, different stops
+        ([0.003, 0.02, 0.001, 0.008, 0.005], [3.0, 1.0, 1.5, 0.5, 2.5]),
+    ],
+)
+def test_batch_columns_match_single_runs(shared_signal, leverage, sl_pct, rr):
+    df = _fixture("BATCHUSDT", n_bars=1500)
+    ohlc = df[["open", "high", "low", "close"]].to_numpy()
+    m = len(sl_pct)
+    if shared_signal:
+        signals = np.broadcast_to(df["signal"].to_numpy(np.int8), (m, len(df)))
+    else:
+        signals = np.random.default_rng(m).choice([-1, 0, 0, 0, 1], (m, len(df))).astype(np.int8)
+    kwargs = dict(cash=100_000.0, commission=0.0005, leverage=leverage)
+
+    batch = run_backtest_batch(ohlc, signals[0] if shared_signal else signals, sl_pct, rr, record_equity=True, **kwargs)
+    for k in range(m):
+        single = run_fast_backtest(*ohlc.T, signals[k], sl_pct=sl_pct[k], rr=rr[k], **kwargs)
+        peak = np.maximum.accumulate(np.concatenate([[kwargs["cash"]], single.equity]))
+        max_dd = np.max(1.0 - single.equity / peak[1:])
+        pnl = single.trades["pnl"].to_numpy()
+
+        assert batch.final_value[k] == single.final_value
+        assert batch.max_drawdown[k] == pytest.approx(max_dd, rel=1e-12, abs=1e-15)
+        assert batch.n_trades[k] == len(single.trades) > 0
+        assert batch.n_wins[k] == (pnl > 0).sum()
+        np.testing.assert_array_equal(batch.equity[k], single.equity)
+    # the configurations really differ
+    assert len(np.unique(batch.final_value)) == m
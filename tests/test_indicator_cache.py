@@ -0,0 +1,127 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from indicators import kernels
+from indicators.cache import IndicatorCache, cache_stats, get_cache, set_cache
+
+SIZE = 100 * 8  # one float64 array of 100
+
+
+def _arr(v):
+    return np.full(100, float(v))
+
+
+@pytest.fixture
+def process_cache():
+    previous = get_cache()
+    cache = IndicatorCache()
+    set_cache(cache)
+    yield cache
+    set_cache(previous)
+
+
+def test_lru_eviction_by_entries():
+    cache = IndicatorCache(max_entries=2)
+    cache.put(("a", "x", ()), _arr(1))
+    cache.put(("b", "x", ()), _arr(2))
+    cache.get(("a", "x", ()))  # a becomes most recent
+    cache.put(("c", "x", ()), _arr(3))
+    assert cache.get(("b", "x", ())) is None
+    assert cache.get(("a", "x", ()))[0] == 1.0 and cache.get(("c", "x", ()))[0] == 3.0
+    assert cache.stats()["evictions"] == 1 and cache.stats()["entries"] == 2
+
+
+def test_byte_limit():
+    cache = IndicatorCache(max_bytes=3 * SIZE)
+    for k in range(4):
+        cache.put((str(k), "x", ()), _arr(k))
+    assert cache.stats()["bytes"] == 3 * SIZE
+    assert cache.get(("0", "x", ())) is None
+    # tuples count every member; a value larger than the whole budget is not kept
+    cache.put(("t", "x", ()), (_arr(0), _arr(1)))
+    assert cache.stats()["bytes"] == 3 * SIZE and cache.stats()["entries"] == 2
+    cache.put(("big", "x", ()), np.zeros(4 * 100))
+    assert cache.get(("big", "x", ())) is None
+    assert cache.stats()["entries"] == 2
+    # replacing a key does not double count it
+    cache.put(("t", "x", ()), _arr(9))
+    assert cache.stats()["bytes"] == 2 * SIZE
+
+
+def test_hit_miss_stats():
+    cache = IndicatorCache()
+    calls = []
+    compute = lambda: calls.append(1) or _arr(1)  # noqa: E731
+    first = cache.get_or_compute(("k", "x", ()), compute)
+    second = cache.get_or_compute(("k", "x", ()), compute)
+    assert first is second and len(calls) == 1
+    assert not first.flags.writeable
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["disk_hits"]) == (1, 1, 0)
+    assert stats["hit_rate"] == 0.5
+    cache.clear()
+    assert cache.stats() == {"hits": 0, "disk_hits": 0, "misses": 0, "hit_rate": 0.0, "evictions": 0, "entries": 0, "bytes": 0}
+
+
+def test_disk_tier_round_trip(tmp_path):
+    cache = IndicatorCache(disk_dir=tmp_path)
+    cache.put(("a", "rsi", ()), _arr(1))
+    cache.put(("b", "supertrend", ()), (_arr(2), np.array([1, -1], dtype=np.int8)))
+    cache.put(("c", "frame", ()), pd.DataFrame({"x": [1.0]}))
+    assert sorted(p.suffix for p in tmp_path.iterdir()) == [".npy", ".npz"]
+
+    warm = IndicatorCache(disk_dir=tmp_path)
+    value = warm.get(("a", "rsi", ()))
+    np.testing.assert_array_equal(value, _arr(1))
+    assert not value.flags.writeable
+    st_value, direction = warm.get(("b", "supertrend", ()))
+    np.testing.assert_array_equal(st_value, _arr(2))
+    assert direction.dtype == np.int8 and direction.tolist() == [1, -1]
+    # pandas values stay in memory only
+    assert warm.get(("c", "frame", ())) is None
+    warm.get(("a", "rsi", ()))
+    stats = warm.stats()
+    assert (stats["hits"], stats["disk_hits"], stats["misses"]) == (1, 2, 1)
+
+
+class _Payload:
+    def __reduce__(self):
+        return (_mark, ())
+
+
+UNPICKLED = []
+
+
+def _mark():
+    UNPICKLED.append(1)
+    return 0
+
+
+def test_disk_tier_never_unpickles(tmp_path):
+    cache = IndicatorCache(disk_dir=tmp_path)
+    key = ("a", "rsi", ())
+    path = cache._disk_path(key, ".npy")
+    np.save(path, np.array([_Payload()], dtype=object), allow_pickle=True)
+    assert cache.get(key) is None and UNPICKLED == []
+    cache._disk_path(key, ".npz").write_bytes(b"PK" + pickle.dumps(_Payload()))
+    path.unlink()
+    assert cache.get(key) is None and UNPICKLED == []
+    # the next computation overwrites it with plain data
+    cache.get_or_compute(key, lambda: _arr(1))
+    np.testing.assert_array_equal(IndicatorCache(disk_dir=tmp_path).get(key), _arr(1))
+
+
+def test_cached_indicator_keys_on_data_and_params(process_cache):
+    close = 100.0 + np.cumsum(np.random.default_rng(0).normal(size=300))
+    a = kernels.rsi(close)
+    b = kernels.rsi(close.copy(), period=14)
+    assert a is b and not a.flags.writeable
+    c = kernels.rsi(close, 7)
+    assert c is not a
+    np.testing.assert_array_equal(a, kernels.rsi_wilder(close, 14))
+    kernels.rsi(close + 1.0)
+    stats = cache_stats()
+    assert (stats["hits"], stats["misses"]) == (1, 3)
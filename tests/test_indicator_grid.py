@@ -0,0 +1,49 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+
+from bench.synthetic import synthetic_ohlcv
+from indicators.grid import IndicatorGrid, compute_rsi_grid, compute_supertrend_grid
+from indicators.kernels import rsi_wilder, supertrend
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+START = int(pd.Timestamp("2024-01-01", tz="UTC").timestamp() * 1000)
+PERIODS = [7, 10, 14]
+MULTIPLIERS = [1.5, 2.0, 3.0]
+
+
+def _bars():
+    df = synthetic_ohlcv("GRIDUSDT", "15m", START, START + 2000 * 900_000 - 1, listing_delay=False)
+    return df["high"].to_numpy(), df["low"].to_numpy(), df["close"].to_numpy()
+
+
+def test_grid_rows_match_single_kernels():
+    h, l, c = _bars()
+    values, directions = compute_supertrend_grid(h, l, c, PERIODS, MULTIPLIERS)
+    _, dir_only = compute_supertrend_grid(h, l, c, PERIODS, MULTIPLIERS, out_values=False)
+    assert _ is None
+    np.testing.assert_array_equal(dir_only, directions)
+    for i, p in enumerate(PERIODS):
+        for j, m in enumerate(MULTIPLIERS):
+            v, d = supertrend(h, l, c, p, m)
+            np.testing.assert_array_equal(values[i * len(MULTIPLIERS) + j], v)
+            np.testing.assert_array_equal(directions[i * len(MULTIPLIERS) + j], d)
+    rsi = compute_rsi_grid(c, PERIODS)
+    for i, p in enumerate(PERIODS):
+        np.testing.assert_array_equal(rsi[i], rsi_wilder(c, p))
+
+
+def test_indicator_grid_lookup():
+    h, l, c = _bars()
+    grid = IndicatorGrid(h, l, c, PERIODS, PERIODS, MULTIPLIERS)
+    np.testing.assert_array_equal(grid.supertrend_direction(10, 2.0000000001), supertrend(h, l, c, 10, 2.0)[1])
+    np.testing.assert_array_equal(grid.rsi_values(14), rsi_wilder(c, 14))
+
+
+def test_param_space_import_does_not_load_numba_grid():
+    code = "import sys, optimize.param_space; print('indicators.grid' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=SRC, check=True)
+    assert out.stdout.strip() == "False"
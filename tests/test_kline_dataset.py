@@ -0,0 +1,96 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bench.synthetic import synthetic_klines
+from data.kline_dataset import IPC_FILE, KlineDataset
+from data.kline_store import KlineStore
+
+SYMBOL = "DATASETUSDT"
+HOUR = 3_600_000
+
+
+def _ms(s):
+    return int(pd.Timestamp(s, tz="UTC").timestamp() * 1000)
+
+
+@pytest.fixture
+def root(tmp_path):
+    # hourly candles across a month boundary: two parquet files
+    store = KlineStore(tmp_path)
+    for symbol, end in ((SYMBOL, "2024-02-03"), ("OTHERUSDT", "2024-01-30")):
+        store.write(symbol, "1h", synthetic_klines(symbol, "1h", _ms("2024-01-29"), _ms(end) - 1, listing_delay=False))
+    return tmp_path
+
+
+def _expected(root, start_ts=None, end_ts=None):
+    df = KlineStore(root).read(SYMBOL, "1h")
+    t = df.index.as_unit("ms").asi8
+    mask = np.ones(len(df), dtype=bool)
+    if start_ts is not None:
+        mask &= t >= start_ts
+    if end_ts is not None:
+        mask &= t <= end_ts
+    return t[mask], df[mask]
+
+
+BOUNDS = [
+    (None, None),
+    (_ms("2024-01-31 22:00"), _ms("2024-02-01 02:00")),  # inclusive on both ends, across the month boundary
+    (_ms("2024-01-31 21:30"), _ms("2024-02-01 01:59")),  # between candles
+    (_ms("2024-02-02 20:00"), None),
+    (None, _ms("2024-01-29 03:00")),
+    (_ms("2024-03-01"), None),  # after the data
+]
+
+
+@pytest.mark.parametrize("compacted", [False, True])
+@pytest.mark.parametrize("start_ts, end_ts", BOUNDS)
+@pytest.mark.parametrize("columns", [("open", "high", "low", "close", "volume"), ("close",), ("high", "low")])
+def test_arrays_bounds_and_columns(root, compacted, start_ts, end_ts, columns):
+    dataset = KlineDataset(root)
+    if compacted:
+        dataset.compact(SYMBOL, "1h")
+    t, df = _expected(root, start_ts, end_ts)
+    out = dataset.arrays(SYMBOL, "1h", start_ts, end_ts, columns=columns)
+    assert list(out) == ["open_time", *columns]
+    assert out["open_time"].dtype == np.int64
+    np.testing.assert_array_equal(out["open_time"], t)
+    for c in columns:
+        assert out[c].dtype == np.float64
+        np.testing.assert_array_equal(out[c], df[c].to_numpy())
+
+
+def test_missing_partition_is_empty(root):
+    out = KlineDataset(root).arrays("MISSINGUSDT", "1h", columns=("close",))
+    assert out["open_time"].dtype == np.int64 and len(out["open_time"]) == 0 and len(out["close"]) == 0
+
+
+def test_compaction_round_trip(root):
+    dataset = KlineDataset(root)
+    before = dataset.arrays(SYMBOL, "1h", columns=("open", "high", "low", "close", "volume"))
+    path = dataset.compact(SYMBOL, "1h")
+    assert path.name == IPC_FILE and dataset._ipc_path(SYMBOL, "1h") == path
+    assert not list(path.parent.glob("*.tmp"))
+    after = dataset.arrays(SYMBOL, "1h", columns=("open", "high", "low", "close", "volume"))
+    for key in before:
+        np.testing.assert_array_equal(after[key], before[key])
+    # served from the memory-mapped file: read-only views
+    assert not after["close"].flags.writeable
+    frame = dataset.read_frame(SYMBOL, "1h")
+    np.testing.assert_array_equal(frame["close"], before["close"])
+    assert dataset.partitions() == [("DATASETUSDT", "1h"), ("OTHERUSDT", "1h")]
+
+    # a later store write makes the IPC file stale: reads go back to parquet and see the new rows
+    old = path.stat().st_mtime - 10
+    os.utime(path, (old, old))
+    extra = synthetic_klines(SYMBOL, "1h", _ms("2024-02-03"), _ms("2024-02-03") + 2 * HOUR - 1, listing_delay=False)
+    KlineStore(root).write(SYMBOL, "1h", extra)
+    assert dataset._ipc_path(SYMBOL, "1h") is None
+    fresh = dataset.arrays(SYMBOL, "1h", columns=("close",))
+    assert len(fresh["close"]) == len(before["close"]) + 2
+    assert fresh["open_time"][-1] == _ms("2024-02-03") + HOUR
+    dataset.compact(SYMBOL, "1h")
+    np.testing.assert_array_equal(dataset.arrays(SYMBOL, "1h", columns=("close",))["close"], fresh["close"])
@@ -0,0 +1,143 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from bench.synthetic import KLINE_COLUMNS, synthetic_klines
+from data.binance_collector import BinanceDataClient
+from data.concurrent_fetch import MONTH_MS
+from data.kline_store import KlineStore
+
+HOUR = 3_600_000
+
+
+def _ms(s):
+    return int(pd.Timestamp(s, tz="UTC").timestamp() * 1000)
+
+
+class FakeExchange:
+    """futures_historical_klines over one fixed 1h history listed at `listing`; records every request."""
+
+    def __init__(self, listing="2024-01-10", end="2024-03-01"):
+        self.klines = synthetic_klines("FAKEUSDT", "1h", _ms(listing), _ms(end), listing_delay=False)
+        self.requests = []
+
+    def futures_historical_klines(self, symbol, interval, start_str, end_str=None, limit=1500):
+        self.requests.append((int(start_str), None if end_str is None else int(end_str)))
+        t = self.klines.index.asi8 // 1_000_000
+        mask = (t >= start_str) & (t <= (end_str if end_str is not None else t.max()))
+        df = self.klines[mask]
+        cols = [t[mask], *(df[c].to_numpy() for c in KLINE_COLUMNS[1:])]
+        return [list(row) for row in zip(*(c.tolist() for c in cols))]
+
+    def expected(self, start_ts, end_ts):
+        t = self.klines.index.asi8 // 1_000_000
+        return self.klines[(t >= start_ts) & (t <= end_ts)]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return KlineStore(tmp_path)
+
+
+def _assert_same_candles(got, expected):
+    assert got.index.equals(expected.index)
+    np.testing.assert_allclose(got[["open", "high", "low", "close"]], expected[["open", "high", "low", "close"]])
+
+
+def test_head_and_tail_gaps_are_fetched(store):
+    fake = FakeExchange()
+    client = BinanceDataClient(client=fake, store=store)
+    client.fetch_klines("FAKEUSDT", "1h", _ms("2024-01-20"), _ms("2024-01-25"))
+    assert store.coverage("FAKEUSDT", "1h") == (_ms("2024-01-20"), _ms("2024-01-25"))
+
+    fake.requests.clear()
+    start, end = _ms("2024-01-15"), _ms("2024-02-05")
+    df = client.fetch_klines("FAKEUSDT", "1h", start, end)
+    assert fake.requests == [(start, _ms("2024-01-20") - HOUR), (_ms("2024-01-25") + HOUR, end)]
+    _assert_same_candles(df, fake.expected(start, end))
+    assert store.coverage("FAKEUSDT", "1h") == (start, end)
+
+    # fully covered: served from the store
+    fake.requests.clear()
+    _assert_same_candles(client.fetch_klines("FAKEUSDT", "1h", start, end), fake.expected(start, end))
+    assert fake.requests == []
+
+
+def test_offline_mode_raises_on_missing_ranges(store):
+    fake = FakeExchange()
+    BinanceDataClient(client=fake, store=store).fetch_klines("FAKEUSDT", "1h", _ms("2024-01-20"), _ms("2024-01-25"))
+
+    offline = BinanceDataClient(store=store, offline=True)
+    assert offline.client is None and offline.fetcher is None
+    df = offline.fetch_klines("FAKEUSDT", "1h", _ms("2024-01-21"), _ms("2024-01-22"))
+    _assert_same_candles(df, fake.expected(_ms("2024-01-21"), _ms("2024-01-22")))
+    with pytest.raises(ValueError, match="offline"):
+        offline.fetch_klines("FAKEUSDT", "1h", _ms("2024-01-21"), _ms("2024-01-27"))
+    with pytest.raises(ValueError, match="offline"):
+        offline.fetch_klines("OTHERUSDT", "1h", _ms("2024-01-21"), _ms("2024-01-22"))
+    with pytest.raises(ValueError, match="KlineStore"):
+        BinanceDataClient(store=None, offline=True)
+
+
+def test_empty_head_before_listing_is_not_refetched(store):
+    fake = FakeExchange(listing="2024-01-10")
+    client = BinanceDataClient(client=fake, store=store)
+    start, end = _ms("2024-01-05"), _ms("2024-01-12")
+    df = client.fetch_klines("FAKEUSDT", "1h", start, end)
+    assert df.index[0] == pd.Timestamp("2024-01-10", tz="UTC")
+    assert store.coverage("FAKEUSDT", "1h") == (start, end)
+
+    fake.requests.clear()
+    client.fetch_klines("FAKEUSDT", "1h", start, end)
+    client.fetch_klines("FAKEUSDT", "1h", _ms("2024-01-06"), end)
+    assert fake.requests == []
+    # earlier than what was recorded is still fetched (and found empty)
+    client.fetch_klines("FAKEUSDT", "1h", _ms("2024-01-01"), end)
+    assert fake.requests == [(_ms("2024-01-01"), start - HOUR)]
+    assert store.coverage("FAKEUSDT", "1h")[0] == _ms("2024-01-01")
+
+
+def test_nothing_recorded_without_candles(store):
+    client = BinanceDataClient(client=FakeExchange(listing="2024-01-10"), store=store)
+    with pytest.raises(ValueError, match="No klines"):
+        client.fetch_klines("FAKEUSDT", "1h", _ms("2024-01-01"), _ms("2024-01-05"))
+    assert store.coverage("FAKEUSDT", "1h") is None
+    # a later listing-day request is not shadowed by the empty one
+    df = client.fetch_klines("FAKEUSDT", "1h", _ms("2024-01-08"), _ms("2024-01-11"))
+    assert store.coverage("FAKEUSDT", "1h") == (_ms("2024-01-08"), df.index.asi8[-1] // 1_000_000)
+
+
+def test_monthly_partition_rewrite(store):
+    klines = synthetic_klines("FAKEUSDT", "1h", _ms("2024-01-30"), _ms("2024-02-03"), listing_delay=False)
+    store.write("FAKEUSDT", "1h", klines.loc[:"2024-02-02"])
+    part = store.partition_dir("FAKEUSDT", "1h")
+    assert sorted(p.name for p in part.glob("*.parquet")) == ["2024-01.parquet", "2024-02.parquet"]
+    jan = pd.read_parquet(part / "2024-01.parquet")
+
+    # overlapping rewrite: later rows win, each month stays sorted and unique
+    update = klines.loc["2024-02-01 12:00":].assign(close=lambda d: d["close"] + 1.0)
+    store.write("FAKEUSDT", "1h", update.iloc[::-1])
+    feb = pd.read_parquet(part / "2024-02.parquet")
+    assert feb.index.is_monotonic_increasing and feb.index.is_unique
+    assert feb.index[0] == pd.Timestamp("2024-02-01", tz="UTC")
+    assert feb.index[-1] == klines.index[-1]
+    np.testing.assert_array_equal(feb.loc["2024-02-01 12:00":, "close"], update["close"])
+    np.testing.assert_array_equal(feb.loc[:"2024-02-01 11:00", "close"], klines.loc["2024-02-01":"2024-02-01 11:00", "close"])
+    pd.testing.assert_frame_equal(pd.read_parquet(part / "2024-01.parquet"), jan)
+    assert not list(part.glob("*.tmp"))
+
+    df = store.read("FAKEUSDT", "1h", _ms("2024-01-31 22:00"), _ms("2024-02-01 01:00"))
+    assert len(df) == 4
+
+
+def test_missing_ranges_for_monthly_candles(store):
+    months = pd.date_range("2024-02-01", "2024-04-01", freq="MS", tz="UTC")
+    klines = synthetic_klines("FAKEUSDT", "1d", _ms("2024-02-01"), _ms("2024-02-03"), listing_delay=False).iloc[:1]
+    store.write("FAKEUSDT", "1M", pd.concat([klines.set_axis([m]) for m in months]).rename_axis("open_time"))
+    client = BinanceDataClient(store=store, offline=True)
+    start, end = _ms("2024-01-01"), _ms("2024-06-01")
+    gaps = client._missing_ranges("FAKEUSDT", "1M", start, end)
+    assert gaps == [(start, _ms("2024-02-01") - MONTH_MS), (_ms("2024-04-01") + MONTH_MS, end)]
+    # the neighbouring month opens fall inside the gaps
+    assert gaps[0][1] >= _ms("2024-01-01") and gaps[1][0] <= _ms("2024-05-01")
+    assert client._missing_ranges("FAKEUSDT", "1M", _ms("2024-01-15"), _ms("2024-04-20")) == []
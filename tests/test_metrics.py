@@ -0,0 +1,113 @@
+import math
+import statistics
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.fast_engine import run_backtest_batch, run_fast_backtest
+from backtest.metrics import (
+    RunningMetrics,
+    compute_metrics,
+    drawdown,
+    equity_metrics,
+    periods_per_year,
+    sharpe_ratio,
+    sortino_ratio,
+    trade_stats,
+)
+from bench.synthetic import synthetic_ohlcv
+
+EQUITY = [100.0, 110.0, 99.0, 121.0]
+RETURNS = [0.1, -0.1, 22.0 / 99.0]
+
+
+def test_sharpe_and_sortino_known_values():
+    mean = statistics.fmean(RETURNS)
+    assert sharpe_ratio(EQUITY, 1.0) == pytest.approx(mean / statistics.stdev(RETURNS))
+    assert sharpe_ratio(EQUITY, 4.0) == pytest.approx(2 * mean / statistics.stdev(RETURNS))
+    assert sortino_ratio(EQUITY, 1.0) == pytest.approx(mean / math.sqrt(0.01 / 3))
+    # flat curve / too short: 0, not nan
+    assert sharpe_ratio([100.0, 100.0, 100.0]) == 0.0
+    assert sharpe_ratio([100.0, 101.0]) == 0.0
+    assert sortino_ratio([100.0, 101.0, 102.0]) == 0.0
+    rows = np.array([EQUITY, EQUITY[::-1]])
+    np.testing.assert_array_equal(sharpe_ratio(rows, 1.0), [sharpe_ratio(EQUITY, 1.0), sharpe_ratio(EQUITY[::-1], 1.0)])
+
+
+def test_drawdown_known_values():
+    assert drawdown(EQUITY) == pytest.approx((0.1, 1))
+    # unrecovered drawdown counts to the end
+    max_dd, bars = drawdown([100.0, 120.0, 90.0, 100.0, 110.0])
+    assert (max_dd, bars) == (pytest.approx(0.25), 3)
+    # initial capital above every value is the peak
+    max_dd, bars = drawdown([100.0, 120.0, 90.0, 100.0, 110.0], initial=150.0)
+    assert (max_dd, bars) == (pytest.approx(0.4), 4)
+    max_dd, bars = drawdown(np.array([[100.0, 50.0, 100.0], [100.0, 100.0, 100.0]]))
+    assert max_dd.tolist() == [0.5, 0.0] and bars.tolist() == [1, 0]
+
+
+def test_equity_metrics_known_values():
+    m = equity_metrics(EQUITY, periods=2.0)
+    assert m["final_value"] == 121.0
+    assert m["total_return"] == pytest.approx(0.21)
+    # 4 bars at 2 bars a year = 2 years
+    assert m["annual_return"] == pytest.approx(0.1)
+    assert m["calmar"] == pytest.approx(0.1 / 0.1)
+    assert m["sharpe_dd"] == pytest.approx(m["sharpe"] * 0.9)
+    assert equity_metrics(EQUITY, 2.0, initial=121.0)["total_return"] == 0.0
+    assert periods_per_year(pd.date_range("2024-01-01", periods=5, freq="15min")) == 365 * 24 * 4
+
+
+def test_trade_stats_known_values():
+    t = trade_stats(np.array([10.0, -5.0, 20.0, -5.0]), np.array([0, 3, 6, 8]), np.array([2, 5, 7, 10]), n_bars=20)
+    assert t["n_trades"] == 4
+    assert t["win_rate"] == 0.5
+    assert t["profit_factor"] == 3.0
+    assert t["avg_trade"] == 5.0
+    assert t["avg_win"] == 15.0
+    assert t["avg_loss"] == -5.0
+    assert t["exposure"] == pytest.approx(7 / 20)
+
+    padded = trade_stats(np.array([[10.0, -5.0, np.nan], [1.0, np.nan, np.nan], [np.nan] * 3]))
+    assert padded["n_trades"].tolist() == [2, 1, 0]
+    assert padded["profit_factor"].tolist() == [2.0, np.inf, 0.0]
+    assert padded["avg_loss"].tolist() == [-5.0, 0.0, 0.0]
+
+
+@pytest.fixture(scope="module")
+def bars():
+    start = int(pd.Timestamp("2024-01-01", tz="UTC").timestamp() * 1000)
+    return synthetic_ohlcv("METRICSUSDT", "1h", start, start + 1500 * 3_600_000 - 1, listing_delay=False)
+
+
+def test_batch_metrics_match_single_runs(bars):
+    ohlc = bars[["open", "high", "low", "close"]].to_numpy()
+    signal = np.random.default_rng(0).choice([-1, 0, 0, 0, 1], len(bars)).astype(np.int8)
+    sl, rr = np.array([0.005, 0.01, 0.02]), np.array([1.5, 2.0, 1.0])
+    batch = compute_metrics(run_backtest_batch(ohlc, signal, sl, rr, record_equity=True), periods=8760.0)
+    no_equity = compute_metrics(run_backtest_batch(ohlc, signal, sl, rr), periods=8760.0)
+    for k in range(3):
+        single = compute_metrics(
+            run_fast_backtest(*ohlc.T, signal, sl_pct=sl[k], rr=rr[k]), periods=8760.0, initial=100_000.0
+        )
+        for key, value in single.items():
+            assert batch[key][k] == pytest.approx(value, rel=1e-9, abs=1e-12), key
+            if key in no_equity:
+                assert no_equity[key][k] == pytest.approx(value, rel=1e-9, abs=1e-12), key
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_running_metrics_in_segments_match_whole_curve(seed):
+    rng = np.random.default_rng(seed)
+    equity = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, 1000)))
+    cuts = np.sort(rng.choice(np.arange(1, 1000), 7, replace=False))
+    running = RunningMetrics(periods=8760.0)
+    for part in np.split(equity, cuts):
+        running.update(part)
+    running.update(np.empty(0))
+    got = running.values()
+    expected = equity_metrics(equity, 8760.0)
+    assert got.keys() == expected.keys()
+    for key in expected:
+        assert got[key] == pytest.approx(expected[key], rel=1e-9), key
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from bench.synthetic import synthetic_ohlcv
+from data.multi_tf_loader import OHLCV, RESAMPLE_MODES, resample_ohlcv
+
+AGG = {"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"}
+START = int(pd.Timestamp("2024-01-01", tz="UTC").timestamp() * 1000)
+STEP = 300_000
+
+
+@pytest.fixture(scope="module")
+def base():
+    # two days + 35 minutes of 5m candles (a partial last bucket for every target) with a hole in the middle
+    df = synthetic_ohlcv("RESAMPLEUSDT", "5m", START, START + (2 * 288 + 7) * STEP - 1, listing_delay=False)
+    return df[OHLCV].drop(df.index[100:113])
+
+
+def _closed_reference(df, base_iv, target_iv):
+    bars = df.resample(pd.Timedelta(target_iv), closed="left", label="left", origin="epoch").agg(AGG)
+    bars = bars.dropna(subset=["open"])  # empty buckets (the hole) never close a bar
+    bars["available"] = bars.index + pd.Timedelta(target_iv)
+    rows = pd.DataFrame({"close_time": df.index + pd.Timedelta(base_iv)})
+    merged = pd.merge_asof(rows, bars.reset_index(drop=True), left_on="close_time", right_on="available")
+    return merged[OHLCV].set_axis(df.index)
+
+
+def _in_progress_reference(df, target_iv):
+    bucket = df.index.floor(pd.Timedelta(target_iv))
+    rows = []
+    for t, b in zip(df.index, bucket):
+        part = df[(df.index >= b) & (df.index <= t)]
+        rows.append(
+            [part["open"].iloc[0], part["high"].max(), part["low"].min(), part["close"].iloc[-1], part["volume"].sum()]
+        )
+    return pd.DataFrame(rows, index=df.index, columns=OHLCV)
+
+
+@pytest.mark.parametrize("unit", ["ns", "ms"])
+@pytest.mark.parametrize("alignment", RESAMPLE_MODES)
+@pytest.mark.parametrize("target_iv", ["15m", "1h", "4h", "1d"])
+def test_resample_matches_pandas(base, unit, alignment, target_iv):
+    df = base.set_axis(base.index.as_unit(unit))
+    got = resample_ohlcv(df, "5m", target_iv, alignment)
+    if alignment == "closed":
+        expected = _closed_reference(base, "5m", target_iv)
+    else:
+        expected = _in_progress_reference(base, target_iv)
+    assert got.index.equals(df.index)
+    pd.testing.assert_frame_equal(got.set_axis(base.index), expected, check_exact=False, rtol=1e-12)
+
+
+def test_closed_partial_last_bucket_is_never_used(base):
+    got = resample_ohlcv(base, "5m", "1d", "closed")
+    # day 1 closes with the last 5m candle of 2024-01-01; nothing of the partial third day shows up
+    first_close = base.index.get_loc(pd.Timestamp("2024-01-01 23:55", tz="UTC"))
+    assert got["close"].iloc[:first_close].isna().all()
+    day2 = base.loc["2024-01-02"]
+    assert got["close"].iloc[-1] == day2["close"].iloc[-1]
+    assert got["volume"].iloc[-1] == pytest.approx(day2["volume"].sum(), rel=1e-12)
+
+
+def test_resample_rejects_bad_arguments(base):
+    with pytest.raises(ValueError, match="multiple"):
+        resample_ohlcv(base, "3m", "5m")
+    with pytest.raises(ValueError, match="alignment"):
+        resample_ohlcv(base, "5m", "1h", "ffill")
+    assert resample_ohlcv(base.iloc[:0], "5m", "1h").empty
@@ -0,0 +1,60 @@
+import optuna
+import pandas as pd
+import pytest
+
+from bench.synthetic import synthetic_ohlcv
+from optimize import optuna_runner
+from optimize.optuna_runner import optimize_study
+
+START = int(pd.Timestamp("2024-01-01", tz="UTC").timestamp() * 1000)
+
+
+@pytest.fixture(scope="module")
+def df():
+    return synthetic_ohlcv("OPTUNAUSDT", "1h", START, START + 400 * 3_600_000 - 1, listing_delay=False)
+
+
+def test_batch_rejects_explicit_backtrader(df):
+    study = optuna.create_study(direction="maximize")
+    with pytest.raises(ValueError, match="batch_size"):
+        optimize_study(study, df, trials=4, engine="backtrader", batch_size=2)
+    assert len(study.trials) == 0
+
+
+def test_batch_defaults_to_fast(df):
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    study = optuna.create_study(direction="maximize", sampler=optuna.samplers.RandomSampler(seed=0))
+    optimize_study(study, df, trials=4, batch_size=2)
+    assert len(study.trials) == 4
+
+
+@pytest.mark.parametrize("engine, batch_size", [("backtrader", 1), (None, 1), ("fast", 2)])
+def test_checkpoints_need_a_reporting_path(df, engine, batch_size):
+    study = optuna.create_study(direction="maximize", pruner=optuna.pruners.MedianPruner())
+    with pytest.raises(ValueError, match="needs"):
+        optimize_study(study, df, trials=2, engine=engine, batch_size=batch_size, checkpoint_every=50)
+
+
+def test_fast_trials_report_checkpoints(df):
+    study = optuna.create_study(direction="maximize", pruner=optuna.pruners.MedianPruner(n_startup_trials=2))
+    optimize_study(study, df, trials=6, engine="fast", checkpoint_every=100)
+    assert all(t.intermediate_values for t in study.trials)
+    assert {t.state for t in study.trials} <= {optuna.trial.TrialState.COMPLETE, optuna.trial.TrialState.PRUNED}
+
+
+@pytest.mark.parametrize("engine, batch_size", [("backtrader", 1), ("fast", 2)])
+def test_nop_pruner_ignores_checkpoints(df, monkeypatch, engine, batch_size):
+    seen = []
+
+    def fake_objective(trial, df, engine, grid, metric, checkpoints, periods):
+        # the backtrader strategy itself is not exercised here, only what reaches it
+        seen.append(checkpoints)
+        return 0.0
+
+    monkeypatch.setattr(optuna_runner, "objective", fake_objective)
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    study = optuna.create_study(direction="maximize", pruner=optuna.pruners.NopPruner())
+    optimize_study(study, df, trials=2, engine=engine, batch_size=batch_size, checkpoint_every=50)
+    assert len(study.trials) == 2
+    assert not any(t.intermediate_values for t in study.trials)
+    assert seen == ([None, None] if batch_size == 1 else [])
@@ -0,0 +1,64 @@
+import os
+
+import numpy as np
+import optuna
+import pandas as pd
+
+from bench.synthetic import synthetic_ohlcv
+from optimize import optuna_runner
+from optimize.optuna_runner import objective, optimize_study
+from optimize.param_space import indicator_grid
+from optimize.parallel import in_memory_copy, make_storage, optimize_parallel, study_storage
+
+START = int(pd.Timestamp("2024-01-01", tz="UTC").timestamp() * 1000)
+
+
+def test_study_storage_removes_only_its_own_journal(tmp_path):
+    with study_storage(None, n_workers=2) as path:
+        assert os.path.exists(path)
+    assert not os.path.exists(path)
+
+    given = str(tmp_path / "journal.log")
+    with study_storage(given, n_workers=2) as path:
+        assert path == given
+        optuna.create_study(storage=make_storage(path))
+    assert os.path.exists(given)
+
+    with study_storage(None, n_workers=1) as path:
+        assert path is None
+
+
+def test_optimize_parallel_spawn_workers():
+    df = synthetic_ohlcv("PARALLELUSDT", "1h", START, START + 300 * 3_600_000 - 1, listing_delay=False)
+    with study_storage(None, n_workers=2) as path:
+        study = optuna.create_study(direction="maximize", storage=make_storage(path))
+        study = optimize_parallel(study, path, df, 4, 2, optimize_study, engine="fast")
+        study = in_memory_copy(study)
+    assert not os.path.exists(path)
+    assert len(study.trials) == 4
+    assert study.best_value > 0
+
+
+def _shared_grid_probe(study, df, n_trials, grid=None, **kwargs):
+    # runs in the spawned worker: the grid must arrive attached, not be rebuilt here
+    optuna_runner.indicator_grid = None
+    assert grid is not None and not grid.rsi.flags.writeable and not grid.st_dir.flags.writeable
+    optimize_study(study, df, n_trials, grid=grid, **kwargs)
+    study.set_user_attr(f"pid_{os.getpid()}", int(grid.rsi.shape[1]))
+
+
+def test_optimize_parallel_shares_the_indicator_grid():
+    df = synthetic_ohlcv("PARALLELUSDT", "1h", START, START + 300 * 3_600_000 - 1, listing_delay=False)
+    grid = indicator_grid(df)
+    with study_storage(None, n_workers=2) as path:
+        study = optuna.create_study(direction="maximize", storage=make_storage(path))
+        study = optimize_parallel(study, path, df, 6, 2, _shared_grid_probe, grid=grid, engine="fast", batch_size=3)
+        attrs = study.user_attrs
+        study = in_memory_copy(study)
+    assert len(attrs) == 2 and set(attrs.values()) == {len(df)}
+    assert len(study.trials) == 6
+    # values computed against the shared grid match a local evaluation
+    for t in study.trials:
+        value = objective(optuna.trial.FixedTrial(t.params), df, "fast", grid)
+        assert t.value == value
+    assert np.isfinite([t.value for t in study.trials]).all()
@@ -0,0 +1,14 @@
+import optuna
+import pytest
+
+from optimize.param_space import suggest_weights
+
+
+def test_suggest_weights_all_zero_falls_back_to_equal():
+    trial = optuna.trial.FixedTrial({"w_5m": 0.0, "w_1h": 0.0, "prob_threshold": 0.7})
+    weights, thr = suggest_weights(trial, ["5m", "1h"])
+    assert weights == {"sig_5m": 0.5, "sig_1h": 0.5}
+    assert thr == 0.7
+
+    trial = optuna.trial.FixedTrial({"w_5m": 0.2, "w_1h": 0.6, "prob_threshold": 0.7})
+    assert suggest_weights(trial, ["5m", "1h"])[0] == pytest.approx({"sig_5m": 0.25, "sig_1h": 0.75})
@@ -0,0 +1,37 @@
+import optuna
+import pytest
+
+from bench.synthetic import SyntheticFuturesClient
+from data.binance_collector import BinanceDataClient
+from data.multi_tf_loader import MultiTFDataLoader
+from optimize.pipeline_optuna_runner import INTERVALS, optimize_study, run_study
+from pipeline.backtest_pipeline import StudyDataContext
+
+
+@pytest.fixture(scope="module")
+def context():
+    client = BinanceDataClient(client=SyntheticFuturesClient(listing_delay=False), store=None)
+    loader = MultiTFDataLoader(client=client, resample="closed")
+    return StudyDataContext("PIPEUSDT", INTERVALS, "2024-01-01", "2024-01-15", loader=loader).load()
+
+
+def test_pruner_requires_fast_engine(context):
+    with pytest.raises(ValueError, match="engine='fast'"):
+        run_study(context, trials=2, engine="backtrader", pruner="median")
+
+
+def test_pruned_pipeline_study(context):
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    study = run_study(context, trials=8, engine="fast", pruner="median", checkpoint_every="D")
+    assert len(study.trials) == 8
+    assert all(t.intermediate_values for t in study.trials)
+    assert isinstance(study.pruner, optuna.pruners.MedianPruner)
+
+
+def test_nop_pruner_study_on_backtrader(context):
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    study = optuna.create_study(direction="maximize", pruner=optuna.pruners.NopPruner())
+    frame = context.frame
+    optimize_study(study, frame, 1, context.symbol, context.start, context.end, engine="backtrader", checkpoint_every="D")
+    assert len(study.trials) == 1
+    assert not study.trials[0].intermediate_values
@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.fast_engine import run_fast_backtest
+from backtest.portfolio import PortfolioData, run_portfolio_backtest
+from bench.synthetic import synthetic_ohlcv
+
+START = int(pd.Timestamp("2024-01-01", tz="UTC").timestamp() * 1000)
+
+
+def _frame(index):
+    n = len(index)
+    close = 100.0 + np.arange(n, dtype=np.float64)
+    return pd.DataFrame({"open": close, "high": close + 1, "low": close - 1, "close": close}, index=index)
+
+
+def _index(start, periods, unit):
+    return pd.date_range(start, periods=periods, freq="5min", tz="UTC").as_unit(unit)
+
+
+def test_align_ms_and_mixed_units_match_ns():
+    a_ns, b_ns = _index("2024-01-01", 6, "ns"), _index("2024-01-01 00:10", 6, "ns")
+    ref = PortfolioData.align({"A": _frame(a_ns), "B": _frame(b_ns)})
+
+    for units in (("ms", "ms"), ("ms", "ns"), ("s", "us")):
+        frames = {"A": _frame(a_ns.as_unit(units[0])), "B": _frame(b_ns.as_unit(units[1]))}
+        data = PortfolioData.align(frames)
+        assert data.index.equals(ref.index)
+        assert data.index[0] == pd.Timestamp("2024-01-01", tz="UTC")
+        assert data.n_bars == 8
+        for c in ("open", "high", "low", "close"):
+            np.testing.assert_array_equal(getattr(data, c), getattr(ref, c))
+
+        signals = {"A": np.ones(6, np.int8), "B": -np.ones(6, np.int8)}
+        index = {sym: df.index for sym, df in frames.items()}
+        out = data.align_signals(signals, index)
+        np.testing.assert_array_equal(out, ref.align_signals(signals, {"A": a_ns, "B": b_ns}))
+        assert out[:2, 1].tolist() == [0, 0] and out[-2:, 0].tolist() == [0, 0]
+
+
+def _synthetic(symbol, bars, offset=0):
+    start = START + offset * 300_000
+    return synthetic_ohlcv(symbol, "5m", start, start + bars * 300_000 - 1, listing_delay=False)
+
+
+def _signal(n, seed):
+    return np.random.default_rng(seed).choice([-1, 0, 0, 0, 1], n).astype(np.int8)
+
+
+def test_single_symbol_matches_fast_engine():
+    df = _synthetic("SOLOUSDT", 3000)
+    signal = _signal(len(df), 0)
+    data = PortfolioData.align({"SOLOUSDT": df})
+    res = run_portfolio_backtest(data, signal[:, None], percents=100, sl_pct=0.004, rr=2.0)
+    ref = run_fast_backtest(*(df[c].to_numpy() for c in ("open", "high", "low", "close")), signal, sl_pct=0.004, rr=2.0)
+    assert len(ref.trades) > 10
+    np.testing.assert_array_equal(res.equity, ref.equity)
+    assert res.final_value == ref.final_value
+    for col in ("entry_idx", "exit_idx", "direction", "size", "entry_price", "exit_price", "pnl"):
+        np.testing.assert_array_equal(res.trades[col].to_numpy(), ref.trades[col].to_numpy(), err_msg=col)
+
+
+def _flat(price, n=4):
+    index = pd.date_range("2024-01-01", periods=n, freq="5min", tz="UTC")
+    df = pd.DataFrame({c: np.full(n, price) for c in ("open", "high", "low", "close")}, index=index)
+    df.iloc[2, df.columns.get_loc("high")] = price * 1.02  # bar 2 touches the take profit
+    return df
+
+
+@pytest.mark.parametrize("order", [("A", "B"), ("B", "A")])
+def test_symbols_compete_for_shared_cash(order):
+    frames = {"A": _flat(100.0), "B": _flat(50.0)}
+    data = PortfolioData.align({s: frames[s] for s in order})
+    signals = np.zeros((4, 2), dtype=np.int8)
+    signals[0] = 1
+    kw = dict(commission=0.0, leverage=1.0, sl_pct=0.01, rr=1.0)
+
+    # both brackets are sized from the full cash at bar 0; the first symbol's fill uses all of it,
+    # so the second is rejected (Margin) and the ledger never goes negative
+    res = run_portfolio_backtest(data, signals, percents=100, **kw)
+    assert (res.margin[1], res.cash[1]) == (100_000.0, 0.0)
+    assert res.trades["symbol"].tolist() == [order[0]]
+    assert res.trades[["entry_idx", "exit_idx"]].values.tolist() == [[1, 2]]
+    assert res.final_value == pytest.approx(101_000.0)
+    # each symbol alone would have filled
+    for sym in order:
+        alone = run_portfolio_backtest(PortfolioData.align({sym: frames[sym]}), signals[:, :1], percents=100, **kw)
+        assert alone.trades["symbol"].tolist() == [sym]
+
+    # half the cash each: both fit
+    res = run_portfolio_backtest(data, signals, percents=50, **kw)
+    assert (res.margin[1], res.cash[1]) == (100_000.0, 0.0)
+    assert sorted(res.trades["symbol"]) == ["A", "B"]
+    np.testing.assert_allclose(res.trades["pnl"], [500.0, 500.0])
+    assert res.final_value == pytest.approx(101_000.0)
+
+
+def test_segment_size_does_not_change_result():
+    # B lists later, C stops early: nan cells on both ends
+    frames = {
+        "AUSDT": _synthetic("AUSDT", 2000),
+        "BUSDT": _synthetic("BUSDT", 1500, offset=400),
+        "CUSDT": _synthetic("CUSDT", 900),
+    }
+    data = PortfolioData.align(frames)
+    signals = data.align_signals(
+        {s: _signal(len(df), k) for k, (s, df) in enumerate(frames.items())},
+        {s: df.index for s, df in frames.items()},
+    )
+    whole = run_portfolio_backtest(data, signals)
+    assert len(whole.trades) > 20 and set(whole.trades["symbol"]) == set(frames)
+    for segment in (1, 7, 333):
+        res = run_portfolio_backtest(data, signals, segment=segment)
+        np.testing.assert_array_equal(res.equity, whole.equity)
+        np.testing.assert_array_equal(res.cash, whole.cash)
+        np.testing.assert_array_equal(res.margin, whole.margin)
+        pd.testing.assert_frame_equal(res.trades, whole.trades)
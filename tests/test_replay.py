@@ -0,0 +1,158 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.fast_engine import run_fast_backtest
+from backtest.replay import _book_fill, _book_update, replay_backtest
+from bench.synthetic import synthetic_ohlcv, write_agg_trade_fixtures
+from data.tick_stream import ASK, BID, TRADE, TickChunk, iter_agg_trades, iter_depth_updates, merge_streams
+
+START = int(pd.Timestamp("2024-01-01", tz="UTC").timestamp() * 1000)
+STEP = 60_000
+
+
+def _chunk(times, prices, qty=None, kind=TRADE):
+    times = np.asarray(times, dtype=np.int64)
+    kinds = np.asarray(kind, dtype=np.int8) if np.ndim(kind) else np.full(len(times), kind, dtype=np.int8)
+    qty = np.ones(len(times)) if qty is None else np.asarray(qty, dtype=np.float64)
+    return TickChunk(times, np.asarray(prices, dtype=np.float64), qty, kinds)
+
+
+def _bars(rows):
+    index = pd.to_datetime(START + STEP * np.arange(len(rows)), unit="ms", utc=True)
+    return pd.DataFrame(rows, columns=["open", "high", "low", "close"], index=index)
+
+
+def _ohlc(bars):
+    return [bars[c].to_numpy() for c in ("open", "high", "low", "close")]
+
+
+def test_no_events_matches_bar_engine():
+    bars = synthetic_ohlcv("REPLAYUSDT", "1m", START, START + 2000 * STEP - 1, listing_delay=False)
+    signal = np.random.default_rng(0).choice([-1, 0, 0, 0, 1], len(bars)).astype(np.int8)
+    ref = run_fast_backtest(*_ohlc(bars), signal)
+    res = replay_backtest(bars, signal, None, "1m")
+    np.testing.assert_array_equal(res.equity, ref.equity)
+    pd.testing.assert_frame_equal(res.trades, ref.trades)
+    assert len(ref.trades) > 10
+    assert (res.fallback_bars, res.tick_bars) == (len(bars), 0)
+
+
+# long bracket from the bar-0 close 100: SL 99.5, TP 100.75; entry fills in bar 1,
+# bar 2 touches both levels
+BRACKET_BARS = [(100, 100, 100, 100), (100, 100, 100, 100), (100, 101, 99, 100), (100, 100, 100, 100)]
+
+
+@pytest.mark.parametrize("path, exit_price", [([100.0, 101.0, 99.0], 100.75), ([100.0, 99.0, 101.0], 99.0)])
+def test_first_touched_bracket_level_wins(path, exit_price):
+    bars = _bars(BRACKET_BARS)
+    signal = np.array([1, 0, 0, 0], dtype=np.int8)
+    times = [START + STEP, *(START + 2 * STEP + 10 * k for k in range(3))]
+    res = replay_backtest(bars, signal, [_chunk(times, [100.0, *path])], "1m")
+    assert len(res.trades) == 1
+    trade = res.trades.iloc[0]
+    assert (trade.entry_idx, trade.exit_idx, trade.entry_price) == (1, 2, 100.0)
+    # TP is a limit at its price, SL a market order at the touching trade
+    assert trade.exit_price == exit_price
+
+    # the bar engine cannot order the touches and always takes the stop
+    ref = run_fast_backtest(*_ohlc(bars), signal)
+    assert ref.trades.iloc[0].exit_price == pytest.approx(99.5)
+
+
+@pytest.mark.parametrize("levels, last_px", [(2, 100.2), (3, 100.3)])
+def test_entry_walks_past_top_n_book(levels, last_px):
+    bars = _bars(BRACKET_BARS)
+    signal = np.array([1, 0, 0, 0], dtype=np.int8)
+    t = START + STEP
+    # asks 100.1 / 100.2 / 100.3 (the last is outside a 2-level book), then a bid makes the book priced
+    depth = _chunk([t, t, t, t + 1], [100.1, 100.2, 100.3, 99.9], [1, 1, 1, 1], [ASK, ASK, ASK, BID])
+    exit_tick = _chunk([START + 2 * STEP], [101.0])
+    res = replay_backtest(bars, signal, [TickChunk.concat([depth, exit_tick])], "1m", book_levels=levels)
+    size = 100_000.0 / 100.0
+    expected = (100.1 + 100.2 + (size - 2) * last_px) / size if levels == 3 else (100.1 + (size - 1) * 100.2) / size
+    trade = res.trades.iloc[0]
+    assert trade.entry_price == pytest.approx(expected, rel=1e-12)
+    assert trade.exit_price == 100.75
+
+
+def test_book_update_and_fill():
+    px = np.zeros((2, 3))
+    qty = np.zeros((2, 3))
+    n = np.zeros(2, dtype=np.int64)
+    for price, q in [(101.0, 1.0), (100.5, 2.0), (102.0, 3.0), (100.0, 4.0)]:
+        _book_update(px, qty, n, 1, price, q)
+    # asks ascending, capped at 3 levels: 102 is pushed out by 100.0
+    assert px[1].tolist() == [100.0, 100.5, 101.0] and qty[1].tolist() == [4.0, 2.0, 1.0]
+    _book_update(px, qty, n, 1, 100.5, 5.0)
+    _book_update(px, qty, n, 1, 100.0, 0.0)
+    assert n[1] == 2 and px[1, :2].tolist() == [100.5, 101.0] and qty[1, :2].tolist() == [5.0, 1.0]
+    for price in (99.0, 99.5, 98.0):
+        _book_update(px, qty, n, 0, price, 1.0)
+    assert px[0].tolist() == [99.5, 99.0, 98.0]
+
+    assert _book_fill(px, qty, n, 1, 5.0) == 100.5
+    assert _book_fill(px, qty, n, 1, 6.0) == pytest.approx((5 * 100.5 + 101.0) / 6)
+    # past the book depth: the rest at the last level
+    assert _book_fill(px, qty, n, 1, 10.0) == pytest.approx((5 * 100.5 + 5 * 101.0) / 10)
+    assert _book_fill(px, qty, n, 0, 4.0) == pytest.approx((99.5 + 99.0 + 2 * 98.0) / 4)
+    n[0] = 0
+    assert np.isnan(_book_fill(px, qty, n, 0, 1.0))
+
+
+def test_merge_streams_orders_ties_by_argument():
+    a = [_chunk([1, 2], [10, 11]), _chunk([2, 5], [12, 13])]
+    b = [_chunk([2, 3], [20, 21], kind=BID), _chunk([], []), _chunk([6], [22], kind=BID)]
+    merged = TickChunk.concat(list(merge_streams(a, b)))
+    assert merged.time.tolist() == [1, 2, 2, 2, 3, 5, 6]
+    assert merged.price.tolist() == [10, 11, 12, 20, 21, 13, 22]
+    assert merged.kind.tolist() == [TRADE, TRADE, TRADE, BID, BID, TRADE, BID]
+    assert list(merge_streams([], [])) == []
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_merge_streams_matches_stable_sort(seed):
+    rng = np.random.default_rng(seed)
+    streams, flat = [], []
+    for k in range(3):
+        times = np.sort(rng.integers(0, 30, rng.integers(0, 40)))
+        prices = k * 1000.0 + np.arange(len(times))
+        cuts = np.sort(rng.integers(0, len(times) + 1, rng.integers(0, 6)))
+        streams.append([_chunk(t, p) for t, p in zip(np.split(times, cuts), np.split(prices, cuts))])
+        flat.append(_chunk(times, prices))
+    expected = TickChunk.concat(flat)
+    expected = expected.take(np.argsort(expected.time, kind="stable"))
+    merged = list(merge_streams(*streams))
+    got = TickChunk.concat(merged) if merged else expected.take(slice(0, 0))
+    assert got.time.tolist() == expected.time.tolist()
+    assert got.price.tolist() == expected.price.tolist()
+
+
+def test_iter_depth_updates(tmp_path):
+    path = tmp_path / "depth.csv"
+    pd.DataFrame(
+        {
+            "transact_time": [1, 2, 3, 4],
+            "side": ["b", "a", "bid", "ASK"],
+            "price": [99.0, 101.0, 98.0, 102.0],
+            "quantity": [1.0, 2.0, 0.0, 3.0],
+        }
+    ).to_csv(path, index=False)
+    chunks = list(iter_depth_updates([path], chunk_rows=3))
+    assert [len(c) for c in chunks] == [3, 1]
+    merged = TickChunk.concat(chunks)
+    assert merged.kind.tolist() == [BID, ASK, BID, ASK]
+    assert merged.qty.tolist() == [1.0, 2.0, 0.0, 3.0]
+
+
+def test_chunk_size_invariance(tmp_path):
+    end = START + 6 * 3_600_000 - 1
+    paths = write_agg_trade_fixtures(str(tmp_path), "REPLAYUSDT", START, end, "5m", 8, "parquet")
+    bars = synthetic_ohlcv("REPLAYUSDT", "5m", START, end, listing_delay=False)
+    signal = np.random.default_rng(1).choice([-1, 0, 0, 1], len(bars)).astype(np.int8)
+    whole = replay_backtest(bars, signal, iter_agg_trades(paths, 1_000_000), "5m")
+    single = replay_backtest(bars, signal, iter_agg_trades(paths, 1), "5m")
+    assert whole.n_events == single.n_events == 8 * len(bars)
+    assert whole.tick_bars == len(bars) and len(whole.trades) > 5
+    np.testing.assert_array_equal(single.equity, whole.equity)
+    pd.testing.assert_frame_equal(single.trades, whole.trades)
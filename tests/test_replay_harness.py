@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from bench.synthetic import synthetic_klines
+from data.binance_collector import BinanceDataClient
+from data.kline_dataset import KlineDataset
+from data.kline_store import KlineStore
+from data.multi_tf_loader import MultiTFDataLoader
+from pipeline.backtest_pipeline import compute_interval_signals
+from pipeline.replay import LatencyHistogram, ReplayHarness
+from signals.rsi_supertrend import signal_array
+
+INTERVALS = ["5m", "15m", "1h"]
+START, END = "2024-01-01", "2024-01-05"
+SYMBOL = "REPLAYUSDT"
+
+
+def test_latency_histogram_is_bounded_and_close_to_exact():
+    rng = np.random.default_rng(0)
+    samples = rng.lognormal(9, 1.5, 20_000).astype(np.int64)
+    h = LatencyHistogram()
+    for ns in samples.tolist():
+        h.record(ns)
+    assert len(h.counts) == 64 * LatencyHistogram.SUB
+    assert (h.count, h.total, h.min, h.max) == (len(samples), int(samples.sum()), samples.min(), samples.max())
+    for q in (50, 90, 99):
+        exact = np.percentile(samples, q)
+        assert exact * 0.97 <= h.percentile(q) <= exact * 1.13
+    assert sum(h.buckets().values()) == len(samples)
+    assert LatencyHistogram().summary() == {"count": 0}
+
+
+@pytest.fixture(scope="module")
+def dataset(tmp_path_factory):
+    """5m 합성 캔들과, 그것을 모은 15m / 1h 캔들을 같은 저장소에 둔다."""
+    root = tmp_path_factory.mktemp("klines")
+    store = KlineStore(root)
+    start_ms = int(pd.Timestamp(START, tz="UTC").timestamp() * 1000)
+    end_ms = int(pd.Timestamp(END, tz="UTC").timestamp() * 1000) + 86_400_000 - 1
+    base = synthetic_klines(SYMBOL, "5m", start_ms, end_ms, listing_delay=False)
+    store.write(SYMBOL, "5m", base)
+    agg = {"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"}
+    for iv in INTERVALS[1:]:
+        store.write(SYMBOL, iv, base.resample(pd.Timedelta(iv), label="left", closed="left").agg(agg))
+    return root
+
+
+def test_empty_inputs(dataset):
+    harness = ReplayHarness(KlineDataset(dataset), INTERVALS)
+    assert all(len(a) == 0 for a in harness.events([]))
+    assert harness.run([]).n_events == 0
+    report = harness.run(["MISSINGUSDT"])
+    assert report.n_events == 0 and report.frame("MISSINGUSDT").empty
+
+
+def test_pipeline_alignment_matches_batch_signals(dataset):
+    loader = MultiTFDataLoader(client=BinanceDataClient(store=KlineStore(dataset), offline=True), resample="closed")
+    batch = compute_interval_signals(loader.fetch_and_merge(SYMBOL, INTERVALS, START, END), INTERVALS)
+
+    report = ReplayHarness(KlineDataset(dataset), INTERVALS, alignment="pipeline").run([SYMBOL], record=True)
+    replay = report.frame(SYMBOL).reindex(batch.index)
+    assert report.summary()["alignment"] == "pipeline"
+    for iv in INTERVALS:
+        np.testing.assert_array_equal(replay[f"sig_{iv}"].to_numpy(), batch[f"sig_{iv}"].to_numpy())
+
+
+def test_native_alignment_uses_closed_higher_candles(dataset):
+    ds = KlineDataset(dataset)
+    report = ReplayHarness(ds, INTERVALS).run([SYMBOL], record=True)
+    replay = report.frame(SYMBOL)
+    base_close = replay.index.asi8 // 1_000_000 + 300_000
+    for iv in INTERVALS[1:]:
+        a = ds.arrays(SYMBOL, iv)
+        sig = signal_array(a["high"], a["low"], a["close"])
+        close_ms = a["open_time"] + int(pd.Timedelta(iv).total_seconds() * 1000)
+        pos = np.searchsorted(close_ms, base_close, side="right") - 1
+        expected = np.where(pos >= 0, sig[np.maximum(pos, 0)], 0)
+        np.testing.assert_array_equal(replay[f"sig_{iv}"].to_numpy(), expected)
+
+
+def test_rows_are_recorded_only_on_request(dataset):
+    ds = KlineDataset(dataset)
+    recorded = ReplayHarness(ds, INTERVALS).run([SYMBOL], record=True)
+    n_base = len(ds.arrays(SYMBOL, INTERVALS[0])["open_time"])
+    assert len(recorded.rows[SYMBOL]) == n_base
+
+    default = ReplayHarness(ds, INTERVALS).run([SYMBOL])
+    assert default.n_events == recorded.n_events
+    assert default.rows == {} and default.frame(SYMBOL).empty
+    assert default.latencies["indicators"].count == recorded.latencies["indicators"].count
+
+    seen = []
+    streamed = ReplayHarness(ds, INTERVALS).run([SYMBOL], on_row=lambda sym, row: seen.append((sym, row)))
+    assert streamed.rows == {}
+    assert [sym for sym, _ in seen] == [SYMBOL] * n_base
+    np.testing.assert_array_equal([row for _, row in seen], recorded.rows[SYMBOL])
+    both = []
+    report = ReplayHarness(ds, INTERVALS).run([SYMBOL], record=True, on_row=lambda sym, row: both.append(row))
+    assert report.rows[SYMBOL] == both
@@ -0,0 +1,122 @@
+"""스트리밍 IndicatorState / SignalEngine 이 배치 커널·signal_array 와 비트 단위로 같은지 (무작위 속성 검사)."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from bench.synthetic import SyntheticFuturesClient
+from data.binance_collector import BinanceDataClient
+from data.multi_tf_loader import MultiTFDataLoader
+from indicators.kernels import atr_wilder, rsi_wilder, supertrend_from_atr
+from pipeline.backtest_pipeline import BacktestPipeline, StudyDataContext
+from probability.calibrator import CALIBRATION_METHODS, ProbabilityCalibrator
+from signals.aggregator import SignalAggregator
+from signals.rsi_supertrend import signal_array
+from signals.streaming import IndicatorState, SignalEngine
+
+
+def _random_case(seed: int):
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(1, 400))
+    close = 100 * np.exp(np.cumsum(rng.normal(0, rng.choice([1e-4, 3e-3, 2e-2]), n)))
+    if n > 20 and rng.random() < 0.5:
+        a = int(rng.integers(0, n - 10))
+        close[a : a + int(rng.integers(2, 10))] = close[a]  # flat stretch
+    open_ = np.r_[close[0], close[:-1]]
+    high = np.maximum(open_, close) * (1 + rng.random(n) * 2e-3 * rng.integers(0, 2, n))
+    low = np.minimum(open_, close) * (1 - rng.random(n) * 2e-3 * rng.integers(0, 2, n))
+    lead = int(rng.integers(0, min(n, 30))) if rng.random() < 0.3 else 0
+    high[:lead] = low[:lead] = close[:lead] = np.nan  # not yet listed / merged higher TF
+    params = dict(
+        rsi_period=int(rng.integers(2, 15)),
+        rsi_overbought=int(rng.integers(60, 91)),
+        rsi_oversold=int(rng.integers(10, 41)),
+        st_atr_period=int(rng.integers(2, 22)),
+        st_multiplier=float(np.round(rng.uniform(1.0, 5.0), 1)),
+    )
+    return high, low, close, params
+
+
+def _same(a, b):
+    np.testing.assert_array_equal(np.asarray(a, dtype=np.float64), np.asarray(b, dtype=np.float64))
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_indicator_state_matches_batch(seed):
+    high, low, close, params = _random_case(seed)
+    st = IndicatorState(**params)
+    rsi, atr, value, direction, sig = [], [], [], [], []
+    for h, lo, c in zip(high.tolist(), low.tolist(), close.tolist()):
+        sig.append(st.update(h, lo, c))
+        rsi.append(st.rsi)
+        atr.append(st.atr)
+        value.append(st.st_value)
+        direction.append(st.direction)
+
+    batch_atr = atr_wilder(high, low, close, params["st_atr_period"])
+    batch_value, batch_dir = supertrend_from_atr(high, low, close, batch_atr, params["st_multiplier"])
+    _same(rsi, rsi_wilder(close, params["rsi_period"]))
+    _same(atr, batch_atr)
+    _same(value, batch_value)
+    _same(direction, batch_dir)
+    _same(sig, signal_array(high, low, close, **params))
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_signal_engine_matches_batch_per_interval(seed):
+    intervals = ["5m", "1h"]
+    engine = SignalEngine(intervals)
+    for k, iv in enumerate(intervals):
+        high, low, close, _ = _random_case(1000 + 2 * seed + k)
+        index = pd.date_range("2024-01-01", periods=len(close), freq=pd.Timedelta(iv), tz="UTC")
+        events = engine.on_candles("SYM", iv, pd.DataFrame({"high": high, "low": low, "close": close}, index=index))
+        _same([e.signal for e in events], signal_array(high, low, close))
+        assert [e.open_time for e in events] == (index.asi8 // 1_000_000).tolist()
+
+
+@pytest.fixture(scope="module")
+def context():
+    client = BinanceDataClient(client=SyntheticFuturesClient(listing_delay=False), store=None)
+    loader = MultiTFDataLoader(client=client, resample="closed")
+    return StudyDataContext("STREAMUSDT", ["5m", "15m", "1h"], "2024-01-01", "2024-01-08", loader=loader).load()
+
+
+@pytest.mark.parametrize("method", CALIBRATION_METHODS)
+def test_signal_engine_matches_batch_score_and_probability(context, method):
+    intervals = context.intervals
+    weights = {"sig_5m": 0.5, "sig_15m": 0.3, "sig_1h": 0.2}
+    pipe = BacktestPipeline(
+        context.symbol,
+        intervals,
+        context.start,
+        context.end,
+        aggregator_weights=weights,
+        prob_threshold=0.5,
+        context=context,
+        engine="fast",
+        calibrator=ProbabilityCalibrator(method, verbose=False),
+    )
+    df = pipe.compute_signals(pipe.prepare_data())
+    pipe.calibrate(df)
+    batch_prob = pipe.calibrator.predict_proba(np.asarray(df["score"], dtype=np.float64))
+
+    # higher intervals see the batch path's forward-filled candle on every base row
+    engine = SignalEngine(intervals, SignalAggregator(weights), pipe.calibrator)
+    base, higher = intervals[0], intervals[1:]
+    cols = {iv: [df[f"{c}_{iv}"].to_numpy(np.float64).tolist() for c in ("high", "low", "close")] for iv in intervals}
+    events = []
+    for i, t in enumerate(df.index.as_unit("ms").asi8.tolist()):
+        for iv in higher:
+            engine.update_indicators(context.symbol, iv, *(col[i] for col in cols[iv]))
+        events.append(engine.on_candle(context.symbol, base, t, *(col[i] for col in cols[base])))
+
+    for iv in intervals:
+        _same([e.signals[f"sig_{iv}"] for e in events], df[f"sig_{iv}"])
+    score = np.array([e.score for e in events])
+    prob = np.array([e.prob for e in events])
+    np.testing.assert_allclose(score, df["score"], rtol=0, atol=1e-15)
+    np.testing.assert_allclose(prob, batch_prob, rtol=1e-12, atol=1e-15)
+    assert len(np.unique(score)) > 5
+
+    stream_signal = np.where(prob >= pipe.prob_threshold, 1, np.where(prob <= 1 - pipe.prob_threshold, -1, 0))
+    np.testing.assert_array_equal(stream_signal, pipe.trade_signals(df))
+    assert (stream_signal != 0).any()
@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from bench.synthetic import synthetic_ohlcv, write_agg_trade_fixtures
+from data.tick_stream import TickChunk, iter_agg_trades
+
+START = int(pd.Timestamp("2024-01-01 12:00", tz="UTC").timestamp() * 1000)
+END = START + 3 * 86_400_000 - 1
+
+
+@pytest.mark.parametrize("fmt", ["csv", "parquet"])
+def test_agg_trade_fixtures_stay_inside_bars(tmp_path, fmt):
+    paths = write_agg_trade_fixtures(str(tmp_path), "SYN00USDT", START, END, "5m", 20, fmt)
+    assert len(paths) == 4  # window starts mid-day
+    bars = synthetic_ohlcv("SYN00USDT", "5m", START, END, listing_delay=False)
+    ticks = TickChunk.concat(list(iter_agg_trades(paths)))
+    assert len(ticks) == 20 * len(bars)
+
+    pos = np.searchsorted(bars.index.asi8 // 1_000_000, ticks.time, side="right") - 1
+    assert pos.min() == 0 and (np.bincount(pos) == 20).all()
+    tick_min = np.full(len(bars), np.inf)
+    tick_max = np.full(len(bars), -np.inf)
+    np.minimum.at(tick_min, pos, ticks.price)
+    np.maximum.at(tick_max, pos, ticks.price)
+    # read_csv's default float parser may be off by an ulp
+    eps = 1e-12
+    assert (tick_min >= bars["low"].to_numpy() * (1 - eps)).all()
+    assert (tick_max <= bars["high"].to_numpy() * (1 + eps)).all()
+    np.testing.assert_allclose(ticks.price[::20], bars["open"].to_numpy(), rtol=eps)
+    np.testing.assert_allclose(ticks.price[19::20], bars["close"].to_numpy(), rtol=eps)
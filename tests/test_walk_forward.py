@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from bench.synthetic import synthetic_ohlcv
+from optimize.walk_forward import CASH, make_folds, walk_forward
+
+
+def _ms(s):
+    return int(pd.Timestamp(s, tz="UTC").timestamp() * 1000)
+
+
+@pytest.fixture(scope="module")
+def bars():
+    return synthetic_ohlcv("WFUSDT", "1h", _ms("2024-01-15"), _ms("2024-05-10") - 1, listing_delay=False)
+
+
+def test_fold_boundaries():
+    index = pd.date_range("2024-01-15", "2024-06-10", freq="h", tz="UTC")
+    folds = make_folds(index, train_months=2, test_months=1, step_months=1)
+    assert [f.test_from[:10] for f in folds] == ["2024-03-01", "2024-04-01", "2024-05-01", "2024-06-01"]
+    # the first train window is clipped to the data, the last test window to its end
+    assert folds[0].train_start == 0 and folds[-1].test_stop == len(index)
+    for f in folds:
+        assert index[f.train_start] >= pd.Timestamp(f.train_from)
+        assert index[f.test_start] == pd.Timestamp(f.test_from)
+        assert f.test_stop == len(index) or index[f.test_stop] == pd.Timestamp(f.test_to)
+    for prev, nxt in zip(folds, folds[1:]):
+        assert prev.test_stop == nxt.test_start
+
+    # a step longer than the test window leaves gaps but never overlaps
+    sparse = make_folds(index, train_months=1, test_months=1, step_months=2)
+    assert [f.test_from[:10] for f in sparse] == ["2024-02-01", "2024-04-01", "2024-06-01"]
+    assert all(a.test_stop <= b.test_start for a, b in zip(sparse, sparse[1:]))
+    assert make_folds(index[:0]) == []
+
+
+def test_overlapping_test_windows_are_rejected(bars):
+    with pytest.raises(ValueError, match="overlapping"):
+        make_folds(bars.index, train_months=1, test_months=2, step_months=1)
+    with pytest.raises(ValueError, match="overlapping"):
+        walk_forward(bars, trials=1, train_months=1, test_months=2, step_months=1)
+
+
+@pytest.fixture(scope="module")
+def serial(bars):
+    return walk_forward(bars, trials=4, train_months=2, test_months=1, step_months=1, seed=3)
+
+
+def test_oos_equity_is_chained(bars, serial):
+    folds, equity = serial.folds, serial.equity
+    assert len(folds) == 3
+    assert equity.index.is_unique and equity.index.is_monotonic_increasing
+    assert len(equity) == int((folds["test_stop"] - folds["test_start"]).sum())
+    assert equity.index[0] == bars.index[folds["test_start"].iloc[0]]
+
+    # each fold starts from the previous fold's ending capital
+    expected = CASH * np.cumprod(folds["test_value"].to_numpy() / CASH)
+    np.testing.assert_allclose(folds["oos_capital"], expected, rtol=1e-12)
+    ends = bars.index[folds["test_stop"].to_numpy() - 1]
+    np.testing.assert_allclose(equity.loc[ends], expected, rtol=1e-12)
+
+
+def test_workers_match_serial_with_fixed_seed(bars, serial):
+    parallel = walk_forward(bars, trials=4, train_months=2, test_months=1, step_months=1, seed=3, n_workers=2)
+    cols = ["fold", "test_start", "test_stop", "best_params", "train_value", "test_value", "oos_capital"]
+    pd.testing.assert_frame_equal(parallel.folds[cols], serial.folds[cols])
+    pd.testing.assert_series_equal(parallel.equity, serial.equity)
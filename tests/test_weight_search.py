@@ -0,0 +1,89 @@
+import numpy as np
+import optuna
+import pytest
+
+from bench.synthetic import SyntheticFuturesClient
+from data.binance_collector import BinanceDataClient
+from data.multi_tf_loader import MultiTFDataLoader
+from optimize.pipeline_optuna_runner import INTERVALS
+from optimize.weight_search import DIRECTIONS, WeightSearch, optimize_weights, pareto_front
+from pipeline.backtest_pipeline import BacktestPipeline, StudyDataContext
+from probability.calibrator import (
+    ProbabilityCalibrator,
+    ScoreTable,
+    fit_sigmoid_batch,
+    roc_summary,
+    youden_threshold_batch,
+)
+
+START, END = "2024-01-01", "2024-01-15"
+
+
+@pytest.fixture(scope="module")
+def context():
+    client = BinanceDataClient(client=SyntheticFuturesClient(listing_delay=False), store=None)
+    loader = MultiTFDataLoader(client=client, resample="closed")
+    return StudyDataContext("WEIGHTUSDT", INTERVALS, START, END, loader=loader).load()
+
+
+def test_pareto_front_drops_dominated_and_duplicate_points():
+    returns = np.array([0.10, 0.20, 0.05, 0.20, -0.10])
+    drawdowns = np.array([0.05, 0.10, 0.20, 0.10, 0.01])
+    # 2 is dominated by 0, 3 duplicates 1
+    assert pareto_front(returns, drawdowns).tolist() == [1, 0, 4]
+    assert pareto_front(np.empty(0), np.empty(0)).tolist() == []
+
+
+@pytest.mark.parametrize("method", ["logistic", "platt"])
+def test_batch_calibration_matches_calibrator(method):
+    rng = np.random.default_rng(0)
+    counts = rng.integers(1, 200, 27).astype(np.float64)
+    positives = np.floor(counts * rng.uniform(0.2, 0.8, 27))
+    scores = rng.uniform(-1, 1, (5, 27))
+    coef = fit_sigmoid_batch(scores, counts, positives, method)
+    probs = 1.0 / (1.0 + np.exp(-(coef[:, :1] * scores + coef[:, 1:])))
+    thresholds = youden_threshold_batch(probs, counts, positives)
+    for i, v in enumerate(scores):
+        cal = ProbabilityCalibrator(method, verbose=False).fit_table(ScoreTable(v, counts, positives))
+        np.testing.assert_allclose(coef[i], cal.coef_, rtol=1e-8)
+        assert thresholds[i] == roc_summary(probs[i], counts=counts, positives=positives).threshold
+    assert youden_threshold_batch(probs, counts, np.zeros(27)).tolist() == [np.inf] * 5
+
+
+def test_evaluate_matches_pipeline_per_vector(context):
+    search = WeightSearch.from_context(context)
+    weights = np.array([[1 / 3, 1 / 3, 1 / 3], [0.6, 0.3, 0.1], [0.1, 0.1, 0.8], [0.5, 0.5, 0.0]])
+    prob_threshold = np.array([0.0, 0.3, 0.5, 0.501])
+    result = search.evaluate(weights, prob_threshold)
+    assert (result.n_trades > 0).all()
+
+    for k, (w, thr) in enumerate(zip(weights, prob_threshold)):
+        pipe = BacktestPipeline(
+            context.symbol,
+            INTERVALS,
+            START,
+            END,
+            aggregator_weights=dict(zip(search.names, w)),
+            prob_threshold=thr,
+            context=context,
+            engine="fast",
+            calibrator=ProbabilityCalibrator(verbose=False),
+        )
+        res = pipe.execute()
+        equity = res.equity
+        assert result.threshold[k] == pytest.approx(pipe.prob_threshold, rel=1e-12)
+        assert result.final_value[k] == pytest.approx(res.final_value, rel=1e-12)
+        assert result.max_drawdown[k] == pytest.approx(np.max(1 - equity / np.maximum.accumulate(equity)), rel=1e-12)
+        assert result.n_trades[k] == len(res.trades)
+
+
+def test_optimize_weights_records_every_candidate(context):
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    search = WeightSearch.from_context(context)
+    study = optuna.create_study(directions=DIRECTIONS, sampler=optuna.samplers.RandomSampler(seed=0))
+    result = optimize_weights(study, search, trials=10, batch_size=4)
+    assert len(study.trials) == len(result.final_value) == 10
+    np.testing.assert_array_equal([t.values for t in study.trials], np.column_stack([result.returns, result.max_drawdown]))
+    np.testing.assert_allclose(result.weights.sum(axis=1), 1.0)
+    again = search.evaluate(result.weights, result.prob_threshold)
+    np.testing.assert_array_equal(again.final_value, result.final_value)